@@ -0,0 +1,69 @@
+"""Add batch queue tables
+
+Revision ID: 003_batch_queue_tables
+Revises: 002_legacy_tha_tables
+Create Date: 2026-10-17
+
+Creates the durable batch analysis queue that replaces the in-memory
+_batch_jobs dict:
+1. batch_jobs - One row per analyze-batch request
+2. batch_tasks - One row per alert directory (leased by workers)
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '003_batch_queue_tables'
+down_revision = '002_legacy_tha_tables'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # 1. Create batch_jobs table
+    op.create_table(
+        'batch_jobs',
+        sa.Column('id', sa.String(36), nullable=False),
+        sa.Column('status', sa.String(20), nullable=False, server_default='pending'),
+        sa.Column('report_level', sa.String(20), nullable=False, server_default='full'),
+        sa.Column('bypass_llm_cache', sa.Boolean(), nullable=False, server_default=sa.false()),
+        sa.Column('total', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.Column('started_at', sa.DateTime(), nullable=True),
+        sa.Column('completed_at', sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_batch_jobs_status', 'batch_jobs', ['status'], unique=False)
+    op.create_index('ix_batch_jobs_created_at', 'batch_jobs', ['created_at'], unique=False)
+
+    # 2. Create batch_tasks table
+    op.create_table(
+        'batch_tasks',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('job_id', sa.String(36), nullable=False),
+        sa.Column('position', sa.Integer(), nullable=False),
+        sa.Column('directory_path', sa.String(1000), nullable=False),
+        sa.Column('status', sa.String(20), nullable=False, server_default='pending'),
+        sa.Column('attempts', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('max_attempts', sa.Integer(), nullable=False, server_default='3'),
+        sa.Column('available_at', sa.DateTime(), nullable=False),
+        sa.Column('lease_owner', sa.String(255), nullable=True),
+        sa.Column('lease_expires_at', sa.DateTime(), nullable=True),
+        sa.Column('heartbeat_at', sa.DateTime(), nullable=True),
+        sa.Column('result', sa.JSON(), nullable=True),
+        sa.Column('error', sa.Text(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.Column('started_at', sa.DateTime(), nullable=True),
+        sa.Column('completed_at', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['job_id'], ['batch_jobs.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_batch_tasks_id', 'batch_tasks', ['id'], unique=False)
+    op.create_index('ix_batch_tasks_job_id', 'batch_tasks', ['job_id'], unique=False)
+    op.create_index('idx_batch_tasks_status_available', 'batch_tasks', ['status', 'available_at'], unique=False)
+    op.create_index('idx_batch_tasks_status_lease', 'batch_tasks', ['status', 'lease_expires_at'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_table('batch_tasks')
+    op.drop_table('batch_jobs')
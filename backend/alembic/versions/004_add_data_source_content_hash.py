@@ -0,0 +1,37 @@
+"""Add content hash to data sources
+
+Revision ID: 004_data_source_content_hash
+Revises: 003_batch_queue_tables
+Create Date: 2026-10-17
+
+Uploads are hashed while they are written so a re-upload of an already
+ingested export is linked to the earlier data source instead of being
+parsed and saved again:
+1. data_sources.content_sha256 - SHA-256 of the uploaded bytes (indexed)
+2. data_sources.duplicate_of_id - Earlier data source with identical content
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '004_data_source_content_hash'
+down_revision = '003_batch_queue_tables'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column('data_sources', sa.Column('content_sha256', sa.String(64), nullable=True))
+    op.add_column('data_sources', sa.Column('duplicate_of_id', sa.Integer(), nullable=True))
+    op.create_index('ix_data_sources_content_sha256', 'data_sources', ['content_sha256'], unique=False)
+    op.create_foreign_key(
+        'fk_data_sources_duplicate_of_id', 'data_sources', 'data_sources',
+        ['duplicate_of_id'], ['id'], ondelete='SET NULL'
+    )
+
+
+def downgrade() -> None:
+    op.drop_constraint('fk_data_sources_duplicate_of_id', 'data_sources', type_='foreignkey')
+    op.drop_index('ix_data_sources_content_sha256', table_name='data_sources')
+    op.drop_column('data_sources', 'duplicate_of_id')
+    op.drop_column('data_sources', 'content_sha256')
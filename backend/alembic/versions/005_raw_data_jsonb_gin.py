@@ -0,0 +1,46 @@
+"""Store raw_data as JSONB with GIN indexes
+
+Revision ID: 005_raw_data_jsonb_gin
+Revises: 004_data_source_content_hash
+Create Date: 2026-10-17
+
+alerts.raw_data and soda_reports.raw_data hold every source column (100+
+SAP fields) and could only be filtered with a full scan:
+1. On PostgreSQL both columns become JSONB with a GIN index, so
+   containment filters (raw_data @> '{"Vendor (LIFNR)": "100200"}') are
+   index lookups. JSONB does not keep key order or duplicate keys.
+2. alerts.data_source_id and soda_reports.data_source_id get B-tree
+   indexes (per-upload queries and field discovery)
+Other databases keep JSON and only get step 2.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '005_raw_data_jsonb_gin'
+down_revision = '004_data_source_content_hash'
+branch_labels = None
+depends_on = None
+
+RAW_DATA_TABLES = ('alerts', 'soda_reports')
+
+
+def upgrade() -> None:
+    is_postgresql = op.get_bind().dialect.name == 'postgresql'
+    for table in RAW_DATA_TABLES:
+        op.create_index(f'ix_{table}_data_source_id', table, ['data_source_id'], unique=False)
+        if is_postgresql:
+            op.execute(f'ALTER TABLE {table} ALTER COLUMN raw_data TYPE JSONB USING raw_data::jsonb')
+            op.create_index(
+                f'ix_{table}_raw_data_gin', table, ['raw_data'],
+                unique=False, postgresql_using='gin'
+            )
+
+
+def downgrade() -> None:
+    is_postgresql = op.get_bind().dialect.name == 'postgresql'
+    for table in RAW_DATA_TABLES:
+        if is_postgresql:
+            op.drop_index(f'ix_{table}_raw_data_gin', table_name=table)
+            op.execute(f'ALTER TABLE {table} ALTER COLUMN raw_data TYPE JSON USING raw_data::json')
+        op.drop_index(f'ix_{table}_data_source_id', table_name=table)
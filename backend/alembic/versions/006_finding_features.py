@@ -0,0 +1,44 @@
+"""Add materialized money loss features
+
+Revision ID: 006_finding_features
+Revises: 005_raw_data_jsonb_gin
+Create Date: 2026-10-17
+
+Money loss features used to be recomputed from lazy relationships for
+every finding, with hash() encodings that differ between processes:
+1. finding_features - one row per finding with the feature vector
+   (stable CRC-32 codes for issue type and focus area) and the feature
+   version it was computed with; written when the finding is saved
+2. ix_finding_features_feature_version - training reads one version
+Existing findings are backfilled by the next model training run.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '006_finding_features'
+down_revision = '005_raw_data_jsonb_gin'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'finding_features',
+        sa.Column('finding_id', sa.Integer(), nullable=False),
+        sa.Column('feature_version', sa.Integer(), nullable=False),
+        sa.Column('severity', sa.Float(), nullable=False),
+        sa.Column('risk_score', sa.Float(), nullable=False),
+        sa.Column('issue_type', sa.Float(), nullable=False),
+        sa.Column('classification_confidence', sa.Float(), nullable=False),
+        sa.Column('focus_area', sa.Float(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['finding_id'], ['findings.id']),
+        sa.PrimaryKeyConstraint('finding_id')
+    )
+    op.create_index('ix_finding_features_feature_version', 'finding_features', ['feature_version'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_finding_features_feature_version', table_name='finding_features')
+    op.drop_table('finding_features')
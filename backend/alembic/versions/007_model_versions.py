@@ -0,0 +1,69 @@
+"""Add model version records
+
+Revision ID: 007_model_versions
+Revises: 006_finding_features
+Create Date: 2026-10-17
+
+Money loss training runs as a background job and can refresh the current
+model incrementally:
+1. model_versions - one row per training run: mode (full/incremental),
+   status, sample counts, training time, model size, metrics, and the
+   newest finding included (where the next incremental refresh starts)
+2. uq_model_versions_active_name - partial unique index on name over
+   queued/running rows, so only one training run per model can be claimed
+   at a time, across processes
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '007_model_versions'
+down_revision = '006_finding_features'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'model_versions',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('name', sa.String(100), nullable=False),
+        sa.Column('version', sa.String(50), nullable=False),
+        sa.Column('status', sa.String(20), nullable=False),
+        sa.Column('mode', sa.String(20), nullable=False),
+        sa.Column('base_version', sa.String(50), nullable=True),
+        sa.Column('feature_version', sa.Integer(), nullable=True),
+        sa.Column('training_samples', sa.Integer(), nullable=True),
+        sa.Column('test_samples', sa.Integer(), nullable=True),
+        sa.Column('last_finding_id', sa.Integer(), nullable=True),
+        sa.Column('n_estimators', sa.Integer(), nullable=True),
+        sa.Column('n_jobs', sa.Integer(), nullable=True),
+        sa.Column('training_seconds', sa.Float(), nullable=True),
+        sa.Column('model_size_bytes', sa.Integer(), nullable=True),
+        sa.Column('model_path', sa.String(), nullable=True),
+        sa.Column('mean_absolute_error', sa.Float(), nullable=True),
+        sa.Column('r2_score', sa.Float(), nullable=True),
+        sa.Column('message', sa.Text(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.Column('started_at', sa.DateTime(), nullable=True),
+        sa.Column('completed_at', sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_model_versions_id', 'model_versions', ['id'], unique=False)
+    op.create_index('ix_model_versions_version', 'model_versions', ['version'], unique=False)
+    op.create_index('ix_model_versions_created_at', 'model_versions', ['created_at'], unique=False)
+    op.create_index('ix_model_versions_name_status', 'model_versions', ['name', 'status'], unique=False)
+    active = sa.text("status IN ('queued', 'running')")
+    op.create_index(
+        'uq_model_versions_active_name', 'model_versions', ['name'], unique=True,
+        postgresql_where=active, sqlite_where=active
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('uq_model_versions_active_name', table_name='model_versions')
+    op.drop_index('ix_model_versions_name_status', table_name='model_versions')
+    op.drop_index('ix_model_versions_created_at', table_name='model_versions')
+    op.drop_index('ix_model_versions_version', table_name='model_versions')
+    op.drop_index('ix_model_versions_id', table_name='model_versions')
+    op.drop_table('model_versions')
@@ -1,5 +1,5 @@
 from fastapi import APIRouter
-from . import ingestion, analysis, maintenance, dashboard
+from . import ingestion, analysis, maintenance, dashboard, raw_data
 
 router = APIRouter()
 
@@ -8,4 +8,5 @@ router.include_router(ingestion.router)
 router.include_router(analysis.router)
 router.include_router(maintenance.router)
 router.include_router(dashboard.router)
+router.include_router(raw_data.router)
 
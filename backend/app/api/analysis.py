@@ -9,7 +9,9 @@ from app.services.analysis.analyzer import Analyzer
 from app.models.analysis_run import AnalysisRun
 from app.models.finding import Finding
 from app.models.focus_area import FocusArea
-from app.schemas.analysis import AnalysisRunResponse, AnalysisRequest
+from app.models.model_version import ModelVersion
+from app.schemas.analysis import AnalysisRunResponse, AnalysisRequest, ModelVersionResponse
+from app.services.ml_engine.training_job import TrainingInProgressError, get_training_job
 from app.utils.audit_logger import audit_log
 
 logger = logging.getLogger(__name__)
@@ -37,7 +39,13 @@ async def run_analysis(
     db: Session = Depends(get_db)
 ):
     """Run analysis on a data source"""
-    analyzer = Analyzer(db)
+    try:
+        analyzer = Analyzer(db, finding_mode=request.finding_mode, group_by=request.group_by)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
     
     try:
         analysis_run = analyzer.analyze_data_source(request.data_source_id)
@@ -112,6 +120,32 @@ async def get_analysis_run(
     return AnalysisRunResponse.model_validate(run)
 
 
+@router.post("/train-model", response_model=ModelVersionResponse, status_code=status.HTTP_202_ACCEPTED)
+async def train_model(
+    full: bool = Query(False, description="Refit on all findings instead of an incremental refresh"),
+    db: Session = Depends(get_db)
+):
+    """Start money loss model training in the background; poll /analysis/model-versions"""
+    try:
+        model_version = get_training_job().start(db, incremental=not full)
+    except TrainingInProgressError as e:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=str(e)
+        )
+    return ModelVersionResponse.model_validate(model_version)
+
+
+@router.get("/model-versions", response_model=List[ModelVersionResponse])
+async def list_model_versions(
+    limit: int = 20,
+    db: Session = Depends(get_db)
+):
+    """Money loss model training runs, newest first"""
+    versions = db.query(ModelVersion).order_by(ModelVersion.id.desc()).limit(limit).all()
+    return [ModelVersionResponse.model_validate(v) for v in versions]
+
+
 @router.get("/findings")
 async def get_findings(
     focus_area: Optional[str] = Query(None),
@@ -6,32 +6,30 @@ Supports both single alert analysis and batch processing with
 configurable report levels (summary/full LLM-generated).
 """
 
-from fastapi import APIRouter, HTTPException, Depends, BackgroundTasks
+from fastapi import APIRouter, HTTPException, Depends
 from sqlalchemy.orm import Session
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Tuple, Union
 from pydantic import BaseModel
 from enum import Enum
+import asyncio
 import os
-import uuid
 import logging
-from datetime import datetime
 
 from app.core.database import get_db
 from app.core.config import settings
 from app.services.content_analyzer import ContentAnalyzer
-from app.services.content_analyzer.artifact_reader import ArtifactReader
+from app.services.content_analyzer.analyzer import ContentFinding
+from app.services.content_analyzer.artifact_reader import AlertArtifacts, ArtifactReader
+from app.services.content_analyzer.summary_cache import SummaryCache
+from app.services.llm_cache import get_llm_response_cache, llm_cache_bypass
 from app.services.content_analyzer.report_generator import ReportGenerator
-from app.models.finding import Finding
-from app.models.focus_area import FocusArea
-from app.models.risk_assessment import RiskAssessment
-from app.models.money_loss import MoneyLossCalculation
-from app.models.data_source import DataSource, DataSourceType, FileFormat
-# Dashboard models for integrated pipeline
-from app.models.alert_instance import AlertInstance
-from app.models.alert_analysis import AlertAnalysis
-from app.models.critical_discovery import CriticalDiscovery
-from app.models.key_finding import KeyFinding
-from app.models.action_item import ActionItem
+from app.services.batch_queue import ClaimedTask, get_batch_queue
+from app.services.batch_queue.finding_writer import (
+    PendingFinding,
+    WrittenFinding,
+    extract_module_from_path,
+    get_finding_writer,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -48,10 +46,6 @@ class ReportLevel(str, Enum):
     FULL = "full"        # Complete LLM-generated report (higher cost)
 
 
-# In-memory batch job storage (for production, use Redis or database)
-_batch_jobs: Dict[str, Dict[str, Any]] = {}
-
-
 # Request/Response Models
 class AnalyzeTextRequest(BaseModel):
     """Request to analyze text content directly."""
@@ -62,6 +56,7 @@ class AnalyzeTextRequest(BaseModel):
     metadata: Optional[str] = None
     summary: Optional[str] = None
     use_llm: bool = True
+    bypass_llm_cache: bool = False  # force fresh LLM responses
 
 
 class AnalyzeDirectoryRequest(BaseModel):
@@ -69,12 +64,14 @@ class AnalyzeDirectoryRequest(BaseModel):
     directory_path: str
     use_llm: bool = True
     report_level: ReportLevel = ReportLevel.FULL  # full or summary
+    bypass_llm_cache: bool = False  # force fresh LLM responses
 
 
 class AnalyzeBatchRequest(BaseModel):
     """Request to analyze multiple alert directories."""
     directory_paths: List[str]
     report_level: ReportLevel = ReportLevel.FULL
+    bypass_llm_cache: bool = False  # force fresh LLM responses
 
 
 class ScanFoldersRequest(BaseModel):
@@ -158,6 +155,28 @@ class FeedbackResponse(BaseModel):
 # Global analyzer instance (lazy initialization)
 _analyzer_instance: Optional[ContentAnalyzer] = None
 
+# Global parsed-Summary cache (lazy initialization, None when disabled)
+_summary_cache_instance: Optional[SummaryCache] = None
+
+
+def get_summary_cache() -> Optional[SummaryCache]:
+    """Get or create the on-disk SummaryCache configured in settings."""
+    global _summary_cache_instance
+
+    if _summary_cache_instance is None and getattr(settings, 'SUMMARY_CACHE_ENABLED', True):
+        cache_path = getattr(settings, 'SUMMARY_CACHE_PATH', None) or os.path.join(
+            getattr(settings, 'STORAGE_PATH', './storage'), "summary_cache"
+        )
+        max_mb = getattr(settings, 'SUMMARY_CACHE_MAX_MB', 512)
+        _summary_cache_instance = SummaryCache(cache_path, max_bytes=max_mb * 1024 * 1024)
+
+    return _summary_cache_instance
+
+
+def get_artifact_reader() -> ArtifactReader:
+    """Create an ArtifactReader backed by the shared Summary cache."""
+    return ArtifactReader(summary_cache=get_summary_cache())
+
 
 def get_content_analyzer() -> ContentAnalyzer:
     """Get or create the ContentAnalyzer instance."""
@@ -178,7 +197,11 @@ def get_content_analyzer() -> ContentAnalyzer:
         _analyzer_instance = ContentAnalyzer(
             llm_provider=llm_provider,
             api_key=api_key,
-            use_llm=use_llm
+            use_llm=use_llm,
+            artifact_reader=get_artifact_reader(),
+            max_workers=getattr(settings, 'ANALYSIS_MAX_WORKERS', 4),
+            llm_mode=getattr(settings, 'LLM_ANALYSIS_MODE', 'staged'),
+            llm_cache=get_llm_response_cache()
         )
 
         logger.info(f"ContentAnalyzer initialized: LLM={use_llm}, provider={llm_provider}")
@@ -186,6 +209,33 @@ def get_content_analyzer() -> ContentAnalyzer:
     return _analyzer_instance
 
 
+def _generate_markdown_report(
+    artifacts: AlertArtifacts,
+    content_finding: ContentFinding,
+    report_level: str,
+    directory_path: str
+) -> Tuple[str, str]:
+    """
+    Generate and save the markdown report; returns (report, path).
+
+    Blocking (full reports make a sync LLM call), so async callers run it
+    with asyncio.to_thread.
+    """
+    report_generator = ReportGenerator()
+    markdown_report = report_generator.generate_report(
+        artifacts=artifacts,
+        content_finding=content_finding,
+        report_level=report_level
+    )
+    markdown_path = report_generator.save_report(
+        report=markdown_report,
+        alert_id=content_finding.alert_id,
+        alert_name=content_finding.alert_name,
+        module=extract_module_from_path(directory_path)
+    )
+    return markdown_report, markdown_path
+
+
 @router.post("/analyze", response_model=FindingResponse)
 async def analyze_content(
     request: AnalyzeTextRequest,
@@ -203,7 +253,7 @@ async def analyze_content(
         analyzer = get_content_analyzer()
 
         # Create artifacts from request
-        artifact_reader = ArtifactReader()
+        artifact_reader = get_artifact_reader()
         artifacts = artifact_reader.read_from_content(
             alert_id=request.alert_id,
             alert_name=request.alert_name,
@@ -213,15 +263,10 @@ async def analyze_content(
             summary=request.summary
         )
 
-        # Temporarily override LLM setting if requested
-        original_use_llm = analyzer.use_llm
-        if not request.use_llm:
-            analyzer.use_llm = False
-
-        try:
-            finding = analyzer.analyze_alert(artifacts, include_raw=True)
-        finally:
-            analyzer.use_llm = original_use_llm
+        with llm_cache_bypass(request.bypass_llm_cache):
+            finding = await analyzer.analyze_alert_async(
+                artifacts, include_raw=True, use_llm=analyzer.use_llm and request.use_llm
+            )
 
         return FindingResponse(**finding.to_dict())
 
@@ -250,15 +295,10 @@ async def analyze_directory(
 
         analyzer = get_content_analyzer()
 
-        # Temporarily override LLM setting if requested
-        original_use_llm = analyzer.use_llm
-        if not request.use_llm:
-            analyzer.use_llm = False
-
-        try:
-            finding = analyzer.analyze_from_directory(request.directory_path, include_raw=True)
-        finally:
-            analyzer.use_llm = original_use_llm
+        with llm_cache_bypass(request.bypass_llm_cache):
+            finding = await analyzer.analyze_from_directory_async(
+                request.directory_path, include_raw=True, use_llm=analyzer.use_llm and request.use_llm
+            )
 
         return FindingResponse(**finding.to_dict())
 
@@ -307,149 +347,52 @@ async def analyze_and_save(
             raise HTTPException(status_code=404, detail=f"Directory not found: {request.directory_path}")
 
         analyzer = get_content_analyzer()
-        artifact_reader = ArtifactReader()
+        artifact_reader = get_artifact_reader()
 
         # Read artifacts first (needed for both analysis and report generation)
-        artifacts = artifact_reader.read_from_directory(request.directory_path)
+        artifacts = await asyncio.to_thread(artifact_reader.read_from_directory, request.directory_path)
 
         # Determine if we should use LLM based on request
         use_llm_for_analysis = request.use_llm and request.report_level == ReportLevel.FULL
 
-        # Override LLM setting
-        original_use_llm = analyzer.use_llm
-        analyzer.use_llm = use_llm_for_analysis
-
-        try:
-            content_finding = analyzer.analyze_alert(artifacts, include_raw=True)
-        finally:
-            analyzer.use_llm = original_use_llm
-
-        # Get or create the focus area
-        focus_area = db.query(FocusArea).filter(FocusArea.code == content_finding.focus_area).first()
-        if not focus_area:
-            focus_area = FocusArea(
-                code=content_finding.focus_area,
-                name=content_finding.focus_area.replace("_", " ").title(),
-                description=f"Auto-created for {content_finding.focus_area}"
-            )
-            db.add(focus_area)
-            db.flush()
-
-        # Get or create a data source for this artifact directory
-        data_source = db.query(DataSource).filter(
-            DataSource.original_filename == request.directory_path
-        ).first()
-        if not data_source:
-            dir_name = os.path.basename(request.directory_path.rstrip('/\\'))
-            data_source = DataSource(
-                filename=f"artifacts_{dir_name}",
-                original_filename=request.directory_path,
-                file_format=FileFormat.JSON,
-                data_type=DataSourceType.ALERT,
-                file_path=request.directory_path,
-                file_size=0,
-                status="processed"
+        with llm_cache_bypass(request.bypass_llm_cache):
+            content_finding = await analyzer.analyze_alert_async(
+                artifacts, include_raw=True, use_llm=use_llm_for_analysis
             )
-            db.add(data_source)
-            db.flush()
 
         # Generate markdown report
         markdown_path = None
         markdown_report = None
         try:
-            report_generator = ReportGenerator()
-            markdown_report = report_generator.generate_report(
-                artifacts=artifacts,
-                content_finding=content_finding,
-                report_level=request.report_level.value
-            )
-
-            # Save markdown to file
-            markdown_path = report_generator.save_report(
-                report=markdown_report,
-                alert_id=content_finding.alert_id,
-                alert_name=content_finding.alert_name,
-                module=_extract_module_from_path(request.directory_path)
+            markdown_report, markdown_path = await asyncio.to_thread(
+                _generate_markdown_report,
+                artifacts, content_finding, request.report_level.value, request.directory_path
             )
             logger.info(f"Generated markdown report: {markdown_path}")
         except Exception as e:
             logger.warning(f"Failed to generate markdown report: {e}")
             # Continue without markdown - don't fail the whole request
 
-        # Create the Finding with new report storage fields
-        finding = Finding(
-            data_source_id=data_source.id,
-            focus_area_id=focus_area.id,
-            title=content_finding.title,
-            description=content_finding.description[:4000] if content_finding.description else None,
-            severity=content_finding.severity,
-            classification_confidence=content_finding.focus_area_confidence,
-            status="new",
-            # New fields for content analysis pipeline
-            source_alert_id=content_finding.alert_id,
-            source_alert_name=content_finding.alert_name,
-            source_module=_extract_module_from_path(request.directory_path),
-            source_directory=request.directory_path,
-            markdown_report=markdown_report,
-            report_path=markdown_path,
-            report_level=request.report_level.value,
-            key_findings_json={
-                "risk_score": content_finding.risk_score,
-                "money_loss_estimate": content_finding.money_loss_estimate,
-                "focus_area": content_finding.focus_area,
-                "severity": content_finding.severity,
-                "total_count": content_finding.total_count,
-                "monetary_amount": content_finding.monetary_amount,
-                "currency": content_finding.currency,
-                "key_metrics": content_finding.key_metrics,
-            },
-            analysis_status="completed",
-            analyzed_at=datetime.utcnow()
-        )
-        db.add(finding)
-        db.flush()
-
-        # Create RiskAssessment
-        risk_assessment = RiskAssessment(
-            finding_id=finding.id,
-            risk_score=content_finding.risk_score,
-            risk_level=content_finding.risk_level,
-            risk_category=content_finding.focus_area,
-            risk_description=content_finding.severity_reasoning,
-            risk_factors=content_finding.risk_factors,
-            potential_impact=content_finding.business_impact
-        )
-        db.add(risk_assessment)
-
-        # Create MoneyLossCalculation
-        money_loss = MoneyLossCalculation(
-            finding_id=finding.id,
-            estimated_loss=content_finding.money_loss_estimate,
-            confidence_score=content_finding.money_loss_confidence,
-            calculation_method="content_analyzer",
-            final_estimate=content_finding.money_loss_estimate,
-            reasoning=f"Estimated from {content_finding.alert_name} analysis"
-        )
-        db.add(money_loss)
-
-        # Populate Alert Dashboard tables for unified visualization
-        dashboard_result = _populate_dashboard_tables(
-            db=db,
+        # Save Finding, RiskAssessment, MoneyLossCalculation and dashboard rows
+        written = (await asyncio.to_thread(get_finding_writer().write_and_commit, db, [PendingFinding(
             content_finding=content_finding,
             directory_path=request.directory_path,
-            finding_id=finding.id
-        )
+            report_level=request.report_level.value,
+            markdown_report=markdown_report,
+            markdown_path=markdown_path
+        )]))[0]
+        if isinstance(written, Exception):
+            raise written
+        dashboard_result = written.dashboard
         logger.info(f"Dashboard integration: {dashboard_result}")
 
-        db.commit()
-
         # Build success message with dashboard info
         dashboard_msg = ""
         if dashboard_result.get("alert_analysis_id"):
             dashboard_msg = f" Dashboard populated: {dashboard_result.get('critical_discoveries', 0)} discoveries, {dashboard_result.get('action_items', 0)} action items."
 
         return SavedFindingResponse(
-            finding_id=finding.id,
+            finding_id=written.finding_id,
             message=f"Finding saved successfully for alert: {content_finding.alert_name}.{dashboard_msg}",
             focus_area=content_finding.focus_area,
             severity=content_finding.severity,
@@ -467,303 +410,6 @@ async def analyze_and_save(
         raise HTTPException(status_code=500, detail=f"Analysis and save failed: {str(e)}")
 
 
-def _extract_module_from_path(directory_path: str) -> str:
-    """Extract module code (FI, MM, SD, etc.) from directory path."""
-    path_parts = directory_path.replace("\\", "/").split("/")
-    # Look for known module codes in path
-    modules = ["FI", "MM", "SD", "MD", "PUR", "HR", "PP", "QM"]
-    for part in path_parts:
-        if part.upper() in modules:
-            return part.upper()
-    return "GENERAL"
-
-
-def _populate_dashboard_tables(
-    db: Session,
-    content_finding,
-    directory_path: str,
-    finding_id: int
-) -> dict:
-    """
-    Populate the Alert Dashboard tables from content analysis results.
-
-    Creates:
-    - AlertInstance (or reuses existing)
-    - AlertAnalysis (linked to AlertInstance)
-    - CriticalDiscovery records (from notable_items)
-    - KeyFinding records
-    - ActionItem records (for high-risk findings)
-
-    Returns dict with created record IDs.
-    """
-    try:
-        module = _extract_module_from_path(directory_path)
-
-        # Map focus area to severity
-        severity_map = {
-            "BUSINESS_PROTECTION": "HIGH",
-            "ACCESS_GOVERNANCE": "HIGH",
-            "BUSINESS_CONTROL": "MEDIUM",
-            "TECHNICAL_CONTROL": "MEDIUM",
-            "JOBS_CONTROL": "LOW",
-            "S4HANA_EXCELLENCE": "MEDIUM"
-        }
-
-        # Map risk_score to fraud_indicator
-        def get_fraud_indicator(risk_score: int, severity: str) -> str:
-            if risk_score >= 80 or severity == "CRITICAL":
-                return "INVESTIGATE"
-            elif risk_score >= 60 or severity == "HIGH":
-                return "MONITOR"
-            else:
-                return "NONE"
-
-        # Validate content_finding before proceeding
-        from app.services.content_analyzer.analyzer import ContentAnalyzer
-        analyzer = ContentAnalyzer(use_llm=False)
-        is_valid, validation_warnings = analyzer._validate_content_finding(content_finding)
-        
-        if validation_warnings:
-            logger.warning(f"Validation warnings for alert {content_finding.alert_id}: {', '.join(validation_warnings)}")
-        
-        # 1. Create or get AlertInstance
-        alert_instance = db.query(AlertInstance).filter(
-            AlertInstance.alert_id == content_finding.alert_id
-        ).first()
-
-        if not alert_instance:
-            # Validate required fields with defaults
-            alert_id = content_finding.alert_id or f"UNKNOWN_{datetime.utcnow().timestamp()}"
-            alert_name = content_finding.alert_name or "Unnamed Alert"
-            focus_area = content_finding.focus_area or "BUSINESS_CONTROL"
-            
-            # Ensure business_purpose is not None
-            business_purpose = (
-                content_finding.business_impact or 
-                (content_finding.description[:500] if content_finding.description else None) or
-                f"Alert: {alert_name}"
-            )
-            
-            # Ensure parameters is a dict, not None
-            parameters = {
-                "directory_path": directory_path,
-                "module": module
-            }
-            
-            alert_instance = AlertInstance(
-                alert_id=alert_id,
-                alert_name=alert_name,
-                focus_area=focus_area,
-                subcategory=module,
-                parameters=parameters,
-                business_purpose=business_purpose
-            )
-            db.add(alert_instance)
-            db.flush()
-            logger.info(f"Created AlertInstance: {alert_instance.alert_id}")
-
-        # 2. Create AlertAnalysis
-        # Validate and set defaults for required fields
-        severity = content_finding.severity.upper() if content_finding.severity else "MEDIUM"
-        risk_score = content_finding.risk_score if content_finding.risk_score is not None else 50
-        
-        fraud_indicator = get_fraud_indicator(risk_score, severity)
-
-        # Convert money_loss_estimate to proper decimal
-        financial_impact = content_finding.money_loss_estimate or 0.0
-
-        # Cap records_affected to PostgreSQL Integer max (2,147,483,647)
-        # Ensure records_affected is >= 0
-        records_affected = content_finding.total_count if content_finding.total_count is not None else 0
-        if records_affected < 0:
-            logger.warning(f"records_affected is negative ({records_affected}), setting to 0")
-            records_affected = 0
-        if records_affected > 2147483647:
-            logger.warning(f"records_affected exceeds max INT ({records_affected}), capping to 2147483647")
-            records_affected = 2147483647  # Cap to max INT value
-
-        # Ensure raw_summary_data is a dict, not None
-        raw_summary_data = {
-            "key_metrics": content_finding.key_metrics if content_finding.key_metrics else {},
-            "risk_factors": content_finding.risk_factors if content_finding.risk_factors else [],
-            "recommended_actions": content_finding.recommended_actions if content_finding.recommended_actions else [],
-            "finding_id": finding_id
-        }
-
-        alert_analysis = AlertAnalysis(
-            alert_instance_id=alert_instance.id,
-            analysis_type="QUANTI",  # Quantitative analysis
-            execution_date=datetime.utcnow().date(),
-            records_affected=records_affected,
-            severity=severity,
-            risk_score=risk_score,
-            fraud_indicator=fraud_indicator,
-            financial_impact_usd=financial_impact,
-            local_currency=content_finding.currency or "USD",
-            report_path=directory_path,
-            raw_summary_data=raw_summary_data,
-            created_by="content_analyzer_pipeline"
-        )
-        db.add(alert_analysis)
-        db.flush()
-        logger.info(f"Created AlertAnalysis: {alert_analysis.id}")
-
-        # 3. Create CriticalDiscovery records from notable_items
-        discovery_count = 0
-        if hasattr(content_finding, 'notable_items') and content_finding.notable_items:
-            for idx, item in enumerate(content_finding.notable_items[:5], 1):  # Max 5 discoveries
-                # Handle both dict and object notable items
-                if isinstance(item, dict):
-                    title = item.get('title', item.get('entity', f'Discovery {idx}'))
-                    description = item.get('description', item.get('details', str(item)))
-                    entity = item.get('entity', item.get('id', ''))
-                    amount = item.get('amount', item.get('value', 0))
-                    percentage = item.get('percentage', 0)
-                else:
-                    title = getattr(item, 'title', f'Discovery {idx}')
-                    description = getattr(item, 'description', str(item))
-                    entity = getattr(item, 'entity', '')
-                    amount = getattr(item, 'amount', 0)
-                    percentage = getattr(item, 'percentage', 0)
-
-                discovery = CriticalDiscovery(
-                    alert_analysis_id=alert_analysis.id,
-                    discovery_order=idx,
-                    title=str(title)[:255],
-                    description=str(description)[:2000],
-                    affected_entity=str(entity)[:255] if entity else None,
-                    metric_value=float(amount) if amount else None,
-                    percentage_of_total=float(percentage) if percentage else None,
-                    is_fraud_indicator=(fraud_indicator == "INVESTIGATE")
-                )
-                db.add(discovery)
-                discovery_count += 1
-
-        # If no notable items, create one from the main finding
-        # This ensures at least one CriticalDiscovery per analysis
-        if discovery_count == 0:
-            # Try to get title from various sources
-            title = (
-                content_finding.title or 
-                content_finding.alert_name or 
-                "Alert Analysis Finding"
-            )
-            
-            # Try to get description from various sources
-            description = (
-                content_finding.description or 
-                content_finding.business_impact or 
-                content_finding.what_happened or
-                f"Analysis of alert: {content_finding.alert_name}"
-            )
-            
-            discovery = CriticalDiscovery(
-                alert_analysis_id=alert_analysis.id,
-                discovery_order=1,
-                title=title[:255],
-                description=description[:2000],
-                metric_value=float(financial_impact) if financial_impact else None,
-                is_fraud_indicator=(fraud_indicator == "INVESTIGATE")
-            )
-            db.add(discovery)
-            discovery_count = 1
-            logger.info(f"Created default CriticalDiscovery from main finding (no notable_items available)")
-
-        if discovery_count == 0:
-            logger.error(f"Failed to create any CriticalDiscovery records for alert_analysis {alert_analysis.id}")
-            raise ValueError("At least one CriticalDiscovery must be created per analysis")
-
-        logger.info(f"Created {discovery_count} CriticalDiscovery records")
-
-        # 4. Create KeyFinding records
-        key_finding_count = 0
-
-        # First key finding: main business impact
-        if content_finding.business_impact:
-            kf = KeyFinding(
-                alert_analysis_id=alert_analysis.id,
-                finding_rank=1,
-                finding_text=content_finding.business_impact[:2000],
-                finding_category="Impact",
-                financial_impact_usd=financial_impact
-            )
-            db.add(kf)
-            key_finding_count += 1
-
-        # Second key finding: risk description
-        if hasattr(content_finding, 'severity_reasoning') and content_finding.severity_reasoning:
-            kf = KeyFinding(
-                alert_analysis_id=alert_analysis.id,
-                finding_rank=2,
-                finding_text=content_finding.severity_reasoning[:2000],
-                finding_category="Risk"
-            )
-            db.add(kf)
-            key_finding_count += 1
-
-        # Third key finding from risk_factors
-        if hasattr(content_finding, 'risk_factors') and content_finding.risk_factors:
-            factors_text = "; ".join(content_finding.risk_factors[:3])
-            kf = KeyFinding(
-                alert_analysis_id=alert_analysis.id,
-                finding_rank=3,
-                finding_text=f"Risk Factors: {factors_text}"[:2000],
-                finding_category="Concentration"
-            )
-            db.add(kf)
-            key_finding_count += 1
-
-        logger.info(f"Created {key_finding_count} KeyFinding records")
-
-        # 5. Create ActionItem records for high-risk findings
-        action_count = 0
-        if fraud_indicator == "INVESTIGATE" or severity in ["CRITICAL", "HIGH"]:
-            # Immediate action for investigation
-            action = ActionItem(
-                alert_analysis_id=alert_analysis.id,
-                action_type="IMMEDIATE",
-                priority=1,
-                title=f"Investigate {content_finding.alert_name}",
-                description=f"High-risk alert detected with {severity} severity and risk score {content_finding.risk_score}. Review findings and determine if fraudulent activity occurred.",
-                status="OPEN"
-            )
-            db.add(action)
-            action_count += 1
-
-        # Short-term action from recommended_actions
-        if hasattr(content_finding, 'recommended_actions') and content_finding.recommended_actions:
-            for idx, rec_action in enumerate(content_finding.recommended_actions[:2], 1):
-                action = ActionItem(
-                    alert_analysis_id=alert_analysis.id,
-                    action_type="SHORT_TERM",
-                    priority=2 + idx,
-                    title=str(rec_action)[:255],
-                    description=f"Recommended action from analysis: {rec_action}",
-                    status="OPEN"
-                )
-                db.add(action)
-                action_count += 1
-
-        logger.info(f"Created {action_count} ActionItem records")
-
-        return {
-            "alert_instance_id": alert_instance.id,
-            "alert_analysis_id": alert_analysis.id,
-            "critical_discoveries": discovery_count,
-            "key_findings": key_finding_count,
-            "action_items": action_count
-        }
-
-    except Exception as e:
-        logger.error(f"Failed to populate dashboard tables: {e}")
-        # Don't fail the whole request - dashboard population is supplementary
-        return {
-            "error": str(e),
-            "alert_instance_id": None,
-            "alert_analysis_id": None
-        }
-
-
 @router.post("/analyze-sample/{sample_name}", response_model=FindingResponse)
 async def analyze_sample(
     sample_name: str,
@@ -809,15 +455,9 @@ async def analyze_sample(
 
         analyzer = get_content_analyzer()
 
-        # Temporarily override LLM setting
-        original_use_llm = analyzer.use_llm
-        if not use_llm:
-            analyzer.use_llm = False
-
-        try:
-            finding = analyzer.analyze_from_directory(sample_path, include_raw=True)
-        finally:
-            analyzer.use_llm = original_use_llm
+        finding = await analyzer.analyze_from_directory_async(
+            sample_path, include_raw=True, use_llm=analyzer.use_llm and use_llm
+        )
 
         return FindingResponse(**finding.to_dict())
 
@@ -897,12 +537,17 @@ async def get_analyzer_status():
     """
     try:
         analyzer = get_content_analyzer()
+        summary_cache = get_summary_cache()
+        llm_cache = get_llm_response_cache()
 
         return {
             "status": "active",
             "use_llm": analyzer.use_llm,
             "llm_provider": analyzer.llm_classifier.llm_provider if analyzer.llm_classifier else None,
+            "llm_mode": analyzer.llm_mode,
             "context_loaded": analyzer._context_loaded,
+            "summary_cache": summary_cache.stats() if summary_cache else None,
+            "llm_cache": llm_cache.stats() if llm_cache else None,
             "version": "1.0.0"
         }
 
@@ -968,7 +613,7 @@ async def scan_folders(request: ScanFoldersRequest):
                     alert_name = folder_name
 
                 # Determine module from path
-                module = _extract_module_from_path(dirpath)
+                module = extract_module_from_path(dirpath)
 
                 folders.append({
                     "path": dirpath,
@@ -998,51 +643,31 @@ async def scan_folders(request: ScanFoldersRequest):
 
 
 @router.post("/analyze-batch", response_model=BatchJobResponse)
-async def analyze_batch(
-    request: AnalyzeBatchRequest,
-    background_tasks: BackgroundTasks,
-    db: Session = Depends(get_db)
-):
+async def analyze_batch(request: AnalyzeBatchRequest):
     """
     Start batch processing of multiple alert directories.
 
-    Creates a background job to process all specified directories.
-    Use batch-status/{job_id} to monitor progress.
+    Enqueues one task per directory in the database-backed batch queue;
+    worker processes (python -m app.services.batch_queue.worker) pick
+    them up. Use batch-status/{job_id} to monitor progress.
 
     Args:
         directory_paths: List of paths to alert directories
         report_level: "summary" (no LLM) or "full" (LLM-generated)
     """
     try:
-        job_id = str(uuid.uuid4())
-
-        # Initialize job tracking
-        _batch_jobs[job_id] = {
-            "job_id": job_id,
-            "status": "pending",
-            "total": len(request.directory_paths),
-            "processed": 0,
-            "successful": 0,
-            "failed": 0,
-            "results": [],
-            "started_at": datetime.utcnow().isoformat(),
-            "completed_at": None,
-            "report_level": request.report_level.value
-        }
-
-        # Start background processing
-        background_tasks.add_task(
-            _process_batch_job,
-            job_id,
+        job_id = await asyncio.to_thread(
+            get_batch_queue().create_job,
             request.directory_paths,
-            request.report_level.value
+            report_level=request.report_level.value,
+            bypass_llm_cache=request.bypass_llm_cache
         )
 
         return BatchJobResponse(
             job_id=job_id,
             total_alerts=len(request.directory_paths),
             status="pending",
-            message=f"Batch job started. Processing {len(request.directory_paths)} alerts with {request.report_level.value} report level."
+            message=f"Batch job queued. Processing {len(request.directory_paths)} alerts with {request.report_level.value} report level."
         )
 
     except Exception as e:
@@ -1050,172 +675,108 @@ async def analyze_batch(
         raise HTTPException(status_code=500, detail=f"Failed to start batch job: {str(e)}")
 
 
-async def _process_batch_job(job_id: str, directory_paths: List[str], report_level: str):
-    """Background task to process batch of alerts."""
-    from app.core.database import SessionLocal
+async def process_batch_alerts(
+    db: Session,
+    tasks: List[ClaimedTask]
+) -> List[Union[Dict[str, Any], BaseException]]:
+    """
+    Analyze a chunk of batch tasks and save the results with one commit.
+
+    Called by batch queue workers. Alerts are analyzed concurrently, then
+    all findings of the chunk are written together by the bulk finding
+    writer. Each written task is marked finished in the same commit as its
+    findings (and only while this worker still holds its lease), so a
+    task that is retried after a lost lease or a crash never has its
+    findings saved twice. Returns, per task, the result shown in
+    batch-status (a missing directory is a failed result) or the exception
+    raised, so the queue can retry that task alone.
+    """
+    outcomes = list(await asyncio.gather(
+        *(_analyze_batch_alert(task.directory_path, task.report_level, task.bypass_llm_cache) for task in tasks),
+        return_exceptions=True
+    ))
+
+    pending = [(idx, outcome) for idx, outcome in enumerate(outcomes) if isinstance(outcome, tuple)]
+    if pending:
+        queue = get_batch_queue()
+
+        def record_results(db: Session, written: List[Tuple[int, WrittenFinding]]):
+            for position, saved in written:
+                idx, (item, result) = pending[position]
+                _fill_batch_result(result, item, saved)
+                queue.record_result(db, tasks[idx], result)
+
+        written = await asyncio.to_thread(
+            get_finding_writer().write_and_commit, db, [item for _, (item, _) in pending], record_results
+        )
+        for (idx, (_, result)), saved in zip(pending, written):
+            if isinstance(saved, Exception):
+                outcomes[idx] = saved
+                continue
+            tasks[idx].recorded = True
+            outcomes[idx] = result
+
+    return outcomes
+
 
-    job = _batch_jobs.get(job_id)
-    if not job:
-        return
+def _fill_batch_result(result: Dict[str, Any], item: PendingFinding, saved: WrittenFinding):
+    """Complete a batch-status result with the finding written for it."""
+    cf = item.content_finding
+    result["status"] = "success"
+    result["finding_id"] = saved.finding_id
+    result["alert_name"] = cf.alert_name
+    result["focus_area"] = cf.focus_area
+    result["severity"] = cf.severity
+    result["dashboard"] = saved.dashboard
 
-    job["status"] = "processing"
 
-    # Create a new database session for background task
-    db = SessionLocal()
+async def _analyze_batch_alert(directory_path: str, report_level: str, bypass_llm_cache: bool):
+    """
+    Analyze one alert directory of a batch chunk.
 
-    try:
-        analyzer = get_content_analyzer()
-        artifact_reader = ArtifactReader()
-        report_generator = ReportGenerator()
-
-        use_llm = report_level == "full"
-        original_use_llm = analyzer.use_llm
-        analyzer.use_llm = use_llm
-
-        for idx, directory_path in enumerate(directory_paths):
-            result = {
-                "path": directory_path,
-                "status": "pending",
-                "finding_id": None,
-                "markdown_path": None,
-                "error": None
-            }
-
-            try:
-                if not os.path.exists(directory_path):
-                    result["status"] = "failed"
-                    result["error"] = f"Directory not found: {directory_path}"
-                    job["failed"] += 1
-                else:
-                    # Read and analyze
-                    artifacts = artifact_reader.read_from_directory(directory_path)
-                    content_finding = analyzer.analyze_alert(artifacts, include_raw=False)
-
-                    # Get or create focus area
-                    focus_area = db.query(FocusArea).filter(
-                        FocusArea.code == content_finding.focus_area
-                    ).first()
-                    if not focus_area:
-                        focus_area = FocusArea(
-                            code=content_finding.focus_area,
-                            name=content_finding.focus_area.replace("_", " ").title(),
-                            description=f"Auto-created for {content_finding.focus_area}"
-                        )
-                        db.add(focus_area)
-                        db.flush()
-
-                    # Get or create data source
-                    data_source = db.query(DataSource).filter(
-                        DataSource.original_filename == directory_path
-                    ).first()
-                    if not data_source:
-                        dir_name = os.path.basename(directory_path.rstrip('/\\'))
-                        data_source = DataSource(
-                            filename=f"artifacts_{dir_name}",
-                            original_filename=directory_path,
-                            file_format=FileFormat.JSON,
-                            data_type=DataSourceType.ALERT,
-                            file_path=directory_path,
-                            file_size=0,
-                            status="processed"
-                        )
-                        db.add(data_source)
-                        db.flush()
-
-                    # Generate markdown report
-                    markdown_path = None
-                    try:
-                        markdown_report = report_generator.generate_report(
-                            artifacts=artifacts,
-                            content_finding=content_finding,
-                            report_level=report_level
-                        )
-                        markdown_path = report_generator.save_report(
-                            report=markdown_report,
-                            alert_id=content_finding.alert_id,
-                            alert_name=content_finding.alert_name,
-                            module=_extract_module_from_path(directory_path)
-                        )
-                    except Exception as e:
-                        logger.warning(f"Failed to generate markdown for {directory_path}: {e}")
-
-                    # Create finding
-                    finding = Finding(
-                        data_source_id=data_source.id,
-                        focus_area_id=focus_area.id,
-                        title=content_finding.title,
-                        description=content_finding.description[:4000] if content_finding.description else None,
-                        severity=content_finding.severity,
-                        classification_confidence=content_finding.focus_area_confidence,
-                        status="new"
-                    )
-                    db.add(finding)
-                    db.flush()
-
-                    # Create RiskAssessment
-                    risk_assessment = RiskAssessment(
-                        finding_id=finding.id,
-                        risk_score=content_finding.risk_score,
-                        risk_level=content_finding.risk_level,
-                        risk_category=content_finding.focus_area,
-                        risk_description=content_finding.severity_reasoning,
-                        risk_factors=content_finding.risk_factors,
-                        potential_impact=content_finding.business_impact
-                    )
-                    db.add(risk_assessment)
-
-                    # Create MoneyLossCalculation
-                    money_loss = MoneyLossCalculation(
-                        finding_id=finding.id,
-                        estimated_loss=content_finding.money_loss_estimate,
-                        confidence_score=content_finding.money_loss_confidence,
-                        calculation_method="content_analyzer",
-                        final_estimate=content_finding.money_loss_estimate,
-                        reasoning=f"Batch processed: {content_finding.alert_name}"
-                    )
-                    db.add(money_loss)
-
-                    # Populate Alert Dashboard tables for batch processing
-                    dashboard_result = _populate_dashboard_tables(
-                        db=db,
-                        content_finding=content_finding,
-                        directory_path=directory_path,
-                        finding_id=finding.id
-                    )
-
-                    db.commit()
-
-                    result["status"] = "success"
-                    result["finding_id"] = finding.id
-                    result["markdown_path"] = markdown_path
-                    result["alert_name"] = content_finding.alert_name
-                    result["focus_area"] = content_finding.focus_area
-                    result["severity"] = content_finding.severity
-                    result["dashboard"] = dashboard_result
-                    job["successful"] += 1
-
-            except Exception as e:
-                db.rollback()
-                result["status"] = "failed"
-                result["error"] = str(e)
-                job["failed"] += 1
-                logger.error(f"Failed to process {directory_path}: {e}")
-
-            job["results"].append(result)
-            job["processed"] = idx + 1
-
-        # Restore LLM setting
-        analyzer.use_llm = original_use_llm
-
-        job["status"] = "completed"
-        job["completed_at"] = datetime.utcnow().isoformat()
+    Returns the finished result dict for a missing directory, otherwise a
+    (PendingFinding, result) pair for the writer.
+    """
+    result = {
+        "path": directory_path,
+        "status": "pending",
+        "finding_id": None,
+        "markdown_path": None,
+        "error": None
+    }
+
+    if not os.path.exists(directory_path):
+        result["status"] = "failed"
+        result["error"] = f"Directory not found: {directory_path}"
+        return result
+
+    analyzer = get_content_analyzer()
+    artifact_reader = get_artifact_reader()
+
+    # Read and analyze
+    artifacts = await asyncio.to_thread(artifact_reader.read_from_directory, directory_path)
+    with llm_cache_bypass(bypass_llm_cache):
+        content_finding = await analyzer.analyze_alert_async(
+            artifacts, include_raw=False, use_llm=report_level == "full"
+        )
 
+    # Generate markdown report
+    try:
+        with llm_cache_bypass(bypass_llm_cache):
+            _, result["markdown_path"] = await asyncio.to_thread(
+                _generate_markdown_report, artifacts, content_finding, report_level, directory_path
+            )
     except Exception as e:
-        job["status"] = "failed"
-        job["completed_at"] = datetime.utcnow().isoformat()
-        logger.error(f"Batch job {job_id} failed: {e}")
-    finally:
-        db.close()
+        logger.warning(f"Failed to generate markdown for {directory_path}: {e}")
+
+    item = PendingFinding(
+        content_finding=content_finding,
+        directory_path=directory_path,
+        report_level=report_level,
+        markdown_path=result["markdown_path"],
+        money_loss_reasoning=f"Batch processed: {content_finding.alert_name}"
+    )
+    return item, result
 
 
 @router.get("/batch-status/{job_id}", response_model=BatchStatusResponse)
@@ -1225,7 +786,7 @@ async def get_batch_status(job_id: str):
 
     Returns progress information and results for each processed alert.
     """
-    job = _batch_jobs.get(job_id)
+    job = await asyncio.to_thread(get_batch_queue().get_job_status, job_id)
     if not job:
         raise HTTPException(status_code=404, detail=f"Job not found: {job_id}")
 
@@ -1243,20 +804,9 @@ async def get_batch_status(job_id: str):
 
 
 @router.get("/batch-jobs")
-async def list_batch_jobs():
+async def list_batch_jobs(limit: int = 100):
     """
-    List all batch jobs (for debugging/monitoring).
+    List recent batch jobs (for debugging/monitoring).
     """
-    jobs = []
-    for job_id, job in _batch_jobs.items():
-        jobs.append({
-            "job_id": job_id,
-            "status": job["status"],
-            "total": job["total"],
-            "processed": job["processed"],
-            "successful": job["successful"],
-            "failed": job["failed"],
-            "started_at": job["started_at"],
-            "completed_at": job["completed_at"]
-        })
+    jobs = await asyncio.to_thread(get_batch_queue().list_jobs, limit)
     return {"jobs": jobs, "total": len(jobs)}
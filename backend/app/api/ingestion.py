@@ -1,6 +1,8 @@
-from fastapi import APIRouter, UploadFile, File, Depends, HTTPException, status, Request
+from fastapi import APIRouter, UploadFile, File, Form, Depends, HTTPException, status, Request
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Optional
+import asyncio
+import hashlib
 import os
 import shutil
 from pathlib import Path
@@ -11,6 +13,8 @@ from app.core.config import settings
 from app.models.data_source import DataSource, DataSourceType, FileFormat
 from app.services.ingestion.parser_factory import ParserFactory
 from app.services.ingestion.data_saver import DataSaver
+from app.services.ingestion.archive_extractor import ArchiveError, ArchiveExtractor
+from app.services.batch_queue import get_batch_queue
 from app.schemas.ingestion import DataSourceResponse, UploadResponse
 from app.utils.audit_logger import audit_log
 from pydantic import BaseModel
@@ -22,9 +26,16 @@ router = APIRouter(prefix="/ingestion", tags=["ingestion"])
 async def upload_file(
     request: Request,
     file: UploadFile = File(...),
+    force_reingest: bool = Form(False),
     db: Session = Depends(get_db)
 ):
-    """Upload and parse a file (PDF, CSV, DOCX, Excel)"""
+    """
+    Upload and parse a file (PDF, CSV, DOCX, Excel)
+    
+    A file whose content was already ingested is not parsed again: the new
+    data source is linked to the earlier one (duplicate_of_id) and shares
+    its records, unless force_reingest is set.
+    """
     
     # Validate file
     if not file.filename:
@@ -71,14 +82,16 @@ async def upload_file(
     MAX_FILE_SIZE = 100 * 1024 * 1024  # 100MB
     file_path = storage_path / f"{datetime.utcnow().timestamp()}_{file.filename}"
     try:
-        # Read file in chunks to handle large files and check size
+        # Read file in chunks to handle large files and check size; hash as we go
         file_size = 0
+        sha256 = hashlib.sha256()
         with open(file_path, "wb") as buffer:
             while True:
                 chunk = await file.read(8192)  # Read 8KB chunks
                 if not chunk:
                     break
                 file_size += len(chunk)
+                sha256.update(chunk)
                 if file_size > MAX_FILE_SIZE:
                     raise HTTPException(
                         status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
@@ -95,6 +108,15 @@ async def upload_file(
             detail=f"Error saving file: {str(e)}"
         )
     
+    content_sha256 = sha256.hexdigest()
+    
+    # Identical content already ingested: link to it instead of parsing again
+    data_saver = DataSaver(db)
+    original = None if force_reingest else data_saver.find_ingested(content_sha256, data_type)
+    if original is not None:
+        os.remove(file_path)
+        return _link_duplicate(request, db, data_saver, file.filename, file_format, file_size, content_sha256, original)
+    
     # Create data source record
     data_source = DataSource(
         filename=file.filename,
@@ -103,15 +125,17 @@ async def upload_file(
         data_type=data_type,
         file_size=file_size,
         file_path=str(file_path),
-        status="pending"
+        status="pending",
+        content_sha256=content_sha256
     )
     
     db.add(data_source)
     db.commit()
     db.refresh(data_source)
     
-    # Parse file
-    parser = ParserFactory.get_parser(str(file_path))
+    # Parse file; one workbook probe serves detection, diagnosis and parsing
+    probe = ParserFactory.probe(str(file_path))
+    parser = ParserFactory.get_parser(str(file_path), probe=probe)
     if not parser:
         # Try to diagnose why no parser was found
         from app.services.ingestion.excel_parser_4c import ExcelParser4C
@@ -125,20 +149,25 @@ async def upload_file(
         if file_ext == '.xlsx':
             parser_4c = ExcelParser4C()
             parser_soda = ExcelParserSoDA()
-            can_parse_4c = parser_4c.can_parse(str(file_path))
-            can_parse_soda = parser_soda.can_parse(str(file_path))
+            can_parse_4c = parser_4c.can_parse(str(file_path), probe=probe)
+            can_parse_soda = parser_soda.can_parse(str(file_path), probe=probe)
             diagnosis.append(f"4C parser can_parse: {can_parse_4c}")
             diagnosis.append(f"SoDA parser can_parse: {can_parse_soda}")
             
             # Check if file has Alert Parameters sheet
             try:
-                import pandas as pd
-                xl_file = pd.ExcelFile(file_path)
-                has_alert_params = 'Alert Parameters' in xl_file.sheet_names
+                sheet_names = probe.sheet_names
+                has_alert_params = 'Alert Parameters' in sheet_names
                 diagnosis.append(f"Has 'Alert Parameters' sheet: {has_alert_params}")
-                diagnosis.append(f"Sheet names: {xl_file.sheet_names}")
+                diagnosis.append(f"Sheet names: {sheet_names}")
+                if sheet_names:
+                    first_row = probe.head(sheet_names[0], rows=1)
+                    if len(first_row) > 0:
+                        diagnosis.append(f"First row of '{sheet_names[0]}': {first_row.iloc[0].tolist()}")
             except Exception as e:
                 diagnosis.append(f"Error checking sheets: {str(e)}")
+            finally:
+                probe.close()
         
         error_msg = f"No parser available for this file: {file.filename}. Diagnosis: {'; '.join(diagnosis)}"
         data_source.status = "error"
@@ -150,7 +179,18 @@ async def upload_file(
         )
     
     try:
-        parse_result = parser.parse(str(file_path))
+        try:
+            # Records arrive in batches and are saved as they are parsed
+            parse_result = ParserFactory.stream_file(
+                parser,
+                str(file_path),
+                batch_size=settings.BATCH_SIZE,
+                preview_rows=settings.UPLOAD_PREVIEW_ROWS,
+                probe=probe
+            )
+        finally:
+            if probe is not None:
+                probe.close()
         
         # Update data source with metadata
         if parse_result.get('metadata'):
@@ -163,15 +203,15 @@ async def upload_file(
                 data_source.report_type = metadata['report_type']
         
         # Save parsed data to database
-        data_saver = DataSaver(db)
+        records_count = 0
         if data_source.data_type == DataSourceType.ALERT:
             try:
-                data_saver.save_4c_alert(data_source, parse_result)
+                records_count = data_saver.save_4c_alert(data_source, parse_result)
             except Exception as e:
                 parse_result['errors'] = parse_result.get('errors', []) + [f"Error saving alerts: {str(e)}"]
         elif data_source.data_type == DataSourceType.REPORT:
             try:
-                data_saver.save_soda_report(data_source, parse_result)
+                records_count = data_saver.save_soda_report(data_source, parse_result)
             except Exception as e:
                 parse_result['errors'] = parse_result.get('errors', []) + [f"Error saving reports: {str(e)}"]
         
@@ -198,17 +238,23 @@ async def upload_file(
                 "data_type": data_source.data_type,
                 "file_size": data_source.file_size,
                 "status": data_source.status,
-                "records_count": len(parse_result.get('data', []))
+                "records_count": records_count
             },
             status="success" if data_source.status == "completed" else "error",
             error_message=data_source.error_message if data_source.status == "error" else None
         )
         
+        # Only counts and a preview go back to the client, never the full record list
         return UploadResponse(
             data_source_id=data_source.id,
             filename=file.filename or "unknown",
             status=data_source.status,
-            parse_result=parse_result
+            parse_result={
+                key: value for key, value in parse_result.items()
+                if key not in ('data', 'batches', 'preview')
+            },
+            records_count=records_count,
+            preview=parse_result.get('preview', [])
         )
         
     except Exception as e:
@@ -225,6 +271,64 @@ async def upload_file(
         )
 
 
+def _link_duplicate(
+    request: Request,
+    db: Session,
+    data_saver: DataSaver,
+    filename: str,
+    file_format: FileFormat,
+    file_size: int,
+    content_sha256: str,
+    original: DataSource
+) -> UploadResponse:
+    """Record an upload of already ingested content as a duplicate of the original data source"""
+    data_source = DataSource(
+        filename=filename,
+        original_filename=filename,
+        file_format=file_format,
+        data_type=original.data_type,
+        file_size=file_size,
+        file_path=original.file_path,
+        alert_id=original.alert_id,
+        report_type=original.report_type,
+        status="duplicate",
+        content_sha256=content_sha256,
+        duplicate_of_id=original.id
+    )
+    db.add(data_source)
+    db.commit()
+    db.refresh(data_source)
+    
+    records_count = data_saver.saved_count(original)
+    audit_log(
+        db=db,
+        action="upload",
+        entity_type="data_source",
+        entity_id=data_source.id,
+        user_ip=request.client.host if request.client else None,
+        user_agent=request.headers.get("user-agent"),
+        description=f"Uploaded file: {filename} (duplicate of data source {original.id})",
+        details={
+            "filename": filename,
+            "file_format": data_source.file_format,
+            "data_type": data_source.data_type,
+            "file_size": file_size,
+            "status": data_source.status,
+            "records_count": records_count,
+            "duplicate_of_id": original.id
+        }
+    )
+    
+    return UploadResponse(
+        data_source_id=data_source.id,
+        filename=filename,
+        status=data_source.status,
+        parse_result={'metadata': {}, 'errors': []},
+        records_count=records_count,
+        duplicate_of_id=original.id
+    )
+
+
 @router.post("/upload-artifacts")
 async def upload_artifacts(
     request: Request,
@@ -335,6 +439,134 @@ async def upload_artifacts(
     }
 
 
+def _bundle_format(summary_path: Optional[str]) -> FileFormat:
+    """File format recorded for an artifact bundle: its Summary's (text summaries count as CSV)"""
+    if summary_path:
+        try:
+            return FileFormat(Path(summary_path).suffix.lower().lstrip('.'))
+        except ValueError:
+            pass
+    return FileFormat.CSV
+
+
+@router.post("/upload-archive")
+async def upload_archive(
+    request: Request,
+    file: UploadFile = File(...),
+    report_level: str = Form("full"),
+    bypass_llm_cache: bool = Form(False),
+    db: Session = Depends(get_db)
+):
+    """
+    Upload a ZIP of alert artifact folders and queue every alert for analysis.
+
+    The archive is extracted member by member (bounded memory whatever its
+    size) into one folder per alert, grouped by the alert ID in the
+    artifact filenames. Each alert with a Summary and at least one other
+    artifact becomes a task of one batch job; monitor it with
+    /content-analysis/batch-status/{job_id}.
+    """
+    if not file.filename or Path(file.filename).suffix.lower() != '.zip':
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="A .zip archive is required"
+        )
+    if report_level not in ("summary", "full"):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Invalid report_level: {report_level}"
+        )
+
+    archive_path = Path(settings.STORAGE_PATH) / "archives" / f"{datetime.utcnow().timestamp()}"
+    archive_path.mkdir(parents=True, exist_ok=True)
+
+    # The upload is spooled to disk by the server; ZipFile reads it from there
+    extractor = ArchiveExtractor(
+        max_members=settings.ARCHIVE_MAX_FILES,
+        max_bytes=settings.ARCHIVE_MAX_EXTRACTED_MB * 1024 * 1024
+    )
+    try:
+        result = await asyncio.to_thread(extractor.extract, file.file, str(archive_path))
+    except ArchiveError as e:
+        ArchiveExtractor.discard(str(archive_path))
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    except Exception as e:
+        ArchiveExtractor.discard(str(archive_path))
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Error extracting archive: {str(e)}"
+        )
+
+    # One data source per alert bundle, as /upload-artifacts creates
+    data_sources = [
+        DataSource(
+            filename=f"Artifacts: {alert.alert_name}",
+            original_filename=", ".join(os.path.basename(path) for path in alert.artifacts.values()),
+            file_format=_bundle_format(alert.artifacts.get("summary")),
+            data_type=DataSourceType.ALERT,
+            file_size=alert.size,
+            file_path=alert.directory,
+            status="completed",
+            alert_id=alert.alert_id
+        )
+        for alert in result.alerts
+    ]
+    db.add_all(data_sources)
+    db.flush()
+    data_source_ids = [data_source.id for data_source in data_sources]
+    db.commit()
+
+    queued = [alert.directory for alert in result.alerts if alert.analyzable]
+    job_id = None
+    if queued:
+        job_id = await asyncio.to_thread(
+            get_batch_queue().create_job,
+            queued,
+            report_level=report_level,
+            bypass_llm_cache=bypass_llm_cache
+        )
+
+    audit_log(
+        db=db,
+        action="upload_archive",
+        entity_type="batch_job",
+        user_ip=request.client.host if request.client else None,
+        user_agent=request.headers.get("user-agent"),
+        description=f"Uploaded archive: {file.filename}",
+        details={
+            "filename": file.filename,
+            "alerts": len(result.alerts),
+            "queued": len(queued),
+            "skipped_files": len(result.skipped),
+            "extracted_bytes": result.total_bytes,
+            "job_id": job_id
+        }
+    )
+
+    return {
+        "job_id": job_id,
+        "archive_path": str(archive_path),
+        "total_alerts": len(result.alerts),
+        "queued_alerts": len(queued),
+        "alerts": [
+            {
+                "data_source_id": data_source_id,
+                "alert_id": alert.alert_id,
+                "alert_name": alert.alert_name,
+                "directory": alert.directory,
+                "artifact_types": {k: k in alert.artifacts for k in ("code", "explanation", "metadata", "summary")},
+                "queued": alert.analyzable
+            }
+            for alert, data_source_id in zip(result.alerts, data_source_ids)
+        ],
+        "skipped_files": result.skipped,
+        "message": (
+            f"Extracted {len(result.alerts)} alerts; {len(queued)} queued for analysis."
+            + (f" Use /content-analysis/batch-status/{job_id} to monitor." if job_id else "")
+        )
+    }
+
+
 @router.get("/data-sources", response_model=List[DataSourceResponse])
 async def list_data_sources(
     skip: int = 0,
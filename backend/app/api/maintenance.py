@@ -12,6 +12,7 @@ from app.models.alert import Alert, AlertMetadata
 from app.models.soda_report import SoDAReport, SoDAReportMetadata
 from app.models.risk_assessment import RiskAssessment
 from app.models.money_loss import MoneyLossCalculation
+from app.models.finding_feature import FindingFeature
 from app.models.audit_log import AuditLog
 from app.models.issue_type import IssueGroup
 from app.schemas.maintenance import (
@@ -62,7 +63,12 @@ async def delete_data_source(
     db: Session = Depends(get_db),
     request: Optional[DeleteRequest] = None
 ):
-    """Delete a data source and all related data"""
+    """
+    Delete a data source and all related data
+    
+    Uploads recorded as duplicates of this data source share its records
+    and stored file, so they are deleted with it.
+    """
     data_source = db.query(DataSource).filter(
         DataSource.id == data_source_id
     ).first()
@@ -74,19 +80,26 @@ async def delete_data_source(
         )
     
     try:
+        duplicate_ids = [
+            source_id for (source_id,) in db.query(DataSource.id).filter(
+                DataSource.duplicate_of_id == data_source_id
+            ).all()
+        ]
+        source_ids = [data_source_id] + duplicate_ids
+        
         # Count related records for audit log
         findings_count = db.query(Finding).filter(
-            Finding.data_source_id == data_source_id
+            Finding.data_source_id.in_(source_ids)
         ).count()
         alerts_count = db.query(Alert).filter(
-            Alert.data_source_id == data_source_id
+            Alert.data_source_id.in_(source_ids)
         ).count()
         reports_count = db.query(SoDAReport).filter(
-            SoDAReport.data_source_id == data_source_id
+            SoDAReport.data_source_id.in_(source_ids)
         ).count()
         analysis_run_ids = [
             run_id for (run_id,) in db.query(AnalysisRun.id).filter(
-                AnalysisRun.data_source_id == data_source_id
+                AnalysisRun.data_source_id.in_(source_ids)
             ).all()
         ]
         issue_group_count = 0
@@ -96,23 +109,29 @@ async def delete_data_source(
             ).count()
         
         # Delete related data in correct order (respecting foreign keys)
-        # 1. Delete money loss calculations
+        # 1. Delete money loss calculations and materialized features
         db.query(MoneyLossCalculation).filter(
             MoneyLossCalculation.finding_id.in_(
-                db.query(Finding.id).filter(Finding.data_source_id == data_source_id)
+                db.query(Finding.id).filter(Finding.data_source_id.in_(source_ids))
+            )
+        ).delete(synchronize_session=False)
+        
+        db.query(FindingFeature).filter(
+            FindingFeature.finding_id.in_(
+                db.query(Finding.id).filter(Finding.data_source_id.in_(source_ids))
             )
         ).delete(synchronize_session=False)
         
         # 2. Delete risk assessments
         db.query(RiskAssessment).filter(
             RiskAssessment.finding_id.in_(
-                db.query(Finding.id).filter(Finding.data_source_id == data_source_id)
+                db.query(Finding.id).filter(Finding.data_source_id.in_(source_ids))
             )
         ).delete(synchronize_session=False)
         
         # 3. Delete findings
         db.query(Finding).filter(
-            Finding.data_source_id == data_source_id
+            Finding.data_source_id.in_(source_ids)
         ).delete(synchronize_session=False)
         
         # 4. Delete issue groups tied to analysis runs, then the runs themselves
@@ -125,27 +144,27 @@ async def delete_data_source(
             ).delete(synchronize_session=False)
         
         # 5. Delete alert metadata and alerts
-        alert_metadata = db.query(AlertMetadata).filter(
-            AlertMetadata.data_source_id == data_source_id
-        ).first()
-        if alert_metadata:
-            db.query(Alert).filter(
-                Alert.data_source_id == data_source_id
-            ).delete(synchronize_session=False)
-            db.delete(alert_metadata)
+        db.query(Alert).filter(
+            Alert.data_source_id.in_(source_ids)
+        ).delete(synchronize_session=False)
+        db.query(AlertMetadata).filter(
+            AlertMetadata.data_source_id.in_(source_ids)
+        ).delete(synchronize_session=False)
         
         # 6. Delete report metadata and reports
-        report_metadata = db.query(SoDAReportMetadata).filter(
-            SoDAReportMetadata.data_source_id == data_source_id
-        ).first()
-        if report_metadata:
-            db.query(SoDAReport).filter(
-                SoDAReport.data_source_id == data_source_id
-            ).delete(synchronize_session=False)
-            db.delete(report_metadata)
+        db.query(SoDAReport).filter(
+            SoDAReport.data_source_id.in_(source_ids)
+        ).delete(synchronize_session=False)
+        db.query(SoDAReportMetadata).filter(
+            SoDAReportMetadata.data_source_id.in_(source_ids)
+        ).delete(synchronize_session=False)
         
-        # 7. Delete the data source itself
+        # 7. Delete its duplicates, then the data source itself
         filename = data_source.filename
+        if duplicate_ids:
+            db.query(DataSource).filter(
+                DataSource.id.in_(duplicate_ids)
+            ).delete(synchronize_session=False)
         db.delete(data_source)
         db.commit()
         
@@ -162,7 +181,8 @@ async def delete_data_source(
                 "alerts_deleted": alerts_count,
                 "reports_deleted": reports_count,
                 "analysis_runs_deleted": len(analysis_run_ids),
-                "issue_groups_deleted": issue_group_count
+                "issue_groups_deleted": issue_group_count,
+                "duplicates_deleted": len(duplicate_ids)
             },
             status="success"
         )
@@ -172,6 +192,7 @@ async def delete_data_source(
             message=f"Data source {data_source_id} and all related data deleted successfully",
             deleted_records={
                 "data_source": 1,
+                "duplicates": len(duplicate_ids),
                 "findings": findings_count,
                 "alerts": alerts_count,
                 "reports": reports_count
@@ -222,6 +243,7 @@ async def delete_all_data_sources(
         
         # Delete all data (same order as single deletion)
         db.query(MoneyLossCalculation).delete()
+        db.query(FindingFeature).delete()
         db.query(RiskAssessment).delete()
         db.query(Finding).delete()
         db.query(IssueGroup).delete()
@@ -0,0 +1,81 @@
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy.orm import Session
+from typing import List, Optional
+from dataclasses import asdict
+
+from app.core.database import get_db
+from app.services.ingestion.raw_field_query import RECORD_MODELS, RawFieldQuery
+from app.schemas.raw_data import (
+    FieldGroupResponse,
+    RawFieldAggregateRequest,
+    RawFieldAggregateResponse,
+    RawFieldQueryRequest,
+    RawFieldQueryResponse,
+    RawFieldsResponse,
+    RawRecordResponse,
+)
+
+router = APIRouter(prefix="/raw-data", tags=["raw-data"])
+
+
+def _model(record_type: str):
+    model = RECORD_MODELS.get(record_type)
+    if model is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Unknown record type: {record_type} (expected one of {', '.join(RECORD_MODELS)})"
+        )
+    return model
+
+
+@router.get("/{record_type}/fields", response_model=RawFieldsResponse)
+def list_raw_fields(
+    record_type: str,
+    data_source_id: Optional[List[int]] = Query(None),
+    db: Session = Depends(get_db)
+):
+    """Raw SAP fields (raw_data keys) of each upload of alerts or soda_reports"""
+    query = RawFieldQuery(db, _model(record_type), data_source_ids=data_source_id)
+    return RawFieldsResponse(fields=query.field_keys())
+
+
+@router.post("/{record_type}/query", response_model=RawFieldQueryResponse)
+def query_raw_fields(
+    record_type: str,
+    request: RawFieldQueryRequest,
+    db: Session = Depends(get_db)
+):
+    """
+    Records whose raw SAP fields match the filters.
+    
+    Fields are matched by header or technical name ("LIFNR" matches
+    "Vendor (LIFNR)"); a record matches when every field equals one of its
+    values. Filtering runs in the database (JSONB containment on PostgreSQL).
+    """
+    query = RawFieldQuery(db, _model(record_type), data_source_ids=request.data_source_ids)
+    records = query.filter(request.filters).offset(request.offset).limit(request.limit).all()
+    return RawFieldQueryResponse(
+        total=query.count(request.filters),
+        records=[RawRecordResponse.model_validate(record) for record in records]
+    )
+
+
+@router.post("/{record_type}/aggregate", response_model=RawFieldAggregateResponse)
+def aggregate_raw_fields(
+    record_type: str,
+    request: RawFieldAggregateRequest,
+    db: Session = Depends(get_db)
+):
+    """Record count, and optionally the sum of a numeric field, per value of a raw SAP field"""
+    query = RawFieldQuery(db, _model(record_type), data_source_ids=request.data_source_ids)
+    groups = query.aggregate(
+        request.group_by,
+        filters=request.filters,
+        sum_field=request.sum_field,
+        limit=request.limit
+    )
+    return RawFieldAggregateResponse(
+        group_by=request.group_by,
+        keys=query.resolve(request.group_by),
+        groups=[FieldGroupResponse(**asdict(group)) for group in groups]
+    )
@@ -10,6 +10,7 @@ class Settings(BaseSettings):
     OPENAI_API_KEY: Optional[str] = None
     ANTHROPIC_API_KEY: Optional[str] = None
     LLM_PROVIDER: str = "openai"  # openai or anthropic
+    LLM_ANALYSIS_MODE: str = "staged"  # staged (4 calls per alert) or fused (1 call)
     
     # AWS Configuration
     AWS_ACCESS_KEY_ID: Optional[str] = None
@@ -20,10 +21,57 @@ class Settings(BaseSettings):
     # File Storage
     STORAGE_TYPE: str = "local"  # local or s3
     STORAGE_PATH: str = "./storage"
+
+    # Parsed Summary cache (content analysis)
+    SUMMARY_CACHE_ENABLED: bool = True
+    SUMMARY_CACHE_PATH: Optional[str] = None  # None = {STORAGE_PATH}/summary_cache
+    SUMMARY_CACHE_MAX_MB: int = 512
+
+    # Alerts analyzed concurrently by ContentAnalyzer.analyze_multiple
+    ANALYSIS_MAX_WORKERS: int = 4
+
+    # Findings per alert upload: "per_row" (one per alert row) or "aggregated"
+    # (one per ANALYSIS_GROUP_BY value: user_name, transaction_code, client, ...)
+    ANALYSIS_FINDING_MODE: str = "per_row"
+    ANALYSIS_GROUP_BY: str = "user_name"
+
+    # Money loss model training job (python -m app.services.ml_engine.training_job)
+    ML_TRAINING_N_JOBS: int = -1  # cores used to fit; -1 = all
+    ML_INCREMENTAL_TREES: int = 20  # trees added per incremental refresh
+    ML_MAX_TREES: int = 300  # refreshes past this many trees retrain from scratch
+    ML_TRAINING_STALE_MINUTES: int = 120  # a run still queued/running after this is marked failed and no longer blocks new runs
+
+    # LLM response cache keyed by prompt fingerprint
+    LLM_CACHE_ENABLED: bool = True
+    LLM_CACHE_PATH: Optional[str] = None  # None = {STORAGE_PATH}/llm_cache.sqlite3
+    LLM_CACHE_TTL_HOURS: int = 720  # 0 = no expiry, entries only evicted by size
+    LLM_CACHE_MAX_MB: int = 256
+
+    # Batch analysis queue (python -m app.services.batch_queue.worker)
+    BATCH_TASK_LEASE_SECONDS: int = 300  # task is re-queued if a worker stops heartbeating this long
+    BATCH_TASK_HEARTBEAT_SECONDS: int = 30
+    BATCH_TASK_MAX_ATTEMPTS: int = 3
+    BATCH_TASK_RETRY_DELAY_SECONDS: int = 30  # doubled on each further attempt
+    BATCH_WORKER_CONCURRENCY: int = 1  # task chunks processed at once per worker process
+    BATCH_WORKER_CHUNK_SIZE: int = 10  # tasks analyzed together and saved with one commit
+    BATCH_WORKER_POLL_SECONDS: float = 2.0
     
     # Data Ingestion Limits
     MAX_RECORDS_PER_FILE: Optional[int] = None  # None = no limit, set to limit records per file
     BATCH_SIZE: int = 1000  # Process records in batches to avoid memory issues
+    INGESTION_LOADER: str = "bulk"  # "bulk" (COPY on PostgreSQL, executemany elsewhere) or "orm"
+    UPLOAD_PREVIEW_ROWS: int = 10  # parsed records echoed back in the upload response
+
+    # PDF ingestion: page extraction processes and per-page cache keyed by file hash
+    PDF_MAX_WORKERS: int = 4  # 1 = extract in the request process
+    PDF_PARALLEL_MIN_PAGES: int = 32  # smaller PDFs are extracted in-process
+    PDF_PAGE_CACHE_ENABLED: bool = True
+    PDF_PAGE_CACHE_PATH: Optional[str] = None  # None = {STORAGE_PATH}/pdf_page_cache
+    PDF_PAGE_CACHE_MAX_MB: int = 256
+
+    # Alert artifact ZIPs (/ingestion/upload-archive)
+    ARCHIVE_MAX_FILES: int = 20000
+    ARCHIVE_MAX_EXTRACTED_MB: int = 2048  # total uncompressed size accepted per archive
     
     # Application
     SECRET_KEY: str
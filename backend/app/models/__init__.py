@@ -5,6 +5,7 @@ from .finding import Finding
 from .issue_type import IssueType, IssueGroup
 from .risk_assessment import RiskAssessment
 from .money_loss import MoneyLossCalculation
+from .finding_feature import FindingFeature
 from .focus_area import FocusArea
 from .analysis_run import AnalysisRun
 from .field_mapping import FieldMapping
@@ -20,6 +21,12 @@ from .key_finding import KeyFinding
 from .concentration_metric import ConcentrationMetric
 from .action_item import ActionItem
 
+# Batch analysis queue
+from .batch_job import BatchJob, BatchTask
+
+# ML model versions
+from .model_version import ModelVersion
+
 __all__ = [
     # Original models
     "DataSource",
@@ -32,6 +39,7 @@ __all__ = [
     "IssueGroup",
     "RiskAssessment",
     "MoneyLossCalculation",
+    "FindingFeature",
     "FocusArea",
     "AnalysisRun",
     "FieldMapping",
@@ -46,5 +54,10 @@ __all__ = [
     "KeyFinding",
     "ConcentrationMetric",
     "ActionItem",
+    # Batch analysis queue
+    "BatchJob",
+    "BatchTask",
+    # ML model versions
+    "ModelVersion",
 ]
 
@@ -1,4 +1,5 @@
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, JSON, Text
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Index, JSON, Text
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import relationship
 from app.core.database import Base
 from datetime import datetime
@@ -19,9 +20,13 @@ class AlertMetadata(Base):
 
 class Alert(Base):
     __tablename__ = "alerts"
+    __table_args__ = (
+        # Containment filters on raw SAP fields (raw_data @> ...) on PostgreSQL
+        Index("ix_alerts_raw_data_gin", "raw_data", postgresql_using="gin"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
-    data_source_id = Column(Integer, ForeignKey("data_sources.id"), nullable=False)
+    data_source_id = Column(Integer, ForeignKey("data_sources.id"), nullable=False, index=True)
     
     # Normalized fields from Skywind 4C alerts
     application_server = Column(String)
@@ -37,8 +42,8 @@ class Alert(Base):
     memory_consumption = Column(Integer)  # MB
     date = Column(DateTime)
     
-    # Raw data stored as JSON for reference
-    raw_data = Column(JSON)
+    # Raw data stored as JSON for reference (JSONB with a GIN index on PostgreSQL)
+    raw_data = Column(JSON().with_variant(JSONB(), "postgresql"))
     
     created_at = Column(DateTime, default=datetime.utcnow)
     
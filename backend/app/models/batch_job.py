@@ -0,0 +1,80 @@
+"""
+Batch Job Models - Durable queue for batch content analysis.
+
+A BatchJob is one analyze-batch request; each alert directory in it is a
+BatchTask that worker processes lease, heartbeat and retry independently.
+"""
+from datetime import datetime
+from sqlalchemy import Column, Integer, String, Text, DateTime, Boolean, ForeignKey, JSON, Index
+from sqlalchemy.orm import relationship
+
+from app.core.database import Base
+
+
+class BatchJob(Base):
+    """
+    Batch Job - A batch analysis request.
+
+    Progress counters are derived from the job's tasks rather than stored,
+    so concurrent workers never contend on the job row.
+    """
+    __tablename__ = "batch_jobs"
+
+    id = Column(String(36), primary_key=True)  # UUID
+    status = Column(String(20), nullable=False, default="pending", index=True)  # pending, processing, completed, failed
+    report_level = Column(String(20), nullable=False, default="full")  # full, summary
+    bypass_llm_cache = Column(Boolean, nullable=False, default=False)
+    total = Column(Integer, nullable=False, default=0)
+
+    created_at = Column(DateTime, default=datetime.utcnow, index=True)
+    started_at = Column(DateTime)  # First task leased
+    completed_at = Column(DateTime)
+
+    tasks = relationship("BatchTask", back_populates="job", cascade="all, delete-orphan", order_by="BatchTask.position")
+
+    def __repr__(self):
+        return f"<BatchJob(id='{self.id}', status='{self.status}', total={self.total})>"
+
+
+class BatchTask(Base):
+    """
+    Batch Task - One alert directory within a batch job.
+
+    A worker owns a task while its lease is valid and extends the lease
+    with heartbeats. Tasks whose lease expires are picked up again by any
+    worker; failures are retried until max_attempts is reached.
+    """
+    __tablename__ = "batch_tasks"
+
+    id = Column(Integer, primary_key=True, index=True)
+    job_id = Column(String(36), ForeignKey("batch_jobs.id", ondelete="CASCADE"), nullable=False, index=True)
+    position = Column(Integer, nullable=False)  # Order within the job
+    directory_path = Column(String(1000), nullable=False)
+
+    status = Column(String(20), nullable=False, default="pending")  # pending, running, succeeded, failed
+    attempts = Column(Integer, nullable=False, default=0)
+    max_attempts = Column(Integer, nullable=False, default=3)
+    available_at = Column(DateTime, nullable=False, default=datetime.utcnow)  # Retry backoff
+
+    # Lease
+    lease_owner = Column(String(255))  # worker id (host:pid:n)
+    lease_expires_at = Column(DateTime)
+    heartbeat_at = Column(DateTime)
+
+    # Outcome
+    result = Column(JSON)  # Per-alert result shown in batch-status
+    error = Column(Text)
+
+    created_at = Column(DateTime, default=datetime.utcnow)
+    started_at = Column(DateTime)
+    completed_at = Column(DateTime)
+
+    __table_args__ = (
+        Index('idx_batch_tasks_status_available', 'status', 'available_at'),
+        Index('idx_batch_tasks_status_lease', 'status', 'lease_expires_at'),
+    )
+
+    job = relationship("BatchJob", back_populates="tasks")
+
+    def __repr__(self):
+        return f"<BatchTask(id={self.id}, job_id='{self.job_id}', status='{self.status}', attempts={self.attempts})>"
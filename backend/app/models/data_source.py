@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, DateTime, Enum as SQLEnum
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Enum as SQLEnum
 from sqlalchemy.orm import relationship
 from app.core.database import Base
 import enum
@@ -32,8 +32,11 @@ class DataSource(Base):
     report_type = Column(String)  # For SoDA reports: AVR, PVR, etc.
     upload_date = Column(DateTime, default=datetime.utcnow, nullable=False)
     uploaded_by = Column(String)  # User who uploaded (if auth implemented)
-    status = Column(String, default="pending")  # pending, processing, completed, error
+    status = Column(String, default="pending")  # pending, processing, completed, error, duplicate
     error_message = Column(String)
+    content_sha256 = Column(String(64), index=True)  # SHA-256 of the uploaded bytes
+    # Earlier upload of identical content whose parsed records this one shares
+    duplicate_of_id = Column(Integer, ForeignKey("data_sources.id", ondelete="SET NULL"), nullable=True)
     
     # Relationships
     alerts = relationship("Alert", back_populates="data_source")
@@ -53,4 +53,5 @@ class Finding(Base):
     issue_type = relationship("IssueType", backref="findings")
     risk_assessment = relationship("RiskAssessment", back_populates="finding", uselist=False)
     money_loss_calculation = relationship("MoneyLossCalculation", back_populates="finding", uselist=False)
+    features = relationship("FindingFeature", back_populates="finding", uselist=False, cascade="all, delete-orphan")
 
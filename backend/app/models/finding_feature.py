@@ -0,0 +1,24 @@
+from sqlalchemy import Column, Integer, ForeignKey, Float, DateTime
+from sqlalchemy.orm import relationship
+from app.core.database import Base
+from datetime import datetime
+
+
+class FindingFeature(Base):
+    """Money loss model features of a finding, materialized when the finding is saved"""
+    __tablename__ = "finding_features"
+
+    finding_id = Column(Integer, ForeignKey("findings.id"), primary_key=True)
+    feature_version = Column(Integer, nullable=False, index=True)  # feature_store.FEATURE_VERSION
+
+    # Feature vector, one column per feature_store.FEATURE_NAMES entry
+    severity = Column(Float, nullable=False)
+    risk_score = Column(Float, nullable=False)
+    issue_type = Column(Float, nullable=False)  # stable code of the issue type
+    classification_confidence = Column(Float, nullable=False)
+    focus_area = Column(Float, nullable=False)  # stable code of the focus area
+
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    # Relationships
+    finding = relationship("Finding", back_populates="features")
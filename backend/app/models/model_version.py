@@ -0,0 +1,62 @@
+"""
+Model Version - One training run of an ML model and what it produced.
+
+Training time, sample counts and model size are recorded per version, and
+last_finding_id marks the newest finding the version has seen, so an
+incremental refresh only fits findings saved after it. At most one
+version per model is queued or running at a time (a partial unique index),
+which is how training runs are claimed across processes.
+"""
+from datetime import datetime
+from sqlalchemy import Column, Integer, String, Text, DateTime, Float, Index, text
+
+from app.core.database import Base
+
+# Statuses of a run that has not finished; one per model name at a time
+ACTIVE_STATUSES = ("queued", "running")
+_ACTIVE = text("status IN ('queued', 'running')")
+
+
+class ModelVersion(Base):
+    """Model Version - A trained (or training) version of a model"""
+    __tablename__ = "model_versions"
+    __table_args__ = (
+        Index("ix_model_versions_name_status", "name", "status"),
+        Index(
+            "uq_model_versions_active_name", "name", unique=True,
+            postgresql_where=_ACTIVE, sqlite_where=_ACTIVE
+        ),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    name = Column(String(100), nullable=False)  # e.g. money_loss_model
+    version = Column(String(50), nullable=False, index=True)
+    status = Column(String(20), nullable=False, default="queued")  # queued, running, completed, skipped, failed
+    mode = Column(String(20), nullable=False, default="full")  # full, incremental
+    base_version = Column(String(50))  # version an incremental refresh started from
+    feature_version = Column(Integer)  # feature_store.FEATURE_VERSION the model was fit on
+
+    # Training data
+    training_samples = Column(Integer)
+    test_samples = Column(Integer)
+    last_finding_id = Column(Integer)  # newest finding included
+
+    # Model and cost
+    n_estimators = Column(Integer)
+    n_jobs = Column(Integer)
+    training_seconds = Column(Float)  # time spent fitting
+    model_size_bytes = Column(Integer)
+    model_path = Column(String)
+
+    # Evaluation on the held-out samples
+    mean_absolute_error = Column(Float)
+    r2_score = Column(Float)
+
+    message = Column(Text)  # why a run was skipped or failed
+
+    created_at = Column(DateTime, default=datetime.utcnow, index=True)
+    started_at = Column(DateTime)
+    completed_at = Column(DateTime)
+
+    def __repr__(self):
+        return f"<ModelVersion(name='{self.name}', version='{self.version}', status='{self.status}')>"
@@ -1,4 +1,5 @@
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, JSON, Text
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Index, JSON, Text
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import relationship
 from app.core.database import Base
 from datetime import datetime
@@ -20,9 +21,13 @@ class SoDAReportMetadata(Base):
 
 class SoDAReport(Base):
     __tablename__ = "soda_reports"
+    __table_args__ = (
+        # Containment filters on raw SAP fields (raw_data @> ...) on PostgreSQL
+        Index("ix_soda_reports_raw_data_gin", "raw_data", postgresql_using="gin"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
-    data_source_id = Column(Integer, ForeignKey("data_sources.id"), nullable=False)
+    data_source_id = Column(Integer, ForeignKey("data_sources.id"), nullable=False, index=True)
     
     # Common fields (will vary by report type)
     user_name = Column(String, index=True)
@@ -32,8 +37,8 @@ class SoDAReport(Base):
     violation_type = Column(String)  # SoD violation, fraud indicator, etc.
     risk_level = Column(String)  # High, Medium, Low
     
-    # Raw data stored as JSON
-    raw_data = Column(JSON)
+    # Raw data stored as JSON (JSONB with a GIN index on PostgreSQL)
+    raw_data = Column(JSON().with_variant(JSONB(), "postgresql"))
     
     created_at = Column(DateTime, default=datetime.utcnow)
     
@@ -5,6 +5,8 @@ from datetime import datetime
 
 class AnalysisRequest(BaseModel):
     data_source_id: int
+    finding_mode: Optional[str] = None  # per_row or aggregated; default from settings
+    group_by: Optional[str] = None  # alert column for aggregated findings, e.g. user_name
 
 
 class AnalysisRunResponse(BaseModel):
@@ -23,3 +25,25 @@ class AnalysisRunResponse(BaseModel):
     class Config:
         from_attributes = True
 
+
+
+class ModelVersionResponse(BaseModel):
+    id: int
+    name: str
+    version: str
+    status: str
+    mode: str
+    base_version: Optional[str] = None
+    training_samples: Optional[int] = None
+    test_samples: Optional[int] = None
+    n_estimators: Optional[int] = None
+    training_seconds: Optional[float] = None
+    model_size_bytes: Optional[int] = None
+    mean_absolute_error: Optional[float] = None
+    r2_score: Optional[float] = None
+    message: Optional[str] = None
+    created_at: Optional[datetime] = None
+    completed_at: Optional[datetime] = None
+    
+    class Config:
+        from_attributes = True
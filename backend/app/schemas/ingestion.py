@@ -16,6 +16,8 @@ class DataSourceResponse(BaseModel):
     upload_date: datetime
     status: str
     error_message: Optional[str]
+    content_sha256: Optional[str] = None
+    duplicate_of_id: Optional[int] = None
     
     class Config:
         from_attributes = True
@@ -25,7 +27,10 @@ class UploadResponse(BaseModel):
     data_source_id: int
     filename: str
     status: str
-    parse_result: Dict[str, Any]
+    parse_result: Dict[str, Any]  # metadata and errors; records are not echoed back
+    records_count: int = 0
+    preview: List[Dict[str, Any]] = []
+    duplicate_of_id: Optional[int] = None  # set when identical content was already ingested
     
     class Config:
         from_attributes = True
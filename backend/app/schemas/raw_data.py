@@ -0,0 +1,48 @@
+from pydantic import BaseModel, Field
+from typing import Optional, Dict, Any, List
+
+
+class RawFieldQueryRequest(BaseModel):
+    # Raw SAP field (header or technical name, e.g. "LIFNR") -> accepted values
+    filters: Dict[str, List[str]] = {}
+    data_source_ids: Optional[List[int]] = None  # None = all uploads of the record type
+    limit: int = Field(100, ge=1, le=1000)
+    offset: int = Field(0, ge=0)
+
+
+class RawRecordResponse(BaseModel):
+    id: int
+    data_source_id: int
+    raw_data: Optional[Dict[str, Any]]
+    
+    class Config:
+        from_attributes = True
+
+
+class RawFieldQueryResponse(BaseModel):
+    total: int
+    records: List[RawRecordResponse]
+
+
+class RawFieldAggregateRequest(BaseModel):
+    group_by: str
+    sum_field: Optional[str] = None  # numeric raw field summed per group
+    filters: Dict[str, List[str]] = {}
+    data_source_ids: Optional[List[int]] = None
+    limit: int = Field(100, ge=1, le=1000)
+
+
+class FieldGroupResponse(BaseModel):
+    value: Optional[str]
+    count: int
+    total: Optional[float] = None
+
+
+class RawFieldAggregateResponse(BaseModel):
+    group_by: str
+    keys: List[str]  # raw_data headers the group_by field resolved to
+    groups: List[FieldGroupResponse]
+
+
+class RawFieldsResponse(BaseModel):
+    fields: Dict[int, List[str]]  # data source id -> raw_data keys
@@ -1,4 +1,5 @@
 from typing import List, Dict, Any, Optional
+from sqlalchemy import func
 from sqlalchemy.orm import Session
 from datetime import datetime
 import traceback
@@ -11,23 +12,54 @@ from app.models.finding import Finding
 from app.models.analysis_run import AnalysisRun
 from app.models.issue_type import IssueGroup
 from app.models.focus_area import FocusArea
+from app.models.risk_assessment import RiskAssessment
 
 from .classifier import FocusAreaClassifier, IssueTypeClassifier
 from .risk_scorer import RiskScorer
 from app.services.hybrid_engine import HybridMoneyLossEngine
+from app.services.ml_engine.feature_store import FeatureStore
 
 logger = logging.getLogger(__name__)
 
+# per_row: one finding per alert row; aggregated: one finding per group of rows
+FINDING_MODES = ("per_row", "aggregated")
+
+# Alert columns aggregated findings can be grouped by, with their title label
+ALERT_GROUP_KEYS = {
+    "user_name": "User",
+    "transaction_code": "Transaction",
+    "client": "Client",
+    "terminal": "Terminal",
+    "application_server": "Server",
+    "ip_address": "IP Address",
+}
+
 
 class Analyzer:
     """Main analysis engine that processes data sources and creates findings"""
     
-    def __init__(self, db: Session):
+    def __init__(self, db: Session, finding_mode: Optional[str] = None, group_by: Optional[str] = None):
+        """
+        Args:
+            db: Database session
+            finding_mode: "per_row" or "aggregated"; default settings.ANALYSIS_FINDING_MODE
+            group_by: Alert column grouped on in aggregated mode; default settings.ANALYSIS_GROUP_BY
+        """
+        from app.core.config import settings
+
+        self.finding_mode = finding_mode or settings.ANALYSIS_FINDING_MODE
+        self.group_by = group_by or settings.ANALYSIS_GROUP_BY
+        if self.finding_mode not in FINDING_MODES:
+            raise ValueError(f"Unknown finding mode '{self.finding_mode}', expected one of {', '.join(FINDING_MODES)}")
+        if self.group_by not in ALERT_GROUP_KEYS:
+            raise ValueError(f"Cannot group alerts by '{self.group_by}', expected one of {', '.join(ALERT_GROUP_KEYS)}")
+
         self.db = db
         self.focus_classifier = FocusAreaClassifier(db)
         self.issue_classifier = IssueTypeClassifier(db)
         self.risk_scorer = RiskScorer()
         self.money_loss_calculator = HybridMoneyLossEngine()
+        self.feature_store = FeatureStore(db)
     
     def analyze_data_source(self, data_source_id: int) -> AnalysisRun:
         """
@@ -127,12 +159,12 @@ class Analyzer:
             logger.warning(f"No alert metadata found for data_source_id={data_source.id}")
             return findings
         
-        # Get alerts
-        alerts = self.db.query(Alert).filter(
+        # Check for alerts (rows are loaded per mode below)
+        alert_count = self.db.query(func.count(Alert.id)).filter(
             Alert.data_source_id == data_source.id
-        ).all()
+        ).scalar()
         
-        if not alerts:
+        if not alert_count:
             logger.warning(f"No alerts found for data_source_id={data_source.id}")
             return findings
         
@@ -169,79 +201,156 @@ class Analyzer:
             data={"alert_id": alert_metadata.alert_id}
         )
         
-        # Create finding for each alert (or aggregate)
-        # For now, create one finding per alert
+        if self.finding_mode == "aggregated":
+            return self._analyze_alert_groups(
+                data_source, alert_metadata, focus_area, issue_type,
+                min(focus_confidence, issue_confidence) if issue_type else focus_confidence
+            )
+        
+        alerts = self.db.query(Alert).filter(
+            Alert.data_source_id == data_source.id
+        ).all()
+        
+        # Create finding for each alert
         for alert in alerts:
             finding = Finding(
                 data_source_id=data_source.id,
                 alert_id=alert.id,
-                focus_area_id=focus_area.id,
-                issue_type_id=issue_type.id if issue_type else None,
+                focus_area=focus_area,
+                issue_type=issue_type,
                 title=f"{alert_metadata.alert_name} - {alert.user_name or 'Unknown User'}",
                 description=f"Alert detected: {alert_metadata.alert_name}",
                 severity=issue_type.default_severity if issue_type else "Medium",
                 classification_confidence=min(focus_confidence, issue_confidence) if issue_type else focus_confidence,
                 detected_at=alert.timestamp or alert.created_at
             )
-            self.db.add(finding)
-            self.db.flush()
-            
-            # Calculate risk assessment
-            risk_data = self.risk_scorer.calculate_risk_score(finding, issue_type)
-            from app.models.risk_assessment import RiskAssessment
-            # Filter out fields that aren't in RiskAssessment model
-            allowed_fields = {'risk_score', 'risk_level', 'risk_category', 'risk_factors', 'potential_impact', 'affected_systems'}
-            filtered_risk_data = {k: v for k, v in risk_data.items() if k in allowed_fields}
-            risk_assessment = RiskAssessment(
-                finding_id=finding.id,
-                **filtered_risk_data,
+            finding.risk_assessment = RiskAssessment(
+                **self._risk_data(finding, issue_type),
                 risk_description=f"Risk associated with {alert_metadata.alert_name}",
                 affected_users=1
             )
-            self.db.add(risk_assessment)
-            self.db.flush()  # Flush to ensure risk_assessment is available for money loss calculation
-            
-            # Calculate money loss
-            try:
-                money_loss_data = self.money_loss_calculator.calculate(
-                    finding=finding,
-                    issue_type=issue_type,
-                    additional_context={
-                        "alert_name": alert_metadata.alert_name,
-                        "alert_id": alert_metadata.alert_id,
-                        "user_name": alert.user_name,
-                    },
-                    use_llm=False,  # Disable LLM for now to avoid API calls, use ML only
-                    use_ml=True
-                )
-                
-                from app.models.money_loss import MoneyLossCalculation
-                money_loss_calc = MoneyLossCalculation(
-                    finding_id=finding.id,
-                    estimated_loss=float(money_loss_data.get("estimated_loss", 0.0)),
-                    confidence_score=float(money_loss_data.get("confidence", 0.5)),
-                    calculation_method=money_loss_data.get("calculation_method", "ml"),
-                    reasoning=money_loss_data.get("reasoning", "")[:1000] if money_loss_data.get("reasoning") else None,
-                    factors_considered=money_loss_data.get("factors_considered", []),
-                    llm_estimate=money_loss_data.get("llm_estimate"),
-                    ml_estimate=money_loss_data.get("ml_estimate"),
-                    final_estimate=float(money_loss_data.get("estimated_loss", 0.0))
-                )
-                self.db.add(money_loss_calc)
-            except Exception as e:
-                logger.warning(f"Failed to calculate money loss for finding {finding.id}: {str(e)}")
-                # Create a default money loss calculation
-                from app.models.money_loss import MoneyLossCalculation
-                money_loss_calc = MoneyLossCalculation(
-                    finding_id=finding.id,
+            findings.append(finding)
+        
+        # Money loss for all findings in one batch
+        self._attach_money_loss(findings, issue_type, [
+            {
+                "alert_name": alert_metadata.alert_name,
+                "alert_id": alert_metadata.alert_id,
+                "user_name": alert.user_name,
+            }
+            for alert in alerts
+        ])
+        
+        self.db.add_all(findings)
+        self.db.flush()
+        
+        return findings
+    
+    def _analyze_alert_groups(self, data_source: DataSource, alert_metadata: AlertMetadata,
+                              focus_area: FocusArea, issue_type, confidence: float) -> List[Finding]:
+        """
+        Create one finding per value of self.group_by, with the group's alert counts.
+        
+        Groups are counted in SQL, so alert rows are never loaded. Severity,
+        issue type and confidence are the same for every alert of the upload,
+        so the risk score and the per-alert money loss are computed once; each
+        group's loss is the per-alert loss times its alert count, which keeps
+        the run total equal to per-row mode. All rows are written in one flush.
+        """
+        from app.models.money_loss import MoneyLossCalculation
+        
+        key = getattr(Alert, self.group_by)
+        label = ALERT_GROUP_KEYS[self.group_by]
+        seen_at = func.coalesce(Alert.timestamp, Alert.created_at)
+        groups = self.db.query(
+            key.label("value"),
+            func.count(Alert.id).label("alert_count"),
+            func.count(func.distinct(Alert.user_name)).label("user_count"),
+            func.min(Alert.id).label("first_alert_id"),
+            func.min(seen_at).label("first_seen"),
+            func.max(seen_at).label("last_seen")
+        ).filter(
+            Alert.data_source_id == data_source.id
+        ).group_by(key).order_by(func.count(Alert.id).desc(), key).all()
+        
+        findings = []
+        for group in groups:
+            value = group.value or f"Unknown {label}"
+            findings.append(Finding(
+                data_source_id=data_source.id,
+                alert_id=group.first_alert_id,
+                focus_area=focus_area,
+                issue_type=issue_type,
+                title=f"{alert_metadata.alert_name} - {value} ({group.alert_count} alerts)",
+                description=f"Alert detected: {alert_metadata.alert_name} ({group.alert_count} alerts for {label} {value})",
+                severity=issue_type.default_severity if issue_type else "Medium",
+                classification_confidence=confidence,
+                detected_at=group.first_seen,
+                key_findings_json={
+                    "group_by": self.group_by,
+                    "group_value": group.value,
+                    "alert_count": group.alert_count,
+                    "user_count": group.user_count,
+                    "first_seen": group.first_seen.isoformat() if group.first_seen else None,
+                    "last_seen": group.last_seen.isoformat() if group.last_seen else None,
+                }
+            ))
+        
+        # Risk depends only on severity, issue type and confidence: score once
+        risk_data = self._risk_data(findings[0], issue_type)
+        for finding, group in zip(findings, groups):
+            finding.risk_assessment = RiskAssessment(
+                **risk_data,
+                risk_description=f"Risk associated with {alert_metadata.alert_name}",
+                affected_users=group.user_count or 1
+            )
+        
+        self.feature_store.attach(findings, issue_type)
+        
+        # Per-alert money loss, from the same features for every group
+        try:
+            money_loss_data = self.money_loss_calculator.calculate(
+                finding=findings[0],
+                issue_type=issue_type,
+                additional_context={
+                    "alert_name": alert_metadata.alert_name,
+                    "alert_id": alert_metadata.alert_id,
+                },
+                use_llm=False,  # Disable LLM for now to avoid API calls, use ML only
+                use_ml=True
+            )
+            error = None
+        except Exception as e:
+            logger.warning(f"Failed to calculate money loss for data_source_id={data_source.id}: {str(e)}")
+            money_loss_data, error = None, e
+        
+        for finding, group in zip(findings, groups):
+            count = group.alert_count
+            if money_loss_data is None:
+                finding.money_loss_calculation = MoneyLossCalculation(
                     estimated_loss=0.0,
                     confidence_score=0.0,
                     calculation_method="failed",
-                    reasoning=f"Calculation failed: {str(e)}"
+                    reasoning=f"Calculation failed: {str(error)}"
                 )
-                self.db.add(money_loss_calc)
+                continue
             
-            findings.append(finding)
+            per_alert = float(money_loss_data.get("estimated_loss", 0.0))
+            reasoning = money_loss_data.get("reasoning") or ""
+            finding.money_loss_calculation = MoneyLossCalculation(
+                estimated_loss=per_alert * count,
+                confidence_score=float(money_loss_data.get("confidence", 0.5)),
+                calculation_method=money_loss_data.get("calculation_method", "ml"),
+                reasoning=f"{reasoning} ({count} alerts x {per_alert:,.2f} per alert)"[:1000],
+                factors_considered=money_loss_data.get("factors_considered", []) + ["alert_count"],
+                llm_estimate=money_loss_data["llm_estimate"] * count if money_loss_data.get("llm_estimate") is not None else None,
+                ml_estimate=money_loss_data["ml_estimate"] * count if money_loss_data.get("ml_estimate") is not None else None,
+                final_estimate=per_alert * count,
+                calculation_details={"per_alert_estimate": per_alert, "alert_count": count}
+            )
+        
+        self.db.add_all(findings)
+        self.db.flush()
         
         return findings
     
@@ -293,75 +402,88 @@ class Analyzer:
             finding = Finding(
                 data_source_id=data_source.id,
                 soda_report_id=report.id,
-                focus_area_id=focus_area.id,
-                issue_type_id=issue_type.id if issue_type else None,
+                focus_area=focus_area,
+                issue_type=issue_type,
                 title=f"{report_type_name} - {report.user_name or report.role_name or 'Unknown'}",
                 description=f"SoDA report: {report_type_name}",
                 severity=report.risk_level or (issue_type.default_severity if issue_type else "Medium"),
                 classification_confidence=min(focus_confidence, issue_confidence) if issue_type else focus_confidence,
                 detected_at=report.created_at
             )
-            self.db.add(finding)
-            self.db.flush()
-            
-            # Calculate risk assessment
-            risk_data = self.risk_scorer.calculate_risk_score(finding, issue_type)
-            from app.models.risk_assessment import RiskAssessment
-            # Filter out fields that aren't in RiskAssessment model
-            allowed_fields = {'risk_score', 'risk_level', 'risk_category', 'risk_factors', 'potential_impact', 'affected_systems'}
-            filtered_risk_data = {k: v for k, v in risk_data.items() if k in allowed_fields}
-            risk_assessment = RiskAssessment(
-                finding_id=finding.id,
-                **filtered_risk_data,
+            finding.risk_assessment = RiskAssessment(
+                **self._risk_data(finding, issue_type),
                 risk_description=f"Risk from {report_type_name}",
                 affected_users=1
             )
-            self.db.add(risk_assessment)
-            self.db.flush()  # Flush to ensure risk_assessment is available for money loss calculation
-            
-            # Calculate money loss
-            try:
-                money_loss_data = self.money_loss_calculator.calculate(
-                    finding=finding,
-                    issue_type=issue_type,
-                    additional_context={
-                        "report_type": report_metadata.report_type,
-                        "user_name": report.user_name,
-                        "role_name": report.role_name,
-                    },
-                    use_llm=False,  # Disable LLM for now to avoid API calls, use ML only
-                    use_ml=True
-                )
-                
-                from app.models.money_loss import MoneyLossCalculation
-                money_loss_calc = MoneyLossCalculation(
-                    finding_id=finding.id,
-                    estimated_loss=float(money_loss_data.get("estimated_loss", 0.0)),
-                    confidence_score=float(money_loss_data.get("confidence", 0.5)),
-                    calculation_method=money_loss_data.get("calculation_method", "ml"),
-                    reasoning=money_loss_data.get("reasoning", "")[:1000] if money_loss_data.get("reasoning") else None,
-                    factors_considered=money_loss_data.get("factors_considered", []),
-                    llm_estimate=money_loss_data.get("llm_estimate"),
-                    ml_estimate=money_loss_data.get("ml_estimate"),
-                    final_estimate=float(money_loss_data.get("estimated_loss", 0.0))
-                )
-                self.db.add(money_loss_calc)
-            except Exception as e:
-                logger.warning(f"Failed to calculate money loss for finding {finding.id}: {str(e)}")
-                # Create a default money loss calculation
-                from app.models.money_loss import MoneyLossCalculation
-                money_loss_calc = MoneyLossCalculation(
-                    finding_id=finding.id,
+            findings.append(finding)
+        
+        # Money loss for all findings in one batch
+        self._attach_money_loss(findings, issue_type, [
+            {
+                "report_type": report_metadata.report_type,
+                "user_name": report.user_name,
+                "role_name": report.role_name,
+            }
+            for report in reports
+        ])
+        
+        self.db.add_all(findings)
+        self.db.flush()
+        
+        return findings
+    
+    def _risk_data(self, finding: Finding, issue_type) -> Dict[str, Any]:
+        """Risk scorer output for a finding, limited to RiskAssessment columns"""
+        risk_data = self.risk_scorer.calculate_risk_score(finding, issue_type)
+        # Filter out fields that aren't in RiskAssessment model
+        allowed_fields = {'risk_score', 'risk_level', 'risk_category', 'risk_factors', 'potential_impact', 'affected_systems'}
+        return {k: v for k, v in risk_data.items() if k in allowed_fields}
+    
+    def _attach_money_loss(self, findings: List[Finding], issue_type, contexts: List[Dict[str, Any]]):
+        """
+        Materialize the findings' features, calculate money loss with one
+        batched ML call and attach a MoneyLossCalculation to each (risk
+        assessments must be attached first).
+        """
+        from app.models.money_loss import MoneyLossCalculation
+        
+        if not findings:
+            return
+        
+        # Materialize the feature vectors; the ML estimate reads them back
+        self.feature_store.attach(findings, issue_type)
+        
+        try:
+            results = self.money_loss_calculator.calculate_many(
+                findings,
+                [issue_type] * len(findings),
+                contexts,
+                use_llm=False,  # Disable LLM for now to avoid API calls, use ML only
+                use_ml=True
+            )
+        except Exception as e:
+            logger.warning(f"Failed to calculate money loss for {len(findings)} findings: {str(e)}")
+            # Create default money loss calculations
+            for finding in findings:
+                finding.money_loss_calculation = MoneyLossCalculation(
                     estimated_loss=0.0,
                     confidence_score=0.0,
                     calculation_method="failed",
                     reasoning=f"Calculation failed: {str(e)}"
                 )
-                self.db.add(money_loss_calc)
-            
-            findings.append(finding)
+            return
         
-        return findings
+        for finding, money_loss_data in zip(findings, results):
+            finding.money_loss_calculation = MoneyLossCalculation(
+                estimated_loss=float(money_loss_data.get("estimated_loss", 0.0)),
+                confidence_score=float(money_loss_data.get("confidence", 0.5)),
+                calculation_method=money_loss_data.get("calculation_method", "ml"),
+                reasoning=money_loss_data.get("reasoning", "")[:1000] if money_loss_data.get("reasoning") else None,
+                factors_considered=money_loss_data.get("factors_considered", []),
+                llm_estimate=money_loss_data.get("llm_estimate"),
+                ml_estimate=money_loss_data.get("ml_estimate"),
+                final_estimate=float(money_loss_data.get("estimated_loss", 0.0))
+            )
     
     def _group_findings(self, findings: List[Finding], analysis_run: AnalysisRun):
         """Group findings by issue type for aggregation"""
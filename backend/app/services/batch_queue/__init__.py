@@ -0,0 +1,25 @@
+"""
+Batch Queue Module
+
+Durable, database-backed queue for batch content analysis. The API
+enqueues jobs; standalone worker processes (app.services.batch_queue.worker)
+lease, heartbeat and retry the per-alert tasks, and the bulk finding writer
+persists each chunk of results with one commit. The worker is not
+imported here so that `python -m app.services.batch_queue.worker` runs
+cleanly.
+"""
+
+from .queue import BatchQueue, ClaimedTask, LeaseLostError, get_batch_queue
+from .finding_writer import BulkFindingWriter, LookupCache, PendingFinding, WrittenFinding, get_finding_writer
+
+__all__ = [
+    "BatchQueue",
+    "ClaimedTask",
+    "LeaseLostError",
+    "get_batch_queue",
+    "BulkFindingWriter",
+    "LookupCache",
+    "PendingFinding",
+    "WrittenFinding",
+    "get_finding_writer",
+]
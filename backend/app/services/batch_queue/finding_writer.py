@@ -0,0 +1,605 @@
+"""
+Bulk Finding Writer
+
+Persists analyzed ContentFindings (Finding, RiskAssessment,
+MoneyLossCalculation, FindingFeature and the Alert Dashboard tables) for a chunk of alerts
+at once. Each table is written with a single multi-row INSERT (with
+RETURNING where child rows need the new ids) instead of one ORM insert and
+flush per row. Focus-area / data-source / alert-instance ids are looked up
+once per write_and_commit call and never kept beyond it, so rows deleted
+in the meantime (e.g. by the maintenance endpoints) are not referenced.
+"""
+
+import logging
+import os
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple, Union
+
+from sqlalchemy import insert
+from sqlalchemy.orm import Session
+
+from app.models.finding import Finding
+from app.models.focus_area import FocusArea
+from app.models.risk_assessment import RiskAssessment
+from app.models.money_loss import MoneyLossCalculation
+from app.models.finding_feature import FindingFeature
+from app.models.data_source import DataSource, DataSourceType, FileFormat
+from app.models.alert_instance import AlertInstance
+from app.models.alert_analysis import AlertAnalysis
+from app.models.critical_discovery import CriticalDiscovery
+from app.models.key_finding import KeyFinding
+from app.models.concentration_metric import ConcentrationMetric
+from app.models.action_item import ActionItem
+from app.services.ml_engine.feature_store import feature_row, feature_vector
+
+logger = logging.getLogger(__name__)
+
+
+# PostgreSQL Integer max
+MAX_INT = 2147483647
+
+
+def extract_module_from_path(directory_path: str) -> str:
+    """Extract module code (FI, MM, SD, etc.) from directory path."""
+    path_parts = directory_path.replace("\\", "/").split("/")
+    # Look for known module codes in path
+    modules = ["FI", "MM", "SD", "MD", "PUR", "HR", "PP", "QM"]
+    for part in path_parts:
+        if part.upper() in modules:
+            return part.upper()
+    return "GENERAL"
+
+
+def fraud_indicator_for(risk_score: int, severity: str) -> str:
+    """Map risk score and severity to the dashboard fraud indicator."""
+    if risk_score >= 80 or severity == "CRITICAL":
+        return "INVESTIGATE"
+    elif risk_score >= 60 or severity == "HIGH":
+        return "MONITOR"
+    else:
+        return "NONE"
+
+
+@dataclass
+class PendingFinding:
+    """An analyzed alert waiting to be persisted."""
+    content_finding: Any  # ContentFinding
+    directory_path: str
+    report_level: str = "summary"
+    markdown_report: Optional[str] = None
+    markdown_path: Optional[str] = None
+    money_loss_reasoning: Optional[str] = None
+
+
+@dataclass
+class LookupCache:
+    """Lookup ids resolved within one write_and_commit call."""
+    focus_area_ids: Dict[str, int] = field(default_factory=dict)
+    data_source_ids: Dict[str, int] = field(default_factory=dict)
+    alert_instance_ids: Dict[str, int] = field(default_factory=dict)
+
+
+@dataclass
+class WrittenFinding:
+    """Ids created for one persisted alert."""
+    finding_id: int
+    dashboard: Dict[str, Any] = field(default_factory=dict)
+
+
+class BulkFindingWriter:
+    """
+    Writes chunks of analyzed alerts with bulk INSERTs.
+
+    Usage:
+        writer = BulkFindingWriter()
+        written = writer.write(db, [PendingFinding(finding, "/data/FI/alert_1")])
+        db.commit()
+    """
+
+    def __init__(self, validate: Optional[Callable[[Any], tuple]] = None):
+        """
+        Initialize the writer.
+
+        Args:
+            validate: Optional check returning (is_valid, warnings) for a
+                ContentFinding (default: ContentAnalyzer._validate_content_finding)
+        """
+        self._validate = validate
+
+    def write(
+        self,
+        db: Session,
+        items: List[PendingFinding],
+        lookups: Optional[LookupCache] = None
+    ) -> List[WrittenFinding]:
+        """
+        Insert findings and dashboard rows for a chunk of alerts.
+
+        Does not commit. Dashboard population runs in a savepoint; if it
+        fails the findings are still written and each item's dashboard dict
+        carries the error, as with single-alert saves.
+
+        Args:
+            db: Database session
+            items: Analyzed alerts to persist
+            lookups: Ids resolved earlier in the same transaction (default: none)
+
+        Returns:
+            WrittenFinding per item, in order
+        """
+        if not items:
+            return []
+        lookups = lookups if lookups is not None else LookupCache()
+
+        for item in items:
+            self._log_validation(item.content_finding)
+
+        finding_ids = self._insert_findings(db, items, lookups)
+
+        try:
+            with db.begin_nested():
+                dashboards = self._insert_dashboard(db, items, finding_ids, lookups)
+        except Exception as e:
+            logger.error(f"Failed to populate dashboard tables: {e}")
+            self._forget_alert_instances(items, lookups)
+            dashboards = [
+                {"error": str(e), "alert_instance_id": None, "alert_analysis_id": None}
+                for _ in items
+            ]
+
+        return [WrittenFinding(finding_id=fid, dashboard=dash) for fid, dash in zip(finding_ids, dashboards)]
+
+    def write_and_commit(
+        self,
+        db: Session,
+        items: List[PendingFinding],
+        before_commit: Optional[Callable[[Session, List[Tuple[int, WrittenFinding]]], None]] = None
+    ) -> List[Union[WrittenFinding, Exception]]:
+        """
+        Write a chunk with one commit; on failure retry item by item.
+
+        A bad alert therefore only fails itself, not the rest of its chunk.
+        Lookup ids are shared by the writes of this call only; they are
+        dropped after a rollback, which may have undone their inserts.
+
+        Args:
+            db: Database session
+            items: Analyzed alerts to persist
+            before_commit: Called with (position, WrittenFinding) pairs of the
+                items about to be committed, in the same transaction; if it
+                raises, those items are rolled back like a failed write
+
+        Returns:
+            WrittenFinding or the exception raised for each item, in order
+        """
+        lookups = LookupCache()
+        try:
+            written = self.write(db, items, lookups)
+            if before_commit is not None:
+                before_commit(db, list(enumerate(written)))
+            db.commit()
+            return written
+        except Exception as e:
+            db.rollback()
+            if len(items) == 1:
+                return [e]
+            logger.warning(f"Bulk write of {len(items)} findings failed ({e}), writing individually")
+
+        outcomes: List[Union[WrittenFinding, Exception]] = []
+        lookups = LookupCache()
+        for position, item in enumerate(items):
+            try:
+                written = self.write(db, [item], lookups)
+                if before_commit is not None:
+                    before_commit(db, [(position, written[0])])
+                db.commit()
+                outcomes.append(written[0])
+            except Exception as e:
+                db.rollback()
+                lookups = LookupCache()
+                outcomes.append(e)
+        return outcomes
+
+    # ------------------------------------------------------------------
+    # Findings
+    # ------------------------------------------------------------------
+
+    def _insert_findings(self, db: Session, items: List[PendingFinding], lookups: LookupCache) -> List[int]:
+        focus_area_ids = self._resolve_focus_areas(
+            db, {item.content_finding.focus_area for item in items}, lookups.focus_area_ids
+        )
+        data_source_ids = self._resolve_data_sources(
+            db, {item.directory_path for item in items}, lookups.data_source_ids
+        )
+        now = datetime.utcnow()
+
+        finding_rows = []
+        for item in items:
+            cf = item.content_finding
+            finding_rows.append({
+                "data_source_id": data_source_ids[item.directory_path],
+                "focus_area_id": focus_area_ids[cf.focus_area],
+                "title": cf.title,
+                "description": cf.description[:4000] if cf.description else None,
+                "severity": cf.severity,
+                "classification_confidence": cf.focus_area_confidence,
+                "status": "new",
+                "source_alert_id": cf.alert_id,
+                "source_alert_name": cf.alert_name,
+                "source_module": extract_module_from_path(item.directory_path),
+                "source_directory": item.directory_path,
+                "markdown_report": item.markdown_report,
+                "report_path": item.markdown_path,
+                "report_level": item.report_level,
+                "key_findings_json": {
+                    "risk_score": cf.risk_score,
+                    "money_loss_estimate": cf.money_loss_estimate,
+                    "focus_area": cf.focus_area,
+                    "severity": cf.severity,
+                    "total_count": cf.total_count,
+                    "monetary_amount": cf.monetary_amount,
+                    "currency": cf.currency,
+                    "key_metrics": cf.key_metrics,
+                },
+                "analysis_status": "completed",
+                "analyzed_at": now,
+            })
+        finding_ids = self._insert_returning_ids(db, Finding, finding_rows)
+
+        risk_rows = []
+        money_rows = []
+        feature_rows = []
+        for item, finding_id in zip(items, finding_ids):
+            cf = item.content_finding
+            feature_rows.append(feature_row(finding_id, feature_vector(
+                cf.severity, cf.risk_score, None, cf.focus_area_confidence, cf.focus_area
+            )))
+            risk_rows.append({
+                "finding_id": finding_id,
+                "risk_score": cf.risk_score,
+                "risk_level": cf.risk_level,
+                "risk_category": cf.focus_area,
+                "risk_description": cf.severity_reasoning,
+                "risk_factors": cf.risk_factors,
+                "potential_impact": cf.business_impact,
+            })
+            money_rows.append({
+                "finding_id": finding_id,
+                "estimated_loss": cf.money_loss_estimate,
+                "confidence_score": cf.money_loss_confidence,
+                "calculation_method": "content_analyzer",
+                "final_estimate": cf.money_loss_estimate,
+                "reasoning": item.money_loss_reasoning or f"Estimated from {cf.alert_name} analysis",
+            })
+        self._insert_many(db, RiskAssessment, risk_rows)
+        self._insert_many(db, MoneyLossCalculation, money_rows)
+        self._insert_many(db, FindingFeature, feature_rows)
+
+        return finding_ids
+
+    def _resolve_focus_areas(self, db: Session, codes: Iterable[str], cache: Dict[str, int]) -> Dict[str, int]:
+        def create(code):
+            return {
+                "code": code,
+                "name": code.replace("_", " ").title(),
+                "description": f"Auto-created for {code}",
+            }
+
+        return self._resolve(db, FocusArea, FocusArea.code, codes, cache, create)
+
+    def _resolve_data_sources(self, db: Session, paths: Iterable[str], cache: Dict[str, int]) -> Dict[str, int]:
+        def create(path):
+            dir_name = os.path.basename(path.rstrip('/\\'))
+            return {
+                "filename": f"artifacts_{dir_name}",
+                "original_filename": path,
+                "file_format": FileFormat.JSON,
+                "data_type": DataSourceType.ALERT,
+                "file_path": path,
+                "file_size": 0,
+                "status": "processed",
+            }
+
+        return self._resolve(db, DataSource, DataSource.original_filename, paths, cache, create)
+
+    def _resolve(self, db, model, key_column, keys, cache, create) -> Dict[str, int]:
+        """Get-or-create ids for keys: cache, then one SELECT, then one INSERT ... RETURNING."""
+        keys = set(keys)
+        resolved = {key: cache[key] for key in keys if key in cache}
+
+        missing = keys - resolved.keys()
+        if missing:
+            for key, row_id in db.query(key_column, model.id).filter(key_column.in_(missing)).all():
+                # First match wins, as with .first() lookups
+                resolved.setdefault(key, row_id)
+            missing -= resolved.keys()
+
+        if missing:
+            ordered = sorted(missing)
+            ids = self._insert_returning_ids(db, model, [create(key) for key in ordered])
+            resolved.update(zip(ordered, ids))
+
+        cache.update(resolved)
+        return resolved
+
+    # ------------------------------------------------------------------
+    # Alert Dashboard tables
+    # ------------------------------------------------------------------
+
+    def _insert_dashboard(
+        self,
+        db: Session,
+        items: List[PendingFinding],
+        finding_ids: List[int],
+        lookups: LookupCache
+    ) -> List[Dict[str, Any]]:
+        instance_ids = self._resolve_alert_instances(db, items, lookups.alert_instance_ids)
+        today = datetime.utcnow().date()
+
+        analysis_rows = []
+        scoring = []
+        for item, finding_id in zip(items, finding_ids):
+            cf = item.content_finding
+            severity = cf.severity.upper() if cf.severity else "MEDIUM"
+            risk_score = cf.risk_score if cf.risk_score is not None else 50
+            fraud_indicator = fraud_indicator_for(risk_score, severity)
+            financial_impact = cf.money_loss_estimate or 0.0
+            scoring.append((severity, fraud_indicator, financial_impact))
+
+            records_affected = cf.total_count if cf.total_count is not None else 0
+            if records_affected < 0:
+                logger.warning(f"records_affected is negative ({records_affected}), setting to 0")
+                records_affected = 0
+            if records_affected > MAX_INT:
+                logger.warning(f"records_affected exceeds max INT ({records_affected}), capping to {MAX_INT}")
+                records_affected = MAX_INT
+
+            concentration_metrics = getattr(cf, 'concentration_metrics', None) or []
+            analysis_rows.append({
+                "alert_instance_id": instance_ids[cf.alert_id or ""],
+                "analysis_type": "QUANTI",  # Quantitative analysis
+                "execution_date": today,
+                "records_affected": records_affected,
+                "unique_entities": max((m.get("entity_count", 0) for m in concentration_metrics), default=None),
+                "severity": severity,
+                "risk_score": risk_score,
+                "fraud_indicator": fraud_indicator,
+                "financial_impact_usd": financial_impact,
+                "local_currency": cf.currency or "USD",
+                "report_path": item.directory_path,
+                "raw_summary_data": {
+                    "key_metrics": cf.key_metrics if cf.key_metrics else {},
+                    "risk_factors": cf.risk_factors if cf.risk_factors else [],
+                    "recommended_actions": cf.recommended_actions if cf.recommended_actions else [],
+                    "finding_id": finding_id
+                },
+                "created_by": "content_analyzer_pipeline",
+            })
+        analysis_ids = self._insert_returning_ids(db, AlertAnalysis, analysis_rows)
+
+        discoveries, key_findings, concentrations, actions = [], [], [], []
+        dashboards = []
+        for item, analysis_id, (severity, fraud_indicator, financial_impact) in zip(items, analysis_ids, scoring):
+            cf = item.content_finding
+            item_discoveries = self._discovery_rows(cf, analysis_id, fraud_indicator, financial_impact)
+            item_key_findings = self._key_finding_rows(cf, analysis_id, financial_impact)
+            item_concentrations = self._concentration_rows(cf, analysis_id)
+            item_actions = self._action_rows(cf, analysis_id, severity, fraud_indicator)
+
+            discoveries.extend(item_discoveries)
+            key_findings.extend(item_key_findings)
+            concentrations.extend(item_concentrations)
+            actions.extend(item_actions)
+            dashboards.append({
+                "alert_instance_id": instance_ids[cf.alert_id or ""],
+                "alert_analysis_id": analysis_id,
+                "critical_discoveries": len(item_discoveries),
+                "key_findings": len(item_key_findings),
+                "concentration_metrics": len(item_concentrations),
+                "action_items": len(item_actions)
+            })
+
+        self._insert_many(db, CriticalDiscovery, discoveries)
+        self._insert_many(db, KeyFinding, key_findings)
+        self._insert_many(db, ConcentrationMetric, concentrations)
+        self._insert_many(db, ActionItem, actions)
+
+        logger.info(
+            f"Dashboard rows for {len(items)} alerts: {len(discoveries)} discoveries, "
+            f"{len(key_findings)} key findings, {len(concentrations)} concentration metrics, "
+            f"{len(actions)} action items"
+        )
+        return dashboards
+
+    def _resolve_alert_instances(
+        self,
+        db: Session,
+        items: List[PendingFinding],
+        cache: Dict[str, int]
+    ) -> Dict[str, int]:
+        # First occurrence in the chunk defines a new instance
+        first_items: Dict[str, PendingFinding] = {}
+        for item in items:
+            first_items.setdefault(item.content_finding.alert_id or "", item)
+
+        def create(alert_id):
+            item = first_items[alert_id]
+            cf = item.content_finding
+            alert_name = cf.alert_name or "Unnamed Alert"
+            module = extract_module_from_path(item.directory_path)
+            return {
+                "alert_id": alert_id or f"UNKNOWN_{datetime.utcnow().timestamp()}",
+                "alert_name": alert_name,
+                "focus_area": cf.focus_area or "BUSINESS_CONTROL",
+                "subcategory": module,
+                "parameters": {"directory_path": item.directory_path, "module": module},
+                "business_purpose": (
+                    cf.business_impact or
+                    (cf.description[:500] if cf.description else None) or
+                    f"Alert: {alert_name}"
+                ),
+            }
+
+        return self._resolve(db, AlertInstance, AlertInstance.alert_id, first_items.keys(), cache, create)
+
+    def _forget_alert_instances(self, items: List[PendingFinding], lookups: LookupCache):
+        # Instances inserted in a rolled-back savepoint must not stay cached
+        for item in items:
+            lookups.alert_instance_ids.pop(item.content_finding.alert_id or "", None)
+
+    @staticmethod
+    def _discovery_rows(cf, analysis_id: int, fraud_indicator: str, financial_impact: float) -> List[Dict]:
+        """CriticalDiscovery rows from notable_items (max 5), or one from the main finding."""
+        rows = []
+        for idx, item in enumerate((getattr(cf, 'notable_items', None) or [])[:5], 1):
+            # Handle both dict and object notable items
+            if isinstance(item, dict):
+                title = item.get('title', item.get('entity', f'Discovery {idx}'))
+                description = item.get('description', item.get('details', str(item)))
+                entity = item.get('entity', item.get('id', ''))
+                amount = item.get('amount', item.get('value', 0))
+                percentage = item.get('percentage', 0)
+            else:
+                title = getattr(item, 'title', f'Discovery {idx}')
+                description = getattr(item, 'description', str(item))
+                entity = getattr(item, 'entity', '')
+                amount = getattr(item, 'amount', 0)
+                percentage = getattr(item, 'percentage', 0)
+
+            rows.append({
+                "alert_analysis_id": analysis_id,
+                "discovery_order": idx,
+                "title": str(title)[:255],
+                "description": str(description)[:2000],
+                "affected_entity": str(entity)[:255] if entity else None,
+                "metric_value": float(amount) if amount else None,
+                "percentage_of_total": float(percentage) if percentage else None,
+                "is_fraud_indicator": fraud_indicator == "INVESTIGATE",
+            })
+
+        if not rows:
+            # Ensure at least one CriticalDiscovery per analysis
+            title = cf.title or cf.alert_name or "Alert Analysis Finding"
+            description = (
+                cf.description or
+                cf.business_impact or
+                cf.what_happened or
+                f"Analysis of alert: {cf.alert_name}"
+            )
+            rows.append({
+                "alert_analysis_id": analysis_id,
+                "discovery_order": 1,
+                "title": title[:255],
+                "description": description[:2000],
+                "affected_entity": None,
+                "metric_value": float(financial_impact) if financial_impact else None,
+                "percentage_of_total": None,
+                "is_fraud_indicator": fraud_indicator == "INVESTIGATE",
+            })
+        return rows
+
+    @staticmethod
+    def _key_finding_rows(cf, analysis_id: int, financial_impact: float) -> List[Dict]:
+        rows = []
+        # Main business impact
+        if cf.business_impact:
+            rows.append((1, cf.business_impact[:2000], "Impact", financial_impact))
+        # Risk description
+        if getattr(cf, 'severity_reasoning', None):
+            rows.append((2, cf.severity_reasoning[:2000], "Risk", None))
+        # Risk factors
+        if getattr(cf, 'risk_factors', None):
+            factors_text = "; ".join(cf.risk_factors[:3])
+            rows.append((3, f"Risk Factors: {factors_text}"[:2000], "Concentration", None))
+
+        return [
+            {
+                "alert_analysis_id": analysis_id,
+                "finding_rank": rank,
+                "finding_text": text,
+                "finding_category": category,
+                "financial_impact_usd": impact,
+            }
+            for rank, text, category, impact in rows
+        ]
+
+    @staticmethod
+    def _concentration_rows(cf, analysis_id: int) -> List[Dict]:
+        return [
+            {
+                "alert_analysis_id": analysis_id,
+                "dimension_type": str(metric["dimension_type"])[:50],
+                "dimension_code": str(metric["dimension_code"])[:50],
+                "record_count": metric.get("record_count"),
+                "value_local": metric.get("value_local"),
+                "percentage_of_total": metric.get("percentage_of_total"),
+                "rank": metric.get("rank"),
+            }
+            for metric in (getattr(cf, 'concentration_metrics', None) or [])
+        ]
+
+    @staticmethod
+    def _action_rows(cf, analysis_id: int, severity: str, fraud_indicator: str) -> List[Dict]:
+        rows = []
+        if fraud_indicator == "INVESTIGATE" or severity in ["CRITICAL", "HIGH"]:
+            # Immediate action for investigation
+            rows.append({
+                "alert_analysis_id": analysis_id,
+                "action_type": "IMMEDIATE",
+                "priority": 1,
+                "title": f"Investigate {cf.alert_name}",
+                "description": f"High-risk alert detected with {severity} severity and risk score {cf.risk_score}. Review findings and determine if fraudulent activity occurred.",
+                "status": "OPEN",
+            })
+
+        # Short-term actions from recommended_actions
+        for idx, rec_action in enumerate((getattr(cf, 'recommended_actions', None) or [])[:2], 1):
+            rows.append({
+                "alert_analysis_id": analysis_id,
+                "action_type": "SHORT_TERM",
+                "priority": 2 + idx,
+                "title": str(rec_action)[:255],
+                "description": f"Recommended action from analysis: {rec_action}",
+                "status": "OPEN",
+            })
+        return rows
+
+    # ------------------------------------------------------------------
+    # Helpers
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _insert_returning_ids(db: Session, model, rows: List[Dict]) -> List[int]:
+        """Multi-row INSERT ... RETURNING id, ids in row order."""
+        if not rows:
+            return []
+        return list(db.scalars(insert(model).returning(model.id, sort_by_parameter_order=True), rows))
+
+    @staticmethod
+    def _insert_many(db: Session, model, rows: List[Dict]):
+        if rows:
+            db.execute(insert(model), rows)
+
+    def _log_validation(self, content_finding):
+        if self._validate is None:
+            from app.services.content_analyzer.analyzer import ContentAnalyzer
+            self._validate = ContentAnalyzer(use_llm=False)._validate_content_finding
+
+        _, warnings = self._validate(content_finding)
+        if warnings:
+            logger.warning(f"Validation warnings for alert {content_finding.alert_id}: {', '.join(warnings)}")
+
+
+# Global writer instance (holds no lookup state between calls)
+_finding_writer_instance: Optional[BulkFindingWriter] = None
+
+
+def get_finding_writer() -> BulkFindingWriter:
+    """Get or create the shared BulkFindingWriter."""
+    global _finding_writer_instance
+
+    if _finding_writer_instance is None:
+        _finding_writer_instance = BulkFindingWriter()
+
+    return _finding_writer_instance
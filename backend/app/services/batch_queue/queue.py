@@ -0,0 +1,470 @@
+"""
+Batch Queue
+
+Database-backed queue for batch content analysis. Jobs and their per-alert
+tasks live in the batch_jobs / batch_tasks tables, so progress survives
+restarts and is visible to every uvicorn worker.
+
+Workers lease one task at a time. A lease is claimed with a conditional
+UPDATE (compare-and-set on status and lease expiry), which is safe across
+processes and hosts on any database; on PostgreSQL candidate rows are also
+selected with FOR UPDATE SKIP LOCKED so concurrent workers don't collide.
+Leases are extended by heartbeats; a task whose lease expires (worker
+crashed or hung) becomes claimable again. Failed tasks are retried with
+exponential backoff until max_attempts.
+
+A handler that persists results can record a task as finished inside its
+own transaction (record_result), so the results are committed only
+together with the completion, and only while the lease is still held; a
+crash before that commit leaves nothing to be written twice on retry.
+"""
+
+import logging
+import threading
+import uuid
+from contextlib import contextmanager
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, List, Optional
+
+from sqlalchemy import and_, func, or_
+from sqlalchemy.orm import Session
+
+from app.models.batch_job import BatchJob, BatchTask
+
+logger = logging.getLogger(__name__)
+
+
+PENDING = "pending"
+RUNNING = "running"
+SUCCEEDED = "succeeded"
+FAILED = "failed"
+
+JOB_PROCESSING = "processing"
+JOB_COMPLETED = "completed"
+
+
+class LeaseLostError(Exception):
+    """The worker no longer owns the task it tried to finish."""
+
+
+@dataclass
+class ClaimedTask:
+    """A leased task, detached from the session that claimed it."""
+    task_id: int
+    job_id: str
+    directory_path: str
+    report_level: str
+    bypass_llm_cache: bool
+    attempt: int
+    lease_owner: str = ""
+    # Set by a handler once record_result was committed with its results
+    recorded: bool = False
+
+
+class BatchQueue:
+    """
+    Durable batch job queue.
+
+    Usage:
+        queue = BatchQueue(SessionLocal)
+        job_id = queue.create_job(["/data/alert_1", "/data/alert_2"])
+
+        # in a worker process
+        task = queue.claim_task("host:1234:0")
+        if task:
+            queue.heartbeat(task.task_id, "host:1234:0")
+            queue.complete_task(task.task_id, "host:1234:0", {"status": "success"})
+    """
+
+    # Candidate rows fetched per claim attempt
+    CLAIM_CANDIDATES = 10
+
+    def __init__(
+        self,
+        session_factory: Callable[[], Session],
+        lease_seconds: float = 300,
+        max_attempts: int = 3,
+        retry_delay_seconds: float = 30
+    ):
+        """
+        Initialize the queue.
+
+        Args:
+            session_factory: Callable returning a new SQLAlchemy session
+            lease_seconds: How long a claimed task is owned without a heartbeat
+            max_attempts: Attempts per task before it is marked failed
+            retry_delay_seconds: Base delay before a failed task is retried
+                (doubled on each further attempt)
+        """
+        self.session_factory = session_factory
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+        self.retry_delay_seconds = retry_delay_seconds
+
+    @contextmanager
+    def _session(self):
+        db = self.session_factory()
+        try:
+            yield db
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            db.close()
+
+    def create_job(
+        self,
+        directory_paths: List[str],
+        report_level: str = "full",
+        bypass_llm_cache: bool = False,
+        job_id: Optional[str] = None
+    ) -> str:
+        """
+        Enqueue a batch job with one task per directory.
+
+        Returns:
+            The job id
+        """
+        job_id = job_id or str(uuid.uuid4())
+        now = datetime.utcnow()
+
+        with self._session() as db:
+            db.add(BatchJob(
+                id=job_id,
+                status=PENDING,
+                report_level=report_level,
+                bypass_llm_cache=bypass_llm_cache,
+                total=len(directory_paths),
+                created_at=now
+            ))
+            db.add_all([
+                BatchTask(
+                    job_id=job_id,
+                    position=position,
+                    directory_path=path,
+                    status=PENDING,
+                    attempts=0,
+                    max_attempts=self.max_attempts,
+                    available_at=now,
+                    created_at=now
+                )
+                for position, path in enumerate(directory_paths)
+            ])
+            db.flush()
+            if not directory_paths:
+                self._finish_job_if_done(db, job_id, now)
+            db.commit()
+
+        logger.info(f"Enqueued batch job {job_id} with {len(directory_paths)} tasks")
+        return job_id
+
+    def claim_task(self, worker_id: str) -> Optional[ClaimedTask]:
+        """
+        Lease the next available task for worker_id.
+
+        Returns:
+            ClaimedTask, or None if nothing is available
+        """
+        now = datetime.utcnow()
+
+        with self._session() as db:
+            self._fail_abandoned(db, now)
+
+            claimable = or_(
+                and_(BatchTask.status == PENDING, BatchTask.available_at <= now),
+                and_(BatchTask.status == RUNNING, BatchTask.lease_expires_at < now)
+            )
+            candidates = db.query(BatchTask.id).filter(claimable).order_by(BatchTask.id).limit(self.CLAIM_CANDIDATES)
+            if db.get_bind().dialect.name == "postgresql":
+                candidates = candidates.with_for_update(skip_locked=True)
+
+            for (task_id,) in candidates.all():
+                claimed = db.query(BatchTask).filter(BatchTask.id == task_id, claimable).update({
+                    BatchTask.status: RUNNING,
+                    BatchTask.lease_owner: worker_id,
+                    BatchTask.lease_expires_at: now + timedelta(seconds=self.lease_seconds),
+                    BatchTask.heartbeat_at: now,
+                    BatchTask.attempts: BatchTask.attempts + 1,
+                    BatchTask.started_at: func.coalesce(BatchTask.started_at, now),
+                }, synchronize_session=False)
+                if not claimed:
+                    # Another worker got there first
+                    continue
+
+                task = db.query(BatchTask).filter(BatchTask.id == task_id).one()
+                job = db.query(BatchJob).filter(BatchJob.id == task.job_id).one()
+                if job.status == PENDING:
+                    job.status = JOB_PROCESSING
+                    job.started_at = now
+
+                claimed_task = ClaimedTask(
+                    task_id=task.id,
+                    job_id=job.id,
+                    directory_path=task.directory_path,
+                    report_level=job.report_level,
+                    bypass_llm_cache=bool(job.bypass_llm_cache),
+                    attempt=task.attempts,
+                    lease_owner=worker_id
+                )
+                db.commit()
+                return claimed_task
+
+            db.commit()
+            return None
+
+    def heartbeat(self, task_id: int, worker_id: str) -> bool:
+        """
+        Extend the lease on a running task.
+
+        Returns:
+            False if worker_id no longer owns the task
+        """
+        now = datetime.utcnow()
+        with self._session() as db:
+            updated = db.query(BatchTask).filter(
+                BatchTask.id == task_id,
+                BatchTask.status == RUNNING,
+                BatchTask.lease_owner == worker_id
+            ).update({
+                BatchTask.heartbeat_at: now,
+                BatchTask.lease_expires_at: now + timedelta(seconds=self.lease_seconds),
+            }, synchronize_session=False)
+            db.commit()
+            return updated == 1
+
+    def complete_task(self, task_id: int, worker_id: str, result: Dict[str, Any]) -> bool:
+        """
+        Record a finished task.
+
+        A result whose status is not "success" (e.g. directory not found)
+        is a permanent failure and is not retried.
+
+        Returns:
+            False if worker_id no longer owns the task (result discarded)
+        """
+        with self._session() as db:
+            task = self._owned_task(db, task_id, worker_id)
+            if task is None:
+                db.rollback()
+                return False
+
+            self._complete(db, task, result)
+            db.commit()
+            return True
+
+    def record_result(self, db: Session, task: ClaimedTask, result: Dict[str, Any]):
+        """
+        Record a finished task in the caller's transaction (like complete_task).
+
+        Nothing is committed here: the completion is saved with whatever
+        else the caller commits, e.g. the findings of the task, or rolled
+        back with it.
+
+        Raises:
+            LeaseLostError: If task.lease_owner no longer owns the task
+        """
+        row = self._owned_task(db, task.task_id, task.lease_owner)
+        if row is None:
+            raise LeaseLostError(f"Task {task.task_id} is no longer leased by {task.lease_owner}")
+        self._complete(db, row, result)
+
+    def _complete(self, db: Session, task: BatchTask, result: Dict[str, Any]):
+        now = datetime.utcnow()
+        task.status = SUCCEEDED if result.get("status") == "success" else FAILED
+        task.result = result
+        task.error = result.get("error")
+        task.completed_at = now
+        task.lease_owner = None
+        task.lease_expires_at = None
+        db.flush()
+        self._finish_job_if_done(db, task.job_id, now)
+
+    def fail_task(self, task_id: int, worker_id: str, error: str) -> bool:
+        """
+        Record a failed attempt; the task is retried until max_attempts.
+
+        Returns:
+            False if worker_id no longer owns the task
+        """
+        now = datetime.utcnow()
+
+        with self._session() as db:
+            task = self._owned_task(db, task_id, worker_id)
+            if task is None:
+                db.rollback()
+                return False
+
+            task.error = error
+            task.lease_owner = None
+            task.lease_expires_at = None
+
+            if task.attempts < task.max_attempts:
+                delay = self.retry_delay_seconds * (2 ** (task.attempts - 1))
+                task.status = PENDING
+                task.available_at = now + timedelta(seconds=delay)
+                logger.warning(
+                    f"Task {task.id} ({task.directory_path}) failed attempt "
+                    f"{task.attempts}/{task.max_attempts}, retrying in {delay:.0f}s: {error}"
+                )
+            else:
+                task.status = FAILED
+                task.result = self._failed_result(task, error)
+                task.completed_at = now
+                logger.error(f"Task {task.id} ({task.directory_path}) failed after {task.attempts} attempts: {error}")
+
+            db.flush()
+            self._finish_job_if_done(db, task.job_id, now)
+            db.commit()
+            return True
+
+    def _owned_task(self, db: Session, task_id: int, worker_id: str) -> Optional[BatchTask]:
+        query = db.query(BatchTask).filter(
+            BatchTask.id == task_id,
+            BatchTask.status == RUNNING,
+            BatchTask.lease_owner == worker_id
+        )
+        if db.get_bind().dialect.name == "postgresql":
+            query = query.with_for_update()
+        task = query.first()
+        if task is None:
+            logger.warning(f"Task {task_id} is no longer leased by {worker_id}")
+        return task
+
+    def _fail_abandoned(self, db: Session, now: datetime):
+        """Fail tasks whose lease expired on their last allowed attempt."""
+        abandoned = db.query(BatchTask).filter(
+            BatchTask.status == RUNNING,
+            BatchTask.lease_expires_at < now,
+            BatchTask.attempts >= BatchTask.max_attempts
+        ).all()
+
+        for task in abandoned:
+            error = f"Lease expired after {task.attempts} attempts (worker lost)"
+            task.status = FAILED
+            task.error = error
+            task.result = self._failed_result(task, error)
+            task.completed_at = now
+            task.lease_owner = None
+            task.lease_expires_at = None
+
+        if abandoned:
+            db.flush()
+            for job_id in {task.job_id for task in abandoned}:
+                self._finish_job_if_done(db, job_id, now)
+
+    def _finish_job_if_done(self, db: Session, job_id: str, now: datetime):
+        # Lock the job row before counting: two workers finishing the last two
+        # tasks would otherwise each see the other's task still running and
+        # neither would complete the job. The second one waits here until the
+        # first commits, then counts both tasks as finished.
+        job = db.query(BatchJob).filter(BatchJob.id == job_id).with_for_update().one()
+        remaining = db.query(func.count(BatchTask.id)).filter(
+            BatchTask.job_id == job_id,
+            BatchTask.status.in_([PENDING, RUNNING])
+        ).scalar()
+        if remaining == 0 and job.status != JOB_COMPLETED:
+            job.status = JOB_COMPLETED
+            job.completed_at = now
+            db.flush()
+
+    @staticmethod
+    def _failed_result(task: BatchTask, error: str) -> Dict[str, Any]:
+        return {
+            "path": task.directory_path,
+            "status": "failed",
+            "finding_id": None,
+            "markdown_path": None,
+            "error": error
+        }
+
+    def get_job_status(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Progress and per-alert results for a job.
+
+        Returns:
+            Dict matching the batch-status response, or None if unknown
+        """
+        with self._session() as db:
+            job = db.query(BatchJob).filter(BatchJob.id == job_id).first()
+            if job is None:
+                return None
+
+            counts = self._task_counts(db, [job_id]).get(job_id, {})
+            finished = db.query(BatchTask).filter(
+                BatchTask.job_id == job_id,
+                BatchTask.status.in_([SUCCEEDED, FAILED])
+            ).order_by(BatchTask.position).all()
+
+            status = self._job_dict(job, counts)
+            status["results"] = [task.result or self._failed_result(task, task.error) for task in finished]
+            return status
+
+    def list_jobs(self, limit: int = 100) -> List[Dict[str, Any]]:
+        """Most recent jobs with progress counters."""
+        with self._session() as db:
+            jobs = db.query(BatchJob).order_by(BatchJob.created_at.desc()).limit(limit).all()
+            counts = self._task_counts(db, [job.id for job in jobs])
+            return [self._job_dict(job, counts.get(job.id, {})) for job in jobs]
+
+    @staticmethod
+    def _task_counts(db: Session, job_ids: List[str]) -> Dict[str, Dict[str, int]]:
+        if not job_ids:
+            return {}
+        rows = db.query(BatchTask.job_id, BatchTask.status, func.count(BatchTask.id)).filter(
+            BatchTask.job_id.in_(job_ids)
+        ).group_by(BatchTask.job_id, BatchTask.status).all()
+
+        counts: Dict[str, Dict[str, int]] = {}
+        for job_id, status, count in rows:
+            counts.setdefault(job_id, {})[status] = count
+        return counts
+
+    @staticmethod
+    def _job_dict(job: BatchJob, counts: Dict[str, int]) -> Dict[str, Any]:
+        successful = counts.get(SUCCEEDED, 0)
+        failed = counts.get(FAILED, 0)
+        started_at = job.started_at or job.created_at
+        return {
+            "job_id": job.id,
+            "status": job.status,
+            "total": job.total,
+            "processed": successful + failed,
+            "successful": successful,
+            "failed": failed,
+            "pending": counts.get(PENDING, 0),
+            "running": counts.get(RUNNING, 0),
+            "report_level": job.report_level,
+            "started_at": started_at.isoformat() if started_at else None,
+            "completed_at": job.completed_at.isoformat() if job.completed_at else None
+        }
+
+
+# Global queue instance (lazy initialization)
+_batch_queue_instance: Optional[BatchQueue] = None
+_batch_queue_lock = threading.Lock()
+
+
+def get_batch_queue() -> BatchQueue:
+    """
+    Get the BatchQueue configured in settings.
+
+    Uses BATCH_TASK_LEASE_SECONDS, BATCH_TASK_MAX_ATTEMPTS and
+    BATCH_TASK_RETRY_DELAY_SECONDS.
+    """
+    global _batch_queue_instance
+
+    if _batch_queue_instance is None:
+        with _batch_queue_lock:
+            if _batch_queue_instance is None:
+                from app.core.config import settings
+                from app.core.database import SessionLocal
+
+                _batch_queue_instance = BatchQueue(
+                    SessionLocal,
+                    lease_seconds=getattr(settings, "BATCH_TASK_LEASE_SECONDS", 300),
+                    max_attempts=getattr(settings, "BATCH_TASK_MAX_ATTEMPTS", 3),
+                    retry_delay_seconds=getattr(settings, "BATCH_TASK_RETRY_DELAY_SECONDS", 30)
+                )
+
+    return _batch_queue_instance
@@ -0,0 +1,244 @@
+"""
+Batch Worker
+
+Standalone process that drains the batch queue. Run any number of these,
+on any number of hosts, against the same database:
+
+    python -m app.services.batch_queue.worker --concurrency 4
+
+Each slot claims up to chunk_size tasks and passes them to a handler
+coroutine (by default the content analysis pipeline from
+app.api.content_analysis.process_batch_alerts), which analyzes them
+together and persists the chunk with a single commit. A handler that
+records tasks as finished in that commit (BatchQueue.record_result) sets
+ClaimedTask.recorded, and the worker leaves those tasks alone. While a handler
+runs, a heartbeat thread extends the task leases, so a long LLM analysis
+is not mistaken for a dead worker. SIGTERM/SIGINT stop the worker after
+its current tasks finish.
+"""
+
+import argparse
+import asyncio
+import logging
+import os
+import signal
+import socket
+import threading
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Union
+
+from sqlalchemy.orm import Session
+
+from .queue import BatchQueue, ClaimedTask, get_batch_queue
+
+logger = logging.getLogger(__name__)
+
+
+# handler(db, tasks) -> result dict or raised exception per task, in order
+TaskHandler = Callable[[Session, List[ClaimedTask]], Awaitable[List[Union[Dict[str, Any], BaseException]]]]
+
+
+class _Heartbeat:
+    """Extends task leases from a background thread until stopped."""
+
+    def __init__(self, queue: BatchQueue, task_ids: List[int], worker_id: str, interval: float):
+        self.queue = queue
+        self.task_ids = list(task_ids)
+        self.worker_id = worker_id
+        self.interval = interval
+        self.lost = set()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name=f"heartbeat-{task_ids[0]}", daemon=True)
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join()
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            for task_id in self.task_ids:
+                if task_id in self.lost:
+                    continue
+                try:
+                    if not self.queue.heartbeat(task_id, self.worker_id):
+                        logger.warning(f"Lost lease on task {task_id}")
+                        self.lost.add(task_id)
+                except Exception as e:
+                    # Keep trying; the lease only lapses if heartbeats fail for lease_seconds
+                    logger.warning(f"Heartbeat for task {task_id} failed: {e}")
+            if len(self.lost) == len(self.task_ids):
+                return
+
+
+class BatchWorker:
+    """
+    Processes batch tasks from a BatchQueue.
+
+    Usage:
+        worker = BatchWorker(get_batch_queue(), process_batch_alerts, SessionLocal)
+        worker.run()
+    """
+
+    def __init__(
+        self,
+        queue: BatchQueue,
+        handler: TaskHandler,
+        session_factory: Callable[[], Session],
+        worker_id: Optional[str] = None,
+        concurrency: int = 1,
+        chunk_size: int = 1,
+        poll_interval: float = 2.0,
+        heartbeat_interval: float = 30.0
+    ):
+        """
+        Initialize the worker.
+
+        Args:
+            queue: Queue to claim tasks from
+            handler: Coroutine processing a chunk of claimed tasks
+            session_factory: Creates the session passed to the handler
+            worker_id: Lease owner prefix (default host:pid)
+            concurrency: Chunks processed at once by this process
+            chunk_size: Tasks claimed and persisted together per slot
+            poll_interval: Seconds to wait when the queue is empty
+            heartbeat_interval: Seconds between lease extensions
+        """
+        self.queue = queue
+        self.handler = handler
+        self.session_factory = session_factory
+        self.worker_id = worker_id or f"{socket.gethostname()}:{os.getpid()}"
+        self.concurrency = max(1, concurrency)
+        self.chunk_size = max(1, chunk_size)
+        self.poll_interval = poll_interval
+        self.heartbeat_interval = heartbeat_interval
+        self.processed = 0
+        self._stopping = threading.Event()
+
+    def stop(self):
+        """Stop claiming new tasks; running tasks are finished."""
+        self._stopping.set()
+
+    def run(self, drain: bool = False):
+        """
+        Process tasks until stopped.
+
+        Args:
+            drain: Exit once the queue is empty instead of polling
+        """
+        asyncio.run(self.run_async(drain=drain))
+
+    async def run_async(self, drain: bool = False):
+        """Async body of run(); one loop per concurrency slot."""
+        logger.info(f"Batch worker {self.worker_id} started (concurrency={self.concurrency}, chunk_size={self.chunk_size})")
+        await asyncio.gather(*(self._slot_loop(slot, drain) for slot in range(self.concurrency)))
+        logger.info(f"Batch worker {self.worker_id} stopped after {self.processed} tasks")
+
+    async def _slot_loop(self, slot: int, drain: bool):
+        slot_id = f"{self.worker_id}:{slot}"
+        while not self._stopping.is_set():
+            if await self.process_one(slot_id):
+                continue
+            if drain:
+                return
+            await asyncio.sleep(self.poll_interval)
+
+    async def process_one(self, slot_id: Optional[str] = None) -> bool:
+        """
+        Claim and process up to chunk_size tasks.
+
+        Returns:
+            False if no task was available
+        """
+        slot_id = slot_id or f"{self.worker_id}:0"
+        tasks = await asyncio.to_thread(self._claim_chunk, slot_id)
+        if not tasks:
+            return False
+
+        for task in tasks:
+            logger.info(f"[{slot_id}] Processing task {task.task_id} attempt {task.attempt}: {task.directory_path}")
+        with _Heartbeat(self.queue, [task.task_id for task in tasks], slot_id, self.heartbeat_interval):
+            try:
+                outcomes = await self._handle(tasks)
+            except Exception as e:
+                outcomes = [e] * len(tasks)
+
+        for task, outcome in zip(tasks, outcomes):
+            if task.recorded:
+                continue
+            if isinstance(outcome, BaseException):
+                logger.error(f"[{slot_id}] Task {task.task_id} failed: {outcome}")
+                await asyncio.to_thread(self.queue.fail_task, task.task_id, slot_id, str(outcome))
+            else:
+                await asyncio.to_thread(self.queue.complete_task, task.task_id, slot_id, outcome)
+
+        self.processed += len(tasks)
+        return True
+
+    def _claim_chunk(self, slot_id: str) -> List[ClaimedTask]:
+        tasks = []
+        while len(tasks) < self.chunk_size:
+            task = self.queue.claim_task(slot_id)
+            if task is None:
+                break
+            tasks.append(task)
+        return tasks
+
+    async def _handle(self, tasks: List[ClaimedTask]) -> List[Union[Dict[str, Any], BaseException]]:
+        db = self.session_factory()
+        try:
+            outcomes = await self.handler(db, tasks)
+        finally:
+            db.close()
+        if len(outcomes) != len(tasks):
+            raise RuntimeError(f"Handler returned {len(outcomes)} results for {len(tasks)} tasks")
+        return outcomes
+
+
+def main(argv=None):
+    """Command-line entry point for a worker process."""
+    from app.core.config import settings
+    from app.core.database import SessionLocal
+    from app.api.content_analysis import process_batch_alerts
+
+    parser = argparse.ArgumentParser(description="Process queued batch content analysis jobs")
+    parser.add_argument(
+        "--concurrency", type=int,
+        default=getattr(settings, "BATCH_WORKER_CONCURRENCY", 1),
+        help="Chunks processed at once by this process"
+    )
+    parser.add_argument(
+        "--chunk-size", type=int,
+        default=getattr(settings, "BATCH_WORKER_CHUNK_SIZE", 10),
+        help="Tasks claimed, analyzed and committed together"
+    )
+    parser.add_argument(
+        "--poll-interval", type=float,
+        default=getattr(settings, "BATCH_WORKER_POLL_SECONDS", 2.0),
+        help="Seconds to wait when the queue is empty"
+    )
+    parser.add_argument("--drain", action="store_true", help="Exit once the queue is empty")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(name)s: %(message)s")
+
+    worker = BatchWorker(
+        get_batch_queue(),
+        process_batch_alerts,
+        SessionLocal,
+        concurrency=args.concurrency,
+        chunk_size=args.chunk_size,
+        poll_interval=args.poll_interval,
+        heartbeat_interval=getattr(settings, "BATCH_TASK_HEARTBEAT_SECONDS", 30)
+    )
+
+    for sig in (signal.SIGTERM, signal.SIGINT):
+        signal.signal(sig, lambda *_: worker.stop())
+
+    worker.run(drain=args.drain)
+
+
+if __name__ == "__main__":
+    main()
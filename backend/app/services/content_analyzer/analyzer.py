@@ -6,11 +6,17 @@ It orchestrates the context loading, artifact reading, LLM classification,
 and scoring to produce comprehensive findings.
 """
 
+import asyncio
+import contextvars
 import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, List, Optional, Any
 from dataclasses import dataclass, field, asdict
 from datetime import datetime
 
+from app.services.llm_cache import LLMResponseCache
+
 from .context_loader import ContextLoader, get_context_loader
 from .artifact_reader import ArtifactReader, AlertArtifacts, SummaryData
 from .llm_classifier import LLMClassifier, ClassificationResult, AnalysisResult, RiskScore
@@ -74,6 +80,9 @@ class ContentFinding:
     # Raw data for debugging/feedback
     raw_analysis: Optional[Dict[str, Any]] = None
 
+    # Entity concentration over all Summary rows (persisted as ConcentrationMetric)
+    concentration_metrics: List[Dict[str, Any]] = field(default_factory=list)
+
     def to_dict(self) -> Dict[str, Any]:
         """Convert to dictionary for API responses."""
         return asdict(self)
@@ -96,13 +105,19 @@ class ContentAnalyzer:
         findings = analyzer.analyze_alert(artifacts)
     """
 
+    LLM_MODES = ("staged", "fused")
+
     def __init__(
         self,
         llm_provider: str = "openai",
         api_key: Optional[str] = None,
         model: Optional[str] = None,
         use_llm: bool = True,
-        context_loader: Optional[ContextLoader] = None
+        context_loader: Optional[ContextLoader] = None,
+        artifact_reader: Optional[ArtifactReader] = None,
+        max_workers: int = 4,
+        llm_mode: str = "staged",
+        llm_cache: Optional[LLMResponseCache] = None
     ):
         """
         Initialize the Content Analyzer.
@@ -113,10 +128,18 @@ class ContentAnalyzer:
             model: Specific model to use
             use_llm: Whether to use LLM (if False, uses pattern-based fallback)
             context_loader: Optional custom context loader
+            artifact_reader: Optional reader (e.g. one with a summary cache)
+            max_workers: Alerts analyzed concurrently by analyze_multiple
+            llm_mode: "staged" (four LLM calls per alert) or "fused" (one
+                call, falling back to staged if the response is unusable)
+            llm_cache: Optional persistent cache of LLM responses
         """
+        if llm_mode not in self.LLM_MODES:
+            raise ValueError(f"Unknown LLM mode: {llm_mode} (expected one of {self.LLM_MODES})")
+
         self.use_llm = use_llm
         self.context_loader = context_loader or get_context_loader()
-        self.artifact_reader = ArtifactReader()
+        self.artifact_reader = artifact_reader or ArtifactReader()
         self.scoring_engine = ScoringEngine()
 
         if use_llm:
@@ -124,19 +147,27 @@ class ContentAnalyzer:
                 llm_provider=llm_provider,
                 api_key=api_key,
                 model=model,
-                context_loader=self.context_loader
+                context_loader=self.context_loader,
+                response_cache=llm_cache
             )
         else:
             self.llm_classifier = None
 
+        self.max_workers = max_workers
+        self.llm_mode = llm_mode
+
         # Load context on initialization
         self._context_loaded = False
+        self._context_lock = threading.Lock()
 
     def _ensure_context_loaded(self):
         """Ensure TH context is loaded."""
-        if not self._context_loaded:
-            self.context_loader.load_all_context()
-            self._context_loaded = True
+        if self._context_loaded:
+            return
+        with self._context_lock:
+            if not self._context_loaded:
+                self.context_loader.load_all_context()
+                self._context_loaded = True
 
     def analyze_alert(
         self,
@@ -157,44 +188,90 @@ class ContentAnalyzer:
 
         logger.info(f"Analyzing alert: {artifacts.alert_name} ({artifacts.alert_id})")
 
-        # Step 1: Classify into focus area
-        if self.use_llm and self.llm_classifier:
-            classification = self.llm_classifier.classify_focus_area(artifacts)
+        fused = None
+        if self.use_llm and self.llm_classifier and self.llm_mode == "fused":
+            # Steps 1-4 in a single LLM call
+            fused = self.llm_classifier.analyze_fused(artifacts)
+            if fused is None:
+                logger.info(f"Fused analysis unusable for {artifacts.alert_name}, using staged LLM calls")
+
+        if fused is not None:
+            stages = (fused.classification, fused.analysis, fused.risk, fused.description)
+            logger.info(f"Classified as: {fused.classification.focus_area} (confidence: {fused.classification.confidence})")
         else:
-            focus_area, confidence, reasoning = self._fallback_classification(artifacts)
-            classification = ClassificationResult(
-                focus_area=focus_area,
-                confidence=confidence,
-                reasoning=reasoning
-            )
-        
-        # Store focus area for use in fallback analysis
-        self._last_classification_focus_area = classification.focus_area
+            stages = self._analyze_staged(artifacts)
 
-        logger.info(f"Classified as: {classification.focus_area} (confidence: {classification.confidence})")
+        return self._build_finding(artifacts, *stages, include_raw=include_raw)
 
-        # Step 2: Analyze summary data
-        if self.use_llm and self.llm_classifier:
-            analysis = self.llm_classifier.analyze_summary(artifacts, classification.focus_area)
-        else:
-            analysis = self._fallback_analysis(artifacts)
+    async def analyze_alert_async(
+        self,
+        artifacts: AlertArtifacts,
+        include_raw: bool = False,
+        use_llm: Optional[bool] = None
+    ) -> ContentFinding:
+        """
+        Analyze a single alert without blocking the event loop.
 
-        # Step 3: Calculate risk score
-        if self.use_llm and self.llm_classifier:
-            risk = self.llm_classifier.calculate_risk_score(
-                artifacts, classification.focus_area, analysis
+        LLM calls go through the asyncio clients; risk scoring and the
+        finding description depend only on the analysis, so they run
+        concurrently.
+
+        Args:
+            artifacts: The alert artifacts to analyze
+            include_raw: Whether to include raw LLM responses
+            use_llm: Override self.use_llm for this call only (safe with
+                concurrent requests sharing the analyzer)
+
+        Returns:
+            ContentFinding with full analysis
+        """
+        if not self._context_loaded:
+            await asyncio.to_thread(self._ensure_context_loaded)
+
+        use_llm = self.use_llm if use_llm is None else use_llm
+        llm = self.llm_classifier if use_llm else None
+
+        logger.info(f"Analyzing alert: {artifacts.alert_name} ({artifacts.alert_id})")
+
+        if llm is None:
+            # No network calls, the fallback stages are pure computation
+            return self._build_finding(
+                artifacts, *self._analyze_without_llm(artifacts), include_raw=include_raw
             )
-        else:
-            risk = self._fallback_risk_score(analysis)
 
-        # Step 4: Generate finding description
-        if self.use_llm and self.llm_classifier:
-            description = self.llm_classifier.generate_finding_description(
-                artifacts, classification.focus_area, analysis
+        fused = None
+        if self.llm_mode == "fused":
+            fused = await llm.analyze_fused_async(artifacts)
+            if fused is None:
+                logger.info(f"Fused analysis unusable for {artifacts.alert_name}, using staged LLM calls")
+
+        if fused is not None:
+            classification, analysis, risk, description = (
+                fused.classification, fused.analysis, fused.risk, fused.description
             )
         else:
-            description = self._fallback_description(artifacts, analysis)
+            classification = await llm.classify_focus_area_async(artifacts)
+            analysis = await llm.analyze_summary_async(artifacts, classification.focus_area)
+            risk, description = await asyncio.gather(
+                llm.calculate_risk_score_async(artifacts, classification.focus_area, analysis),
+                llm.generate_finding_description_async(artifacts, classification.focus_area, analysis)
+            )
+
+        logger.info(f"Classified as: {classification.focus_area} (confidence: {classification.confidence})")
+        return self._build_finding(
+            artifacts, classification, analysis, risk, description, include_raw=include_raw
+        )
 
+    def _build_finding(
+        self,
+        artifacts: AlertArtifacts,
+        classification: ClassificationResult,
+        analysis: AnalysisResult,
+        risk: RiskScore,
+        description: Dict[str, str],
+        include_raw: bool = False
+    ) -> ContentFinding:
+        """Score the staged results and assemble the ContentFinding."""
         # Step 5: Calculate combined score
         # Pass alert_name for type-based severity determination
         # Pass metadata for BACKDAYS normalization
@@ -255,6 +332,8 @@ class ContentAnalyzer:
 
             # Recommendations
             recommended_actions=analysis.recommended_actions if analysis.recommended_actions is not None else [],
+
+            concentration_metrics=self._build_concentration_metrics(artifacts.summary_data),
         )
 
         # Include raw data if requested
@@ -270,6 +349,50 @@ class ContentAnalyzer:
 
         return finding
 
+    def _analyze_staged(self, artifacts: AlertArtifacts) -> tuple:
+        """
+        Run classification, analysis, risk scoring and description as separate steps.
+
+        Returns:
+            Tuple of (ClassificationResult, AnalysisResult, RiskScore, description dict)
+        """
+        if not (self.use_llm and self.llm_classifier):
+            return self._analyze_without_llm(artifacts)
+
+        # Step 1: Classify into focus area
+        classification = self.llm_classifier.classify_focus_area(artifacts)
+        logger.info(f"Classified as: {classification.focus_area} (confidence: {classification.confidence})")
+
+        # Step 2: Analyze summary data
+        analysis = self.llm_classifier.analyze_summary(artifacts, classification.focus_area)
+
+        # Step 3: Calculate risk score
+        risk = self.llm_classifier.calculate_risk_score(
+            artifacts, classification.focus_area, analysis
+        )
+
+        # Step 4: Generate finding description
+        description = self.llm_classifier.generate_finding_description(
+            artifacts, classification.focus_area, analysis
+        )
+
+        return classification, analysis, risk, description
+
+    def _analyze_without_llm(self, artifacts: AlertArtifacts) -> tuple:
+        """Steps 1-4 using the rule-based fallbacks."""
+        focus_area, confidence, reasoning = self._fallback_classification(artifacts)
+        classification = ClassificationResult(
+            focus_area=focus_area,
+            confidence=confidence,
+            reasoning=reasoning
+        )
+        logger.info(f"Classified as: {classification.focus_area} (confidence: {classification.confidence})")
+
+        analysis = self._fallback_analysis(artifacts, classification.focus_area)
+        risk = self._fallback_risk_score(analysis)
+        description = self._fallback_description(artifacts, analysis)
+        return classification, analysis, risk, description
+
     def analyze_from_directory(
         self,
         directory_path: str,
@@ -288,32 +411,65 @@ class ContentAnalyzer:
         artifacts = self.artifact_reader.read_from_directory(directory_path)
         return self.analyze_alert(artifacts, include_raw=include_raw)
 
+    async def analyze_from_directory_async(
+        self,
+        directory_path: str,
+        include_raw: bool = False,
+        use_llm: Optional[bool] = None
+    ) -> ContentFinding:
+        """Async variant of analyze_from_directory; artifacts are read on a worker thread."""
+        artifacts = await asyncio.to_thread(self.artifact_reader.read_from_directory, directory_path)
+        return await self.analyze_alert_async(artifacts, include_raw=include_raw, use_llm=use_llm)
+
     def analyze_multiple(
         self,
         artifacts_list: List[AlertArtifacts],
-        include_raw: bool = False
+        include_raw: bool = False,
+        max_workers: Optional[int] = None
     ) -> List[ContentFinding]:
         """
         Analyze multiple alerts.
 
+        Alerts are analyzed concurrently on a thread pool (LLM calls are
+        network-bound); a failure in one alert yields an error finding for
+        that alert only.
+
         Args:
             artifacts_list: List of AlertArtifacts to analyze
             include_raw: Whether to include raw LLM responses
+            max_workers: Concurrency limit (default: self.max_workers);
+                1 analyzes sequentially
 
         Returns:
-            List of ContentFinding objects
+            List of ContentFinding objects, in the same order as artifacts_list
         """
-        findings = []
-        for artifacts in artifacts_list:
-            try:
-                finding = self.analyze_alert(artifacts, include_raw=include_raw)
-                findings.append(finding)
-            except Exception as e:
-                logger.error(f"Failed to analyze {artifacts.alert_name}: {e}")
-                # Create a minimal finding for failed analyses
-                findings.append(self._create_error_finding(artifacts, str(e)))
-
-        return findings
+        workers = self.max_workers if max_workers is None else max_workers
+        workers = max(1, min(workers, len(artifacts_list)))
+
+        if workers == 1:
+            return [self._analyze_isolated(artifacts, include_raw) for artifacts in artifacts_list]
+
+        # Load shared context once before fanning out
+        self._ensure_context_loaded()
+
+        # Each task runs in a copy of the caller's context so request-scoped
+        # settings (e.g. llm_cache_bypass) apply inside the worker threads
+        contexts = [contextvars.copy_context() for _ in artifacts_list]
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="content-analyzer") as pool:
+            return list(pool.map(
+                lambda context, artifacts: context.run(self._analyze_isolated, artifacts, include_raw),
+                contexts,
+                artifacts_list
+            ))
+
+    def _analyze_isolated(self, artifacts: AlertArtifacts, include_raw: bool) -> ContentFinding:
+        """Analyze one alert, turning any exception into an error finding."""
+        try:
+            return self.analyze_alert(artifacts, include_raw=include_raw)
+        except Exception as e:
+            logger.error(f"Failed to analyze {artifacts.alert_name}: {e}")
+            # Create a minimal finding for failed analyses
+            return self._create_error_finding(artifacts, str(e))
 
     def _parse_metadata(self, metadata_text: str) -> Dict[str, Any]:
         """
@@ -424,6 +580,20 @@ class ContentAnalyzer:
         """Extract notable items from summary_data (top items by amount/value)."""
         notable_items = []
         
+        if summary_data and summary_data.concentrations:
+            # Top entities by the primary amount column, computed over all rows
+            primary = summary_data.concentrations[0]
+            for entry in primary.top_entries[:max_items]:
+                notable_items.append({
+                    "title": entry.entity,
+                    "entity": entry.entity,
+                    "description": f"{primary.entity_column} {entry.entity}: {primary.amount_column} {entry.amount:,.2f} across {entry.record_count:,} records",
+                    "amount": entry.amount,
+                    "record_count": entry.record_count,
+                    "percentage_of_total": entry.percentage_of_total
+                })
+            return notable_items
+        
         if not summary_data or not summary_data.sample_rows:
             return notable_items
         
@@ -496,6 +666,17 @@ class ContentAnalyzer:
         """
         violations = []
         
+        if summary_data and summary_data.concentrations:
+            # Full-dataset concentrations from the Summary reader
+            for result in summary_data.concentrations:
+                for entry in result.top_entries:
+                    if entry.percentage_of_total > 50:
+                        violations.append(
+                            f"{entry.entity}: {entry.percentage_of_total:.1f}% of total "
+                            f"{result.amount_column} by {result.entity_column} ({entry.amount:,.2f})"
+                        )
+            return violations[:5]
+        
         if not summary_data or not summary_data.sample_rows:
             return violations
         
@@ -553,6 +734,33 @@ class ContentAnalyzer:
         
         return violations[:5]  # Limit to top 5
 
+    def _build_concentration_metrics(self, summary_data: Optional[SummaryData]) -> List[Dict[str, Any]]:
+        """
+        Flatten full-dataset concentrations into ConcentrationMetric rows.
+
+        Uses the primary amount column only, so each entity dimension is
+        recorded once per analysis.
+        """
+        metrics = []
+        if not summary_data or not summary_data.concentrations:
+            return metrics
+
+        primary_amount = summary_data.concentrations[0].amount_column
+        for result in summary_data.concentrations:
+            if result.amount_column != primary_amount:
+                continue
+            for entry in result.top_entries:
+                metrics.append({
+                    "dimension_type": result.dimension_type,
+                    "dimension_code": entry.entity,
+                    "record_count": entry.record_count,
+                    "value_local": entry.amount,
+                    "percentage_of_total": round(entry.percentage_of_total, 2),
+                    "rank": entry.rank,
+                    "entity_count": result.entity_count
+                })
+        return metrics
+
     def _detect_threshold_violations(
         self, 
         summary_data: Optional[SummaryData], 
@@ -620,7 +828,11 @@ class ContentAnalyzer:
         
         return metrics
 
-    def _fallback_analysis(self, artifacts: AlertArtifacts) -> AnalysisResult:
+    def _fallback_analysis(
+        self,
+        artifacts: AlertArtifacts,
+        focus_area: Optional[str] = None
+    ) -> AnalysisResult:
         """Fallback analysis when LLM is not available."""
         # IMPORTANT: Quantitative data (counts, monetary amounts) comes ONLY from Summary_* file
         # The other 3 files (Code, Explanation, Metadata) provide CONTEXT only:
@@ -668,9 +880,8 @@ class ContentAnalyzer:
         business_risk = self._extract_business_risk(artifacts.explanation, artifacts.alert_name)
         
         # Determine severity using scoring engine
-        # Get focus area from classification result (stored during analyze_alert)
-        # If not available, try to classify from alert name
-        focus_area = getattr(self, '_last_classification_focus_area', None)
+        # Focus area comes from the classification result (passed by analyze_alert);
+        # if not available, try to classify from alert name
         if not focus_area:
             # Try simple classification from alert name
             alert_lower = artifacts.alert_name.lower()
@@ -941,5 +1152,7 @@ def create_content_analyzer(
     return ContentAnalyzer(
         llm_provider=llm_provider,
         api_key=api_key,
-        use_llm=use_llm
+        use_llm=use_llm,
+        max_workers=int(os.environ.get("ANALYSIS_MAX_WORKERS", "4")),
+        llm_mode=os.environ.get("LLM_ANALYSIS_MODE", "staged")
     )
@@ -12,12 +12,21 @@ Enhanced with dynamic column detection for varying alert types.
 
 import os
 import re
+import math
 import logging
-from typing import Dict, List, Optional, NamedTuple, Any, Tuple
+from itertools import chain, islice
+from typing import Dict, List, Optional, NamedTuple, Any, Tuple, TYPE_CHECKING
 from dataclasses import dataclass, field
 from pathlib import Path
 from enum import Enum
 
+from app.utils.encoding import read_text
+from .column_profiler import ColumnProfiler
+
+if TYPE_CHECKING:
+    from .concentration_engine import ConcentrationAccumulator, ConcentrationResult
+    from .summary_cache import SummaryCache
+
 logger = logging.getLogger(__name__)
 
 
@@ -47,8 +56,16 @@ class ColumnInfo:
     min_value: Optional[float] = None
     max_value: Optional[float] = None
     avg_value: Optional[float] = None
+    std_dev: Optional[float] = None
     non_null_count: int = 0
 
+    # Profile sketches: approximate distinct count and most frequent values.
+    # top_values counts are lower bounds; each true count is at most
+    # top_values_error higher (0 when the counts are exact)
+    distinct_count: Optional[int] = None
+    top_values: List[Tuple[str, int]] = field(default_factory=list)
+    top_values_error: int = 0
+
 
 @dataclass
 class SummaryData:
@@ -72,6 +89,9 @@ class SummaryData:
     # Sample data (first N rows as dicts)
     sample_rows: List[Dict[str, Any]] = field(default_factory=list)
 
+    # Entity concentration computed over all rows (see ConcentrationEngine)
+    concentrations: List["ConcentrationResult"] = field(default_factory=list)
+
     # Raw text representation (for backward compatibility)
     raw_text: str = ""
 
@@ -218,6 +238,11 @@ class AlertArtifacts:
         return "\n".join(lines)
 
 
+def _is_blank(value: Any) -> bool:
+    """True for empty worksheet cells (None or NaN)."""
+    return value is None or (isinstance(value, float) and math.isnan(value))
+
+
 class ArtifactReader:
     """
     Reads and parses the 4 artifact files for 4C alerts.
@@ -231,8 +256,30 @@ class ArtifactReader:
 
     ARTIFACT_PREFIXES = ["Code_", "Explanation_", "Metadata_", "Summary_"]
 
-    def __init__(self):
-        self._artifacts_cache: Dict[str, AlertArtifacts] = {}
+    # Tried in order for text artifacts
+    TEXT_ENCODINGS = ('utf-8', 'latin-1', 'cp1252')
+
+    # Rows inspected when looking for the Summary header row
+    HEADER_SCAN_ROWS = 5
+
+    # Rows kept as SummaryData.sample_rows
+    SAMPLE_ROW_COUNT = 10
+
+    # Rows buffered per column profiling / concentration batch
+    BATCH_ROWS = 50000
+
+    # Column types that get total/min/max/avg statistics
+    NUMERIC_COLUMN_TYPES = [ColumnType.NUMERIC, ColumnType.CURRENCY, ColumnType.COUNT, ColumnType.PERCENTAGE]
+
+    def __init__(self, summary_cache: Optional["SummaryCache"] = None):
+        """
+        Initialize the reader.
+
+        Args:
+            summary_cache: Optional on-disk cache of parsed Summary workbooks;
+                unchanged files are then loaded without re-parsing
+        """
+        self.summary_cache = summary_cache
 
     def read_from_directory(self, directory_path: str) -> AlertArtifacts:
         """
@@ -296,7 +343,7 @@ class ArtifactReader:
                 artifacts.summary_path = filepath
                 # For xlsx files, also get structured data
                 if filename_lower.endswith('.xlsx'):
-                    summary_data = self._read_xlsx_structured(filepath)
+                    summary_data = self._read_summary_xlsx(filepath)
                     if summary_data:
                         artifacts.summary = summary_data.raw_text
                         artifacts.summary_data = summary_data
@@ -305,6 +352,20 @@ class ArtifactReader:
 
         return artifacts
 
+    @staticmethod
+    def artifact_type(filename: str) -> Optional[str]:
+        """
+        Artifact type of a filename ("code", "explanation", "metadata",
+        "summary"), by the prefix rules of read_from_directory, or None.
+        """
+        filename_lower = filename.lower()
+        for artifact_type in ("code", "explanation", "summary"):
+            if filename_lower.startswith(f"{artifact_type}_"):
+                return artifact_type
+        if filename_lower.startswith("metadata"):  # Handle "Metadata " with space
+            return "metadata"
+        return None
+
     def _parse_filename(self, filename: str) -> tuple:
         """
         Parse alert ID and name from artifact filename.
@@ -457,21 +518,16 @@ class ArtifactReader:
         if filename_lower.endswith('.xlsx'):
             return self._read_xlsx(filepath)
 
-        # Handle plain text files
-        encodings = ['utf-8', 'latin-1', 'cp1252']
+        # Handle plain text files: encoding chosen from the bytes, file decoded once
+        try:
+            text, _ = read_text(filepath, self.TEXT_ENCODINGS)
+        except Exception as e:
+            logger.error(f"Error reading {filepath}: {e}")
+            return None
 
-        for encoding in encodings:
-            try:
-                with open(filepath, 'r', encoding=encoding) as f:
-                    return f.read()
-            except UnicodeDecodeError:
-                continue
-            except Exception as e:
-                logger.error(f"Error reading {filepath}: {e}")
-                return None
-
-        logger.error(f"Could not read {filepath} with any encoding")
-        return None
+        if text is None:
+            logger.error(f"Could not read {filepath} with any encoding")
+        return text
 
     def _read_docx(self, filepath: str) -> Optional[str]:
         """Read text content from a Word document."""
@@ -489,166 +545,278 @@ class ArtifactReader:
 
     def _read_xlsx(self, filepath: str) -> Optional[str]:
         """Read content from an Excel file as text summary (backward compatible)."""
-        summary_data = self._read_xlsx_structured(filepath)
+        summary_data = self._read_summary_xlsx(filepath)
         if summary_data:
             return summary_data.raw_text
         return None
 
+    def _read_summary_xlsx(self, filepath: str) -> Optional[SummaryData]:
+        """Read a Summary workbook, using the summary cache when configured."""
+        if self.summary_cache is None:
+            return self._read_xlsx_structured(filepath)
+
+        try:
+            key = self.summary_cache.key_for(filepath)
+        except OSError as e:
+            logger.warning(f"Could not hash {filepath} for summary cache: {e}")
+            return self._read_xlsx_structured(filepath)
+
+        summary_data = self.summary_cache.get(key)
+        if summary_data is not None:
+            logger.debug(f"Summary cache hit for {filepath}")
+            return summary_data
+
+        summary_data = self._read_xlsx_structured(filepath)
+        if summary_data is not None:
+            self.summary_cache.put(key, summary_data)
+        return summary_data
+
     def _read_xlsx_structured(self, filepath: str) -> Optional[SummaryData]:
         """
         Read Excel file with dynamic column detection and metric extraction.
 
+        Streams the first worksheet through openpyxl in read-only mode: the
+        header row is located from the first rows read, and rows are fed to
+        the column profilers and concentration aggregation in BATCH_ROWS
+        batches in the same pass. Only the sample rows and one batch are
+        kept in memory, so the cost is a single read of the workbook
+        regardless of row count.
+
         Returns:
             SummaryData object with structured column info and metrics
         """
         try:
             import pandas as pd
             import numpy as np
+            from openpyxl import load_workbook
+        except ImportError:
+            logger.warning("pandas/openpyxl not installed, cannot read .xlsx files")
+            return None
 
-            # First, detect header row by reading raw data
-            df_raw = pd.read_excel(filepath, header=None, nrows=5)
-
-            # Find header row (skip "Data" marker row if present)
-            header_row = 0
-            for i, row in df_raw.iterrows():
-                first_val = str(row.iloc[0]).strip().lower() if pd.notna(row.iloc[0]) else ""
-                if first_val == "data":
-                    header_row = i + 1
-                    break
-                # Check if this looks like a header row (multiple non-empty text values)
-                non_empty = sum(1 for v in row if pd.notna(v) and str(v).strip())
-                if non_empty > 3:
-                    header_row = i
-                    break
+        from .concentration_engine import ConcentrationEngine
 
-            # Read with detected header
-            df = pd.read_excel(filepath, header=header_row)
+        try:
+            workbook = load_workbook(filepath, read_only=True, data_only=True)
+            try:
+                rows = workbook.worksheets[0].iter_rows(values_only=True)
+
+                # Buffer just enough rows to locate the header
+                buffered = list(islice(rows, self.HEADER_SCAN_ROWS))
+                header_row = self._detect_header_row(buffered)
+                buffered.extend(islice(rows, max(0, header_row + 1 - len(buffered))))
+
+                header = buffered[header_row] if header_row < len(buffered) else ()
+                column_names = self._make_column_names(header)
+                profilers = [self._make_profiler(name) for name in column_names]
+
+                # Entity/amount columns are aggregated in batches over all rows
+                concentration = ConcentrationEngine().accumulator_for_header(column_names)
+
+                row_count = 0
+                pending_blank = 0
+                head_rows: List[tuple] = []
+                batch: List[tuple] = []
+
+                for row in chain(buffered[header_row + 1:], rows):
+                    if all(_is_blank(value) for value in row):
+                        # Blank rows only count if more data follows them
+                        pending_blank += 1
+                        continue
+
+                    for _ in range(pending_blank):
+                        if len(head_rows) < self.SAMPLE_ROW_COUNT:
+                            head_rows.append(())
+                    row_count += pending_blank
+                    pending_blank = 0
+
+                    if len(head_rows) < self.SAMPLE_ROW_COUNT:
+                        head_rows.append(row)
+                    row_count += 1
+
+                    batch.append(row)
+                    if len(batch) >= self.BATCH_ROWS:
+                        self._profile_batch(batch, profilers, concentration)
+                        batch = []
+
+                if batch:
+                    self._profile_batch(batch, profilers, concentration)
+            finally:
+                workbook.close()
 
             # Remove completely empty columns
-            df = df.dropna(axis=1, how='all')
+            kept = [
+                (idx, profiler) for idx, profiler in enumerate(profilers)
+                if profiler.non_null_count > 0
+            ]
 
-            # Build SummaryData
             summary_data = SummaryData(
-                row_count=len(df),
-                column_count=len(df.columns)
+                row_count=row_count,
+                column_count=len(kept)
             )
 
-            # Detect column info for each column
-            currency_column = None
-            for col_name in df.columns:
-                col_info = self._analyze_column(df, col_name)
+            currency_columns: Dict[str, str] = {}
+            for _, profiler in kept:
+                col_info = self._column_info_from_profile(profiler)
                 summary_data.columns.append(col_info)
+                if col_info.column_type == ColumnType.TEXT and self._is_currency_column(profiler.name):
+                    currency_columns[profiler.name] = profiler.most_common_value()
 
-                # Track currency column for amount columns
-                if col_info.column_type == ColumnType.TEXT:
-                    col_lower = col_name.lower()
-                    if 'currency' in col_lower or 'waers' in col_lower:
-                        # Get most common currency
-                        currency_values = df[col_name].dropna().astype(str)
-                        if len(currency_values) > 0:
-                            currency_column = currency_values.mode().iloc[0] if len(currency_values.mode()) > 0 else None
-
-            # Set currency
-            if currency_column:
-                summary_data.currency = currency_column
-
-            # Calculate total amount from key metric columns
-            total_amount = 0.0
-            for col_info in summary_data.columns:
-                if col_info.is_key_metric and col_info.column_type in [ColumnType.CURRENCY, ColumnType.NUMERIC]:
-                    if col_info.total is not None:
-                        total_amount += col_info.total
-
-            if total_amount > 0:
-                summary_data.total_amount = total_amount
+            self._apply_summary_totals(summary_data, currency_columns)
+            summary_data.concentrations = concentration.results(summary_data.columns)
 
             # Extract sample rows
-            sample_df = df.head(10)
-            for _, row in sample_df.iterrows():
+            head_records = []
+            for row in head_rows:
                 row_dict = {}
-                for col in df.columns:
-                    val = row[col]
-                    if pd.notna(val):
-                        row_dict[str(col)] = val
+                record = []
+                for idx, profiler in kept:
+                    val = row[idx] if idx < len(row) else None
+                    if not _is_blank(val):
+                        row_dict[profiler.name] = val
+                    record.append(np.nan if _is_blank(val) else val)
                 summary_data.sample_rows.append(row_dict)
+                head_records.append(record)
 
             # Generate raw text representation
-            summary_data.raw_text = self._generate_raw_text(df, summary_data)
+            head_df = pd.DataFrame(head_records, columns=[profiler.name for _, profiler in kept])
+            summary_data.raw_text = self._generate_raw_text(head_df, summary_data)
 
             return summary_data
 
-        except ImportError:
-            logger.warning("pandas/openpyxl not installed, cannot read .xlsx files")
-            return None
         except Exception as e:
             logger.error(f"Error reading xlsx {filepath}: {e}")
             return None
 
-    def _analyze_column(self, df: "pd.DataFrame", col_name: str) -> ColumnInfo:
+    def _detect_header_row(self, rows: List[tuple]) -> int:
         """
-        Analyze a column to detect its type and extract statistics.
-
-        Args:
-            df: DataFrame containing the column
-            col_name: Name of the column to analyze
+        Find the header row among the first rows of a Summary sheet.
 
-        Returns:
-            ColumnInfo with detected type and statistics
+        Skips a leading "Data" marker row if present; otherwise the first row
+        with more than 3 non-empty values is taken as the header.
         """
+        for i, row in enumerate(rows):
+            first_val = str(row[0]).strip().lower() if row and not _is_blank(row[0]) else ""
+            if first_val == "data":
+                return i + 1
+            non_empty = sum(1 for v in row if not _is_blank(v) and str(v).strip())
+            if non_empty > 3:
+                return i
+        return 0
+
+    def _make_column_names(self, header: tuple) -> List[str]:
+        """Build column names from a header row the same way pandas does."""
+        names = []
+        seen: Dict[str, int] = {}
+        for idx, value in enumerate(header):
+            name = f"Unnamed: {idx}" if _is_blank(value) else str(value)
+            # Mangle duplicates: "Name", "Name.1", "Name.2", ...
+            if name in seen:
+                seen[name] += 1
+                name = f"{name}.{seen[name]}"
+            else:
+                seen[name] = 0
+            names.append(name)
+        return names
+
+    def _profile_batch(
+        self,
+        batch: List[tuple],
+        profilers: List[ColumnProfiler],
+        concentration: "ConcentrationAccumulator"
+    ):
+        """Feed one batch of streamed rows to the column profilers and concentration."""
         import pandas as pd
-        import numpy as np
 
-        # Extract SAP field code if present (e.g., "Amount (DMBTR)" -> "DMBTR")
-        sap_field = self._extract_sap_field(str(col_name))
+        frame = pd.DataFrame(batch)
+
+        # Cells beyond the header get pandas-style placeholder names
+        for idx in range(len(profilers), len(frame.columns)):
+            profilers.append(self._make_profiler(f"Unnamed: {idx}"))
+        frame.columns = [profiler.name for profiler in profilers[:len(frame.columns)]]
+
+        for idx, profiler in enumerate(profilers[:len(frame.columns)]):
+            profiler.update(frame.iloc[:, idx])
+
+        tracked = [
+            name for name in concentration.entity_columns + concentration.amount_columns
+            if name in frame.columns
+        ]
+        if tracked:
+            concentration.update(frame[tracked])
 
-        # Clean column name for display
-        clean_name = str(col_name)
+    def _make_profiler(self, col_name: str) -> ColumnProfiler:
+        """Create a ColumnProfiler that parses numbers only for numeric column types."""
+        import pandas as pd
+
+        sap_field = self._extract_sap_field(col_name)
+
+        def is_numeric(head_values: List[Any]) -> bool:
+            col_type = self._detect_column_type(col_name, pd.Series(head_values, dtype=object), sap_field)
+            return col_type in self.NUMERIC_COLUMN_TYPES
+
+        return ColumnProfiler(col_name, numeric_resolver=is_numeric)
+
+    def _is_currency_column(self, col_name: str) -> bool:
+        """Check whether a column holds currency codes (e.g. "Currency (WAERS)")."""
+        col_lower = str(col_name).lower()
+        return 'currency' in col_lower or 'waers' in col_lower
+
+    def _column_info_from_profile(self, profiler: ColumnProfiler) -> ColumnInfo:
+        """Build ColumnInfo from a column profile."""
+        import pandas as pd
+
+        col_name = profiler.name
+        sap_field = self._extract_sap_field(col_name)
+
+        clean_name = col_name
         if sap_field:
-            # Remove SAP code from display name
             clean_name = re.sub(r'\s*\([A-Z0-9_]+\)\s*$', '', clean_name).strip()
 
         col_info = ColumnInfo(
             name=clean_name,
-            original_name=str(col_name),
-            sap_field=sap_field
+            original_name=col_name,
+            sap_field=sap_field,
+            non_null_count=profiler.non_null_count
         )
 
-        series = df[col_name]
-        non_null = series.dropna()
-        col_info.non_null_count = len(non_null)
-
-        if len(non_null) == 0:
+        if profiler.non_null_count == 0:
             return col_info
 
-        # Store sample values
-        col_info.sample_values = list(non_null.head(5))
-
-        # Detect column type
-        col_info.column_type = self._detect_column_type(col_name, series, sap_field)
-
-        # Check if this is a key metric column
+        col_info.sample_values = profiler.head_values[:5]
+        col_info.distinct_count = profiler.distinct_count
+        col_info.top_values = profiler.top_values()
+        col_info.top_values_error = profiler.top_values_error
+        col_info.column_type = self._detect_column_type(
+            col_name, pd.Series(profiler.head_values, dtype=object), sap_field
+        )
         col_info.is_key_metric = self._is_key_metric_column(col_name, sap_field, col_info.column_type)
 
-        # Calculate statistics for numeric columns
-        if col_info.column_type in [ColumnType.NUMERIC, ColumnType.CURRENCY, ColumnType.COUNT, ColumnType.PERCENTAGE]:
-            try:
-                # Convert to numeric, handling string numbers with commas
-                numeric_series = pd.to_numeric(
-                    non_null.astype(str).str.replace(',', '').str.replace('-', ''),
-                    errors='coerce'
-                )
-                numeric_series = numeric_series.dropna()
-
-                if len(numeric_series) > 0:
-                    col_info.total = float(numeric_series.sum())
-                    col_info.min_value = float(numeric_series.min())
-                    col_info.max_value = float(numeric_series.max())
-                    col_info.avg_value = float(numeric_series.mean())
-            except Exception as e:
-                logger.debug(f"Could not calculate stats for {col_name}: {e}")
+        if col_info.column_type in self.NUMERIC_COLUMN_TYPES:
+            if profiler.numeric_count > 0:
+                col_info.total = profiler.total
+                col_info.min_value = profiler.min_value
+                col_info.max_value = profiler.max_value
+                col_info.avg_value = profiler.mean
+                col_info.std_dev = profiler.std_dev
 
         return col_info
 
+    def _apply_summary_totals(self, summary_data: SummaryData, currency_columns: Dict[str, str]):
+        """Set currency and total amount on SummaryData from its analyzed columns."""
+        # The last currency column wins, as in the column-by-column scan
+        if currency_columns:
+            summary_data.currency = list(currency_columns.values())[-1]
+
+        # Calculate total amount from key metric columns
+        total_amount = 0.0
+        for col_info in summary_data.columns:
+            if col_info.is_key_metric and col_info.column_type in [ColumnType.CURRENCY, ColumnType.NUMERIC]:
+                if col_info.total is not None:
+                    total_amount += col_info.total
+
+        if total_amount > 0:
+            summary_data.total_amount = total_amount
+
     def _detect_column_type(self, col_name: str, series: "pd.Series", sap_field: Optional[str]) -> ColumnType:
         """
         Detect the type of a column based on name, SAP field, and values.
@@ -0,0 +1,295 @@
+"""
+Column Profiler for Summary Data
+
+Bounded-memory column statistics, updated one row batch at a time:
+- Running sum/min/max and Welford mean/variance (merged per batch with
+  Chan's parallel formula)
+- HyperLogLog distinct count
+- Space-saving top-k frequent values
+
+Memory per column is constant (a few KB) regardless of row count, so
+ColumnInfo can be filled for multi-million-row Summary files without
+holding the sheet in memory. Each batch is processed with vectorized
+pandas/numpy operations instead of per-value string conversion.
+"""
+
+import math
+import logging
+from typing import Any, Callable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+def coerce_numeric(series: "pd.Series") -> "np.ndarray":
+    """
+    Convert a column batch to numbers the way Summary columns are totalled.
+
+    Thousands separators and minus signs are stripped (SAP exports write
+    negative amounts as "1,234.00-"), so values are magnitudes. Values that
+    cannot be parsed become NaN.
+    """
+    import pandas as pd
+    import numpy as np
+
+    if pd.api.types.is_bool_dtype(series):
+        return np.full(len(series), np.nan)
+    if pd.api.types.is_numeric_dtype(series):
+        return np.abs(series.to_numpy(dtype=float, na_value=np.nan))
+
+    kind = pd.api.types.infer_dtype(series, skipna=True)
+    if kind in ("integer", "floating", "mixed-integer-float", "decimal"):
+        return np.abs(np.array(pd.to_numeric(series, errors='coerce'), dtype=float))
+    if kind == "boolean":
+        return np.full(len(series), np.nan)
+    if kind == "string":
+        return np.abs(_parse_number_strings(series))
+
+    # Mixed cells: real numbers parse directly, only the rest go through
+    # the (slower) string cleanup
+    is_bool = series.map(type).to_numpy() == bool
+    values = np.array(pd.to_numeric(series, errors='coerce'), dtype=float)
+    values[is_bool] = np.nan
+    retry = np.isnan(values) & series.notna().to_numpy() & ~is_bool
+    if retry.any():
+        values[retry] = _parse_number_strings(series[retry])
+    return np.abs(values)
+
+
+def _parse_number_strings(series: "pd.Series") -> "np.ndarray":
+    """Parse SAP-formatted number strings, dropping ',' and '-'."""
+    import pandas as pd
+    import numpy as np
+
+    cleaned = (
+        series.astype(str)
+        .str.replace(',', '', regex=False)
+        .str.replace('-', '', regex=False)
+    )
+    return np.array(pd.to_numeric(cleaned, errors='coerce'), dtype=float)
+
+
+class HyperLogLog:
+    """
+    HyperLogLog cardinality sketch over 64-bit pandas value hashes.
+
+    With the default precision (2^12 registers, 4 KB) the standard error is
+    about 1.6%; small cardinalities use linear counting and are near exact.
+    """
+
+    def __init__(self, precision: int = 12):
+        import numpy as np
+
+        self.precision = precision
+        self.num_registers = 1 << precision
+        self.registers = np.zeros(self.num_registers, dtype=np.uint8)
+
+    def update_hashes(self, hashes: "np.ndarray"):
+        """Add a batch of uint64 hashes."""
+        import numpy as np
+
+        if len(hashes) == 0:
+            return
+        hashes = hashes.astype(np.uint64, copy=False)
+        remaining_bits = 64 - self.precision
+        index = (hashes >> np.uint64(remaining_bits)).astype(np.int64)
+        rest = hashes & np.uint64((1 << remaining_bits) - 1)
+
+        # Rank = position of the leftmost 1-bit in the remaining bits
+        rank = np.full(len(hashes), remaining_bits + 1, dtype=np.uint8)
+        nonzero = rest > 0
+        if nonzero.any():
+            _, exponent = np.frexp(rest[nonzero].astype(np.float64))
+            rank[nonzero] = (remaining_bits - exponent + 1).astype(np.uint8)
+
+        np.maximum.at(self.registers, index, rank)
+
+    def estimate(self) -> int:
+        """Estimated number of distinct values added."""
+        import numpy as np
+
+        m = self.num_registers
+        alpha = 0.7213 / (1 + 1.079 / m)
+        raw = alpha * m * m / float(np.sum(np.power(2.0, -self.registers.astype(np.float64))))
+
+        zeros = int(np.count_nonzero(self.registers == 0))
+        if raw <= 2.5 * m and zeros > 0:
+            # Linear counting for small cardinalities
+            return int(round(m * math.log(m / zeros)))
+        return int(round(raw))
+
+
+class SpaceSavingTopK:
+    """
+    Space-saving heavy hitters with a fixed number of counters.
+
+    Batches are merged as mergeable summaries: batch value counts are added
+    to the counters, and when more than `capacity` values remain the
+    (capacity+1)-th largest count is subtracted from all of them and
+    accumulated in `offset`. A reported count c is a lower bound,
+    c <= true_count <= c + offset, so `offset` is the error bound of every
+    count; any value more frequent than N / (capacity + 1) is guaranteed
+    to be tracked. While the number of distinct values stays within
+    capacity, offset is 0 and counts are exact.
+    """
+
+    def __init__(self, capacity: int = 32):
+        self.capacity = capacity
+        self.counters = None  # pd.Series: value -> count
+        self.offset = 0
+
+    def update_counts(self, counts: "pd.Series"):
+        """Merge a batch of value counts (index = value, values = count)."""
+        import pandas as pd
+
+        if counts is None or len(counts) == 0:
+            return
+        if len(counts) > self.capacity + 1:
+            # Only the batch's top capacity+1 values and values already
+            # counted can survive the merge; the rest fall below the
+            # eviction threshold, so skip aligning them
+            candidates = counts.nlargest(self.capacity + 1)
+            if self.counters is not None:
+                tracked = counts[counts.index.isin(self.counters.index)]
+                candidates = pd.concat([candidates, tracked])
+                candidates = candidates[~candidates.index.duplicated()]
+            counts = candidates
+        merged = counts if self.counters is None else self.counters.add(counts, fill_value=0)
+        if len(merged) > self.capacity:
+            top = merged.nlargest(self.capacity + 1, keep="all")
+            threshold = top.iloc[self.capacity]
+            merged = top - threshold
+            merged = merged[merged > 0]
+            self.offset += int(threshold)
+        self.counters = merged
+
+    def top(self, n: int = 10) -> List[Tuple[str, int]]:
+        """Top-n (value, count) with lower-bound counts (see offset); ties resolve to the smallest value."""
+        if self.counters is None or len(self.counters) == 0:
+            return []
+        ordered = sorted(
+            ((str(value), int(count)) for value, count in self.counters.items()),
+            key=lambda item: (-item[1], item[0])
+        )
+        return ordered[:n]
+
+
+class ColumnProfiler:
+    """
+    Streaming profile of one Summary column.
+
+    Usage:
+        profiler = ColumnProfiler("Amount (DMBTR)")
+        for batch in batches:
+            profiler.update(batch)          # pd.Series of raw cell values
+        profiler.total, profiler.mean, profiler.distinct_count, profiler.top_values()
+
+    When numeric_resolver is given it is called once with the first
+    TYPE_SAMPLE_SIZE non-null values; if it returns False, numeric parsing
+    is skipped for the rest of the column (text/date/identifier columns).
+    """
+
+    # Non-null values kept for type inference (matches _detect_column_type)
+    TYPE_SAMPLE_SIZE = 20
+
+    def __init__(
+        self,
+        name: str,
+        numeric_resolver: Optional[Callable[[List[Any]], bool]] = None,
+        top_k_capacity: int = 32,
+        hll_precision: int = 12
+    ):
+        self.name = name
+        self.non_null_count = 0
+        self.head_values: List[Any] = []
+        self.track_numeric = True
+        self._numeric_resolver = numeric_resolver
+
+        # Numeric statistics
+        self.numeric_count = 0
+        self.total = 0.0
+        self.min_value: Optional[float] = None
+        self.max_value: Optional[float] = None
+        self.mean = 0.0
+        self._m2 = 0.0
+
+        # Sketches
+        self.distinct = HyperLogLog(hll_precision)
+        self.frequent = SpaceSavingTopK(top_k_capacity)
+
+    def update(self, series: "pd.Series"):
+        """Add one batch of cell values."""
+        import pandas as pd
+        import numpy as np
+
+        non_null = series[series.notna()]
+        if len(non_null) == 0:
+            return
+        self.non_null_count += len(non_null)
+
+        if len(self.head_values) < self.TYPE_SAMPLE_SIZE:
+            self.head_values.extend(non_null.iloc[:self.TYPE_SAMPLE_SIZE - len(self.head_values)].tolist())
+            if self._numeric_resolver and len(self.head_values) >= self.TYPE_SAMPLE_SIZE:
+                self.resolve_numeric()
+
+        if self.track_numeric:
+            numbers = coerce_numeric(non_null)
+            numbers = numbers[np.isfinite(numbers)]
+            if len(numbers):
+                self._update_numeric(numbers)
+
+        # Sketches hash raw values; labels are only stringified when reported
+        self.distinct.update_hashes(pd.util.hash_array(non_null.to_numpy()))
+        self.frequent.update_counts(non_null.value_counts(sort=False))
+
+    def resolve_numeric(self):
+        """Decide from the head sample whether numeric statistics are needed."""
+        if self._numeric_resolver is not None:
+            self.track_numeric = bool(self._numeric_resolver(self.head_values))
+            self._numeric_resolver = None
+
+    def _update_numeric(self, numbers: "np.ndarray"):
+        """Merge a batch into running sum/min/max and Welford mean/M2."""
+        count = len(numbers)
+        batch_mean = float(numbers.mean())
+        batch_m2 = float(((numbers - batch_mean) ** 2).sum())
+        batch_min = float(numbers.min())
+        batch_max = float(numbers.max())
+
+        # Chan et al. parallel combination of (n, mean, M2)
+        combined = self.numeric_count + count
+        delta = batch_mean - self.mean
+        self.mean += delta * count / combined
+        self._m2 += batch_m2 + delta * delta * self.numeric_count * count / combined
+        self.numeric_count = combined
+
+        self.total += float(numbers.sum())
+        self.min_value = batch_min if self.min_value is None else min(self.min_value, batch_min)
+        self.max_value = batch_max if self.max_value is None else max(self.max_value, batch_max)
+
+    @property
+    def std_dev(self) -> Optional[float]:
+        """Sample standard deviation of the numeric values."""
+        if self.numeric_count < 2:
+            return None
+        return math.sqrt(self._m2 / (self.numeric_count - 1))
+
+    @property
+    def distinct_count(self) -> int:
+        """Approximate number of distinct non-null values."""
+        if self.non_null_count == 0:
+            return 0
+        return min(self.distinct.estimate(), self.non_null_count)
+
+    def top_values(self, n: int = 5) -> List[Tuple[str, int]]:
+        """Most frequent values with lower bounds of their counts."""
+        return self.frequent.top(n)
+
+    @property
+    def top_values_error(self) -> int:
+        """How far the true count of a top value can exceed the reported one."""
+        return self.frequent.offset
+
+    def most_common_value(self) -> Optional[str]:
+        """Most frequent value; ties resolve to the smallest, like Series.mode()."""
+        top = self.frequent.top(1)
+        return top[0][0] if top else None
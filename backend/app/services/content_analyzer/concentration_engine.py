@@ -0,0 +1,282 @@
+"""
+Concentration Engine for Summary Data
+
+Computes how monetary values are distributed across entities (vendors,
+customers, company codes, organizations) over ALL rows of a Summary file,
+not just the sample rows.
+
+For every (entity column, amount column) pair it aggregates the amount per
+entity with a vectorized group-by (factorize + bincount), selects the top-k
+entities with numpy.argpartition and computes each entity's share of the
+column total. Aggregation can be fed in row batches, so the streaming
+Summary reader never needs the full DataFrame in memory.
+"""
+
+import re
+import logging
+from typing import Dict, List, Optional, Any, Tuple
+from dataclasses import dataclass, field
+
+from .artifact_reader import ColumnInfo, ColumnType
+from .column_profiler import coerce_numeric
+
+logger = logging.getLogger(__name__)
+
+
+# Column name keywords used to pick entity and amount columns
+ENTITY_KEYWORDS = ["entity", "vendor", "customer", "org", "company"]
+AMOUNT_KEYWORDS = ["amount", "value", "total", "sum", "price"]
+
+
+@dataclass
+class ConcentrationEntry:
+    """One entity's aggregated amount within a concentration result."""
+    entity: str
+    amount: float
+    record_count: int
+    percentage_of_total: float
+    rank: int
+
+
+@dataclass
+class ConcentrationResult:
+    """Concentration of one amount column across one entity column."""
+    entity_column: str          # Display name, e.g. "Vendor"
+    amount_column: str          # Display name, e.g. "Amount in LC"
+    dimension_type: str         # e.g. "VENDOR", stored in ConcentrationMetric
+    total_amount: float
+    entity_count: int           # Distinct entities with a value
+    top_entries: List[ConcentrationEntry] = field(default_factory=list)
+
+    @property
+    def top_share(self) -> float:
+        """Share of the total held by the largest entity (0-100)."""
+        return self.top_entries[0].percentage_of_total if self.top_entries else 0.0
+
+
+def _clean_name(col_name: str) -> str:
+    """Strip a trailing SAP field code: "Vendor (LIFNR)" -> "Vendor"."""
+    return re.sub(r'\s*\([A-Z0-9_]+\)\s*$', '', str(col_name)).strip()
+
+
+def is_entity_column_name(col_name: str) -> bool:
+    """Check whether a column name looks like an entity dimension."""
+    name_lower = _clean_name(col_name).lower()
+    return any(keyword in name_lower for keyword in ENTITY_KEYWORDS)
+
+
+def is_amount_column_name(col_name: str) -> bool:
+    """Check whether a column name looks like a monetary amount."""
+    name_lower = _clean_name(col_name).lower()
+    return any(keyword in name_lower for keyword in AMOUNT_KEYWORDS)
+
+
+def dimension_type_for(col_name: str) -> str:
+    """Build a ConcentrationMetric.dimension_type code from a column name."""
+    code = re.sub(r'[^A-Z0-9]+', '_', _clean_name(col_name).upper()).strip('_')
+    return (code or "ENTITY")[:50]
+
+
+class ConcentrationAccumulator:
+    """
+    Incremental entity/amount aggregation over row batches.
+
+    Columns are identified by their original (header) names. Each update()
+    aggregates one batch and merges it into the running per-entity totals;
+    memory grows with the number of distinct entities, not rows.
+    """
+
+    def __init__(self, entity_columns: List[str], amount_columns: List[str]):
+        self.entity_columns = list(entity_columns)
+        self.amount_columns = list(amount_columns)
+        self._sums: Dict[Tuple[str, str], Any] = {}
+        self._counts: Dict[str, Any] = {}
+        self._totals: Dict[str, float] = {col: 0.0 for col in self.amount_columns}
+
+    @property
+    def is_empty(self) -> bool:
+        return not self.entity_columns or not self.amount_columns
+
+    def update(self, frame: "pd.DataFrame"):
+        """Aggregate one batch of rows (a DataFrame with the tracked columns)."""
+        import pandas as pd
+        import numpy as np
+
+        if self.is_empty or len(frame) == 0:
+            return
+
+        amounts = {}
+        for amt_col in self.amount_columns:
+            if amt_col in frame.columns:
+                values = self._to_amounts(frame[amt_col])
+                amounts[amt_col] = values
+                self._totals[amt_col] += float(values.sum())
+
+        for ent_col in self.entity_columns:
+            if ent_col not in frame.columns:
+                continue
+            codes, uniques = pd.factorize(frame[ent_col], use_na_sentinel=True)
+            if len(uniques) == 0:
+                continue
+            valid = codes >= 0
+            codes = codes[valid]
+            labels = pd.Index([str(u).strip() for u in uniques])
+
+            counts = np.bincount(codes, minlength=len(uniques))
+            self._merge(self._counts, ent_col, pd.Series(counts, index=labels))
+
+            for amt_col, values in amounts.items():
+                sums = np.bincount(codes, weights=values[valid], minlength=len(uniques))
+                self._merge(self._sums, (ent_col, amt_col), pd.Series(sums, index=labels))
+
+    @staticmethod
+    def _to_amounts(series: "pd.Series") -> "np.ndarray":
+        """Summary number coercion (magnitudes) with unparseable values as 0."""
+        import numpy as np
+
+        return np.nan_to_num(coerce_numeric(series), nan=0.0, posinf=0.0, neginf=0.0)
+
+    @staticmethod
+    def _merge(store: Dict, key: Any, partial: "pd.Series"):
+        """Add a batch aggregate into the running aggregate for key."""
+        # Labels that stringify identically (100 vs "100") collapse here
+        partial = partial.groupby(level=0, sort=False).sum()
+        partial = partial[partial.index != ""]
+        current = store.get(key)
+        store[key] = partial if current is None else current.add(partial, fill_value=0)
+
+    def results(
+        self,
+        columns: Optional[List[ColumnInfo]] = None,
+        top_k: int = 10
+    ) -> List[ConcentrationResult]:
+        """
+        Build ranked concentration results from the aggregated totals.
+
+        Args:
+            columns: Final ColumnInfo list; when given, only amount columns
+                typed CURRENCY/NUMERIC and non-numeric entity columns are kept,
+                and key metric amount columns are ranked first.
+            top_k: Number of top entities to keep per result
+
+        Returns:
+            List of ConcentrationResult, primary (key metric) amount column first
+        """
+        import numpy as np
+
+        amount_columns = list(self.amount_columns)
+        entity_columns = list(self.entity_columns)
+
+        if columns is not None:
+            by_name = {col.original_name: col for col in columns}
+            numeric_types = [ColumnType.CURRENCY, ColumnType.NUMERIC]
+            amount_columns = [
+                c for c in amount_columns
+                if c in by_name and by_name[c].column_type in numeric_types
+            ]
+            amount_columns.sort(key=lambda c: not by_name[c].is_key_metric)
+            entity_columns = [
+                c for c in entity_columns
+                if c in by_name and by_name[c].column_type not in numeric_types
+            ]
+
+        results = []
+        for amt_col in amount_columns:
+            total = self._totals.get(amt_col, 0.0)
+            if total <= 0:
+                continue
+            for ent_col in entity_columns:
+                sums = self._sums.get((ent_col, amt_col))
+                if sums is None or len(sums) == 0:
+                    continue
+                counts = self._counts[ent_col]
+
+                values = sums.to_numpy(dtype=float)
+                k = min(top_k, len(values))
+                top_idx = np.argpartition(-values, k - 1)[:k]
+                top_idx = top_idx[np.argsort(-values[top_idx], kind="stable")]
+
+                entries = []
+                for rank, idx in enumerate(top_idx, 1):
+                    amount = float(values[idx])
+                    if amount <= 0:
+                        break
+                    entity = sums.index[idx]
+                    entries.append(ConcentrationEntry(
+                        entity=entity,
+                        amount=amount,
+                        record_count=int(counts.get(entity, 0)),
+                        percentage_of_total=amount / total * 100,
+                        rank=rank
+                    ))
+
+                results.append(ConcentrationResult(
+                    entity_column=_clean_name(ent_col),
+                    amount_column=_clean_name(amt_col),
+                    dimension_type=dimension_type_for(ent_col),
+                    total_amount=total,
+                    entity_count=int((values > 0).sum()),
+                    top_entries=entries
+                ))
+
+        return results
+
+
+class ConcentrationEngine:
+    """
+    Vectorized concentration analysis for Summary data.
+
+    Usage:
+        engine = ConcentrationEngine(top_k=10)
+        results = engine.analyze(df, summary_data.columns)
+    """
+
+    def __init__(self, top_k: int = 10):
+        self.top_k = top_k
+
+    def select_columns(self, columns: List[ColumnInfo]) -> Tuple[List[str], List[str]]:
+        """
+        Pick entity and amount columns (original names) from analyzed columns.
+
+        Returns:
+            Tuple of (entity_columns, amount_columns)
+        """
+        numeric_types = [ColumnType.CURRENCY, ColumnType.NUMERIC]
+        entity_columns = []
+        amount_columns = []
+        for col in columns:
+            if col.column_type in numeric_types:
+                if is_amount_column_name(col.name):
+                    amount_columns.append(col.original_name)
+            elif is_entity_column_name(col.name):
+                entity_columns.append(col.original_name)
+        return entity_columns, amount_columns
+
+    def accumulator_for_header(self, column_names: List[str]) -> ConcentrationAccumulator:
+        """
+        Create an accumulator for a streamed sheet from its header alone.
+
+        Column types are not known until the whole sheet is read, so
+        candidates are chosen by name; results() filters them by type.
+        """
+        entity_columns = [c for c in column_names if is_entity_column_name(c)]
+        amount_columns = [c for c in column_names if is_amount_column_name(c) and c not in entity_columns]
+        return ConcentrationAccumulator(entity_columns, amount_columns)
+
+    def analyze(self, df: "pd.DataFrame", columns: List[ColumnInfo]) -> List[ConcentrationResult]:
+        """
+        Run concentration analysis over every row of a DataFrame.
+
+        Args:
+            df: Full Summary data, columns labelled by original header names
+            columns: ColumnInfo for the DataFrame's columns
+
+        Returns:
+            List of ConcentrationResult, primary amount column first
+        """
+        entity_columns, amount_columns = self.select_columns(columns)
+        accumulator = ConcentrationAccumulator(entity_columns, amount_columns)
+        if accumulator.is_empty:
+            return []
+        accumulator.update(df[[c for c in entity_columns + amount_columns if c in df.columns]])
+        return accumulator.results(columns, top_k=self.top_k)
@@ -5,12 +5,15 @@ Uses LLM (OpenAI/Anthropic) to intelligently classify alerts into focus areas
 and analyze content based on contextual understanding.
 """
 
+import asyncio
 import json
 import logging
 import re
-from typing import Dict, List, Optional, Any, Tuple
+from typing import Callable, Dict, List, Optional, Any, Tuple
 from dataclasses import dataclass
 
+from app.services.llm_cache import LLMResponseCache
+
 from .artifact_reader import AlertArtifacts
 from .context_loader import ContextLoader, get_context_loader
 from . import prompts
@@ -49,6 +52,16 @@ class RiskScore:
     raw_response: Optional[str] = None
 
 
+@dataclass
+class FusedAnalysisResult:
+    """Result of a single-call (fused) classification, analysis, scoring and description."""
+    classification: ClassificationResult
+    analysis: AnalysisResult
+    risk: RiskScore
+    description: Dict[str, str]
+    raw_response: Optional[str] = None
+
+
 class LLMClassifier:
     """
     LLM-based classifier for analyzing alerts and extracting findings.
@@ -64,12 +77,21 @@ class LLMClassifier:
         "JOBS_CONTROL",
     ]
 
+    VALID_SEVERITIES = ["Critical", "High", "Medium", "Low"]
+
+    # Summary text sent to the LLM is truncated to this many characters
+    MAX_SUMMARY_CHARS = 10000
+
+    # The fused response carries all four stages, so it needs more room
+    FUSED_MAX_TOKENS = 4000
+
     def __init__(
         self,
         llm_provider: str = "openai",
         api_key: Optional[str] = None,
         model: Optional[str] = None,
-        context_loader: Optional[ContextLoader] = None
+        context_loader: Optional[ContextLoader] = None,
+        response_cache: Optional[LLMResponseCache] = None
     ):
         """
         Initialize the LLM classifier.
@@ -79,12 +101,15 @@ class LLMClassifier:
             api_key: API key for the provider
             model: Model to use (defaults based on provider)
             context_loader: Optional context loader instance
+            response_cache: Optional persistent cache of LLM responses
         """
         self.llm_provider = llm_provider.lower()
         self.api_key = api_key
         self.model = model or self._default_model()
         self.context_loader = context_loader or get_context_loader()
+        self.response_cache = response_cache
         self._client = None
+        self._async_client = None
 
     def _default_model(self) -> str:
         """Get default model based on provider."""
@@ -116,17 +141,110 @@ class LLMClassifier:
 
         return self._client
 
-    def _call_llm(self, system_prompt: str, user_prompt: str) -> str:
+    def _get_async_client(self):
+        """Get or create the asyncio LLM client."""
+        if self._async_client is not None:
+            return self._async_client
+
+        if self.llm_provider == "openai":
+            try:
+                from openai import AsyncOpenAI
+                self._async_client = AsyncOpenAI(api_key=self.api_key)
+            except ImportError:
+                raise ImportError("OpenAI library not installed. Run: pip install openai")
+
+        elif self.llm_provider == "anthropic":
+            try:
+                from anthropic import AsyncAnthropic
+                self._async_client = AsyncAnthropic(api_key=self.api_key)
+            except ImportError:
+                raise ImportError("Anthropic library not installed. Run: pip install anthropic")
+
+        else:
+            raise ValueError(f"Unknown LLM provider: {self.llm_provider}")
+
+        return self._async_client
+
+    def _call_llm(
+        self,
+        system_prompt: str,
+        user_prompt: str,
+        max_tokens: int = 2000,
+        validate: Optional[Callable[[str], bool]] = None
+    ) -> str:
         """
         Make a call to the LLM.
 
         Args:
             system_prompt: System prompt setting context
             user_prompt: User prompt with the actual request
+            max_tokens: Maximum tokens in the response
+            validate: Whether a response is usable; only usable responses
+                are cached (and served from the cache), so a truncated or
+                malformed reply is requested again next time
 
         Returns:
             LLM response text
         """
+        cached = self._cached_response(system_prompt, user_prompt, validate)
+        if cached is not None:
+            return cached
+
+        response = self._request_llm(system_prompt, user_prompt, max_tokens)
+        self._store_response(system_prompt, user_prompt, response, validate)
+        return response
+
+    async def _call_llm_async(
+        self,
+        system_prompt: str,
+        user_prompt: str,
+        max_tokens: int = 2000,
+        validate: Optional[Callable[[str], bool]] = None
+    ) -> str:
+        """
+        Async variant of _call_llm; awaits the provider instead of blocking.
+
+        The response cache is a SQLite file, so its lookups and writes run
+        in a worker thread to keep them off the event loop.
+        """
+        cached = await asyncio.to_thread(self._cached_response, system_prompt, user_prompt, validate)
+        if cached is not None:
+            return cached
+
+        response = await self._request_llm_async(system_prompt, user_prompt, max_tokens)
+        await asyncio.to_thread(self._store_response, system_prompt, user_prompt, response, validate)
+        return response
+
+    def _cached_response(
+        self,
+        system_prompt: str,
+        user_prompt: str,
+        validate: Optional[Callable[[str], bool]]
+    ) -> Optional[str]:
+        if self.response_cache is None:
+            return None
+        cached = self.response_cache.get(self.llm_provider, self.model, system_prompt, user_prompt)
+        if cached is not None and validate is not None and not validate(cached):
+            # Stored before responses were validated; request a fresh one
+            return None
+        return cached
+
+    def _store_response(
+        self,
+        system_prompt: str,
+        user_prompt: str,
+        response: str,
+        validate: Optional[Callable[[str], bool]]
+    ):
+        if self.response_cache is None:
+            return
+        if validate is not None and not validate(response):
+            logger.warning("LLM response failed validation, not caching it")
+            return
+        self.response_cache.put(self.llm_provider, self.model, system_prompt, user_prompt, response)
+
+    def _request_llm(self, system_prompt: str, user_prompt: str, max_tokens: int) -> str:
+        """Send a prompt to the provider API."""
         client = self._get_client()
 
         try:
@@ -138,14 +256,46 @@ class LLMClassifier:
                         {"role": "user", "content": user_prompt}
                     ],
                     temperature=0.3,  # Lower temperature for more consistent results
-                    max_tokens=2000
+                    max_tokens=max_tokens
                 )
                 return response.choices[0].message.content
 
             elif self.llm_provider == "anthropic":
                 response = client.messages.create(
                     model=self.model,
-                    max_tokens=2000,
+                    max_tokens=max_tokens,
+                    system=system_prompt,
+                    messages=[
+                        {"role": "user", "content": user_prompt}
+                    ]
+                )
+                return response.content[0].text
+
+        except Exception as e:
+            logger.error(f"LLM call failed: {e}")
+            raise
+
+    async def _request_llm_async(self, system_prompt: str, user_prompt: str, max_tokens: int) -> str:
+        """Send a prompt to the provider API with the asyncio client."""
+        client = self._get_async_client()
+
+        try:
+            if self.llm_provider == "openai":
+                response = await client.chat.completions.create(
+                    model=self.model,
+                    messages=[
+                        {"role": "system", "content": system_prompt},
+                        {"role": "user", "content": user_prompt}
+                    ],
+                    temperature=0.3,
+                    max_tokens=max_tokens
+                )
+                return response.choices[0].message.content
+
+            elif self.llm_provider == "anthropic":
+                response = await client.messages.create(
+                    model=self.model,
+                    max_tokens=max_tokens,
                     system=system_prompt,
                     messages=[
                         {"role": "user", "content": user_prompt}
@@ -167,6 +317,17 @@ class LLMClassifier:
         Returns:
             Parsed JSON dictionary
         """
+        try:
+            return self._load_json(response)
+        except json.JSONDecodeError as e:
+            logger.error(f"Failed to parse JSON response: {e}")
+            logger.debug(f"Response was: {response}")
+            # Return a default structure
+            return {"error": str(e), "raw": response}
+
+    @staticmethod
+    def _load_json(response: str) -> Any:
+        """JSON value in an LLM response (raises JSONDecodeError)."""
         # Try to extract JSON from markdown code blocks
         json_match = re.search(r'```(?:json)?\s*\n?(.*?)\n?```', response, re.DOTALL)
         if json_match:
@@ -179,13 +340,30 @@ class LLMClassifier:
             else:
                 json_str = response
 
+        return json.loads(json_str)
+
+    def _accepted_by(self, parse: Callable[[str], Any]) -> Callable[[str], bool]:
+        """Response validator for a stage: a JSON object its parser accepts."""
+        def validate(response: str) -> bool:
+            try:
+                if not isinstance(self._load_json(response), dict):
+                    return False
+                parse(response)
+            except Exception:
+                return False
+            return True
+        return validate
+
+    def _is_valid_fused(self, response: str) -> bool:
+        """Response validator for the fused call (schema check of _parse_fused)."""
         try:
-            return json.loads(json_str)
-        except json.JSONDecodeError as e:
-            logger.error(f"Failed to parse JSON response: {e}")
-            logger.debug(f"Response was: {response}")
-            # Return a default structure
-            return {"error": str(e), "raw": response}
+            result = self._load_json(response)
+        except json.JSONDecodeError:
+            return False
+        return not self._validate_fused_response(result)
+
+    # Each stage below is split into prompt building, response parsing and
+    # an error default, shared by the sync and async entry points.
 
     def classify_focus_area(self, artifacts: AlertArtifacts) -> ClassificationResult:
         """
@@ -197,39 +375,57 @@ class LLMClassifier:
         Returns:
             ClassificationResult with focus area and confidence
         """
-        # Build the classification prompt
-        prompt = prompts.CLASSIFICATION_PROMPT.format(
+        try:
+            response = self._call_llm(
+                prompts.SYSTEM_PROMPT, self._classification_prompt(artifacts),
+                validate=self._accepted_by(self._parse_classification)
+            )
+            return self._parse_classification(response)
+        except Exception as e:
+            return self._default_classification(e)
+
+    async def classify_focus_area_async(self, artifacts: AlertArtifacts) -> ClassificationResult:
+        """Async variant of classify_focus_area."""
+        try:
+            response = await self._call_llm_async(
+                prompts.SYSTEM_PROMPT, self._classification_prompt(artifacts),
+                validate=self._accepted_by(self._parse_classification)
+            )
+            return self._parse_classification(response)
+        except Exception as e:
+            return self._default_classification(e)
+
+    def _classification_prompt(self, artifacts: AlertArtifacts) -> str:
+        return prompts.CLASSIFICATION_PROMPT.format(
             alert_name=artifacts.alert_name,
             code_summary=artifacts.code_summary or "Not available",
             explanation=artifacts.explanation or "Not available",
             metadata=artifacts.metadata[:1000] if artifacts.metadata else "Not available"
         )
 
-        try:
-            response = self._call_llm(prompts.SYSTEM_PROMPT, prompt)
-            result = self._parse_json_response(response)
+    def _parse_classification(self, response: str) -> ClassificationResult:
+        result = self._parse_json_response(response)
 
-            focus_area = result.get("focus_area", "BUSINESS_CONTROL")
-            # Validate focus area
-            if focus_area not in self.VALID_FOCUS_AREAS:
-                logger.warning(f"Invalid focus area from LLM: {focus_area}, defaulting to BUSINESS_CONTROL")
-                focus_area = "BUSINESS_CONTROL"
+        focus_area = result.get("focus_area", "BUSINESS_CONTROL")
+        # Validate focus area
+        if focus_area not in self.VALID_FOCUS_AREAS:
+            logger.warning(f"Invalid focus area from LLM: {focus_area}, defaulting to BUSINESS_CONTROL")
+            focus_area = "BUSINESS_CONTROL"
 
-            return ClassificationResult(
-                focus_area=focus_area,
-                confidence=float(result.get("confidence", 0.5)),
-                reasoning=result.get("reasoning", "Classification based on alert content"),
-                raw_response=response
-            )
+        return ClassificationResult(
+            focus_area=focus_area,
+            confidence=float(result.get("confidence", 0.5)),
+            reasoning=result.get("reasoning", "Classification based on alert content"),
+            raw_response=response
+        )
 
-        except Exception as e:
-            logger.error(f"Classification failed: {e}")
-            # Return default classification
-            return ClassificationResult(
-                focus_area="BUSINESS_CONTROL",
-                confidence=0.3,
-                reasoning=f"Default classification due to error: {str(e)}"
-            )
+    def _default_classification(self, error: Exception) -> ClassificationResult:
+        logger.error(f"Classification failed: {error}")
+        return ClassificationResult(
+            focus_area="BUSINESS_CONTROL",
+            confidence=0.3,
+            reasoning=f"Default classification due to error: {str(error)}"
+        )
 
     def analyze_summary(
         self,
@@ -246,42 +442,57 @@ class LLMClassifier:
         Returns:
             AnalysisResult with detailed analysis
         """
-        # Truncate summary if too long
-        summary_data = artifacts.summary
-        if summary_data and len(summary_data) > 10000:
-            summary_data = summary_data[:10000] + "\n... [truncated]"
+        try:
+            response = self._call_llm(
+                prompts.SYSTEM_PROMPT, self._analysis_prompt(artifacts, focus_area),
+                validate=self._accepted_by(self._parse_analysis)
+            )
+            return self._parse_analysis(response)
+        except Exception as e:
+            return self._default_analysis(e)
+
+    async def analyze_summary_async(self, artifacts: AlertArtifacts, focus_area: str) -> AnalysisResult:
+        """Async variant of analyze_summary."""
+        try:
+            response = await self._call_llm_async(
+                prompts.SYSTEM_PROMPT, self._analysis_prompt(artifacts, focus_area),
+                validate=self._accepted_by(self._parse_analysis)
+            )
+            return self._parse_analysis(response)
+        except Exception as e:
+            return self._default_analysis(e)
 
-        prompt = prompts.ANALYSIS_PROMPT.format(
+    def _analysis_prompt(self, artifacts: AlertArtifacts, focus_area: str) -> str:
+        return prompts.ANALYSIS_PROMPT.format(
             alert_name=artifacts.alert_name,
             focus_area=focus_area,
             explanation=artifacts.explanation or "Not available",
-            summary_data=summary_data or "No summary data available"
+            summary_data=self._summary_for_prompt(artifacts)
         )
 
-        try:
-            response = self._call_llm(prompts.SYSTEM_PROMPT, prompt)
-            result = self._parse_json_response(response)
-
-            return AnalysisResult(
-                findings_summary=result.get("findings_summary", "Analysis results"),
-                qualitative_analysis=result.get("qualitative_analysis", {}),
-                quantitative_analysis=result.get("quantitative_analysis", {}),
-                severity=result.get("severity", "Medium"),
-                severity_reasoning=result.get("severity_reasoning", ""),
-                recommended_actions=result.get("recommended_actions", []),
-                raw_response=response
-            )
+    def _parse_analysis(self, response: str) -> AnalysisResult:
+        result = self._parse_json_response(response)
+
+        return AnalysisResult(
+            findings_summary=result.get("findings_summary", "Analysis results"),
+            qualitative_analysis=result.get("qualitative_analysis", {}),
+            quantitative_analysis=result.get("quantitative_analysis", {}),
+            severity=result.get("severity", "Medium"),
+            severity_reasoning=result.get("severity_reasoning", ""),
+            recommended_actions=result.get("recommended_actions", []),
+            raw_response=response
+        )
 
-        except Exception as e:
-            logger.error(f"Analysis failed: {e}")
-            return AnalysisResult(
-                findings_summary=f"Analysis failed: {str(e)}",
-                qualitative_analysis={},
-                quantitative_analysis={},
-                severity="Medium",
-                severity_reasoning="Default severity due to analysis error",
-                recommended_actions=["Review alert manually"]
-            )
+    def _default_analysis(self, error: Exception) -> AnalysisResult:
+        logger.error(f"Analysis failed: {error}")
+        return AnalysisResult(
+            findings_summary=f"Analysis failed: {str(error)}",
+            qualitative_analysis={},
+            quantitative_analysis={},
+            severity="Medium",
+            severity_reasoning="Default severity due to analysis error",
+            recommended_actions=["Review alert manually"]
+        )
 
     def calculate_risk_score(
         self,
@@ -300,40 +511,64 @@ class LLMClassifier:
         Returns:
             RiskScore with score and factors
         """
-        # Format analysis results for the prompt
-        analysis_json = json.dumps({
+        prompt = self._risk_prompt(artifacts, focus_area, analysis_result)
+        try:
+            return self._parse_risk(self._call_llm(
+                prompts.SYSTEM_PROMPT, prompt, validate=self._accepted_by(self._parse_risk)
+            ))
+        except Exception as e:
+            return self._default_risk(e)
+
+    async def calculate_risk_score_async(
+        self,
+        artifacts: AlertArtifacts,
+        focus_area: str,
+        analysis_result: AnalysisResult
+    ) -> RiskScore:
+        """Async variant of calculate_risk_score."""
+        prompt = self._risk_prompt(artifacts, focus_area, analysis_result)
+        try:
+            return self._parse_risk(await self._call_llm_async(
+                prompts.SYSTEM_PROMPT, prompt, validate=self._accepted_by(self._parse_risk)
+            ))
+        except Exception as e:
+            return self._default_risk(e)
+
+    def _analysis_json(self, analysis_result: AnalysisResult) -> str:
+        """Format analysis results for the risk and description prompts."""
+        return json.dumps({
             "findings_summary": analysis_result.findings_summary,
             "qualitative_analysis": analysis_result.qualitative_analysis,
             "quantitative_analysis": analysis_result.quantitative_analysis,
             "severity": analysis_result.severity
         }, indent=2)
 
-        prompt = prompts.RISK_SCORING_PROMPT.format(
+    def _risk_prompt(self, artifacts: AlertArtifacts, focus_area: str, analysis_result: AnalysisResult) -> str:
+        return prompts.RISK_SCORING_PROMPT.format(
             alert_name=artifacts.alert_name,
             focus_area=focus_area,
-            analysis_results=analysis_json
+            analysis_results=self._analysis_json(analysis_result)
         )
 
-        try:
-            response = self._call_llm(prompts.SYSTEM_PROMPT, prompt)
-            result = self._parse_json_response(response)
-
-            return RiskScore(
-                risk_score=int(result.get("risk_score", 50)),
-                risk_level=result.get("risk_level", "Medium"),
-                risk_factors=result.get("risk_factors", []),
-                potential_financial_impact=result.get("potential_financial_impact", {}),
-                raw_response=response
-            )
+    def _parse_risk(self, response: str) -> RiskScore:
+        result = self._parse_json_response(response)
 
-        except Exception as e:
-            logger.error(f"Risk scoring failed: {e}")
-            return RiskScore(
-                risk_score=50,
-                risk_level="Medium",
-                risk_factors=["Unable to calculate specific risk factors"],
-                potential_financial_impact={}
-            )
+        return RiskScore(
+            risk_score=int(result.get("risk_score", 50)),
+            risk_level=result.get("risk_level", "Medium"),
+            risk_factors=result.get("risk_factors", []),
+            potential_financial_impact=result.get("potential_financial_impact", {}),
+            raw_response=response
+        )
+
+    def _default_risk(self, error: Exception) -> RiskScore:
+        logger.error(f"Risk scoring failed: {error}")
+        return RiskScore(
+            risk_score=50,
+            risk_level="Medium",
+            risk_factors=["Unable to calculate specific risk factors"],
+            potential_financial_impact={}
+        )
 
     def generate_finding_description(
         self,
@@ -352,38 +587,211 @@ class LLMClassifier:
         Returns:
             Dictionary with title, description, business_impact
         """
-        analysis_json = json.dumps({
-            "findings_summary": analysis_result.findings_summary,
-            "qualitative_analysis": analysis_result.qualitative_analysis,
-            "quantitative_analysis": analysis_result.quantitative_analysis,
-            "severity": analysis_result.severity
-        }, indent=2)
+        prompt = self._description_prompt(artifacts, focus_area, analysis_result)
+        try:
+            response = self._call_llm(prompts.SYSTEM_PROMPT, prompt, validate=self._accepted_by(
+                lambda r: self._parse_description(r, artifacts, analysis_result)
+            ))
+            return self._parse_description(response, artifacts, analysis_result)
+        except Exception as e:
+            return self._default_description(e, artifacts, analysis_result)
+
+    async def generate_finding_description_async(
+        self,
+        artifacts: AlertArtifacts,
+        focus_area: str,
+        analysis_result: AnalysisResult
+    ) -> Dict[str, str]:
+        """Async variant of generate_finding_description."""
+        prompt = self._description_prompt(artifacts, focus_area, analysis_result)
+        try:
+            response = await self._call_llm_async(prompts.SYSTEM_PROMPT, prompt, validate=self._accepted_by(
+                lambda r: self._parse_description(r, artifacts, analysis_result)
+            ))
+            return self._parse_description(response, artifacts, analysis_result)
+        except Exception as e:
+            return self._default_description(e, artifacts, analysis_result)
 
-        prompt = prompts.FINDING_DESCRIPTION_PROMPT.format(
+    def _description_prompt(self, artifacts: AlertArtifacts, focus_area: str, analysis_result: AnalysisResult) -> str:
+        return prompts.FINDING_DESCRIPTION_PROMPT.format(
             alert_name=artifacts.alert_name,
             focus_area=focus_area,
-            analysis_results=analysis_json
+            analysis_results=self._analysis_json(analysis_result)
         )
 
-        try:
-            response = self._call_llm(prompts.SYSTEM_PROMPT, prompt)
-            result = self._parse_json_response(response)
+    def _parse_description(
+        self,
+        response: str,
+        artifacts: AlertArtifacts,
+        analysis_result: AnalysisResult
+    ) -> Dict[str, str]:
+        result = self._parse_json_response(response)
+
+        return {
+            "title": result.get("title", artifacts.alert_name),
+            "description": result.get("description", analysis_result.findings_summary),
+            "business_impact": result.get("business_impact", ""),
+            "technical_details": result.get("technical_details", "")
+        }
 
-            return {
-                "title": result.get("title", artifacts.alert_name),
-                "description": result.get("description", analysis_result.findings_summary),
-                "business_impact": result.get("business_impact", ""),
-                "technical_details": result.get("technical_details", "")
-            }
+    def _default_description(
+        self,
+        error: Exception,
+        artifacts: AlertArtifacts,
+        analysis_result: AnalysisResult
+    ) -> Dict[str, str]:
+        logger.error(f"Description generation failed: {error}")
+        return {
+            "title": artifacts.alert_name,
+            "description": analysis_result.findings_summary,
+            "business_impact": "Review required",
+            "technical_details": ""
+        }
+
+    def _summary_for_prompt(self, artifacts: AlertArtifacts) -> str:
+        """Summary text for prompts, truncated if too long."""
+        summary_data = artifacts.summary
+        if summary_data and len(summary_data) > self.MAX_SUMMARY_CHARS:
+            summary_data = summary_data[:self.MAX_SUMMARY_CHARS] + "\n... [truncated]"
+        return summary_data or "No summary data available"
+
+    def analyze_fused(self, artifacts: AlertArtifacts) -> Optional[FusedAnalysisResult]:
+        """
+        Classify, analyze, score and describe an alert with a single LLM call.
+
+        The alert context (explanation, metadata, summary) is sent once
+        instead of once per stage.
+
+        Args:
+            artifacts: The alert artifacts
+
+        Returns:
+            FusedAnalysisResult, or None if the call failed or the response
+            did not match the expected schema (caller should use the staged path)
+        """
+        try:
+            response = self._call_llm(
+                prompts.SYSTEM_PROMPT, self._fused_prompt(artifacts), max_tokens=self.FUSED_MAX_TOKENS,
+                validate=self._is_valid_fused
+            )
+        except Exception as e:
+            logger.error(f"Fused analysis failed: {e}")
+            return None
+        return self._parse_fused(response, artifacts)
 
+    async def analyze_fused_async(self, artifacts: AlertArtifacts) -> Optional[FusedAnalysisResult]:
+        """Async variant of analyze_fused."""
+        try:
+            response = await self._call_llm_async(
+                prompts.SYSTEM_PROMPT, self._fused_prompt(artifacts), max_tokens=self.FUSED_MAX_TOKENS,
+                validate=self._is_valid_fused
+            )
         except Exception as e:
-            logger.error(f"Description generation failed: {e}")
-            return {
-                "title": artifacts.alert_name,
-                "description": analysis_result.findings_summary,
-                "business_impact": "Review required",
-                "technical_details": ""
-            }
+            logger.error(f"Fused analysis failed: {e}")
+            return None
+        return self._parse_fused(response, artifacts)
+
+    def _fused_prompt(self, artifacts: AlertArtifacts) -> str:
+        return prompts.FUSED_ANALYSIS_PROMPT.format(
+            alert_name=artifacts.alert_name,
+            code_summary=artifacts.code_summary or "Not available",
+            explanation=artifacts.explanation or "Not available",
+            metadata=artifacts.metadata[:1000] if artifacts.metadata else "Not available",
+            summary_data=self._summary_for_prompt(artifacts)
+        )
+
+    def _parse_fused(self, response: str, artifacts: AlertArtifacts) -> Optional[FusedAnalysisResult]:
+        """Build a FusedAnalysisResult, or None if the response fails the schema check."""
+        result = self._parse_json_response(response)
+        errors = self._validate_fused_response(result)
+        if errors:
+            logger.warning(f"Fused response for {artifacts.alert_name} failed schema check: {'; '.join(errors)}")
+            return None
+
+        classification = result["classification"]
+        analysis = result["analysis"]
+        risk = result["risk"]
+        description = result["description"]
+
+        focus_area = classification["focus_area"]
+        if focus_area not in self.VALID_FOCUS_AREAS:
+            logger.warning(f"Invalid focus area from LLM: {focus_area}, defaulting to BUSINESS_CONTROL")
+            focus_area = "BUSINESS_CONTROL"
+
+        analysis_result = AnalysisResult(
+            findings_summary=analysis["findings_summary"],
+            qualitative_analysis=analysis["qualitative_analysis"],
+            quantitative_analysis=analysis["quantitative_analysis"],
+            severity=analysis["severity"],
+            severity_reasoning=analysis.get("severity_reasoning", ""),
+            recommended_actions=analysis["recommended_actions"],
+            raw_response=response
+        )
+
+        return FusedAnalysisResult(
+            classification=ClassificationResult(
+                focus_area=focus_area,
+                confidence=float(classification["confidence"]),
+                reasoning=classification.get("reasoning", "Classification based on alert content"),
+                raw_response=response
+            ),
+            analysis=analysis_result,
+            risk=RiskScore(
+                risk_score=int(risk["risk_score"]),
+                risk_level=risk["risk_level"],
+                risk_factors=risk["risk_factors"],
+                potential_financial_impact=risk.get("potential_financial_impact") or {},
+                raw_response=response
+            ),
+            description={
+                "title": description["title"],
+                "description": description.get("description") or analysis_result.findings_summary,
+                "business_impact": description.get("business_impact", ""),
+                "technical_details": description.get("technical_details", "")
+            },
+            raw_response=response
+        )
+
+    def _validate_fused_response(self, result: Dict[str, Any]) -> List[str]:
+        """
+        Check a parsed fused response against the FUSED_ANALYSIS_PROMPT schema.
+
+        Returns:
+            List of schema errors (empty if the response is usable)
+        """
+        if not isinstance(result, dict) or "error" in result:
+            return ["response is not a JSON object"]
+
+        errors = []
+        sections = {}
+        for name in ("classification", "analysis", "risk", "description"):
+            section = result.get(name)
+            if isinstance(section, dict):
+                sections[name] = section
+            else:
+                errors.append(f"missing section '{name}'")
+        if errors:
+            return errors
+
+        def check(section: str, key: str, types, predicate=None, message: str = "invalid value"):
+            value = sections[section].get(key)
+            if not isinstance(value, types) or isinstance(value, bool):
+                errors.append(f"{section}.{key} has wrong type")
+            elif predicate is not None and not predicate(value):
+                errors.append(f"{section}.{key}: {message}")
+
+        check("classification", "focus_area", str)
+        check("classification", "confidence", (int, float), lambda v: 0 <= v <= 1, "must be 0-1")
+        check("analysis", "findings_summary", str)
+        check("analysis", "qualitative_analysis", dict)
+        check("analysis", "quantitative_analysis", dict)
+        check("analysis", "severity", str, lambda v: v in self.VALID_SEVERITIES, "unknown severity")
+        check("analysis", "recommended_actions", list)
+        check("risk", "risk_score", (int, float), lambda v: 0 <= v <= 100, "must be 0-100")
+        check("risk", "risk_level", str)
+        check("risk", "risk_factors", list)
+        check("description", "title", str, lambda v: bool(v.strip()), "must not be empty")
+        return errors
 
     def analyze_without_llm(self, artifacts: AlertArtifacts) -> Tuple[str, float, str]:
         """
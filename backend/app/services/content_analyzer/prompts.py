@@ -6,7 +6,7 @@ Each prompt is versioned for tracking improvements over time.
 """
 
 # Version tracking for prompts
-PROMPT_VERSION = "1.0.0"
+PROMPT_VERSION = "1.1.0"
 
 # System prompt that establishes the analyzer's role and knowledge
 SYSTEM_PROMPT = """You are an expert SAP security and compliance analyst working for Skywind Software Group's Treasure Hunt Analyzer (THA) system.
@@ -165,6 +165,92 @@ FINDING_DESCRIPTION_PROMPT = """Generate a clear, professional finding descripti
 }}
 """
 
+# Single-call prompt that replaces the classification, analysis, risk scoring
+# and description prompts (fused analysis mode)
+FUSED_ANALYSIS_PROMPT = """Analyze the following alert in ONE pass: classify it, analyze its Summary data, score its risk and write the finding description.
+
+## Alert Information
+
+**Alert Name:** {alert_name}
+
+**Code Context (What the alert technically detects):**
+{code_summary}
+
+**Explanation (Business context):**
+{explanation}
+
+**Metadata (Parameters):**
+{metadata}
+
+## Summary Data to Analyze:
+{summary_data}
+
+## Focus Areas (choose ONE):
+1. BUSINESS_PROTECTION - Fraud, cybersecurity, vendor manipulation, unauthorized postings
+2. BUSINESS_CONTROL - Process bottlenecks, approval delays, business anomalies
+3. ACCESS_GOVERNANCE - SoD violations, excessive privileges, authorization issues
+4. TECHNICAL_CONTROL - System dumps, memory/CPU issues, infrastructure problems
+5. JOBS_CONTROL - Long-running jobs, job failures, resource contention
+6. S/4HANA_EXCELLENCE - Post-migration safeguarding, configuration drift, migration validation
+
+## Risk Scoring Guidelines:
+- 0-25: Low risk - Minor issues, no immediate action required
+- 26-50: Medium risk - Should be reviewed, potential for escalation
+- 51-75: High risk - Requires attention, significant business impact possible
+- 76-100: Critical risk - Immediate action required, major business impact
+
+## Description Requirements:
+- Title: Brief, action-oriented (max 100 chars)
+- Description: 2-3 sentences explaining the finding
+- Business Impact: Why this matters to the business
+
+## Your Response (JSON format, all four sections required):
+{{
+    "classification": {{
+        "focus_area": "FOCUS_AREA_CODE",
+        "confidence": 0.0-1.0,
+        "reasoning": "Brief explanation of why this classification"
+    }},
+    "analysis": {{
+        "findings_summary": "Human-readable summary of what was found",
+        "qualitative_analysis": {{
+            "what_happened": "Description of the events/issues detected",
+            "business_risk": "What business risk does this represent",
+            "affected_areas": ["list", "of", "affected", "business", "areas"]
+        }},
+        "quantitative_analysis": {{
+            "total_count": 0,
+            "key_metrics": {{
+                "metric_name": "value"
+            }},
+            "notable_items": [
+                {{"item": "description", "value": "amount/count"}}
+            ]
+        }},
+        "severity": "Critical|High|Medium|Low",
+        "severity_reasoning": "Why this severity level",
+        "recommended_actions": ["action1", "action2"]
+    }},
+    "risk": {{
+        "risk_score": 0-100,
+        "risk_level": "Low|Medium|High|Critical",
+        "risk_factors": ["factor1", "factor2"],
+        "potential_financial_impact": {{
+            "estimated_amount": 0.0,
+            "currency": "USD",
+            "confidence": 0.0-1.0,
+            "reasoning": "How this estimate was derived"
+        }}
+    }},
+    "description": {{
+        "title": "Concise finding title",
+        "description": "Detailed description of the finding",
+        "business_impact": "Why this matters to the business",
+        "technical_details": "Optional technical context"
+    }}
+}}
+"""
+
 # Prompt for when we need to extract structured data from Summary
 DATA_EXTRACTION_PROMPT = """Extract structured data from the following alert Summary.
 
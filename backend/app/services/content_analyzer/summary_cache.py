@@ -0,0 +1,201 @@
+"""
+Summary Cache for Parsed Summary Files
+
+Persists parsed SummaryData (column profiles, totals, concentrations,
+sample rows, raw text) on disk, keyed by the SHA-256 of the Summary file
+content, so re-analyzing an unchanged alert skips xlsx parsing entirely.
+
+Entries are stored as zlib-compressed pickles under
+<cache_dir>/<digest[:2]>/<digest>.summary with a small format header.
+Total size is bounded: when it exceeds max_bytes the least recently used
+entries (by file mtime, bumped on every hit) are evicted. Entries are
+unpickled on read, so the cache directory must only be writable by THA.
+"""
+
+import os
+import hashlib
+import logging
+import pickle
+import threading
+import zlib
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+from .artifact_reader import SummaryData
+
+logger = logging.getLogger(__name__)
+
+
+class SummaryCache:
+    """
+    Content-addressed on-disk cache of parsed SummaryData.
+
+    Usage:
+        cache = SummaryCache("./storage/summary_cache", max_bytes=512 * 1024 * 1024)
+        key = cache.key_for(summary_path)
+        summary_data = cache.get(key)
+        if summary_data is None:
+            summary_data = parse(summary_path)
+            cache.put(key, summary_data)
+    """
+
+    # Bump when SummaryData or the Summary parsing rules change
+    FORMAT_VERSION = 2
+    MAGIC = b"THSC"
+    ENTRY_SUFFIX = ".summary"
+    HASH_CHUNK_BYTES = 1024 * 1024
+
+    def __init__(self, cache_dir: str, max_bytes: int = 512 * 1024 * 1024):
+        self.cache_dir = Path(cache_dir)
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+
+        self._lock = threading.Lock()
+        # Resolved path -> (size, mtime_ns, digest); avoids rehashing unchanged files
+        self._digests: Dict[str, Tuple[int, int, str]] = {}
+        self._total_bytes: Optional[int] = None
+
+    def key_for(self, filepath: str) -> str:
+        """SHA-256 of the file content (memoized per size + mtime)."""
+        path = os.path.realpath(filepath)
+        stat = os.stat(path)
+        with self._lock:
+            known = self._digests.get(path)
+        if known and known[0] == stat.st_size and known[1] == stat.st_mtime_ns:
+            return known[2]
+
+        sha = hashlib.sha256()
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(self.HASH_CHUNK_BYTES), b""):
+                sha.update(chunk)
+        digest = sha.hexdigest()
+
+        with self._lock:
+            self._digests[path] = (stat.st_size, stat.st_mtime_ns, digest)
+        return digest
+
+    def _entry_path(self, key: str) -> Path:
+        return self.cache_dir / key[:2] / f"{key}{self.ENTRY_SUFFIX}"
+
+    def _header(self) -> bytes:
+        return self.MAGIC + bytes([self.FORMAT_VERSION])
+
+    def get(self, key: str) -> Optional[SummaryData]:
+        """Return cached SummaryData for a key, or None on a miss."""
+        path = self._entry_path(key)
+        try:
+            data = path.read_bytes()
+        except OSError:
+            self._count(hit=False)
+            return None
+
+        header = self._header()
+        try:
+            if not data.startswith(header):
+                raise ValueError("unknown cache entry format")
+            summary_data = pickle.loads(zlib.decompress(data[len(header):]))
+            if not isinstance(summary_data, SummaryData):
+                raise ValueError("cache entry is not SummaryData")
+        except Exception as e:
+            logger.warning(f"Discarding unreadable summary cache entry {path.name}: {e}")
+            self._remove(path)
+            self._count(hit=False)
+            return None
+
+        # Mark as recently used for LRU eviction
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        self._count(hit=True)
+        return summary_data
+
+    def _count(self, hit: bool):
+        with self._lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+    def put(self, key: str, summary_data: SummaryData):
+        """Store SummaryData under a key and evict old entries if over budget."""
+        path = self._entry_path(key)
+        try:
+            payload = self._header() + zlib.compress(
+                pickle.dumps(summary_data, protocol=pickle.HIGHEST_PROTOCOL), 6
+            )
+        except Exception as e:
+            logger.warning(f"Could not serialize summary for cache: {e}")
+            return
+
+        if len(payload) > self.max_bytes:
+            return
+
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            previous = path.stat().st_size if path.exists() else 0
+            tmp_path = path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+            tmp_path.write_bytes(payload)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            logger.warning(f"Could not write summary cache entry {path.name}: {e}")
+            return
+
+        with self._lock:
+            if self._total_bytes is not None:
+                self._total_bytes += len(payload) - previous
+        self._evict()
+
+    def _entries(self):
+        """All cache entries as (mtime, size, path)."""
+        entries = []
+        for path in self.cache_dir.glob(f"*/*{self.ENTRY_SUFFIX}"):
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+        return entries
+
+    def _evict(self):
+        """Delete least recently used entries until the cache fits max_bytes."""
+        with self._lock:
+            if self._total_bytes is not None and self._total_bytes <= self.max_bytes:
+                return
+
+            entries = self._entries()
+            total = sum(size for _, size, _ in entries)
+            if total > self.max_bytes:
+                for _, size, path in sorted(entries, key=lambda e: e[0]):
+                    if self._remove(path):
+                        total -= size
+                    if total <= self.max_bytes:
+                        break
+            self._total_bytes = total
+
+    def _remove(self, path: Path) -> bool:
+        try:
+            path.unlink()
+            return True
+        except OSError:
+            return False
+
+    def clear(self):
+        """Remove all cache entries."""
+        with self._lock:
+            for _, _, path in self._entries():
+                self._remove(path)
+            self._total_bytes = 0
+
+    def stats(self) -> Dict[str, int]:
+        """Hit/miss counters and current on-disk size."""
+        with self._lock:
+            size = sum(size for _, size, _ in self._entries())
+            self._total_bytes = size
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "size_bytes": size,
+            "max_bytes": self.max_bytes,
+        }
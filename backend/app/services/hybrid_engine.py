@@ -2,7 +2,7 @@
 Hybrid Money Loss Calculation Engine
 Combines LLM reasoning with ML predictions
 """
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional, Sequence
 from app.models.finding import Finding
 from app.models.issue_type import IssueType
 from app.services.llm_engine.money_loss_llm import MoneyLossLLM
@@ -35,28 +35,59 @@ class HybridMoneyLossEngine:
         Returns:
             Dict with final estimate and breakdown
         """
-        llm_result = None
-        ml_result = None
+        return self.calculate_many(
+            [finding], [issue_type], [additional_context], use_llm=use_llm, use_ml=use_ml
+        )[0]
+    
+    def calculate_many(self, findings: Sequence[Finding],
+                       issue_types: Optional[Sequence[Optional[IssueType]]] = None,
+                       additional_contexts: Optional[Sequence[Optional[Dict[str, Any]]]] = None,
+                       use_llm: bool = True,
+                       use_ml: bool = True) -> List[Dict[str, Any]]:
+        """
+        Calculate money loss for several findings
+        
+        ML estimates come from one batched model call; LLM estimates (when
+        enabled) are still requested per finding.
+        
+        Args:
+            findings: Findings to calculate loss for
+            issue_types: Issue type per finding; default each finding's issue_type
+            additional_contexts: LLM context per finding
+            use_llm: Whether to use LLM calculation
+            use_ml: Whether to use ML calculation
         
-        # Get LLM estimate
+        Returns:
+            One dict per finding, as calculate() returns
+        """
+        if issue_types is None:
+            issue_types = [finding.issue_type for finding in findings]
+        if additional_contexts is None:
+            additional_contexts = [None] * len(findings)
+        
+        # Get LLM estimates
+        llm_results: List[Optional[Dict[str, Any]]] = [None] * len(findings)
         if use_llm and self.llm_calculator:
-            try:
-                llm_result = self.llm_calculator.calculate(
-                    finding, issue_type, additional_context
-                )
-            except Exception as e:
-                # Fallback to ML if LLM fails
-                use_llm = False
-        else:
-            use_llm = False
+            for i, (finding, issue_type, context) in enumerate(zip(findings, issue_types, additional_contexts)):
+                try:
+                    llm_results[i] = self.llm_calculator.calculate(finding, issue_type, context)
+                except Exception:
+                    # Fallback to ML if LLM fails
+                    pass
         
-        # Get ML estimate
+        # Get ML estimates
+        ml_results: List[Optional[Dict[str, Any]]] = [None] * len(findings)
         if use_ml:
             try:
-                ml_result = self.ml_calculator.calculate(finding, issue_type)
+                ml_results = self.ml_calculator.calculate_many(findings, issue_types)
             except Exception:
-                use_ml = False
+                pass
         
+        return [self._combine(llm_result, ml_result) for llm_result, ml_result in zip(llm_results, ml_results)]
+    
+    def _combine(self, llm_result: Optional[Dict[str, Any]],
+                 ml_result: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+        """Final estimate from the LLM and ML results of one finding"""
         # Combine results
         if llm_result and ml_result:
             # Weighted average: LLM gets higher weight for reasoning
@@ -1,19 +1,23 @@
 from .base_parser import BaseParser
 from .pdf_parser import PDFParser
+from .pdf_page_cache import PDFPageCache
 from .csv_parser import CSVParser
 from .docx_parser import DOCXParser
 from .excel_parser_4c import ExcelParser4C
 from .excel_parser_soda import ExcelParserSoDA
+from .workbook_probe import WorkbookProbe
 from .parser_factory import ParserFactory
 from .data_saver import DataSaver
 
 __all__ = [
     "BaseParser",
     "PDFParser",
+    "PDFPageCache",
     "CSVParser",
     "DOCXParser",
     "ExcelParser4C",
     "ExcelParserSoDA",
+    "WorkbookProbe",
     "ParserFactory",
     "DataSaver",
 ]
@@ -0,0 +1,180 @@
+"""
+Streaming extraction of alert artifact archives.
+
+A ZIP of 4C alert output (hundreds of alert folders with Code_,
+Explanation_, Metadata_ and Summary_ files) is unpacked member by member
+with a fixed-size copy buffer, so memory stays bounded whatever the
+archive size. Each artifact is written straight into one directory per
+alert, named "<alert_id> - <alert name>" like the exported alert folders,
+with the alert taken from the artifact filename (ArtifactReader's
+_parse_filename) or, failing that, from the folder the file sits in.
+The resulting directories are what the batch analysis queue consumes.
+"""
+import logging
+import os
+import re
+import shutil
+import zipfile
+from dataclasses import dataclass, field
+from pathlib import PurePosixPath
+from typing import BinaryIO, Dict, List, Optional, Tuple, Union
+
+from app.services.content_analyzer.artifact_reader import ArtifactReader
+
+logger = logging.getLogger(__name__)
+
+# Characters not allowed in the alert directory names we create
+_UNSAFE_NAME = re.compile(r'[\\/:*?"<>|\x00-\x1f]')
+
+
+class ArchiveError(ValueError):
+    """The archive is unreadable or exceeds the extraction limits"""
+
+
+@dataclass
+class ExtractedAlert:
+    """One alert's artifacts, extracted into their own directory"""
+    alert_id: str
+    alert_name: str
+    directory: str
+    artifacts: Dict[str, str] = field(default_factory=dict)  # artifact type -> file path
+    size: int = 0
+
+    @property
+    def analyzable(self) -> bool:
+        """A Summary plus at least one other artifact, as scan-folders requires"""
+        return 'summary' in self.artifacts and len(self.artifacts) >= 2
+
+
+@dataclass
+class ExtractionResult:
+    """Outcome of ArchiveExtractor.extract"""
+    alerts: List[ExtractedAlert]
+    skipped: List[str]  # archive members that are not alert artifacts
+    total_bytes: int
+
+
+class ArchiveExtractor:
+    """
+    Unpack alert artifact ZIPs into per-alert directories.
+
+    Usage:
+        extractor = ArchiveExtractor(max_members=20000, max_bytes=2 * 1024 ** 3)
+        result = extractor.extract(upload.file, "./storage/archives/1700000000.0")
+        queue.create_job([alert.directory for alert in result.alerts if alert.analyzable])
+    """
+
+    COPY_BUFFER_BYTES = 1024 * 1024
+
+    def __init__(
+        self,
+        max_members: int = 20000,
+        max_bytes: int = 2 * 1024 * 1024 * 1024,
+        reader: Optional[ArtifactReader] = None
+    ):
+        """
+        Args:
+            max_members: Most archive entries accepted
+            max_bytes: Most bytes written in total; counted while copying,
+                so a member that lies about its size cannot exceed it
+            reader: ArtifactReader whose filename rules identify artifacts
+        """
+        self.max_members = max_members
+        self.max_bytes = max_bytes
+        self.reader = reader or ArtifactReader()
+
+    def extract(self, archive: Union[str, BinaryIO], target_dir: str) -> ExtractionResult:
+        """
+        Extract every alert artifact of the archive under target_dir.
+
+        Raises:
+            ArchiveError: Not a ZIP file, or over max_members / max_bytes
+        """
+        try:
+            with zipfile.ZipFile(archive) as zf:
+                members = [info for info in zf.infolist() if not info.is_dir()]
+                if len(members) > self.max_members:
+                    raise ArchiveError(
+                        f"Archive has {len(members)} files, more than the {self.max_members} allowed"
+                    )
+                return self._extract_members(zf, members, target_dir)
+        except (zipfile.BadZipFile, NotImplementedError, RuntimeError) as e:
+            # RuntimeError: encrypted member; NotImplementedError: unsupported compression
+            raise ArchiveError(f"Not a readable ZIP archive: {e}")
+
+    def _extract_members(self, zf: zipfile.ZipFile, members: List[zipfile.ZipInfo], target_dir: str) -> ExtractionResult:
+        alerts: Dict[str, ExtractedAlert] = {}
+        skipped = []
+        total_bytes = 0
+
+        for info in members:
+            member = PurePosixPath(info.filename.replace('\\', '/'))
+            artifact_type = self.reader.artifact_type(member.name)
+            if artifact_type is None or member.name.startswith('.'):
+                skipped.append(info.filename)
+                continue
+
+            alert_id, alert_name = self._alert_for(member)
+            alert = alerts.get(alert_id)
+            if alert is None:
+                directory = os.path.join(target_dir, self._directory_name(alert_id, alert_name))
+                os.makedirs(directory, exist_ok=True)
+                alert = alerts[alert_id] = ExtractedAlert(alert_id, alert_name, directory)
+
+            # Only the file name is kept, so member paths cannot escape target_dir
+            file_path = os.path.join(alert.directory, member.name)
+            if os.path.exists(file_path):
+                skipped.append(info.filename)
+                continue
+
+            written = self._copy_member(zf, info, file_path, self.max_bytes - total_bytes)
+            total_bytes += written
+            alert.size += written
+            alert.artifacts.setdefault(artifact_type, file_path)
+
+        logger.info(f"Extracted {len(alerts)} alerts ({total_bytes} bytes), skipped {len(skipped)} files")
+        return ExtractionResult(list(alerts.values()), skipped, total_bytes)
+
+    def _alert_for(self, member: PurePosixPath) -> Tuple[str, str]:
+        """Alert ID and name from the artifact filename, else from its folder"""
+        alert_id, alert_name = self.reader._parse_filename(member.name)
+        if alert_id:
+            return alert_id, alert_name
+
+        folder = member.parent.name or 'Unknown Alert'
+        # Exported alert folders are named "200025_001373 - Alert Name"
+        match = re.match(r'^\(?(\d+_\d+)\s*-\s*(.+)$', folder)
+        if match:
+            return match.group(1), match.group(2)
+        return folder, folder
+
+    @staticmethod
+    def _directory_name(alert_id: str, alert_name: str) -> str:
+        name = alert_id if alert_name in ('', alert_id) else f"{alert_id} - {alert_name}"
+        return _UNSAFE_NAME.sub('_', name).strip(' .')[:200] or 'alert'
+
+    def _copy_member(self, zf: zipfile.ZipFile, info: zipfile.ZipInfo, file_path: str, budget: int) -> int:
+        """Stream one member to disk with a fixed buffer; returns the bytes written"""
+        written = 0
+        try:
+            with zf.open(info) as source, open(file_path, 'wb') as target:
+                while True:
+                    chunk = source.read(self.COPY_BUFFER_BYTES)
+                    if not chunk:
+                        break
+                    written += len(chunk)
+                    if written > budget:
+                        raise ArchiveError(
+                            f"Archive expands to more than {self.max_bytes // (1024 * 1024)}MB"
+                        )
+                    target.write(chunk)
+        except Exception:
+            if os.path.exists(file_path):
+                os.remove(file_path)
+            raise
+        return written
+
+    @staticmethod
+    def discard(target_dir: str):
+        """Remove an extraction directory (after a failed extraction)"""
+        shutil.rmtree(target_dir, ignore_errors=True)
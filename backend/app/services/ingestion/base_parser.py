@@ -1,5 +1,6 @@
 from abc import ABC, abstractmethod
-from typing import Dict, List, Any, Optional
+from itertools import chain
+from typing import Dict, Iterator, List, Any, Optional
 from pathlib import Path
 
 
@@ -15,10 +16,39 @@ class BaseParser(ABC):
             Dict with keys:
             - metadata: Dict with file metadata
             - data: List of records or DataFrame-like structure
+            - records_cleaned: True if records are already JSON-safe
+              (see record_cleaner.dataframe_to_records)
             - errors: List of any errors encountered
         """
         pass
     
+    def parse_stream(self, file_path: str, batch_size: int = 1000, preview_rows: int = 10) -> Dict[str, Any]:
+        """
+        Parse a file with its records delivered in batches instead of one list
+        
+        Returns the parse() dict with 'data' replaced by:
+            - batches: iterator of record lists (at most batch_size each),
+              consumed once, e.g. by DataSaver
+            - preview: up to preview_rows records from the first batch
+        
+        Parsers that can read a file incrementally override this; the default
+        parses the whole file and slices the record list. Non-tabular data
+        (e.g. PDF text) is returned unchanged under 'data'.
+        """
+        result = self.parse(file_path)
+        data = result.get('data')
+        if isinstance(data, list):
+            del result['data']
+            batches = (data[start:start + batch_size] for start in range(0, len(data), batch_size))
+            self._attach_batches(result, batches, preview_rows)
+        return result
+    
+    def _attach_batches(self, result: Dict[str, Any], batches: Iterator[List[Dict[str, Any]]], preview_rows: int):
+        """Store batches in a parse result, reading ahead only the first batch for the preview"""
+        first = next(batches, [])
+        result['preview'] = first[:preview_rows]
+        result['batches'] = chain([first], batches)
+    
     @abstractmethod
     def can_parse(self, file_path: str) -> bool:
         """Check if this parser can handle the given file"""
@@ -0,0 +1,146 @@
+"""
+Bulk loader for ingested alert / report rows.
+
+Streams rows into PostgreSQL with COPY FROM STDIN; other databases
+(SQLite in development and tests) get a single executemany INSERT. Rows
+are tuples in `columns` order, with JSON columns already serialized to
+text so each record is encoded exactly once.
+"""
+import io
+import logging
+from datetime import date, datetime
+from typing import Any, Iterable, List, Optional, Sequence
+
+from sqlalchemy import Table, Text, bindparam, insert
+from sqlalchemy.orm import Session
+
+logger = logging.getLogger(__name__)
+
+
+def _copy_text(value: Any) -> str:
+    """Format one value for COPY's text format."""
+    if value is None:
+        return "\\N"
+    if isinstance(value, datetime):
+        return value.isoformat(sep=" ")
+    if isinstance(value, date):
+        return value.isoformat()
+    text = str(value)
+    if "\\" in text or "\t" in text or "\n" in text or "\r" in text:
+        text = (
+            text.replace("\\", "\\\\")
+            .replace("\t", "\\t")
+            .replace("\n", "\\n")
+            .replace("\r", "\\r")
+        )
+    return text
+
+
+class _CopyStream(io.TextIOBase):
+    """File-like object feeding COPY from a row iterator, chunk by chunk."""
+
+    def __init__(self, rows: Iterable[Sequence[Any]], chunk_rows: int):
+        self._rows = iter(rows)
+        self._chunk_rows = chunk_rows
+        self._buffer = ""
+        self._position = 0
+        self.row_count = 0
+
+    def readable(self) -> bool:
+        return True
+
+    def _fill(self) -> bool:
+        """Format the next chunk of rows once the current one is consumed."""
+        lines = []
+        for row in self._rows:
+            lines.append("\t".join(_copy_text(value) for value in row))
+            if len(lines) >= self._chunk_rows:
+                break
+        if not lines:
+            return False
+        self.row_count += len(lines)
+        self._buffer = "\n".join(lines) + "\n"
+        self._position = 0
+        return True
+
+    def read(self, size: Optional[int] = -1) -> str:
+        if size is None or size < 0:
+            parts = [self._buffer[self._position:]]
+            while self._fill():
+                parts.append(self._buffer)
+            self._buffer, self._position = "", 0
+            return "".join(parts)
+
+        if self._position >= len(self._buffer) and not self._fill():
+            return ""
+        chunk = self._buffer[self._position:self._position + size]
+        self._position += len(chunk)
+        return chunk
+
+
+class BulkLoader:
+    """Insert many rows into one table within the session's transaction"""
+
+    def __init__(self, db: Session, chunk_rows: int = 10000):
+        self.db = db
+        self.chunk_rows = chunk_rows
+
+    @property
+    def uses_copy(self) -> bool:
+        """True when the session is bound to PostgreSQL via psycopg2"""
+        dialect = self.db.get_bind().dialect
+        return dialect.name == "postgresql" and dialect.driver == "psycopg2"
+
+    def load(
+        self,
+        table: Table,
+        columns: List[str],
+        rows: Iterable[Sequence[Any]],
+        json_columns: Sequence[str] = ()
+    ) -> int:
+        """
+        Insert rows (tuples in `columns` order) and return the number inserted.
+
+        Values of `json_columns` must already be JSON text. Does not commit.
+        """
+        if self.uses_copy:
+            return self._copy(table, columns, rows)
+        return self._executemany(table, columns, rows, json_columns)
+
+    def _copy(self, table: Table, columns: List[str], rows: Iterable[Sequence[Any]]) -> int:
+        stream = _CopyStream(rows, self.chunk_rows)
+        column_list = ", ".join(f'"{column}"' for column in columns)
+        cursor = self.db.connection().connection.cursor()
+        try:
+            cursor.copy_expert(f'COPY "{table.name}" ({column_list}) FROM STDIN', stream)
+        finally:
+            cursor.close()
+        logger.info(f"COPY loaded {stream.row_count} rows into {table.name}")
+        return stream.row_count
+
+    def _executemany(
+        self,
+        table: Table,
+        columns: List[str],
+        rows: Iterable[Sequence[Any]],
+        json_columns: Sequence[str]
+    ) -> int:
+        # Pre-serialized JSON is bound as plain text so it is not encoded again
+        keys = [f"{column}_json" if column in json_columns else column for column in columns]
+        statement = insert(table).values(
+            {column: bindparam(f"{column}_json", type_=Text()) for column in json_columns}
+        )
+
+        total = 0
+        batch = []
+        for row in rows:
+            batch.append(dict(zip(keys, row)))
+            if len(batch) >= self.chunk_rows:
+                self.db.execute(statement, batch)
+                total += len(batch)
+                batch = []
+        if batch:
+            self.db.execute(statement, batch)
+            total += len(batch)
+        logger.info(f"Inserted {total} rows into {table.name}")
+        return total
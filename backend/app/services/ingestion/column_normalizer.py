@@ -0,0 +1,116 @@
+"""
+Column-level parsing of ingested date, timestamp and duration fields.
+
+DataSaver used to run strptime with up to four formats on every record.
+parse_datetime_column() instead detects which of the accepted formats a
+column uses from a sample and parses the whole column with
+pd.to_datetime(format=...), format by format, parsing each distinct
+string once. Values that no format parses (or that pandas cannot
+represent, e.g. out-of-bounds years on pandas versions with nanosecond
+timestamps only) are returned in a separate bucket of row positions for
+the caller's per-value fallback, so results stay identical to the
+per-record strptime rules.
+"""
+from dataclasses import dataclass, field
+from typing import Any, List, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+# Values to_datetime() resolves to the current time regardless of the format
+_RELATIVE_WORDS = {"now", "today"}
+
+
+@dataclass
+class ParsedColumn:
+    """Parsed values in row order, plus the rows left for a per-value fallback"""
+    values: List[Any]
+    unparsed: List[int] = field(default_factory=list)  # positions of non-empty values not parsed
+
+
+def _distinct_present(values: Sequence[Any]) -> Tuple[np.ndarray, np.ndarray, pd.Series]:
+    """
+    Positions of the truthy values, and str() of each as codes into distinct strings.
+
+    Empty (falsy) values are left out; only the distinct strings are parsed.
+    """
+    column = pd.Series(values, dtype=object)
+    present = column.astype(bool).to_numpy()
+    codes, uniques = pd.factorize(column[present].map(str))
+    return np.flatnonzero(present), codes, pd.Series(np.asarray(uniques, dtype=object), dtype=object)
+
+
+def rank_formats(strings: pd.Series, formats: Sequence[str], sample_size: int = 200) -> List[str]:
+    """Formats that parse any of the first sample_size strings, most matches first"""
+    sample = strings.head(sample_size)
+    sample = sample[~sample.isin(_RELATIVE_WORDS)]
+    counts = {fmt: int(pd.to_datetime(sample, format=fmt, errors="coerce").notna().sum()) for fmt in formats}
+    # sorted() is stable, so ties keep the order of `formats`
+    return sorted((fmt for fmt in formats if counts[fmt]), key=lambda fmt: -counts[fmt])
+
+
+def parse_datetime_column(values: Sequence[Any], formats: Sequence[str], sample_size: int = 200) -> ParsedColumn:
+    """
+    Parse values with the first matching strptime format, a column at a time.
+
+    Empty values become None. The accepted formats must not overlap (no
+    string parses under two of them), which holds for the separators and
+    field orders DataSaver uses.
+    """
+    result = np.full(len(values), None, dtype=object)
+    positions, codes, strings = _distinct_present(values)
+    if strings.empty:
+        return ParsedColumn(result.tolist())
+
+    parsed = np.full(len(strings), None, dtype=object)
+    remaining = strings[~strings.isin(_RELATIVE_WORDS)]
+    for fmt in rank_formats(remaining, formats, sample_size):
+        if remaining.empty:
+            break
+        converted = pd.to_datetime(remaining, format=fmt, errors="coerce")
+        matched = converted.notna().to_numpy()
+        parsed[remaining.index[matched]] = list(converted[matched].dt.to_pydatetime())
+        remaining = remaining[~matched]
+
+    result[positions] = parsed[codes]
+    unparsed = np.isin(codes, np.flatnonzero(pd.isna(parsed)))
+    return ParsedColumn(result.tolist(), positions[unparsed].tolist())
+
+
+def _to_float(strings: pd.Series) -> np.ndarray:
+    """float() of each string, NaN where float() fails"""
+    try:
+        # numpy parses like float(), but rejects the whole array on one bad value
+        return strings.to_numpy(dtype=str).astype(float)
+    except ValueError:
+        pass
+    numbers = np.full(len(strings), np.nan)
+    # to_numeric only finds the candidates; its own parsing rounds long decimals differently
+    numeric = pd.to_numeric(strings, errors="coerce").notna().to_numpy()
+    try:
+        numbers[numeric] = strings[numeric].to_numpy(dtype=str).astype(float)
+    except ValueError:
+        pass
+    return numbers
+
+
+def parse_integer_column(values: Sequence[Any]) -> ParsedColumn:
+    """
+    int(float(str(value))) for every value, a column at a time.
+
+    Empty values become None; values that are not finite numbers are
+    returned in the unparsed bucket.
+    """
+    result = np.full(len(values), None, dtype=object)
+    positions, codes, strings = _distinct_present(values)
+    if strings.empty:
+        return ParsedColumn(result.tolist())
+
+    numbers = _to_float(strings)
+    finite = np.isfinite(numbers)
+    parsed = np.full(len(strings), None, dtype=object)
+    parsed[finite] = [int(number) for number in numbers[finite]]
+
+    result[positions] = parsed[codes]
+    unparsed = ~finite[codes]
+    return ParsedColumn(result.tolist(), positions[unparsed].tolist())
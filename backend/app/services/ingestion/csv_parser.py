@@ -1,12 +1,17 @@
 import pandas as pd
 from pathlib import Path
-from typing import Dict, Any
+from typing import Dict, Any, Iterator, List
+from app.utils.encoding import sniff_encoding
 from .base_parser import BaseParser
+from .record_cleaner import dataframe_to_records
 
 
 class CSVParser(BaseParser):
     """Parser for CSV files"""
     
+    # Tried in order; latin-1 accepts any byte sequence
+    ENCODINGS = ['utf-8', 'latin-1', 'iso-8859-1', 'cp1252']
+    
     def can_parse(self, file_path: str) -> bool:
         return self.get_file_extension(file_path) == 'csv'
     
@@ -19,24 +24,16 @@ class CSVParser(BaseParser):
         }
         
         try:
-            # Try different encodings
-            encodings = ['utf-8', 'latin-1', 'iso-8859-1', 'cp1252']
-            df = None
-            
-            for encoding in encodings:
-                try:
-                    df = pd.read_csv(file_path, encoding=encoding)
-                    break
-                except UnicodeDecodeError:
-                    continue
-            
-            if df is None:
+            # Pick the encoding from the bytes, then parse once
+            encoding = sniff_encoding(file_path, self.ENCODINGS)
+            if encoding is None:
                 result['errors'].append("Could not decode CSV file with any standard encoding")
                 return result
             
-            # Convert to records, handling NaN values
-            df = df.where(pd.notna(df), None)
-            records = df.to_dict('records')
+            df = pd.read_csv(file_path, encoding=encoding)
+            
+            # Convert to JSON-safe records (NaN/Infinity -> None, numpy -> Python)
+            records = dataframe_to_records(df)
             
             result['metadata'] = {
                 'row_count': len(df),
@@ -45,9 +42,59 @@ class CSVParser(BaseParser):
             }
             
             result['data'] = records
+            result['records_cleaned'] = True
+            
+        except Exception as e:
+            result['errors'].append(f"Error parsing CSV: {str(e)}")
+        
+        return result
+    
+    def parse_stream(self, file_path: str, batch_size: int = 1000, preview_rows: int = 10) -> Dict[str, Any]:
+        """
+        Parse CSV file in chunks of batch_size rows
+        
+        Only one chunk is in memory at a time. Column types are inferred per
+        chunk, so an integer column with a gap in another chunk keeps its
+        integer values here (parse() would turn the whole column to float).
+        metadata['row_count'] is filled in once all batches are consumed.
+        """
+        result = {
+            'metadata': {},
+            'errors': []
+        }
+        
+        try:
+            encoding = sniff_encoding(file_path, self.ENCODINGS)
+            if encoding is None:
+                result['errors'].append("Could not decode CSV file with any standard encoding")
+                return result
+            
+            reader = pd.read_csv(file_path, encoding=encoding, chunksize=batch_size)
+            first = next(reader)  # header-only files give one empty chunk
             
+            result['metadata'] = {
+                'row_count': None,
+                'column_count': len(first.columns),
+                'columns': first.columns.tolist()
+            }
+            self._attach_batches(
+                result, self._iter_batches(first, reader, result['metadata']), preview_rows
+            )
+            result['records_cleaned'] = True
+        
         except Exception as e:
             result['errors'].append(f"Error parsing CSV: {str(e)}")
         
         return result
+    
+    def _iter_batches(self, first: pd.DataFrame, reader, metadata: Dict[str, Any]) -> Iterator[List[Dict[str, Any]]]:
+        """Clean chunk by chunk; records the total row count at the end"""
+        row_count = 0
+        chunk = first
+        while chunk is not None:
+            row_count += len(chunk)
+            yield dataframe_to_records(chunk)
+            chunk = next(reader, None)
+        reader.close()
+        metadata['row_count'] = row_count
 
@@ -1,58 +1,173 @@
 """
 Service to save parsed data to database
 """
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Callable, Iterable, Iterator, Optional, Tuple
 from sqlalchemy.orm import Session
 from datetime import datetime
+from itertools import chain
+import pandas as pd
+import logging
 import re
 import json
-import math
 
-from app.models.data_source import DataSource
+from app.models.data_source import DataSource, DataSourceType
 from app.models.alert import Alert, AlertMetadata
 from app.models.soda_report import SoDAReport, SoDAReportMetadata
+from .bulk_loader import BulkLoader
+from .column_normalizer import ParsedColumn, parse_datetime_column, parse_integer_column
+from .record_cleaner import clean_json_value
+
+logger = logging.getLogger(__name__)
+
+# Accepted formats, tried in order (they do not overlap)
+TIMESTAMP_FORMATS = [
+    "%d.%m.%Y, %H:%M:%S",
+    "%Y-%m-%d %H:%M:%S",
+    "%d/%m/%Y %H:%M:%S",
+    "%Y/%m/%d %H:%M:%S",
+]
+DATE_FORMATS = [
+    "%Y/%m/%d",
+    "%Y-%m-%d",
+    "%d/%m/%Y",
+    "%d.%m.%Y",
+]
+
+
+# Columns written by the bulk loader (raw_data is pre-serialized JSON)
+ALERT_COLUMNS = [
+    "data_source_id", "application_server", "user_name", "full_name", "client",
+    "transaction_code", "timestamp", "duration", "duration_unit", "ip_address",
+    "date", "raw_data", "created_at",
+]
+SODA_REPORT_COLUMNS = [
+    "data_source_id", "user_name", "role_name", "transaction_code",
+    "authorization_object", "violation_type", "risk_level", "raw_data", "created_at",
+]
+
+
+def _field(records: List[Dict[str, Any]], key: str) -> pd.Series:
+    """record.get(key, '') for every record, as an object column"""
+    return pd.Series([record.get(key, '') for record in records], dtype=object)
+
+
+def _first_field(records: List[Dict[str, Any]]) -> pd.Series:
+    """Value of each record's first column ('' for empty records)"""
+    return pd.Series(
+        [record.get(next(iter(record)), '') if record else '' for record in records],
+        dtype=object
+    )
+
+
+def _coalesce(*columns: pd.Series) -> pd.Series:
+    """Vectorized `a or b or c`: first truthy value per row, else the last column's value"""
+    result = columns[-1]
+    for column in reversed(columns[:-1]):
+        result = column.where(column.astype(bool), result)
+    return result
+
+
+class _RecordBatches:
+    """Iterates record batches once, cleaning them and stopping at a record limit"""
+    
+    def __init__(
+        self,
+        batches: Iterable[List[Dict[str, Any]]],
+        limit: Optional[int] = None,
+        clean: Optional[Callable[[Dict[str, Any]], Dict[str, Any]]] = None
+    ):
+        self._batches = batches
+        self._limit = limit
+        self._clean = clean
+        self.saved = 0  # records handed out so far
+        self.truncated = False  # True if records beyond the limit were dropped
+    
+    def __iter__(self) -> Iterator[List[Dict[str, Any]]]:
+        for batch in self._batches:
+            if not batch:
+                continue
+            if self._limit and self.saved + len(batch) > self._limit:
+                batch = batch[:self._limit - self.saved]
+                self.truncated = True
+            if self._clean is not None:
+                batch = [self._clean(record) for record in batch]
+            if batch:
+                self.saved += len(batch)
+                yield batch
+            if self.truncated:
+                return
 
 
 class DataSaver:
     """Save parsed data to database"""
     
-    def __init__(self, db: Session):
+    def __init__(self, db: Session, loader: Optional[str] = None):
+        """
+        Args:
+            db: Database session
+            loader: "bulk" (COPY on PostgreSQL, executemany elsewhere) or "orm"
+                (one ORM object per record); default settings.INGESTION_LOADER
+        """
+        from app.core.config import settings
+
         self.db = db
+        self.loader = loader or settings.INGESTION_LOADER
     
     def _clean_json_value(self, value: Any) -> Any:
         """Clean value for JSON serialization (replace NaN, Infinity with null)"""
-        # Handle float special values
-        if isinstance(value, float):
-            if math.isnan(value) or math.isinf(value):
-                return None
-            # Check for very large numbers that might cause JSON issues
-            if abs(value) > 1e308:
-                return None
-        # Handle numpy/pandas types
-        elif hasattr(value, 'item'):  # numpy scalar
-            try:
-                return self._clean_json_value(value.item())
-            except (ValueError, OverflowError):
-                return None
-        elif isinstance(value, dict):
-            return {k: self._clean_json_value(v) for k, v in value.items()}
-        elif isinstance(value, list):
-            return [self._clean_json_value(item) for item in value]
-        # Handle other non-serializable types
-        try:
-            json.dumps(value)  # Test if serializable
-            return value
-        except (TypeError, ValueError, OverflowError):
-            return str(value) if value is not None else None
+        return clean_json_value(value)
     
     def _clean_record(self, record: Dict[str, Any]) -> Dict[str, Any]:
         """Clean a record by replacing NaN/Infinity values with null"""
         return {k: self._clean_json_value(v) for k, v in record.items()}
     
-    def save_4c_alert(self, data_source: DataSource, parse_result: Dict[str, Any]):
-        """Save 4C alert data to database"""
+    def _record_batches(self, parse_result: Dict[str, Any]) -> "_RecordBatches":
+        """Cleaned record batches of a parse result, capped at MAX_RECORDS_PER_FILE"""
+        from app.core.config import settings
+        
+        if 'batches' in parse_result:  # parse_stream() result
+            batches = parse_result['batches']
+        else:
+            data = parse_result.get('data', [])
+            batches = (data[i:i + settings.BATCH_SIZE] for i in range(0, len(data), settings.BATCH_SIZE))
+        
+        # Parsers clean records column by column; anything else is cleaned per record
+        clean = None if parse_result.get('records_cleaned') else self._clean_record
+        return _RecordBatches(batches, settings.MAX_RECORDS_PER_FILE, clean)
+    
+    def find_ingested(self, content_sha256: str, data_type: DataSourceType) -> Optional[DataSource]:
+        """
+        Latest completed data source of the same type with identical content
+        
+        Duplicates are never returned themselves, only the upload whose
+        records they share.
+        """
+        return (
+            self.db.query(DataSource)
+            .filter(
+                DataSource.content_sha256 == content_sha256,
+                DataSource.data_type == data_type,
+                DataSource.status == "completed",
+                DataSource.duplicate_of_id.is_(None),
+            )
+            .order_by(DataSource.id.desc())
+            .first()
+        )
+    
+    def saved_count(self, data_source: DataSource) -> int:
+        """Number of records saved for a data source"""
+        model = Alert if data_source.data_type == DataSourceType.ALERT else SoDAReport
+        return self.db.query(model).filter(model.data_source_id == data_source.id).count()
+    
+    def save_4c_alert(self, data_source: DataSource, parse_result: Dict[str, Any]) -> int:
+        """
+        Save 4C alert data to database
+        
+        Accepts a parse() result ('data') or a parse_stream() result
+        ('batches'); batches are consumed once. Returns the number of
+        records saved.
+        """
         metadata = parse_result.get('metadata', {})
-        data = parse_result.get('data', [])
         
         # Save alert metadata
         alert_metadata = AlertMetadata(
@@ -67,39 +182,26 @@ class DataSaver:
         
         # Save alert records
         # Note: All fields from source file (up to 100+) are preserved in raw_data JSON column
-        from app.core.config import settings
-        
-        # Apply limit if configured
-        records_to_process = data
-        if settings.MAX_RECORDS_PER_FILE:
-            records_to_process = data[:settings.MAX_RECORDS_PER_FILE]
-        
-        # Process in batches to avoid memory issues
-        batch_size = settings.BATCH_SIZE
-        total_records = len(records_to_process)
-        
-        for i in range(0, total_records, batch_size):
-            batch = records_to_process[i:i + batch_size]
-            for record in batch:
-                # Clean record to remove NaN values (preserves all fields)
-                cleaned_record = self._clean_record(record)  # All fields preserved
-                alert = self._parse_alert_record(cleaned_record)  # Only extracts common fields
-                alert.data_source_id = data_source.id
-                alert.raw_data = cleaned_record  # Complete record with all fields stored here
-                self.db.add(alert)
-            
-            # Commit batch to avoid large transactions
-            self.db.commit()
+        batches = self._record_batches(parse_result)
+        if self.loader == "orm":
+            self._save_records_orm(data_source, batches, self._parse_alert_records)
+        else:
+            self._bulk_load_alerts(data_source, batches)
         
         # Update metadata with actual count saved
-        if settings.MAX_RECORDS_PER_FILE and len(data) > settings.MAX_RECORDS_PER_FILE:
-            alert_metadata.result_count = len(records_to_process)
+        if batches.truncated:
+            alert_metadata.result_count = batches.saved
             self.db.commit()
+        return batches.saved
     
-    def save_soda_report(self, data_source: DataSource, parse_result: Dict[str, Any]):
-        """Save SoDA report data to database"""
+    def save_soda_report(self, data_source: DataSource, parse_result: Dict[str, Any]) -> int:
+        """
+        Save SoDA report data to database
+        
+        Accepts a parse() or parse_stream() result like save_4c_alert.
+        Returns the number of records saved.
+        """
         metadata = parse_result.get('metadata', {})
-        data = parse_result.get('data', [])
         
         # Save report metadata
         report_date = None
@@ -114,52 +216,156 @@ class DataSaver:
             report_type=metadata.get('report_type', 'UNKNOWN'),
             report_date=report_date,
             parameters=metadata.get('parameters', {}),
-            kpis=metadata.get('kpis', {}),
-            result_count=len(data)
+            kpis=metadata.get('kpis', {})
         )
         self.db.add(report_metadata)
         self.db.flush()
         
         # Save report records
         # Note: All fields from source file (up to 100+) are preserved in raw_data JSON column
-        from app.core.config import settings
-        
-        # Apply limit if configured
-        records_to_process = data
-        if settings.MAX_RECORDS_PER_FILE:
-            records_to_process = data[:settings.MAX_RECORDS_PER_FILE]
-        
-        # Process in batches to avoid memory issues
-        batch_size = settings.BATCH_SIZE
-        total_records = len(records_to_process)
+        batches = self._record_batches(parse_result)
+        report_type = metadata.get('report_type')
+        if self.loader == "orm":
+            self._save_records_orm(
+                data_source, batches, lambda records: [self._parse_soda_record(record, report_type) for record in records]
+            )
+        else:
+            self._bulk_load_soda_reports(data_source, batches, report_type)
         
-        for i in range(0, total_records, batch_size):
-            batch = records_to_process[i:i + batch_size]
-            for record in batch:
-                # Clean record to remove NaN values (preserves all fields)
-                cleaned_record = self._clean_record(record)  # All fields preserved
-                report = self._parse_soda_record(cleaned_record, metadata.get('report_type'))  # Only extracts common fields
-                report.data_source_id = data_source.id
-                report.raw_data = cleaned_record  # Complete record with all fields stored here
-                self.db.add(report)
+        # Record the count saved (a stream's size is only known once consumed)
+        report_metadata.result_count = batches.saved
+        self.db.commit()
+        return batches.saved
+    
+    def _save_records_orm(self, data_source: DataSource, batches: Iterable[List[Dict[str, Any]]], parse_records: Callable):
+        """Save cleaned records as one ORM object each, committing after every batch"""
+        # Batches hold at most BATCH_SIZE records to avoid memory issues
+        for batch in batches:
+            for record, row in zip(batch, parse_records(batch)):  # Only extracts common fields
+                row.data_source_id = data_source.id
+                row.raw_data = record  # Complete record with all fields stored here
+                self.db.add(row)
             
             # Commit batch to avoid large transactions
             self.db.commit()
+    
+    def _bulk_load_alerts(self, data_source: DataSource, batches: Iterable[List[Dict[str, Any]]]):
+        """Bulk load all batches in one stream of rows and commit once"""
+        from app.core.config import settings
+
+        rows = chain.from_iterable(self._alert_rows(data_source, batch) for batch in batches)
+        BulkLoader(self.db, chunk_rows=settings.BATCH_SIZE).load(
+            Alert.__table__, ALERT_COLUMNS, rows, json_columns=["raw_data"]
+        )
+        self.db.commit()
+    
+    def _alert_rows(self, data_source: DataSource, records: List[Dict[str, Any]]) -> Iterator[tuple]:
+        """Normalize alert columns for a batch of cleaned records at once"""
+        # Same field fallbacks as _parse_alert_record, one column at a time
+        timestamps, durations, dates = self._alert_time_columns(records)
+        columns = [
+            [data_source.id] * len(records),
+            _coalesce(_field(records, 'Application Server (RFCDEST)'), _field(records, 'Unnamed: 2')),
+            _coalesce(_field(records, 'User Name (BNAME)'), _field(records, 'Unnamed: 4')),
+            _coalesce(_field(records, 'Full Name (NAME_TEXT)'), _field(records, 'Unnamed: 1')),
+            _coalesce(_field(records, 'Client (MANDT)'), _field(records, 'Unnamed: 3')),
+            _coalesce(_field(records, 'Transaction Code (TCODE)'), _field(records, 'Unnamed: 6')),
+            timestamps,
+            durations,
+            _coalesce(_field(records, 'Duration Unit (DURATION_UNIT)'), _field(records, 'Unnamed: 10')),
+            _coalesce(_field(records, 'IP address (HOSTADR)'), _field(records, 'Unnamed: 12')),
+            dates,
+            [json.dumps(record) for record in records],
+            [datetime.utcnow()] * len(records),
+        ]
+        return zip(*columns)
+    
+    def _bulk_load_soda_reports(self, data_source: DataSource, batches: Iterable[List[Dict[str, Any]]], report_type: str):
+        """Bulk load all batches in one stream of rows and commit once"""
+        from app.core.config import settings
+
+        rows = chain.from_iterable(self._soda_report_rows(data_source, batch, report_type) for batch in batches)
+        BulkLoader(self.db, chunk_rows=settings.BATCH_SIZE).load(
+            SoDAReport.__table__, SODA_REPORT_COLUMNS, rows, json_columns=["raw_data"]
+        )
+        self.db.commit()
+    
+    def _soda_report_rows(self, data_source: DataSource, records: List[Dict[str, Any]], report_type: str) -> Iterator[tuple]:
+        """Normalize SoDA report columns for a batch of cleaned records at once"""
+        count = len(records)
         
-        # Update metadata with actual count saved
-        if settings.MAX_RECORDS_PER_FILE and len(data) > settings.MAX_RECORDS_PER_FILE:
-            report_metadata.result_count = len(records_to_process)
-            self.db.commit()
+        # Same violation rules as _parse_soda_record
+        report_type = report_type or ''
+        if 'VIOLATION' in report_type or 'AVR' in report_type or 'PVR' in report_type:
+            violation_types = ["SoD Violation"] * count
+            risk_levels = ["High"] * count
+        else:
+            fraud = pd.Series(['FRAUD' in str(record).upper() for record in records], dtype=bool)
+            violation_types = fraud.map({True: "Fraud Indicator", False: "Access Issue"}).tolist()
+            risk_levels = fraud.map({True: "Critical", False: "Medium"}).tolist()
+        
+        columns = [
+            [data_source.id] * count,
+            _coalesce(_field(records, 'User Name'), _field(records, 'User'), _field(records, 'BNAME'), _first_field(records)),
+            _coalesce(_field(records, 'Role Name'), _field(records, 'Role'), _field(records, 'ROLE')),
+            _coalesce(_field(records, 'Transaction Code'), _field(records, 'TCODE'), _field(records, 'Transaction')),
+            _coalesce(_field(records, 'Authorization Object'), _field(records, 'AUTH_OBJECT')),
+            violation_types,
+            risk_levels,
+            [json.dumps(record) for record in records],
+            [datetime.utcnow()] * count,
+        ]
+        return zip(*columns)
+    
+    def _alert_time_columns(self, records: List[Dict[str, Any]]) -> Tuple[List[Any], List[Any], List[Any]]:
+        """
+        Parse the timestamp, duration and date of a batch of alert records
+        
+        Each column is parsed at once (see column_normalizer); only values in
+        its unparsed bucket go through the per-value rules below. Returns
+        three lists in record order.
+        """
+        # Timestamp from 'Data', else the first column
+        timestamps = _coalesce(_field(records, 'Data'), _first_field(records))
+        durations = _coalesce(_field(records, 'Duration In Time Units (DURATION)'), _field(records, 'Unnamed: 9'))
+        dates = _coalesce(_field(records, 'Date (DATE)'), _field(records, 'Unnamed: 21'))
+        
+        return (
+            self._resolve_unparsed(
+                'timestamp', timestamps, parse_datetime_column(timestamps, TIMESTAMP_FORMATS), self._parse_timestamp
+            ),
+            self._resolve_unparsed('duration', durations, parse_integer_column(durations), self._parse_duration),
+            self._resolve_unparsed('date', dates, parse_datetime_column(dates, DATE_FORMATS), self._parse_date),
+        )
     
-    def _parse_alert_record(self, record: Dict[str, Any]) -> Alert:
-        """Parse a single alert record"""
+    def _resolve_unparsed(self, name: str, raw: pd.Series, parsed: ParsedColumn, parse_value: Callable) -> List[Any]:
+        """Fill a parsed column's unparsed bucket with the per-value fallback"""
+        values = parsed.values
+        if parsed.unparsed:
+            logger.info(f"{len(parsed.unparsed)} of {len(values)} {name} values matched no known format")
+            raw_values = raw.to_numpy()
+            for position in parsed.unparsed:
+                values[position] = parse_value(raw_values[position])
+        return values
+    
+    def _parse_alert_records(self, records: List[Dict[str, Any]]) -> List[Alert]:
+        """Parse a batch of alert records, with dates and durations parsed per column"""
+        return [
+            self._parse_alert_record(record, timestamp, duration, date)
+            for record, timestamp, duration, date in zip(records, *self._alert_time_columns(records))
+        ]
+    
+    def _parse_alert_record(
+        self,
+        record: Dict[str, Any],
+        timestamp: Optional[datetime],
+        duration: Optional[int],
+        date: Optional[datetime]
+    ) -> Alert:
+        """Parse a single alert record (timestamp, duration and date come from _alert_time_columns)"""
         # Map fields from Skywind 4C format
         alert = Alert()
-        
-        # Try to extract timestamp from first column
-        timestamp_str = record.get('Data', '') or record.get(list(record.keys())[0] if record else '', '')
-        if timestamp_str:
-            alert.timestamp = self._parse_timestamp(timestamp_str)
+        alert.timestamp = timestamp
         
         # Map user fields
         alert.user_name = record.get('User Name (BNAME)', '') or record.get('Unnamed: 4', '')
@@ -167,24 +373,14 @@ class DataSaver:
         alert.client = record.get('Client (MANDT)', '') or record.get('Unnamed: 3', '')
         alert.application_server = record.get('Application Server (RFCDEST)', '') or record.get('Unnamed: 2', '')
         
-        # Duration
-        duration_str = record.get('Duration In Time Units (DURATION)', '') or record.get('Unnamed: 9', '')
-        if duration_str:
-            try:
-                alert.duration = int(float(str(duration_str)))
-            except:
-                pass
-        
+        alert.duration = duration
         alert.duration_unit = record.get('Duration Unit (DURATION_UNIT)', '') or record.get('Unnamed: 10', '')
         
         # IP and other fields
         alert.ip_address = record.get('IP address (HOSTADR)', '') or record.get('Unnamed: 12', '')
         alert.transaction_code = record.get('Transaction Code (TCODE)', '') or record.get('Unnamed: 6', '')
         
-        # Date
-        date_str = record.get('Date (DATE)', '') or record.get('Unnamed: 21', '')
-        if date_str:
-            alert.date = self._parse_date(date_str)
+        alert.date = date
         
         return alert
     
@@ -231,43 +427,37 @@ class DataSaver:
         
         return report
     
+    def _parse_duration(self, duration_str: Any) -> Optional[int]:
+        """Parse duration in time units (None if empty or not numeric)"""
+        if not duration_str:
+            return None
+        try:
+            return int(float(str(duration_str)))
+        except (TypeError, ValueError, OverflowError):
+            return None
+    
     def _parse_timestamp(self, timestamp_str: str) -> datetime:
-        """Parse timestamp string"""
+        """Parse a single timestamp string (falls back to the current time)"""
         if not timestamp_str:
             return datetime.utcnow()
         
-        # Try common formats
-        formats = [
-            "%d.%m.%Y, %H:%M:%S",
-            "%Y-%m-%d %H:%M:%S",
-            "%d/%m/%Y %H:%M:%S",
-            "%Y/%m/%d %H:%M:%S",
-        ]
-        
-        for fmt in formats:
+        for fmt in TIMESTAMP_FORMATS:
             try:
                 return datetime.strptime(str(timestamp_str), fmt)
-            except:
+            except ValueError:
                 continue
         
         return datetime.utcnow()
     
-    def _parse_date(self, date_str: str) -> datetime:
-        """Parse date string"""
+    def _parse_date(self, date_str: str) -> Optional[datetime]:
+        """Parse a single date string"""
         if not date_str:
             return None
         
-        formats = [
-            "%Y/%m/%d",
-            "%Y-%m-%d",
-            "%d/%m/%Y",
-            "%d.%m.%Y",
-        ]
-        
-        for fmt in formats:
+        for fmt in DATE_FORMATS:
             try:
                 return datetime.strptime(str(date_str), fmt)
-            except:
+            except ValueError:
                 continue
         
         return None
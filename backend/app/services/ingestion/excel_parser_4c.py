@@ -1,17 +1,23 @@
 import pandas as pd
 import re
 from pathlib import Path
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Tuple
 from .base_parser import BaseParser
+from .record_cleaner import dataframe_to_record_batches, dataframe_to_records
+from .workbook_probe import WorkbookProbe
 
 
 class ExcelParser4C(BaseParser):
     """Parser for Skywind 4C Excel alert files"""
     
-    def can_parse(self, file_path: str) -> bool:
+    def can_parse(self, file_path: str, probe: Optional[WorkbookProbe] = None) -> bool:
         """Check if file is a Skywind 4C Excel file"""
         if not self.get_file_extension(file_path) == 'xlsx':
             return False
+        if probe is None:
+            # A probe opened here is closed here; a caller's probe stays open for parse()
+            with WorkbookProbe(file_path) as own_probe:
+                return self.can_parse(file_path, own_probe)
         
         filename = Path(file_path).stem
         
@@ -25,12 +31,12 @@ class ExcelParser4C(BaseParser):
         if re.search(r'_\d{6}_\d{6}', filename):
             # Try to verify with "Alert Parameters" sheet if possible
             try:
-                xl_file = pd.ExcelFile(file_path)
-                if 'Alert Parameters' in xl_file.sheet_names:
+                sheet_names = probe.sheet_names
+                if 'Alert Parameters' in sheet_names:
                     return True
                 # Even without Alert Parameters sheet, if it has the pattern, it's likely 4C
                 # Check if it has a "Data" sheet (common in 4C alerts)
-                if 'Data' in xl_file.sheet_names:
+                if 'Data' in sheet_names:
                     return True
             except Exception:
                 # If we can't open the file, but it has the pattern, assume it's 4C
@@ -39,8 +45,7 @@ class ExcelParser4C(BaseParser):
         
         # 3. Check if file has "Alert Parameters" sheet (strongest indicator)
         try:
-            xl_file = pd.ExcelFile(file_path)
-            sheet_names = xl_file.sheet_names
+            sheet_names = probe.sheet_names
             
             if 'Alert Parameters' in sheet_names:
                 return True
@@ -64,13 +69,52 @@ class ExcelParser4C(BaseParser):
         
         return False
     
-    def parse(self, file_path: str) -> Dict[str, Any]:
+    def parse(self, file_path: str, probe: Optional[WorkbookProbe] = None) -> Dict[str, Any]:
         """Parse Skywind 4C Excel file"""
+        result, data_df = self._read(file_path, probe)
+        if data_df is not None:
+            try:
+                # Convert to JSON-safe records (NaN/Infinity -> None, numpy -> Python)
+                # This preserves ALL fields from the source file (up to 100+ fields)
+                result['data'] = dataframe_to_records(data_df)  # All columns preserved
+                result['records_cleaned'] = True
+            except Exception as e:
+                result['errors'].append(f"Error parsing file: {str(e)}")
+        return result
+    
+    def parse_stream(
+        self,
+        file_path: str,
+        batch_size: int = 1000,
+        preview_rows: int = 10,
+        probe: Optional[WorkbookProbe] = None
+    ) -> Dict[str, Any]:
+        """
+        Parse Skywind 4C Excel file, yielding cleaned records in batches
+        
+        The Data sheet is read once as a DataFrame; records are built one
+        batch at a time while the consumer saves them, so the full list of
+        record dicts never exists at once.
+        """
+        result, data_df = self._read(file_path, probe)
+        del result['data']
+        if data_df is None:
+            data_df = pd.DataFrame()
+        self._attach_batches(result, dataframe_to_record_batches(data_df, batch_size), preview_rows)
+        result['records_cleaned'] = True
+        return result
+    
+    def _read(self, file_path: str, probe: Optional[WorkbookProbe]) -> Tuple[Dict[str, Any], Optional[pd.DataFrame]]:
+        """Read metadata and the Data sheet; returns the parse result (without records) and the data frame"""
+        if probe is None:
+            with WorkbookProbe(file_path) as own_probe:
+                return self._read(file_path, own_probe)
         result = {
             'metadata': {},
             'data': [],
             'errors': []
         }
+        data_df = None
         
         try:
             # Extract alert ID from filename
@@ -92,24 +136,23 @@ class ExcelParser4C(BaseParser):
             # Extract alert name from filename
             alert_name = self._extract_alert_name(filename)
             
-            # Read all sheets
-            xl_file = pd.ExcelFile(file_path)
+            # Sheets are read from the probe's already opened workbook
+            sheet_names = probe.sheet_names
             
             # Parse Alert Parameters sheet
             alert_params = {}
-            if 'Alert Parameters' in xl_file.sheet_names:
+            if 'Alert Parameters' in sheet_names:
                 try:
-                    params_df = pd.read_excel(file_path, sheet_name='Alert Parameters', header=0)
+                    params_df = probe.read_sheet('Alert Parameters', header=0)
                     alert_params = self._parse_alert_parameters(params_df)
                 except Exception as e:
                     result['errors'].append(f"Error parsing Alert Parameters: {str(e)}")
             
-            # Parse Data sheet
-            data_records = []
-            if 'Data' in xl_file.sheet_names:
+            # Read Data sheet
+            if 'Data' in sheet_names:
                 try:
                     # Try reading with header=0 first (standard case)
-                    data_df = pd.read_excel(file_path, sheet_name='Data', header=0)
+                    data_df = probe.read_sheet('Data', header=0)
                     
                     # Check if first row looks like headers (contains text, not all numeric)
                     # If first row is all text/strings, it's likely the header row
@@ -125,22 +168,16 @@ class ExcelParser4C(BaseParser):
                         # Use first row as column names
                         data_df.columns = data_df.iloc[0]
                         data_df = data_df[1:].reset_index(drop=True)
-                    
-                    # Convert to records, handling NaN values
-                    # This preserves ALL fields from the source file (up to 100+ fields)
-                    data_df = data_df.where(pd.notna(data_df), None)
-                    data_records = data_df.to_dict('records')  # All columns preserved
                 except Exception as e:
+                    data_df = None
                     # Try alternative parsing if first attempt fails
                     try:
                         # Try reading without assuming header structure
-                        data_df = pd.read_excel(file_path, sheet_name='Data', header=None)
-                        if len(data_df) > 1:
+                        fallback_df = probe.read_sheet('Data', header=None)
+                        if len(fallback_df) > 1:
                             # Use first row as headers
-                            data_df.columns = data_df.iloc[0]
-                            data_df = data_df[1:].reset_index(drop=True)
-                            data_df = data_df.where(pd.notna(data_df), None)
-                            data_records = data_df.to_dict('records')
+                            fallback_df.columns = fallback_df.iloc[0]
+                            data_df = fallback_df[1:].reset_index(drop=True)
                         else:
                             result['errors'].append(f"Data sheet is empty or has insufficient rows")
                     except Exception as e2:
@@ -152,16 +189,15 @@ class ExcelParser4C(BaseParser):
                 'alert_name': alert_name,
                 'filename': filename,
                 'parameters': alert_params,
-                'data_row_count': len(data_records),
-                'sheets': xl_file.sheet_names
+                'data_row_count': len(data_df) if data_df is not None else 0,
+                'sheets': sheet_names
             }
             
-            result['data'] = data_records
-            
         except Exception as e:
             result['errors'].append(f"Error parsing file: {str(e)}")
+            data_df = None
         
-        return result
+        return result, data_df
     
     def _extract_alert_name(self, filename: str) -> str:
         """Extract alert name from filename"""
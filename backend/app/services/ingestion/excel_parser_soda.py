@@ -1,9 +1,12 @@
 import pandas as pd
 import re
 from pathlib import Path
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Tuple
 from datetime import datetime
+from itertools import chain
 from .base_parser import BaseParser
+from .record_cleaner import dataframe_to_record_batches, dataframe_to_records
+from .workbook_probe import WorkbookProbe
 
 
 class ExcelParserSoDA(BaseParser):
@@ -21,7 +24,7 @@ class ExcelParserSoDA(BaseParser):
         'UAT': 'User Access Test',
     }
     
-    def can_parse(self, file_path: str) -> bool:
+    def can_parse(self, file_path: str, probe: Optional[WorkbookProbe] = None) -> bool:
         """Check if file is a Skywind SoDA Excel file"""
         if not self.get_file_extension(file_path) == 'xlsx':
             return False
@@ -44,22 +47,68 @@ class ExcelParserSoDA(BaseParser):
                 return True
         
         # Check if file has "Parameters" and "KPIs" sheets (SoDA structure)
-        try:
-            xl_file = pd.ExcelFile(file_path)
-            if 'Parameters' in xl_file.sheet_names and 'KPIs' in xl_file.sheet_names:
-                return True
-        except Exception:
-            pass
+        if probe is None:
+            # A probe opened here is closed here; a caller's probe stays open for parse()
+            with WorkbookProbe(file_path) as own_probe:
+                return self.can_parse(file_path, own_probe)
+        if probe.has_sheet('Parameters') and probe.has_sheet('KPIs'):
+            return True
         
         return False
     
-    def parse(self, file_path: str) -> Dict[str, Any]:
+    def parse(self, file_path: str, probe: Optional[WorkbookProbe] = None) -> Dict[str, Any]:
         """Parse Skywind SoDA Excel file"""
+        result, result_frames = self._read(file_path, probe)
+        if result_frames is not None:
+            data_records = []
+            for sheet_name, result_df in result_frames:
+                try:
+                    # Convert to JSON-safe records (NaN/Infinity -> None, numpy -> Python)
+                    # This preserves ALL fields from the source file (up to 100+ fields)
+                    data_records.extend(dataframe_to_records(result_df))  # All columns preserved
+                except Exception as e:
+                    result['errors'].append(f"Error parsing {sheet_name}: {str(e)}")
+            result['data'] = data_records
+            result['records_cleaned'] = True
+        return result
+    
+    def parse_stream(
+        self,
+        file_path: str,
+        batch_size: int = 1000,
+        preview_rows: int = 10,
+        probe: Optional[WorkbookProbe] = None
+    ) -> Dict[str, Any]:
+        """
+        Parse Skywind SoDA Excel file, yielding cleaned records in batches
+        
+        Result sheets are read up front; records are built one batch at a
+        time as the consumer saves them.
+        """
+        result, result_frames = self._read(file_path, probe)
+        del result['data']
+        batches = chain.from_iterable(
+            dataframe_to_record_batches(result_df, batch_size) for _, result_df in result_frames or []
+        )
+        self._attach_batches(result, batches, preview_rows)
+        result['records_cleaned'] = True
+        return result
+    
+    def _read(
+        self,
+        file_path: str,
+        probe: Optional[WorkbookProbe]
+    ) -> Tuple[Dict[str, Any], Optional[List[Tuple[str, pd.DataFrame]]]]:
+        """Read metadata and the Result sheets; returns the parse result (without records) and the frames"""
+        if probe is None:
+            with WorkbookProbe(file_path) as own_probe:
+                return self._read(file_path, own_probe)
         result = {
             'metadata': {},
             'data': [],
             'errors': []
         }
+        result_frames = None
         
         try:
             filename = Path(file_path).stem
@@ -67,35 +116,35 @@ class ExcelParserSoDA(BaseParser):
             # Detect report type
             report_type = self._detect_report_type(filename)
             
-            # Read all sheets
-            xl_file = pd.ExcelFile(file_path)
+            # Sheets are read from the probe's already opened workbook
+            sheet_names = probe.sheet_names
             
             # Parse Parameters sheet
             parameters = {}
-            if 'Parameters' in xl_file.sheet_names:
+            if 'Parameters' in sheet_names:
                 try:
-                    params_df = pd.read_excel(file_path, sheet_name='Parameters', header=0)
+                    params_df = probe.read_sheet('Parameters', header=0)
                     parameters = self._parse_parameters(params_df)
                 except Exception as e:
                     result['errors'].append(f"Error parsing Parameters: {str(e)}")
             
             # Parse KPIs sheet
             kpis = {}
-            if 'KPIs' in xl_file.sheet_names:
+            if 'KPIs' in sheet_names:
                 try:
-                    kpis_df = pd.read_excel(file_path, sheet_name='KPIs', header=0)
+                    kpis_df = probe.read_sheet('KPIs', header=0)
                     kpis = self._parse_kpis(kpis_df)
                 except Exception as e:
                     result['errors'].append(f"Error parsing KPIs: {str(e)}")
             
-            # Parse Result sheet(s)
-            data_records = []
-            result_sheets = [s for s in xl_file.sheet_names if s.startswith('Result')]
+            # Read Result sheet(s)
+            result_frames = []
+            result_sheets = [s for s in sheet_names if s.startswith('Result')]
             
             for sheet_name in result_sheets:
                 try:
                     # First row contains headers
-                    result_df = pd.read_excel(file_path, sheet_name=sheet_name, header=0)
+                    result_df = probe.read_sheet(sheet_name, header=0)
                     
                     # Skip the first row if it's just headers
                     if len(result_df) > 0:
@@ -103,12 +152,7 @@ class ExcelParserSoDA(BaseParser):
                         result_df.columns = result_df.iloc[0]
                         result_df = result_df[1:].reset_index(drop=True)
                     
-                    # Convert to records, handling NaN values
-                    # This preserves ALL fields from the source file (up to 100+ fields)
-                    # Replace NaN with None before converting to dict
-                    result_df = result_df.where(pd.notna(result_df), None)
-                    records = result_df.to_dict('records')  # All columns preserved
-                    data_records.extend(records)
+                    result_frames.append((sheet_name, result_df))
                 except Exception as e:
                     result['errors'].append(f"Error parsing {sheet_name}: {str(e)}")
             
@@ -122,17 +166,16 @@ class ExcelParserSoDA(BaseParser):
                 'filename': filename,
                 'parameters': parameters,
                 'kpis': kpis,
-                'data_row_count': len(data_records),
+                'data_row_count': sum(len(result_df) for _, result_df in result_frames),
                 'report_date': report_date.isoformat() if report_date else None,
-                'sheets': xl_file.sheet_names
+                'sheets': sheet_names
             }
             
-            result['data'] = data_records
-            
         except Exception as e:
             result['errors'].append(f"Error parsing file: {str(e)}")
+            result_frames = None
         
-        return result
+        return result, result_frames
     
     def _detect_report_type(self, filename: str) -> str:
         """Detect SoDA report type from filename"""
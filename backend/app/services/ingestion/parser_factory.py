@@ -1,4 +1,4 @@
-from typing import Optional
+from typing import Any, Dict, Optional
 from pathlib import Path
 from .base_parser import BaseParser
 from .pdf_parser import PDFParser
@@ -6,11 +6,12 @@ from .csv_parser import CSVParser
 from .docx_parser import DOCXParser
 from .excel_parser_4c import ExcelParser4C
 from .excel_parser_soda import ExcelParserSoDA
+from .workbook_probe import WorkbookProbe
 
 
 class ParserFactory:
     """Factory for creating appropriate parser based on file type"""
-    
+
     _parsers = [
         ExcelParser4C(),  # Check 4C first (more specific)
         ExcelParserSoDA(),  # Check SoDA second (more specific)
@@ -18,18 +19,68 @@ class ParserFactory:
         CSVParser(),
         DOCXParser(),
     ]
-    
+
+    # Parsers whose can_parse/parse accept a shared WorkbookProbe
+    _workbook_parsers = (ExcelParser4C, ExcelParserSoDA)
+
     @classmethod
-    def get_parser(cls, file_path: str) -> Optional[BaseParser]:
-        """Get appropriate parser for the file"""
-        for parser in cls._parsers:
-            if parser.can_parse(file_path):
-                return parser
+    def probe(cls, file_path: str) -> Optional[WorkbookProbe]:
+        """
+        Create the workbook probe for an Excel file (None for other formats).
+
+        Pass it to get_parser() and parse_file() so the workbook is opened
+        once per upload; the caller closes it when done.
+        """
+        if Path(file_path).suffix.lower() == '.xlsx':
+            return WorkbookProbe(file_path)
         return None
-    
+
     @classmethod
-    def can_parse_file(cls, file_path: str) -> bool:
+    def get_parser(cls, file_path: str, probe: Optional[WorkbookProbe] = None) -> Optional[BaseParser]:
+        """Get appropriate parser for the file"""
+        own_probe = probe is None
+        if own_probe:
+            probe = cls.probe(file_path)
+        try:
+            for parser in cls._parsers:
+                if probe is not None and isinstance(parser, cls._workbook_parsers):
+                    if parser.can_parse(file_path, probe=probe):
+                        return parser
+                elif parser.can_parse(file_path):
+                    return parser
+            return None
+        finally:
+            if own_probe and probe is not None:
+                probe.close()
+
+    @classmethod
+    def can_parse_file(cls, file_path: str, probe: Optional[WorkbookProbe] = None) -> bool:
         """Check if any parser can handle this file"""
-        parser = cls.get_parser(file_path)
+        parser = cls.get_parser(file_path, probe=probe)
         return parser is not None
 
+    @classmethod
+    def parse_file(
+        cls,
+        parser: BaseParser,
+        file_path: str,
+        probe: Optional[WorkbookProbe] = None
+    ) -> Dict[str, Any]:
+        """Parse the file with the given parser, reusing the probe for workbooks"""
+        if probe is not None and isinstance(parser, cls._workbook_parsers):
+            return parser.parse(file_path, probe=probe)
+        return parser.parse(file_path)
+
+    @classmethod
+    def stream_file(
+        cls,
+        parser: BaseParser,
+        file_path: str,
+        batch_size: int,
+        preview_rows: int = 10,
+        probe: Optional[WorkbookProbe] = None
+    ) -> Dict[str, Any]:
+        """Parse the file into record batches (see BaseParser.parse_stream)"""
+        if probe is not None and isinstance(parser, cls._workbook_parsers):
+            return parser.parse_stream(file_path, batch_size, preview_rows, probe=probe)
+        return parser.parse_stream(file_path, batch_size, preview_rows)
@@ -0,0 +1,210 @@
+"""
+Per-page cache of extracted PDF content.
+
+Stores what PDFParser extracts from each page (text and tables) on disk,
+keyed by the SHA-256 of the PDF content and the page index, so
+re-uploading the same report skips pdfplumber entirely and a partly
+extracted report only extracts the missing pages.
+
+Entries are zlib-compressed JSON under
+<cache_dir>/<digest[:2]>/<digest>/<page>.page with a small format header.
+Total size is bounded: when it exceeds max_bytes the least recently used
+pages (by file mtime, bumped on every hit) are evicted.
+"""
+import hashlib
+import json
+import logging
+import os
+import threading
+import zlib
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# (text or None, tables) as returned by extract_text() / extract_tables()
+PageContent = Tuple[Optional[str], List[List[List[Optional[str]]]]]
+
+
+class PDFPageCache:
+    """
+    Content-addressed on-disk cache of extracted PDF pages.
+
+    Usage:
+        cache = PDFPageCache("./storage/pdf_page_cache", max_bytes=256 * 1024 * 1024)
+        key = cache.key_for(pdf_path)
+        pages = cache.get_many(key, range(page_count))
+        for index in missing:
+            cache.put(key, index, extract(index))
+    """
+
+    # Bump when the extraction rules (pdfplumber settings) change
+    FORMAT_VERSION = 1
+    MAGIC = b"THPC"
+    ENTRY_SUFFIX = ".page"
+    HASH_CHUNK_BYTES = 1024 * 1024
+
+    def __init__(self, cache_dir: str, max_bytes: int = 256 * 1024 * 1024):
+        self.cache_dir = Path(cache_dir)
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+
+        self._lock = threading.Lock()
+        # Resolved path -> (size, mtime_ns, digest); avoids rehashing unchanged files
+        self._digests: Dict[str, Tuple[int, int, str]] = {}
+        self._total_bytes: Optional[int] = None
+
+    def key_for(self, filepath: str) -> str:
+        """SHA-256 of the file content (memoized per size + mtime)."""
+        path = os.path.realpath(filepath)
+        stat = os.stat(path)
+        with self._lock:
+            known = self._digests.get(path)
+        if known and known[0] == stat.st_size and known[1] == stat.st_mtime_ns:
+            return known[2]
+
+        sha = hashlib.sha256()
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(self.HASH_CHUNK_BYTES), b""):
+                sha.update(chunk)
+        digest = sha.hexdigest()
+
+        with self._lock:
+            self._digests[path] = (stat.st_size, stat.st_mtime_ns, digest)
+        return digest
+
+    def _entry_path(self, key: str, index: int) -> Path:
+        return self.cache_dir / key[:2] / key / f"{index}{self.ENTRY_SUFFIX}"
+
+    def _header(self) -> bytes:
+        return self.MAGIC + bytes([self.FORMAT_VERSION])
+
+    def get(self, key: str, index: int) -> Optional[PageContent]:
+        """Return the cached content of one page, or None on a miss."""
+        path = self._entry_path(key, index)
+        try:
+            data = path.read_bytes()
+        except OSError:
+            self._count(hit=False)
+            return None
+
+        header = self._header()
+        try:
+            if not data.startswith(header):
+                raise ValueError("unknown cache entry format")
+            text, tables = json.loads(zlib.decompress(data[len(header):]))
+        except Exception as e:
+            logger.warning(f"Discarding unreadable PDF page cache entry {path.name}: {e}")
+            self._remove(path)
+            self._count(hit=False)
+            return None
+
+        # Mark as recently used for LRU eviction
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        self._count(hit=True)
+        return text, tables
+
+    def get_many(self, key: str, indexes: Iterable[int]) -> Dict[int, PageContent]:
+        """Cached content of the given pages, by page index (misses left out)."""
+        pages = {}
+        for index in indexes:
+            page = self.get(key, index)
+            if page is not None:
+                pages[index] = page
+        return pages
+
+    def _count(self, hit: bool):
+        with self._lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+    def put(self, key: str, index: int, page: PageContent):
+        """Store one page's content and evict old entries if over budget."""
+        path = self._entry_path(key, index)
+        try:
+            payload = self._header() + zlib.compress(json.dumps(list(page)).encode("utf-8"), 6)
+        except (TypeError, ValueError) as e:
+            logger.warning(f"Could not serialize PDF page for cache: {e}")
+            return
+
+        if len(payload) > self.max_bytes:
+            return
+
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            previous = path.stat().st_size if path.exists() else 0
+            tmp_path = path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+            tmp_path.write_bytes(payload)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            logger.warning(f"Could not write PDF page cache entry {path.name}: {e}")
+            return
+
+        with self._lock:
+            if self._total_bytes is not None:
+                self._total_bytes += len(payload) - previous
+        self._evict()
+
+    def _entries(self):
+        """All cache entries as (mtime, size, path)."""
+        entries = []
+        for path in self.cache_dir.glob(f"*/*/*{self.ENTRY_SUFFIX}"):
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+        return entries
+
+    def _evict(self):
+        """Delete least recently used pages until the cache fits max_bytes."""
+        with self._lock:
+            if self._total_bytes is not None and self._total_bytes <= self.max_bytes:
+                return
+
+            entries = self._entries()
+            total = sum(size for _, size, _ in entries)
+            if total > self.max_bytes:
+                for _, size, path in sorted(entries, key=lambda e: e[0]):
+                    if self._remove(path):
+                        total -= size
+                    if total <= self.max_bytes:
+                        break
+            self._total_bytes = total
+
+    def _remove(self, path: Path) -> bool:
+        try:
+            path.unlink()
+        except OSError:
+            return False
+        # Drop the document directory once its last page is gone
+        try:
+            path.parent.rmdir()
+        except OSError:
+            pass
+        return True
+
+    def clear(self):
+        """Remove all cache entries."""
+        with self._lock:
+            for _, _, path in self._entries():
+                self._remove(path)
+            self._total_bytes = 0
+
+    def stats(self) -> Dict[str, int]:
+        """Hit/miss counters and current on-disk size."""
+        with self._lock:
+            size = sum(size for _, size, _ in self._entries())
+            self._total_bytes = size
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "size_bytes": size,
+            "max_bytes": self.max_bytes,
+        }
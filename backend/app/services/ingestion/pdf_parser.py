@@ -1,15 +1,72 @@
+import logging
+import multiprocessing
+import os
 import pdfplumber
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from pathlib import Path
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional, Sequence, Tuple
 from .base_parser import BaseParser
+from .pdf_page_cache import PageContent, PDFPageCache
+
+logger = logging.getLogger(__name__)
+
+# Shared page cache configured in settings (lazy initialization)
+_page_cache_instance: Optional[PDFPageCache] = None
+
+
+def get_pdf_page_cache() -> Optional[PDFPageCache]:
+    """Get or create the on-disk PDFPageCache configured in settings (None when disabled)."""
+    global _page_cache_instance
+    from app.core.config import settings
+
+    if _page_cache_instance is None and settings.PDF_PAGE_CACHE_ENABLED:
+        cache_path = settings.PDF_PAGE_CACHE_PATH or os.path.join(settings.STORAGE_PATH, "pdf_page_cache")
+        _page_cache_instance = PDFPageCache(cache_path, max_bytes=settings.PDF_PAGE_CACHE_MAX_MB * 1024 * 1024)
+
+    return _page_cache_instance
+
+
+def _extract_page(page) -> PageContent:
+    """Text and tables of one pdfplumber page"""
+    return page.extract_text(), page.extract_tables() or []
+
+
+def _extract_page_range(file_path: str, indexes: Sequence[int]) -> List[Tuple[int, PageContent]]:
+    """Extract the given pages in a worker process (opens its own copy of the PDF)"""
+    pages = []
+    with pdfplumber.open(file_path) as pdf:
+        for index in indexes:
+            page = pdf.pages[index]
+            pages.append((index, _extract_page(page)))
+            # Release the page's parsed objects; workers handle long ranges
+            page.close()
+    return pages
 
 
 class PDFParser(BaseParser):
     """Parser for PDF files"""
-    
+
+    def __init__(
+        self,
+        max_workers: Optional[int] = None,
+        parallel_min_pages: Optional[int] = None,
+        page_cache: Optional[PDFPageCache] = None
+    ):
+        """
+        Args:
+            max_workers: Processes extracting pages; default settings.PDF_MAX_WORKERS
+            parallel_min_pages: PDFs with fewer pages to extract stay in-process;
+                default settings.PDF_PARALLEL_MIN_PAGES
+            page_cache: Per-page cache; default the shared cache from settings
+        """
+        self.max_workers = max_workers
+        self.parallel_min_pages = parallel_min_pages
+        self.page_cache = page_cache
+
     def can_parse(self, file_path: str) -> bool:
         return self.get_file_extension(file_path) == 'pdf'
-    
+
     def parse(self, file_path: str) -> Dict[str, Any]:
         """Parse PDF file"""
         result = {
@@ -17,41 +74,94 @@ class PDFParser(BaseParser):
             'data': [],
             'errors': []
         }
-        
+
         try:
             with pdfplumber.open(file_path) as pdf:
                 # Extract metadata
                 metadata = pdf.metadata or {}
-                
-                # Extract text from all pages
-                full_text = []
-                tables = []
-                
-                for page in pdf.pages:
-                    # Extract text
-                    text = page.extract_text()
-                    if text:
-                        full_text.append(text)
-                    
-                    # Extract tables
-                    page_tables = page.extract_tables()
-                    if page_tables:
-                        tables.extend(page_tables)
-                
+                page_count = len(pdf.pages)
+
+                # Extract text and tables of all pages, in page order
+                pages = self._extract_pages(pdf, file_path, page_count)
+                full_text = [text for text, _ in pages if text]
+                tables = [table for _, page_tables in pages for table in page_tables]
+
                 result['metadata'] = {
-                    'page_count': len(pdf.pages),
+                    'page_count': page_count,
                     'title': metadata.get('Title', ''),
                     'author': metadata.get('Author', ''),
                     'subject': metadata.get('Subject', ''),
                 }
-                
+
                 result['data'] = {
                     'text': '\n\n'.join(full_text),
                     'tables': tables
                 }
-                
+
         except Exception as e:
             result['errors'].append(f"Error parsing PDF: {str(e)}")
-        
+
         return result
 
+    def _settings(self) -> Tuple[int, int, Optional[PDFPageCache]]:
+        """Worker count, parallel threshold and page cache, defaults from settings"""
+        from app.core.config import settings
+
+        max_workers = self.max_workers if self.max_workers is not None else settings.PDF_MAX_WORKERS
+        min_pages = (
+            self.parallel_min_pages if self.parallel_min_pages is not None
+            else settings.PDF_PARALLEL_MIN_PAGES
+        )
+        page_cache = self.page_cache if self.page_cache is not None else get_pdf_page_cache()
+        return max_workers, min_pages, page_cache
+
+    def _extract_pages(self, pdf, file_path: str, page_count: int) -> List[PageContent]:
+        """
+        Content of every page, from the page cache where present.
+
+        Missing pages are extracted in worker processes when there are at
+        least parallel_min_pages of them, otherwise from the open PDF.
+        """
+        max_workers, min_pages, page_cache = self._settings()
+
+        key = None
+        pages: Dict[int, PageContent] = {}
+        if page_cache is not None:
+            try:
+                key = page_cache.key_for(file_path)
+                pages = page_cache.get_many(key, range(page_count))
+            except OSError as e:
+                logger.warning(f"PDF page cache unavailable for {Path(file_path).name}: {e}")
+                key = None
+
+        missing = [index for index in range(page_count) if index not in pages]
+        extracted: Dict[int, PageContent] = {}
+        if missing and max_workers > 1 and len(missing) >= max(min_pages, 2):
+            try:
+                extracted = self._extract_parallel(file_path, missing, max_workers)
+            except (BrokenProcessPool, OSError) as e:
+                logger.warning(f"Parallel PDF extraction failed, extracting in-process: {e}")
+        for index in missing:
+            if index not in extracted:
+                extracted[index] = _extract_page(pdf.pages[index])
+
+        if key is not None:
+            for index, page in extracted.items():
+                page_cache.put(key, index, page)
+
+        pages.update(extracted)
+        return [pages[index] for index in range(page_count)]
+
+    @staticmethod
+    def _extract_parallel(file_path: str, indexes: List[int], max_workers: int) -> Dict[int, PageContent]:
+        """Extract pages across processes, in contiguous ranges (each worker reopens the PDF)"""
+        # A few ranges per worker balance uneven pages without reparsing the PDF too often
+        chunk_count = min(len(indexes), max_workers * 4)
+        size = -(-len(indexes) // chunk_count)
+        chunks = [indexes[i:i + size] for i in range(0, len(indexes), size)]
+
+        # spawn: forking the multi-threaded API process is not safe
+        context = multiprocessing.get_context("spawn")
+        with ProcessPoolExecutor(max_workers=min(max_workers, len(chunks)), mp_context=context) as pool:
+            results = pool.map(_extract_page_range, [file_path] * len(chunks), chunks)
+            return {index: page for chunk in results for index, page in chunk}
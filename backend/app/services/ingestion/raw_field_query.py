@@ -0,0 +1,229 @@
+"""
+Filtering and aggregation on raw SAP fields of ingested records.
+
+Alert.raw_data and SoDAReport.raw_data keep every source column under its
+header, e.g. "Vendor (LIFNR)" in a 4C export or "BUKRS" in a SoDA sheet.
+RawFieldQuery resolves a requested field (the header itself or the SAP
+technical name) to the headers used by the selected uploads and builds
+the whole query in SQL, so only matching rows or aggregate rows leave
+the database.
+
+On PostgreSQL equality filters are JSONB containment predicates
+(raw_data @> '{"Vendor (LIFNR)": "100200"}'), which the GIN index on
+raw_data serves. Other databases (SQLite in development and tests) get
+the equivalent JSON path comparisons.
+"""
+import re
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Sequence, Type, Union
+
+from sqlalchemy import and_, case, false, func, or_, select, type_coerce
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.orm import Query, Session
+
+from app.models.alert import Alert
+from app.models.data_source import DataSource, DataSourceType
+from app.models.soda_report import SoDAReport
+
+RawDataModel = Union[Type[Alert], Type[SoDAReport]]
+
+# Record tables with a raw_data column, by API name
+RECORD_MODELS: Dict[str, RawDataModel] = {
+    "alerts": Alert,
+    "soda_reports": SoDAReport,
+}
+
+_DATA_TYPES = {Alert: DataSourceType.ALERT, SoDAReport: DataSourceType.REPORT}
+
+# "Vendor (LIFNR)" -> "LIFNR"
+_TECHNICAL_NAME = re.compile(r'\(([^()]+)\)\s*$')
+
+
+@dataclass
+class FieldGroup:
+    """One aggregate row: a raw field value, its record count and optional sum"""
+    value: Optional[str]
+    count: int
+    total: Optional[float] = None
+
+
+def technical_name(header: str) -> str:
+    """SAP technical name in a column header ("Vendor (LIFNR)" -> "LIFNR"), else the header"""
+    match = _TECHNICAL_NAME.search(header)
+    return match.group(1).strip() if match else header.strip()
+
+
+def _numeric_variants(value: str) -> List[Any]:
+    """The value plus its number form, since Excel cells arrive as numbers or text"""
+    variants: List[Any] = [value]
+    try:
+        number = float(value)
+    except ValueError:
+        return variants
+    if number.is_integer() and abs(number) < 2 ** 53:
+        variants.append(int(number))
+    else:
+        variants.append(number)
+    return variants
+
+
+class RawFieldQuery:
+    """
+    Field-level queries over the raw_data of one record table.
+
+    Usage:
+        query = RawFieldQuery(db, Alert, data_source_ids=[12, 13])
+        rows = query.filter({"LIFNR": ["100200"], "BUKRS": ["1000"]}).limit(100).all()
+        groups = query.aggregate("BUKRS", filters={"LIFNR": ["100200"]}, sum_field="WRBTR")
+    """
+
+    def __init__(self, db: Session, model: RawDataModel, data_source_ids: Optional[Sequence[int]] = None):
+        """
+        Args:
+            db: Database session
+            model: Alert or SoDAReport
+            data_source_ids: Uploads to query; default all uploads of the model's type
+        """
+        self.db = db
+        self.model = model
+        self.data_source_ids = list(data_source_ids) if data_source_ids is not None else None
+        self._keys: Optional[Dict[int, List[str]]] = None
+
+    @property
+    def is_postgresql(self) -> bool:
+        return self.db.get_bind().dialect.name == "postgresql"
+
+    def field_keys(self) -> Dict[int, List[str]]:
+        """
+        raw_data keys per data source, read from its first record.
+
+        Records of one upload share the columns of its source file, so one
+        row per upload is enough. All uploads are read with one statement:
+        a correlated subquery picks each upload's first record (an index
+        lookup on data_source_id), instead of one query per upload.
+        """
+        if self._keys is None:
+            first_raw_data = (
+                select(self.model.raw_data)
+                .where(self.model.data_source_id == DataSource.id)
+                .order_by(self.model.id)
+                .limit(1)
+                .correlate(DataSource)
+                .scalar_subquery()
+            )
+            query = self.db.query(DataSource.id, first_raw_data.label("raw_data"))
+            if self.data_source_ids is not None:
+                query = query.filter(DataSource.id.in_(self.data_source_ids))
+            else:
+                query = query.filter(DataSource.data_type == _DATA_TYPES[self.model])
+            self._keys = {
+                row.id: list(row.raw_data)
+                for row in query.order_by(DataSource.id)
+                if isinstance(row.raw_data, dict)
+            }
+        return self._keys
+
+    def resolve(self, field: str) -> List[str]:
+        """raw_data keys holding a field: the exact header, or any header with its technical name"""
+        wanted = technical_name(field).upper()
+        keys = []
+        for data_source_keys in self.field_keys().values():
+            for key in data_source_keys:
+                if key not in keys and (key == field or technical_name(key).upper() == wanted):
+                    keys.append(key)
+        return keys
+
+    def _base(self, *columns) -> Query:
+        query = self.db.query(*columns) if columns else self.db.query(self.model)
+        if self.data_source_ids is not None:
+            query = query.filter(self.model.data_source_id.in_(self.data_source_ids))
+        return query
+
+    def _equals(self, key: str, value: str):
+        """raw_data[key] == value (as text or number)"""
+        column = self.model.raw_data
+        variants = _numeric_variants(value)
+        if self.is_postgresql:
+            # Containment is what the GIN index serves
+            return or_(*(column.op("@>")(type_coerce({key: variant}, JSONB)) for variant in variants))
+        conditions = [column[key].as_string() == value]
+        if len(variants) > 1:
+            conditions.append(column[key].as_float() == float(variants[1]))
+        return or_(*conditions)
+
+    def _predicate(self, filters: Dict[str, Sequence[str]]):
+        """AND over fields, OR over each field's values and matching headers"""
+        conditions = []
+        for field, values in filters.items():
+            keys = self.resolve(field)
+            if not keys or not values:
+                return false()
+            conditions.append(or_(*(self._equals(key, str(value)) for key in keys for value in values)))
+        return and_(*conditions)
+
+    def _text(self, keys: List[str]):
+        """The field as text, from whichever of its headers the row has"""
+        values = [self.model.raw_data[key].as_string() for key in keys]
+        return values[0] if len(values) == 1 else func.coalesce(*values)
+
+    def _number(self, keys: List[str]):
+        """The field as a number; NULL where it is not numeric"""
+        values = []
+        for key in keys:
+            element = self.model.raw_data[key]
+            if self.is_postgresql:
+                # Casting text like "n/a" would abort the query
+                values.append(case((func.jsonb_typeof(element) == "number", element.as_float()), else_=None))
+            else:
+                values.append(element.as_float())
+        return values[0] if len(values) == 1 else func.coalesce(*values)
+
+    def filter(self, filters: Optional[Dict[str, Sequence[str]]] = None) -> Query:
+        """Records whose raw fields equal one of the given values, in id order"""
+        query = self._base()
+        if filters:
+            query = query.filter(self._predicate(filters))
+        return query.order_by(self.model.id)
+
+    def count(self, filters: Optional[Dict[str, Sequence[str]]] = None) -> int:
+        """Number of records filter() returns"""
+        query = self._base(func.count(self.model.id))
+        if filters:
+            query = query.filter(self._predicate(filters))
+        return query.scalar() or 0
+
+    def aggregate(
+        self,
+        group_by: str,
+        filters: Optional[Dict[str, Sequence[str]]] = None,
+        sum_field: Optional[str] = None,
+        limit: int = 100
+    ) -> List[FieldGroup]:
+        """Record count (and sum of sum_field) per value of group_by, largest groups first"""
+        group_keys = self.resolve(group_by)
+        if not group_keys:
+            return []
+        value = self._text(group_keys).label("value")
+        columns = [value, func.count(self.model.id).label("count")]
+
+        sum_keys = self.resolve(sum_field) if sum_field else []
+        if sum_keys:
+            columns.append(func.sum(self._number(sum_keys)).label("total"))
+
+        query = self._base(*columns)
+        if filters:
+            query = query.filter(self._predicate(filters))
+        rows = (
+            query.group_by(value)
+            .order_by(func.count(self.model.id).desc(), value)
+            .limit(limit)
+            .all()
+        )
+        return [
+            FieldGroup(
+                value=row.value,
+                count=row.count,
+                total=float(row.total) if sum_keys and row.total is not None else None
+            )
+            for row in rows
+        ]
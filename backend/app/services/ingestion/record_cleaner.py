@@ -0,0 +1,106 @@
+"""
+JSON-safe record cleaning for parsed tables.
+
+clean_json_value() is the per-value rule DataSaver has always applied to
+each record (NaN/Infinity -> None, numpy scalars -> Python values,
+non-serializable values -> str). dataframe_to_records() produces the same
+records from a DataFrame column by column: float columns are cleaned with
+numpy, integer/bool columns are converted in bulk, and only values of
+unusual types fall back to clean_json_value(). dataframe_to_record_batches()
+does the same one slice of rows at a time, for streaming parsers.
+"""
+import json
+import math
+from typing import Any, Dict, Iterator, List
+
+import numpy as np
+import pandas as pd
+
+# Types that are JSON-serializable as-is
+_PLAIN_TYPES = {str, int, bool, type(None)}
+
+
+def clean_json_value(value: Any) -> Any:
+    """Clean value for JSON serialization (replace NaN, Infinity with null)"""
+    # Handle float special values
+    if isinstance(value, float):
+        if math.isnan(value) or math.isinf(value):
+            return None
+        # Check for very large numbers that might cause JSON issues
+        if abs(value) > 1e308:
+            return None
+    # Handle numpy/pandas types
+    elif hasattr(value, 'item'):  # numpy scalar
+        try:
+            return clean_json_value(value.item())
+        except (ValueError, OverflowError):
+            return None
+    elif isinstance(value, dict):
+        return {k: clean_json_value(v) for k, v in value.items()}
+    elif isinstance(value, list):
+        return [clean_json_value(item) for item in value]
+    # Handle other non-serializable types
+    try:
+        json.dumps(value)  # Test if serializable
+        return value
+    except (TypeError, ValueError, OverflowError):
+        return str(value) if value is not None else None
+
+
+def _clean_float_column(column: pd.Series) -> List[Any]:
+    values = column.to_numpy(dtype=float)
+    with np.errstate(invalid="ignore"):
+        invalid = ~np.isfinite(values) | (np.abs(values) > 1e308)
+    cleaned = values.astype(object)
+    cleaned[invalid] = None
+    return cleaned.tolist()
+
+
+def _clean_object_column(column: pd.Series) -> List[Any]:
+    values = column.to_numpy(dtype=object)
+    types = set(map(type, values))
+    if type(pd.NA) in types:
+        # to_dict('records') returns None for pd.NA
+        values = np.array([None if v is pd.NA else v for v in values], dtype=object)
+        types.discard(type(pd.NA))
+        types.add(type(None))
+    if types <= _PLAIN_TYPES:
+        return values.tolist()
+    if types <= _PLAIN_TYPES | {float}:
+        return [
+            None if type(v) is float and (not math.isfinite(v) or abs(v) > 1e308) else v
+            for v in values
+        ]
+    return [v if type(v) in _PLAIN_TYPES else clean_json_value(v) for v in values]
+
+
+def clean_column(column: pd.Series) -> List[Any]:
+    """Clean one column; returns a list of JSON-safe Python values"""
+    dtype = column.dtype
+    if isinstance(dtype, np.dtype):  # extension dtypes (Int64, category, ...) take the object path
+        if dtype.kind == "f":
+            return _clean_float_column(column)
+        if dtype.kind in "iub":
+            return column.tolist()
+    return _clean_object_column(column)
+
+
+def dataframe_to_records(df: pd.DataFrame) -> List[Dict[str, Any]]:
+    """
+    Convert a DataFrame to cleaned records.
+
+    Equivalent to applying clean_json_value to every value of
+    df.where(pd.notna(df), None).to_dict('records').
+    """
+    df = df.where(pd.notna(df), None)
+    keys = df.columns.tolist()
+    if not keys:
+        return [{} for _ in range(len(df))]
+    columns = [clean_column(df.iloc[:, position]) for position in range(len(keys))]
+    return [dict(zip(keys, row)) for row in zip(*columns)]
+
+
+def dataframe_to_record_batches(df: pd.DataFrame, batch_size: int) -> Iterator[List[Dict[str, Any]]]:
+    """Yield the records of dataframe_to_records(df) in lists of at most batch_size"""
+    for start in range(0, len(df), batch_size):
+        yield dataframe_to_records(df.iloc[start:start + batch_size])
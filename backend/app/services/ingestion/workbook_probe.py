@@ -0,0 +1,69 @@
+"""
+Shared view of one uploaded Excel workbook.
+
+Detecting and parsing an upload used to open the same .xlsx several times:
+each Excel parser's can_parse() built its own pd.ExcelFile, get_parser()
+repeated the checks, and parse() opened the file again and read every
+sheet with a separate read_excel call. A WorkbookProbe opens the workbook
+once, caches the sheet names and previews, and is passed to every parser's
+can_parse()/parse() for the same upload.
+"""
+from typing import Dict, List, Optional, Tuple
+
+import pandas as pd
+
+
+class WorkbookProbe:
+    """Opens a workbook lazily, once, and serves sheet names and sheets from it"""
+
+    def __init__(self, file_path: str):
+        self.file_path = str(file_path)
+        self._excel_file: Optional[pd.ExcelFile] = None
+        self._error: Optional[Exception] = None
+        self._heads: Dict[Tuple[str, int], pd.DataFrame] = {}
+
+    def __enter__(self) -> "WorkbookProbe":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def _open(self) -> pd.ExcelFile:
+        # A failed open is remembered so callers see the same error without retrying
+        if self._error is not None:
+            raise self._error
+        if self._excel_file is None:
+            try:
+                self._excel_file = pd.ExcelFile(self.file_path)
+            except Exception as e:
+                self._error = e
+                raise
+        return self._excel_file
+
+    @property
+    def sheet_names(self) -> List[str]:
+        """Sheet names; raises the open error if the file is not a readable workbook"""
+        return self._open().sheet_names
+
+    def has_sheet(self, sheet_name: str) -> bool:
+        """True if the workbook can be opened and contains the sheet"""
+        try:
+            return sheet_name in self.sheet_names
+        except Exception:
+            return False
+
+    def head(self, sheet_name: str, rows: int = 5) -> pd.DataFrame:
+        """First rows of a sheet without header handling (cached)"""
+        key = (sheet_name, rows)
+        if key not in self._heads:
+            self._heads[key] = self._open().parse(sheet_name, header=None, nrows=rows)
+        return self._heads[key]
+
+    def read_sheet(self, sheet_name: str, header: Optional[int] = 0) -> pd.DataFrame:
+        """Read a whole sheet from the already opened workbook"""
+        return self._open().parse(sheet_name, header=header)
+
+    def close(self) -> None:
+        if self._excel_file is not None:
+            self._excel_file.close()
+            self._excel_file = None
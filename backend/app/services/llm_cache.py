@@ -0,0 +1,262 @@
+"""
+LLM Response Cache
+
+Persistent cache of LLM responses keyed by prompt fingerprint:
+SHA-256 over (provider, model, SHA-256 of the system prompt, SHA-256 of
+the user prompt). Re-analyzing an unchanged alert sends identical prompts,
+so repeated batch runs are answered from the cache without API calls.
+
+Storage is a single SQLite file. Entries expire after a TTL, and the total
+stored response size is bounded by evicting least recently used entries.
+Lookups can be bypassed per request with `llm_cache_bypass()`; bypassed
+calls still store the fresh response.
+"""
+
+import hashlib
+import logging
+import os
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+
+# Set for the duration of a request that must not read cached responses
+_bypass: ContextVar[bool] = ContextVar("llm_cache_bypass", default=False)
+
+
+@contextmanager
+def llm_cache_bypass(enabled: bool = True):
+    """
+    Skip cache lookups for LLM calls made inside this block.
+
+    Usage:
+        with llm_cache_bypass(request.bypass_llm_cache):
+            finding = analyzer.analyze_alert(artifacts)
+    """
+    token = _bypass.set(enabled)
+    try:
+        yield
+    finally:
+        _bypass.reset(token)
+
+
+def is_llm_cache_bypassed() -> bool:
+    """True inside an active llm_cache_bypass() block."""
+    return _bypass.get()
+
+
+def _sha256(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+class LLMResponseCache:
+    """
+    SQLite-backed LLM response cache.
+
+    Usage:
+        cache = LLMResponseCache("./storage/llm_cache.sqlite3")
+        response = cache.get("openai", "gpt-4o-mini", system_prompt, user_prompt)
+        if response is None:
+            response = call_llm(...)
+            cache.put("openai", "gpt-4o-mini", system_prompt, user_prompt, response)
+    """
+
+    def __init__(
+        self,
+        path: str,
+        ttl_seconds: Optional[float] = 30 * 24 * 3600,
+        max_bytes: int = 256 * 1024 * 1024
+    ):
+        """
+        Initialize the cache.
+
+        Args:
+            path: SQLite database file (created if missing)
+            ttl_seconds: Entry lifetime; None keeps entries until evicted
+            max_bytes: Maximum total size of stored responses
+        """
+        self.path = path
+        self.ttl_seconds = ttl_seconds
+        self.max_bytes = max_bytes
+
+        self.hits = 0
+        self.misses = 0
+        self.bypassed = 0
+        self.stores = 0
+
+        self._lock = threading.Lock()
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False, timeout=30)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS llm_responses (
+                key TEXT PRIMARY KEY,
+                provider TEXT NOT NULL,
+                model TEXT NOT NULL,
+                response TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                created_at REAL NOT NULL,
+                accessed_at REAL NOT NULL
+            )
+            """
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS ix_llm_responses_accessed_at ON llm_responses (accessed_at)"
+        )
+        self._conn.commit()
+
+    @staticmethod
+    def make_key(provider: str, model: str, system_prompt: str, user_prompt: str) -> str:
+        """Prompt fingerprint: provider, model, system prompt hash, user prompt hash."""
+        parts = [provider.lower(), model, _sha256(system_prompt or ""), _sha256(user_prompt or "")]
+        return _sha256("\x00".join(parts))
+
+    def get(self, provider: str, model: str, system_prompt: str, user_prompt: str) -> Optional[str]:
+        """Return the cached response, or None on a miss, expiry or active bypass."""
+        if is_llm_cache_bypassed():
+            with self._lock:
+                self.bypassed += 1
+            return None
+
+        key = self.make_key(provider, model, system_prompt, user_prompt)
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT response, created_at FROM llm_responses WHERE key = ?", (key,)
+            ).fetchone()
+
+            if row is not None and self.ttl_seconds is not None and now - row[1] > self.ttl_seconds:
+                self._conn.execute("DELETE FROM llm_responses WHERE key = ?", (key,))
+                self._conn.commit()
+                row = None
+
+            if row is None:
+                self.misses += 1
+                return None
+
+            self._conn.execute("UPDATE llm_responses SET accessed_at = ? WHERE key = ?", (now, key))
+            self._conn.commit()
+            self.hits += 1
+            return row[0]
+
+    def put(self, provider: str, model: str, system_prompt: str, user_prompt: str, response: str):
+        """Store a response and evict least recently used entries if over budget."""
+        if not response:
+            return
+        key = self.make_key(provider, model, system_prompt, user_prompt)
+        size = len(response.encode("utf-8"))
+        if size > self.max_bytes:
+            return
+
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                """
+                INSERT OR REPLACE INTO llm_responses
+                    (key, provider, model, response, size, created_at, accessed_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+                """,
+                (key, provider.lower(), model, response, size, now, now)
+            )
+            self.stores += 1
+            self._evict()
+            self._conn.commit()
+
+    def _evict(self):
+        """Drop expired entries, then least recently used ones until within max_bytes."""
+        if self.ttl_seconds is not None:
+            self._conn.execute(
+                "DELETE FROM llm_responses WHERE created_at < ?", (time.time() - self.ttl_seconds,)
+            )
+
+        total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM llm_responses").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+
+        excess = total - self.max_bytes
+        rows = self._conn.execute(
+            "SELECT key, size FROM llm_responses ORDER BY accessed_at ASC"
+        )
+        evict = []
+        for key, size in rows:
+            if excess <= 0:
+                break
+            evict.append((key,))
+            excess -= size
+        self._conn.executemany("DELETE FROM llm_responses WHERE key = ?", evict)
+        logger.debug(f"Evicted {len(evict)} LLM cache entries")
+
+    def clear(self):
+        """Remove all cached responses."""
+        with self._lock:
+            self._conn.execute("DELETE FROM llm_responses")
+            self._conn.commit()
+
+    def stats(self) -> Dict[str, float]:
+        """Hit/miss counters and current size."""
+        with self._lock:
+            entries, size = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM llm_responses"
+            ).fetchone()
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "bypassed": self.bypassed,
+                "stores": self.stores,
+                "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+                "entries": entries,
+                "size_bytes": size,
+                "max_bytes": self.max_bytes,
+            }
+
+
+# Global cache instance (lazy initialization, None when disabled)
+_llm_cache_instance: Optional[LLMResponseCache] = None
+_llm_cache_initialized = False
+_llm_cache_lock = threading.Lock()
+
+
+def get_llm_response_cache() -> Optional[LLMResponseCache]:
+    """
+    Get the process-wide LLM response cache configured in settings.
+
+    Uses LLM_CACHE_ENABLED, LLM_CACHE_PATH (default
+    {STORAGE_PATH}/llm_cache.sqlite3), LLM_CACHE_TTL_HOURS and
+    LLM_CACHE_MAX_MB. Returns None when the cache is disabled or cannot
+    be opened.
+    """
+    global _llm_cache_instance, _llm_cache_initialized
+
+    if _llm_cache_initialized:
+        return _llm_cache_instance
+
+    with _llm_cache_lock:
+        if _llm_cache_initialized:
+            return _llm_cache_instance
+
+        from app.core.config import settings
+
+        if getattr(settings, "LLM_CACHE_ENABLED", True):
+            path = getattr(settings, "LLM_CACHE_PATH", None) or os.path.join(
+                getattr(settings, "STORAGE_PATH", "./storage"), "llm_cache.sqlite3"
+            )
+            ttl_hours = getattr(settings, "LLM_CACHE_TTL_HOURS", 720)
+            try:
+                _llm_cache_instance = LLMResponseCache(
+                    path,
+                    ttl_seconds=ttl_hours * 3600 if ttl_hours else None,
+                    max_bytes=getattr(settings, "LLM_CACHE_MAX_MB", 256) * 1024 * 1024
+                )
+            except sqlite3.Error as e:
+                logger.warning(f"LLM response cache disabled, cannot open {path}: {e}")
+
+        _llm_cache_initialized = True
+        return _llm_cache_instance
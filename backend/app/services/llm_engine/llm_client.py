@@ -1,3 +1,4 @@
+import asyncio
 from abc import ABC, abstractmethod
 from typing import Dict, Any, Optional
 from app.core.config import settings
@@ -13,46 +14,72 @@ class LLMClient(ABC):
         """Generate response from LLM"""
         pass
 
+    async def generate_async(self, prompt: str, system_prompt: Optional[str] = None) -> str:
+        """Generate response without blocking the event loop"""
+        return await asyncio.to_thread(self.generate, prompt, system_prompt)
+
 
 class OpenAIClient(LLMClient):
     """OpenAI API client"""
+
+    provider = "openai"
+    model = "gpt-4"
     
     def __init__(self, api_key: Optional[str] = None):
         self.api_key = api_key or settings.OPENAI_API_KEY
         if not self.api_key:
             raise ValueError("OpenAI API key not configured")
         self.client = openai.OpenAI(api_key=self.api_key)
+        self.async_client = openai.AsyncOpenAI(api_key=self.api_key)
     
     def generate(self, prompt: str, system_prompt: Optional[str] = None) -> str:
         """Generate response using OpenAI"""
-        messages = []
-        if system_prompt:
-            messages.append({"role": "system", "content": system_prompt})
-        messages.append({"role": "user", "content": prompt})
-        
         response = self.client.chat.completions.create(
-            model="gpt-4",
-            messages=messages,
+            model=self.model,
+            messages=self._messages(prompt, system_prompt),
             temperature=0.3,
             max_tokens=1000
         )
         
         return response.choices[0].message.content
 
+    async def generate_async(self, prompt: str, system_prompt: Optional[str] = None) -> str:
+        """Generate response using the asyncio OpenAI client"""
+        response = await self.async_client.chat.completions.create(
+            model=self.model,
+            messages=self._messages(prompt, system_prompt),
+            temperature=0.3,
+            max_tokens=1000
+        )
+
+        return response.choices[0].message.content
+
+    @staticmethod
+    def _messages(prompt: str, system_prompt: Optional[str]) -> list:
+        messages = []
+        if system_prompt:
+            messages.append({"role": "system", "content": system_prompt})
+        messages.append({"role": "user", "content": prompt})
+        return messages
+
 
 class AnthropicClient(LLMClient):
     """Anthropic Claude API client"""
+
+    provider = "anthropic"
+    model = "claude-3-opus-20240229"
     
     def __init__(self, api_key: Optional[str] = None):
         self.api_key = api_key or settings.ANTHROPIC_API_KEY
         if not self.api_key:
             raise ValueError("Anthropic API key not configured")
         self.client = anthropic.Anthropic(api_key=self.api_key)
+        self.async_client = anthropic.AsyncAnthropic(api_key=self.api_key)
     
     def generate(self, prompt: str, system_prompt: Optional[str] = None) -> str:
         """Generate response using Anthropic Claude"""
         response = self.client.messages.create(
-            model="claude-3-opus-20240229",
+            model=self.model,
             max_tokens=1000,
             system=system_prompt or "",
             messages=[
@@ -62,6 +89,19 @@ class AnthropicClient(LLMClient):
         
         return response.content[0].text
 
+    async def generate_async(self, prompt: str, system_prompt: Optional[str] = None) -> str:
+        """Generate response using the asyncio Anthropic client"""
+        response = await self.async_client.messages.create(
+            model=self.model,
+            max_tokens=1000,
+            system=system_prompt or "",
+            messages=[
+                {"role": "user", "content": prompt}
+            ]
+        )
+
+        return response.content[0].text
+
 
 def get_llm_client() -> LLMClient:
     """Factory function to get configured LLM client"""
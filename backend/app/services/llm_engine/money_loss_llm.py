@@ -1,6 +1,7 @@
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Optional, Tuple
 from app.models.finding import Finding
 from app.models.issue_type import IssueType
+from app.services.llm_cache import LLMResponseCache, get_llm_response_cache
 from .llm_client import get_llm_client, LLMClient
 import json
 import re
@@ -54,12 +55,19 @@ Provide your analysis in the following JSON format:
     }}
 }}"""
 
-    def __init__(self, llm_client: Optional[LLMClient] = None):
+    def __init__(self, llm_client: Optional[LLMClient] = None,
+                 response_cache: Optional[LLMResponseCache] = None):
         try:
             self.llm_client = llm_client or get_llm_client()
         except (ValueError, Exception):
             # If LLM client can't be initialized (no API key), set to None
             self.llm_client = None
+
+        try:
+            self.response_cache = response_cache or get_llm_response_cache()
+        except Exception:
+            # Cache is optional; estimates are still produced without it
+            self.response_cache = None
     
     def calculate(self, finding: Finding, 
                   issue_type: Optional[IssueType] = None,
@@ -87,17 +95,45 @@ Provide your analysis in the following JSON format:
         
         try:
             # Get LLM response
-            response = self.llm_client.generate(prompt, self.SYSTEM_PROMPT)
+            response, from_cache = self._generate(prompt)
             
             # Parse JSON from response
-            result = self._parse_response(response)
+            result = self._parse_json(response)
+            if result is None:
+                # Free text is not cached, so the prompt is sent again next time
+                return self._extract_from_text(response)
             
+            if not from_cache:
+                self._store_response(prompt, response)
             return result
             
         except Exception as e:
             # Fallback calculation
             return self._fallback_calculation(finding, issue_type)
     
+    def _cache_key(self) -> Tuple[str, str]:
+        provider = getattr(self.llm_client, "provider", type(self.llm_client).__name__)
+        return provider, getattr(self.llm_client, "model", "")
+    
+    def _generate(self, prompt: str) -> Tuple[str, bool]:
+        """Generate a response, answering repeated prompts from the response cache; returns (response, from_cache)"""
+        if self.response_cache:
+            cached = self.response_cache.get(*self._cache_key(), self.SYSTEM_PROMPT, prompt)
+            if cached is not None:
+                try:
+                    if self._parse_json(cached) is not None:
+                        return cached, True
+                except (TypeError, ValueError):
+                    pass
+                # Stored before responses were checked; request a fresh one
+
+        return self.llm_client.generate(prompt, self.SYSTEM_PROMPT), False
+    
+    def _store_response(self, prompt: str, response: str):
+        """Cache a response that parsed as a JSON estimate"""
+        if self.response_cache:
+            self.response_cache.put(*self._cache_key(), self.SYSTEM_PROMPT, prompt, response)
+    
     def _format_additional_context(self, context: Dict[str, Any]) -> str:
         """Format additional context for prompt"""
         if not context:
@@ -111,26 +147,39 @@ Provide your analysis in the following JSON format:
     
     def _parse_response(self, response: str) -> Dict[str, Any]:
         """Parse JSON from LLM response"""
-        # Try to extract JSON from response
-        json_match = re.search(r'\{.*\}', response, re.DOTALL)
-        if json_match:
-            json_str = json_match.group(0)
-            try:
-                result = json.loads(json_str)
-                # Validate and normalize
-                return {
-                    "estimated_loss": float(result.get("estimated_loss", 0)),
-                    "confidence": float(result.get("confidence", 0.5)),
-                    "reasoning": result.get("reasoning", ""),
-                    "factors_considered": result.get("factors_considered", []),
-                    "breakdown": result.get("breakdown", {})
-                }
-            except json.JSONDecodeError:
-                pass
+        result = self._parse_json(response)
+        if result is not None:
+            return result
         
         # If JSON parsing fails, try to extract numbers
         return self._extract_from_text(response)
     
+    def _parse_json(self, response: str) -> Optional[Dict[str, Any]]:
+        """
+        Normalized estimate from the JSON object in a response
+        
+        Returns None if the response holds no parseable JSON object; raises
+        ValueError/TypeError if the object's numbers are not numbers.
+        """
+        # Try to extract JSON from response
+        json_match = re.search(r'\{.*\}', response, re.DOTALL)
+        if not json_match:
+            return None
+        try:
+            result = json.loads(json_match.group(0))
+        except json.JSONDecodeError:
+            return None
+        if not isinstance(result, dict):
+            return None
+        # Validate and normalize
+        return {
+            "estimated_loss": float(result.get("estimated_loss", 0)),
+            "confidence": float(result.get("confidence", 0.5)),
+            "reasoning": result.get("reasoning", ""),
+            "factors_considered": result.get("factors_considered", []),
+            "breakdown": result.get("breakdown", {})
+        }
+    
     def _extract_from_text(self, text: str) -> Dict[str, Any]:
         """Extract estimate from unstructured text"""
         # Look for currency amounts
@@ -1,8 +1,13 @@
 from .money_loss_ml import MoneyLossML
 from .model_trainer import ModelTrainer
+from .model_registry import ModelRegistry, get_model_registry
+from .training_job import TrainingJob, get_training_job
 
 __all__ = [
     "MoneyLossML",
     "ModelTrainer",
+    "ModelRegistry",
+    "get_model_registry",
+    "TrainingJob",
+    "get_training_job",
 ]
-
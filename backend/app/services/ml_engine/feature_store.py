@@ -0,0 +1,228 @@
+"""
+Materialized features for the money loss model.
+
+The feature vector is defined once here and shared by training
+(ModelTrainer), inference (MoneyLossML) and the finding_features table.
+Issue type and focus area codes are encoded with CRC-32 rather than
+hash(), whose value for a string changes with every process, so a vector
+stored by one worker means the same to every other worker and to
+training.
+
+Rows are written together with their finding: Analyzer attaches them
+before scoring money loss, and FindingWriter inserts them with the other
+per-finding tables. Training reads the table with one columnar query,
+after backfilling findings saved before it existed or under an older
+FEATURE_VERSION.
+"""
+import zlib
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+from sqlalchemy import func, inspect, insert, or_
+from sqlalchemy.orm import Session
+
+from app.models.finding import Finding
+from app.models.finding_feature import FindingFeature
+from app.models.focus_area import FocusArea
+from app.models.issue_type import IssueType
+from app.models.money_loss import MoneyLossCalculation
+from app.models.risk_assessment import RiskAssessment
+
+# Bump when any feature's encoding changes; older rows are then recomputed
+FEATURE_VERSION = 1
+FEATURE_NAMES = ["severity", "risk_score", "issue_type", "classification_confidence", "focus_area"]
+
+SEVERITY_CODES = {"critical": 4, "high": 3, "medium": 2, "low": 1}
+ISSUE_TYPE_BUCKETS = 1000
+FOCUS_AREA_BUCKETS = 100
+
+Vector = List[float]
+
+
+def _per_alert_loss(estimated_loss: float, details: Optional[Dict[str, Any]]) -> float:
+    """Loss of one alert: the per-alert estimate of an aggregated finding, else estimated_loss"""
+    if isinstance(details, dict) and details.get("per_alert_estimate") is not None:
+        return float(details["per_alert_estimate"])
+    return float(estimated_loss)
+
+
+def stable_code(value: str, buckets: int) -> int:
+    """Category code that is the same in every process (CRC-32, unlike hash())"""
+    return zlib.crc32(value.encode("utf-8")) % buckets
+
+
+def feature_vector(
+    severity: Optional[str],
+    risk_score: Optional[float],
+    issue_type_code: Optional[str],
+    confidence: Optional[float],
+    focus_area_code: Optional[str]
+) -> Vector:
+    """Model input for one finding, in FEATURE_NAMES order"""
+    return [
+        float(SEVERITY_CODES.get((severity or "").lower(), 2)),
+        float(risk_score if risk_score is not None else 50),
+        float(stable_code(issue_type_code or "UNKNOWN", ISSUE_TYPE_BUCKETS)),
+        float(confidence or 0.5),
+        float(stable_code(focus_area_code or "UNKNOWN", FOCUS_AREA_BUCKETS)),
+    ]
+
+
+def finding_vector(finding: Finding, issue_type: Optional[IssueType] = None) -> Vector:
+    """Feature vector computed from a finding and its related rows"""
+    issue_type = issue_type or finding.issue_type
+    return feature_vector(
+        finding.severity,
+        finding.risk_assessment.risk_score if finding.risk_assessment else None,
+        issue_type.code if issue_type else None,
+        finding.classification_confidence,
+        finding.focus_area.code if finding.focus_area else None,
+    )
+
+
+def feature_row(finding_id: int, vector: Vector) -> Dict[str, Any]:
+    """finding_features row for a bulk insert"""
+    return {"finding_id": finding_id, "feature_version": FEATURE_VERSION, **dict(zip(FEATURE_NAMES, vector))}
+
+
+def _vector_of(row: Optional[FindingFeature]) -> Optional[Vector]:
+    if row is None or row.feature_version != FEATURE_VERSION:
+        return None
+    return [row.severity, row.risk_score, row.issue_type, row.classification_confidence, row.focus_area]
+
+
+def stored_vectors(findings: Sequence[Finding]) -> List[Optional[Vector]]:
+    """
+    Materialized vectors of the findings (None where missing or outdated).
+
+    Rows attached in memory are used as they are; rows of persisted
+    findings that are not loaded yet are fetched with one query per session.
+    """
+    vectors: List[Optional[Vector]] = [None] * len(findings)
+    unloaded: Dict[Session, Dict[int, List[int]]] = {}
+    for i, finding in enumerate(findings):
+        state = inspect(finding)
+        if state.persistent and "features" in state.unloaded:
+            unloaded.setdefault(state.session, {}).setdefault(finding.id, []).append(i)
+        else:
+            vectors[i] = _vector_of(finding.features)
+
+    for session, positions in unloaded.items():
+        rows = session.query(FindingFeature).filter(
+            FindingFeature.finding_id.in_(list(positions)),
+            FindingFeature.feature_version == FEATURE_VERSION
+        )
+        for row in rows:
+            for i in positions[row.finding_id]:
+                vectors[i] = _vector_of(row)
+    return vectors
+
+
+class FeatureStore:
+    """
+    Write and read the finding_features table.
+
+    Usage:
+        store = FeatureStore(db)
+        store.attach(findings)            # before the findings are flushed
+        X, y = store.training_matrix()    # after store.backfill()
+    """
+
+    BACKFILL_BATCH_SIZE = 5000
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def attach(self, findings: Sequence[Finding], issue_type: Optional[IssueType] = None):
+        """Compute and attach a feature row to each finding (saved with it on flush)"""
+        for finding in findings:
+            finding.features = FindingFeature(
+                feature_version=FEATURE_VERSION,
+                **dict(zip(FEATURE_NAMES, finding_vector(finding, issue_type)))
+            )
+
+    def backfill(self) -> int:
+        """
+        Materialize features of findings without a current row.
+
+        Reads the inputs of all such findings in one joined query (no lazy
+        loading per finding). Returns the number of rows written.
+        """
+        stale = self.db.query(
+            Finding.id,
+            Finding.severity,
+            RiskAssessment.risk_score,
+            IssueType.code.label("issue_type_code"),
+            Finding.classification_confidence,
+            FocusArea.code.label("focus_area_code")
+        ).outerjoin(
+            RiskAssessment, RiskAssessment.finding_id == Finding.id
+        ).outerjoin(
+            IssueType, IssueType.id == Finding.issue_type_id
+        ).outerjoin(
+            FocusArea, FocusArea.id == Finding.focus_area_id
+        ).outerjoin(
+            FindingFeature, FindingFeature.finding_id == Finding.id
+        ).filter(
+            or_(FindingFeature.finding_id.is_(None), FindingFeature.feature_version != FEATURE_VERSION)
+        ).all()
+        if not stale:
+            return 0
+
+        self.db.query(FindingFeature).filter(
+            FindingFeature.feature_version != FEATURE_VERSION
+        ).delete(synchronize_session=False)
+
+        rows = [
+            feature_row(r.id, feature_vector(
+                r.severity, r.risk_score, r.issue_type_code, r.classification_confidence, r.focus_area_code
+            ))
+            for r in stale
+        ]
+        for start in range(0, len(rows), self.BACKFILL_BATCH_SIZE):
+            self.db.execute(insert(FindingFeature), rows[start:start + self.BACKFILL_BATCH_SIZE])
+        return len(rows)
+
+    def max_finding_id(self) -> Optional[int]:
+        """Newest finding with current features (high-water mark for incremental training)"""
+        return self.db.query(func.max(FindingFeature.finding_id)).filter(
+            FindingFeature.feature_version == FEATURE_VERSION
+        ).scalar()
+
+    def training_matrix(
+        self,
+        after_finding_id: Optional[int] = None,
+        up_to_finding_id: Optional[int] = None
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Feature matrix and estimated losses of findings with a money loss calculation.
+
+        The target is the loss of one alert. An aggregated finding (one per
+        group of alerts, see Analyzer) stores the group total, but its
+        features describe a single alert, so its per-alert estimate from
+        calculation_details is used instead.
+
+        Args:
+            after_finding_id: Only findings with a higher id (new since a model version)
+            up_to_finding_id: Only findings up to this id (those present when training started)
+        """
+        query = self.db.query(
+            *[getattr(FindingFeature, name) for name in FEATURE_NAMES],
+            MoneyLossCalculation.estimated_loss,
+            MoneyLossCalculation.calculation_details
+        ).join(
+            MoneyLossCalculation, MoneyLossCalculation.finding_id == FindingFeature.finding_id
+        ).filter(
+            FindingFeature.feature_version == FEATURE_VERSION
+        )
+        if after_finding_id is not None:
+            query = query.filter(FindingFeature.finding_id > after_finding_id)
+        if up_to_finding_id is not None:
+            query = query.filter(FindingFeature.finding_id <= up_to_finding_id)
+        rows = query.order_by(FindingFeature.finding_id).all()
+
+        if not rows:
+            return np.empty((0, len(FEATURE_NAMES))), np.empty(0)
+        X = np.array([row[:-2] for row in rows], dtype=float)
+        y = np.array([_per_alert_loss(row[-2], row[-1]) for row in rows], dtype=float)
+        return X, y
@@ -0,0 +1,198 @@
+"""
+Process-wide registry of trained ML models.
+
+ModelTrainer publishes each model version as an uncompressed joblib file
+(<name>_<version>.joblib) and then points <name>.current at it. The
+registry loads a version once per process, not once per Analyzer, with
+mmap_mode="r": model arrays are mapped from the file rather than read
+onto the heap, so processes share those pages (scikit-learn trees still
+copy their node arrays into their own buffers when unpickled). Every
+lookup stats the pointer file, so a newly published version replaces
+the loaded one on the next request, without a restart.
+
+Models saved before versions were published (<name>.pkl) are still
+served while no pointer file exists.
+"""
+import json
+import logging
+import os
+import pickle
+import threading
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+import joblib
+
+logger = logging.getLogger(__name__)
+
+MONEY_LOSS_MODEL = "money_loss_model"
+
+# Shared registry for the configured model directory (lazy initialization)
+_registry_instance: Optional["ModelRegistry"] = None
+
+
+def get_model_registry() -> "ModelRegistry":
+    """Get or create the process-wide ModelRegistry under STORAGE_PATH/ml_models."""
+    global _registry_instance
+    from app.core.config import settings
+
+    if _registry_instance is None:
+        _registry_instance = ModelRegistry(os.path.join(settings.STORAGE_PATH, "ml_models"))
+
+    return _registry_instance
+
+
+@dataclass
+class LoadedModel:
+    """A model version held in memory by the registry"""
+    name: str
+    version: str
+    path: str
+    model: Any
+    loaded_at: datetime = field(default_factory=datetime.utcnow)
+
+
+class ModelRegistry:
+    """
+    Load each published model version once per process and follow new versions.
+
+    Usage:
+        registry = get_model_registry()
+        registry.publish(MONEY_LOSS_MODEL, model, "20240101120000")  # trainer
+        model = registry.get(MONEY_LOSS_MODEL)  # inference, any process
+    """
+
+    MODEL_SUFFIX = ".joblib"
+    POINTER_SUFFIX = ".current"
+
+    def __init__(self, model_dir: str, mmap: bool = True, keep_versions: int = 5):
+        """
+        Args:
+            model_dir: Directory holding model files and pointers
+            mmap: Memory-map model arrays when loading (shared between processes)
+            keep_versions: Model files kept per name when publishing; older ones are removed
+        """
+        self.model_dir = Path(model_dir)
+        self.mmap = mmap
+        self.keep_versions = keep_versions
+        self.loads = 0
+
+        self._lock = threading.Lock()
+        self._loaded: Dict[str, LoadedModel] = {}
+        # Name -> pointer file (mtime_ns, size, inode) the loaded model was read for
+        self._seen: Dict[str, Optional[Tuple[int, int, int]]] = {}
+
+    def _pointer_path(self, name: str) -> Path:
+        return self.model_dir / f"{name}{self.POINTER_SUFFIX}"
+
+    def _pointer_state(self, name: str) -> Optional[Tuple[int, int, int]]:
+        try:
+            stat = os.stat(self._pointer_path(name))
+        except OSError:
+            return None
+        return stat.st_mtime_ns, stat.st_size, stat.st_ino
+
+    def get(self, name: str = MONEY_LOSS_MODEL) -> Optional[Any]:
+        """The current model for name, or None if none has been trained."""
+        loaded = self.current(name)
+        return loaded.model if loaded else None
+
+    def current(self, name: str = MONEY_LOSS_MODEL) -> Optional[LoadedModel]:
+        """The current version of name, loaded on first use and after each publish."""
+        state = self._pointer_state(name)
+        with self._lock:
+            if name in self._seen and self._seen[name] == state:
+                return self._loaded.get(name)
+
+            loaded = self._load(name) if state is not None else self._load_legacy(name)
+            self._seen[name] = state
+            if loaded is not None:
+                self._loaded[name] = loaded
+            else:
+                self._loaded.pop(name, None)
+            return loaded
+
+    def _load(self, name: str) -> Optional[LoadedModel]:
+        """Load the version the pointer file names; keep the previous one if that fails."""
+        try:
+            pointer = json.loads(self._pointer_path(name).read_text())
+            path = self.model_dir / pointer["file"]
+            model = joblib.load(path, mmap_mode="r" if self.mmap else None)
+        except Exception as e:
+            logger.warning(f"Could not load model {name}: {e}")
+            return self._loaded.get(name)
+
+        self.loads += 1
+        logger.info(f"Loaded model {name} version {pointer['version']}")
+        return LoadedModel(name, pointer["version"], str(path), model)
+
+    def _load_legacy(self, name: str) -> Optional[LoadedModel]:
+        """<name>.pkl written before versions were published"""
+        path = self.model_dir / f"{name}.pkl"
+        if not path.exists():
+            return None
+        try:
+            with open(path, "rb") as f:
+                model = pickle.load(f)
+        except Exception as e:
+            logger.warning(f"Could not load model {path.name}: {e}")
+            return None
+
+        self.loads += 1
+        return LoadedModel(name, "legacy", str(path), model)
+
+    def publish(self, name: str, model: Any, version: str) -> Path:
+        """
+        Save a model version and make it current for every process.
+
+        Returns:
+            Path of the saved model file
+        """
+        self.model_dir.mkdir(parents=True, exist_ok=True)
+        filename = f"{name}_{version}{self.MODEL_SUFFIX}"
+        path = self.model_dir / filename
+
+        # Uncompressed, so arrays can be memory-mapped; renamed into place so
+        # processes still mapping an older file of the same name keep it intact
+        tmp_path = self.model_dir / f".{filename}.{os.getpid()}.tmp"
+        joblib.dump(model, tmp_path)
+        os.replace(tmp_path, path)
+
+        pointer = {"version": version, "file": filename, "published_at": datetime.utcnow().isoformat()}
+        tmp_pointer = self.model_dir / f".{name}{self.POINTER_SUFFIX}.{os.getpid()}.tmp"
+        tmp_pointer.write_text(json.dumps(pointer))
+        os.replace(tmp_pointer, self._pointer_path(name))
+
+        logger.info(f"Published model {name} version {version}")
+        self._prune(name, keep=path)
+        return path
+
+    def versions(self, name: str = MONEY_LOSS_MODEL) -> List[str]:
+        """Published versions of name still on disk, newest first."""
+        prefix = f"{name}_"
+        return [
+            path.name[len(prefix):-len(self.MODEL_SUFFIX)]
+            for path in self._model_files(name)
+        ]
+
+    def _model_files(self, name: str) -> List[Path]:
+        """Model files of name, newest first."""
+        files = []
+        for path in self.model_dir.glob(f"{name}_*{self.MODEL_SUFFIX}"):
+            try:
+                files.append((path.stat().st_mtime_ns, path))
+            except OSError:
+                continue
+        return [path for _, path in sorted(files, reverse=True)]
+
+    def _prune(self, name: str, keep: Path):
+        """Remove model files beyond keep_versions (never the current one)."""
+        for path in self._model_files(name)[self.keep_versions:]:
+            if path == keep:
+                continue
+            try:
+                path.unlink()
+            except OSError:
+                pass
@@ -1,45 +1,102 @@
 """
 ML Model Training Pipeline
 Trains models for money loss prediction based on historical data
+
+A full fit grows a new forest on every finding. An incremental refresh
+warm-starts the current version's forest and adds ML_INCREMENTAL_TREES
+trees fit on the findings saved since that version, until the forest
+reaches ML_MAX_TREES and the next run refits from scratch. Trees are fit
+on all cores (ML_TRAINING_N_JOBS), and each run is recorded as a
+ModelVersion with its sample counts, fit time and model size.
 """
-import pandas as pd
+import time
+import joblib
 import numpy as np
 from sklearn.ensemble import RandomForestRegressor
 from sklearn.model_selection import train_test_split
 from sklearn.metrics import mean_absolute_error, r2_score
-import pickle
-import os
-from pathlib import Path
-from typing import Optional, Dict, Any
+from datetime import datetime
+from typing import Optional, Dict, Any, Tuple
 from sqlalchemy.orm import Session
-from app.models.finding import Finding
-from app.models.money_loss import MoneyLossCalculation
-from app.core.config import settings
+from app.models.model_version import ModelVersion
+from .feature_store import FEATURE_VERSION, FeatureStore
+from .model_registry import MONEY_LOSS_MODEL, ModelRegistry, get_model_registry
+
+# Fewer samples than this are not worth a fit (in total, or new for a refresh)
+MIN_TRAINING_SAMPLES = 10
 
 
 class ModelTrainer:
     """Train ML models for money loss prediction"""
     
-    def __init__(self, db: Session):
+    def __init__(self, db: Session, registry: Optional[ModelRegistry] = None):
         self.db = db
-        self.model_dir = Path(settings.STORAGE_PATH) / "ml_models"
+        self.registry = registry or get_model_registry()
+        self.feature_store = FeatureStore(db)
+        self.model_dir = self.registry.model_dir
         self.model_dir.mkdir(parents=True, exist_ok=True)
     
-    def train(self, model_version: Optional[str] = None) -> Dict[str, Any]:
+    def train(self, model_version: Optional[str] = None, incremental: bool = False,
+              record: Optional[ModelVersion] = None) -> Dict[str, Any]:
         """
         Train money loss prediction model
         
+        Args:
+            model_version: Version name; default a UTC timestamp
+            incremental: Refresh the current version with findings saved since it
+                (full fit when there is no compatible current version)
+            record: ModelVersion row to fill in; created when not given
+        
         Returns:
             Dict with training metrics
         """
-        # Load training data
-        X, y = self._load_training_data()
+        from app.core.config import settings
+        
+        if record is None:
+            record = ModelVersion(name=MONEY_LOSS_MODEL)
+            self.db.add(record)
+        record.version = model_version or record.version or datetime.utcnow().strftime("%Y%m%d%H%M%S")
+        record.status = "running"
+        record.mode = "incremental" if incremental else "full"
+        record.n_jobs = settings.ML_TRAINING_N_JOBS
+        record.started_at = datetime.utcnow()
+        self.db.commit()
+        
+        try:
+            return self._train(record, incremental, settings)
+        except Exception as e:
+            self.db.rollback()
+            record.status = "failed"
+            record.message = str(e)[:1000]
+            record.completed_at = datetime.utcnow()
+            self.db.commit()
+            raise
+    
+    def _train(self, record: ModelVersion, incremental: bool, settings) -> Dict[str, Any]:
+        # Load training data: only findings present now, so the high-water
+        # mark recorded below is exact even while new findings arrive
+        self._backfill_features()
+        last_finding_id = self.feature_store.max_finding_id()
         
-        if len(X) < 10:
-            return {
-                "success": False,
-                "message": "Insufficient training data (need at least 10 samples)"
-            }
+        base = self._base_model(settings) if incremental else None
+        if base is not None:
+            base_record, model = base
+            X, y = self.feature_store.training_matrix(
+                after_finding_id=base_record.last_finding_id, up_to_finding_id=last_finding_id
+            )
+            if len(X) < MIN_TRAINING_SAMPLES:
+                return self._skip(
+                    record, f"Only {len(X)} new samples since version {base_record.version} "
+                            f"(need at least {MIN_TRAINING_SAMPLES})"
+                )
+            record.base_version = base_record.version
+        else:
+            record.mode = "full"
+            X, y = self.feature_store.training_matrix(up_to_finding_id=last_finding_id)
+            if len(X) < MIN_TRAINING_SAMPLES:
+                return self._skip(
+                    record, f"Insufficient training data (need at least {MIN_TRAINING_SAMPLES} samples)"
+                )
         
         # Split data
         X_train, X_test, y_train, y_test = train_test_split(
@@ -47,81 +104,102 @@ class ModelTrainer:
         )
         
         # Train model
-        model = RandomForestRegressor(
-            n_estimators=100,
-            max_depth=10,
-            random_state=42
-        )
+        if base is not None:
+            # Warm start keeps the fitted trees and fits only the added ones
+            model.set_params(
+                warm_start=True,
+                n_estimators=len(model.estimators_) + settings.ML_INCREMENTAL_TREES,
+                n_jobs=settings.ML_TRAINING_N_JOBS
+            )
+        else:
+            model = RandomForestRegressor(
+                n_estimators=100,
+                max_depth=10,
+                random_state=42,
+                n_jobs=settings.ML_TRAINING_N_JOBS
+            )
+        started = time.perf_counter()
         model.fit(X_train, y_train)
+        training_seconds = time.perf_counter() - started
         
         # Evaluate
         y_pred = model.predict(X_test)
         mae = mean_absolute_error(y_test, y_pred)
         r2 = r2_score(y_test, y_pred)
         
-        # Save model
-        version = model_version or "latest"
-        model_path = self.model_dir / f"money_loss_model_{version}.pkl"
-        with open(model_path, 'wb') as f:
-            pickle.dump(model, f)
+        # Publish: every process's registry switches to this version
+        model_path = self.registry.publish(MONEY_LOSS_MODEL, model, record.version)
         
-        # Also save as latest
-        latest_path = self.model_dir / "money_loss_model.pkl"
-        with open(latest_path, 'wb') as f:
-            pickle.dump(model, f)
+        record.status = "completed"
+        record.feature_version = FEATURE_VERSION
+        record.training_samples = len(X_train)
+        record.test_samples = len(X_test)
+        record.last_finding_id = last_finding_id
+        record.n_estimators = len(model.estimators_)
+        record.training_seconds = training_seconds
+        record.model_size_bytes = model_path.stat().st_size
+        record.model_path = str(model_path)
+        record.mean_absolute_error = float(mae)
+        record.r2_score = float(r2)
+        record.completed_at = datetime.utcnow()
+        self.db.commit()
         
         return {
             "success": True,
-            "model_version": version,
+            "model_version": record.version,
+            "mode": record.mode,
+            "base_version": record.base_version,
             "training_samples": len(X_train),
             "test_samples": len(X_test),
+            "n_estimators": record.n_estimators,
+            "training_seconds": training_seconds,
+            "model_size_bytes": record.model_size_bytes,
             "mean_absolute_error": float(mae),
             "r2_score": float(r2),
             "model_path": str(model_path)
         }
     
-    def _load_training_data(self) -> tuple:
-        """Load training data from database"""
-        # Get findings with money loss calculations
-        findings = self.db.query(Finding).join(
-            MoneyLossCalculation
-        ).all()
-        
-        X = []
-        y = []
-        
-        for finding in findings:
-            # Extract features
-            features = self._extract_features(finding)
-            if features:
-                X.append(features)
-                y.append(finding.money_loss_calculation.estimated_loss)
-        
-        return np.array(X), np.array(y)
+    def _skip(self, record: ModelVersion, message: str) -> Dict[str, Any]:
+        record.status = "skipped"
+        record.message = message
+        record.completed_at = datetime.utcnow()
+        self.db.commit()
+        return {
+            "success": False,
+            "model_version": record.version,
+            "message": message
+        }
     
-    def _extract_features(self, finding: Finding) -> Optional[list]:
-        """Extract features from finding"""
+    def _base_model(self, settings) -> Optional[Tuple[ModelVersion, RandomForestRegressor]]:
+        """
+        Latest completed version to refresh, with its model loaded for fitting.
+        
+        None (full fit) if there is none, it was fit on other features, its
+        file is gone, or its forest already has ML_MAX_TREES trees.
+        """
+        base_record = self.db.query(ModelVersion).filter(
+            ModelVersion.name == MONEY_LOSS_MODEL,
+            ModelVersion.status == "completed"
+        ).order_by(ModelVersion.completed_at.desc(), ModelVersion.id.desc()).first()
+        if (
+            base_record is None
+            or base_record.feature_version != FEATURE_VERSION
+            or base_record.last_finding_id is None
+            or not base_record.model_path
+        ):
+            return None
+        if (base_record.n_estimators or 0) + settings.ML_INCREMENTAL_TREES > settings.ML_MAX_TREES:
+            return None
         try:
-            severity_map = {"Critical": 4, "High": 3, "Medium": 2, "Low": 1}
-            severity_encoded = severity_map.get(finding.severity, 2)
-            
-            risk_score = finding.risk_assessment.risk_score if finding.risk_assessment else 50
-            
-            issue_type_code = finding.issue_type.code if finding.issue_type else "UNKNOWN"
-            issue_type_hash = hash(issue_type_code) % 1000
-            
-            confidence = finding.classification_confidence or 0.5
-            
-            focus_area_code = finding.focus_area.code
-            focus_area_hash = hash(focus_area_code) % 100
-            
-            return [
-                severity_encoded,
-                risk_score,
-                issue_type_hash,
-                confidence,
-                focus_area_hash
-            ]
+            # Loaded into memory (not memory-mapped): fitting extends the model
+            model = joblib.load(base_record.model_path)
         except Exception:
             return None
-
+        return base_record, model
+    
+    def _backfill_features(self) -> int:
+        """Materialize features of findings saved before the feature table (or under an older version)"""
+        backfilled = self.feature_store.backfill()
+        if backfilled:
+            self.db.commit()
+        return backfilled
@@ -1,35 +1,46 @@
-from typing import Dict, Any, Optional
-import pickle
-import os
+from typing import Dict, Any, List, Optional, Sequence
 from pathlib import Path
+import joblib
 import numpy as np
 from sklearn.ensemble import RandomForestRegressor
 from app.models.finding import Finding
 from app.models.issue_type import IssueType
-from app.core.config import settings
+from .feature_store import FEATURE_NAMES, finding_vector, stored_vectors
+from .model_registry import MONEY_LOSS_MODEL, ModelRegistry, get_model_registry
 
 
 class MoneyLossML:
     """ML-based money loss prediction"""
     
-    def __init__(self, model_path: Optional[str] = None):
-        self.model_path = model_path or os.path.join(
-            settings.STORAGE_PATH, "ml_models", "money_loss_model.pkl"
-        )
-        self.model = None
-        self._load_model()
+    def __init__(self, model_path: Optional[str] = None, registry: Optional[ModelRegistry] = None):
+        """
+        Args:
+            model_path: Model file to use instead of the registry's current money loss model
+            registry: Model registry; default the process-wide one
+        """
+        self.model_path = model_path
+        self.registry = registry
+        self._model = None
+        if model_path:
+            self._load_model()
+    
+    @property
+    def model(self):
+        """Current model: the registry's latest version, so new versions apply without a restart"""
+        if self.model_path:
+            return self._model
+        return (self.registry or get_model_registry()).get(MONEY_LOSS_MODEL)
     
     def _load_model(self):
-        """Load trained model"""
+        """Load the model file given as model_path (joblib or plain pickle)"""
         model_file = Path(self.model_path)
         if model_file.exists():
             try:
-                with open(model_file, 'rb') as f:
-                    self.model = pickle.load(f)
+                self._model = joblib.load(model_file)
             except Exception:
-                self.model = None
+                self._model = None
         else:
-            self.model = None
+            self._model = None
     
     def calculate(self, finding: Finding,
                   issue_type: Optional[IssueType] = None) -> Dict[str, Any]:
@@ -39,66 +50,67 @@ class MoneyLossML:
         Returns:
             Dict with estimated_loss, confidence, etc.
         """
-        if not self.model:
-            # Return default if no model available
-            return self._default_calculation(finding, issue_type)
+        return self.calculate_many([finding], [issue_type])[0]
+    
+    def calculate_many(self, findings: Sequence[Finding],
+                       issue_types: Optional[Sequence[Optional[IssueType]]] = None) -> List[Dict[str, Any]]:
+        """
+        Calculate money loss for several findings with one model call
         
-        # Extract features
-        features = self._extract_features(finding, issue_type)
+        Args:
+            findings: Findings to score
+            issue_types: Issue type per finding; default each finding's issue_type
         
-        # Predict
+        Returns:
+            One result dict per finding, as calculate() returns
+        """
+        if issue_types is None:
+            issue_types = [finding.issue_type for finding in findings]
+        if not findings:
+            return []
+        
+        model = self.model
+        if not model:
+            # Return default if no model available
+            return [
+                self._default_calculation(finding, issue_type)
+                for finding, issue_type in zip(findings, issue_types)
+            ]
+        
+        # One feature matrix, one predict call (fixed per-call overhead paid once);
+        # materialized vectors are reused, the rest computed
         try:
-            estimated_loss = float(self.model.predict([features])[0])
-            confidence = 0.7  # ML confidence
-            
-            return {
-                "estimated_loss": max(0, estimated_loss),  # Ensure non-negative
-                "confidence": confidence,
+            features = np.array([
+                stored if stored is not None else self._extract_features(finding, issue_type)
+                for finding, issue_type, stored in zip(findings, issue_types, stored_vectors(findings))
+            ], dtype=float)
+            estimates = model.predict(features)
+        except Exception:
+            return [
+                self._default_calculation(finding, issue_type)
+                for finding, issue_type in zip(findings, issue_types)
+            ]
+        
+        feature_names = self._get_feature_names()
+        return [
+            {
+                "estimated_loss": max(0.0, float(estimated_loss)),  # Ensure non-negative
+                "confidence": 0.7,  # ML confidence
                 "reasoning": "ML model prediction based on historical data",
-                "factors_considered": self._get_feature_names(),
+                "factors_considered": list(feature_names),
                 "breakdown": {}
             }
-        except Exception:
-            return self._default_calculation(finding, issue_type)
+            for estimated_loss in estimates
+        ]
     
     def _extract_features(self, finding: Finding,
                          issue_type: Optional[IssueType]) -> list:
         """Extract features for ML model"""
-        # Severity encoding
-        severity_map = {"Critical": 4, "High": 3, "Medium": 2, "Low": 1}
-        severity_encoded = severity_map.get(finding.severity, 2)
-        
-        # Risk score
-        risk_score = finding.risk_assessment.risk_score if finding.risk_assessment else 50
-        
-        # Issue type encoding (simple hash)
-        issue_type_code = issue_type.code if issue_type else "UNKNOWN"
-        issue_type_hash = hash(issue_type_code) % 1000
-        
-        # Classification confidence
-        confidence = finding.classification_confidence or 0.5
-        
-        # Focus area encoding
-        focus_area_code = finding.focus_area.code
-        focus_area_hash = hash(focus_area_code) % 100
-        
-        return [
-            severity_encoded,
-            risk_score,
-            issue_type_hash,
-            confidence,
-            focus_area_hash
-        ]
+        return finding_vector(finding, issue_type)
     
     def _get_feature_names(self) -> list:
         """Get feature names for explanation"""
-        return [
-            "severity",
-            "risk_score",
-            "issue_type",
-            "classification_confidence",
-            "focus_area"
-        ]
+        return list(FEATURE_NAMES)
     
     def _default_calculation(self, finding: Finding,
                            issue_type: Optional[IssueType]) -> Dict[str, Any]:
@@ -0,0 +1,186 @@
+"""
+Money Loss Model Training Job
+
+ModelTrainer.train fits in the caller's thread. TrainingJob moves that off
+the request path: start() records a queued ModelVersion and returns it at
+once, and a background thread with its own database session does the fit
+(on all cores, see ModelTrainer). The same run is available as a
+standalone process, e.g. from cron after the nightly batch analysis:
+
+    python -m app.services.ml_engine.training_job          # incremental refresh
+    python -m app.services.ml_engine.training_job --full   # refit on all findings
+
+One run at a time, across processes: a partial unique index on
+model_versions(name) covers queued and running rows, so inserting the
+queued row is the claim, and a second claim fails with an IntegrityError
+however the two starts interleave. Runs left queued or running for longer
+than ML_TRAINING_STALE_MINUTES (a crashed process) are marked failed
+before each claim so they do not block training forever.
+"""
+
+import argparse
+import json
+import logging
+import threading
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, Optional
+
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.models.model_version import ACTIVE_STATUSES, ModelVersion
+from .model_registry import MONEY_LOSS_MODEL, ModelRegistry
+from .model_trainer import ModelTrainer
+
+logger = logging.getLogger(__name__)
+
+
+class TrainingInProgressError(RuntimeError):
+    """Another training run has not finished yet"""
+
+
+class TrainingJob:
+    """
+    Run money loss model training in the background.
+
+    Usage:
+        job = get_training_job()
+        version = job.start(db, incremental=True)   # returns immediately
+        job.wait()                                  # tests / scripts only
+    """
+
+    def __init__(self, session_factory: Callable[[], Session], registry: Optional[ModelRegistry] = None):
+        """
+        Args:
+            session_factory: Creates the session the training thread uses
+            registry: Registry new versions are published to; default the process-wide one
+        """
+        self.session_factory = session_factory
+        self.registry = registry
+        self._thread: Optional[threading.Thread] = None
+
+    def active(self, db: Session) -> Optional[ModelVersion]:
+        """The queued or running version, if any"""
+        return db.query(ModelVersion).filter(
+            ModelVersion.name == MONEY_LOSS_MODEL,
+            ModelVersion.status.in_(ACTIVE_STATUSES)
+        ).order_by(ModelVersion.id.desc()).first()
+
+    def claim(self, db: Session, incremental: bool = True) -> ModelVersion:
+        """
+        Record a queued version, failing if another run holds the claim.
+
+        Raises:
+            TrainingInProgressError: A run is already queued or running
+        """
+        from app.core.config import settings
+
+        cutoff = datetime.utcnow() - timedelta(minutes=settings.ML_TRAINING_STALE_MINUTES)
+        db.query(ModelVersion).filter(
+            ModelVersion.name == MONEY_LOSS_MODEL,
+            ModelVersion.status.in_(ACTIVE_STATUSES),
+            ModelVersion.created_at < cutoff
+        ).update({
+            ModelVersion.status: "failed",
+            ModelVersion.message: f"Abandoned after {settings.ML_TRAINING_STALE_MINUTES} minutes",
+            ModelVersion.completed_at: datetime.utcnow()
+        }, synchronize_session=False)
+
+        record = ModelVersion(
+            name=MONEY_LOSS_MODEL,
+            version=datetime.utcnow().strftime("%Y%m%d%H%M%S"),
+            status="queued",
+            mode="incremental" if incremental else "full"
+        )
+        db.add(record)
+        try:
+            db.commit()
+        except IntegrityError:
+            # The unique index on active versions: another run holds the claim
+            db.rollback()
+            running = self.active(db)
+            if running is None:
+                raise TrainingInProgressError("Another training run was just started")
+            raise TrainingInProgressError(f"Model version {running.version} is still {running.status}")
+        return record
+
+    def start(self, db: Session, incremental: bool = True) -> ModelVersion:
+        """
+        Queue a training run and start it in a background thread.
+
+        Raises:
+            TrainingInProgressError: A run is already queued or running
+        """
+        record = self.claim(db, incremental)
+        thread = threading.Thread(
+            target=self._run_logged,
+            args=(record.id, incremental),
+            name=f"train-{record.version}",
+            daemon=True
+        )
+        self._thread = thread
+        thread.start()
+        return record
+
+    def run(self, version_id: Optional[int] = None, incremental: bool = True) -> Dict[str, Any]:
+        """Train in the calling thread with a session of its own (background thread or CLI)."""
+        db = self.session_factory()
+        try:
+            record = db.get(ModelVersion, version_id) if version_id is not None else None
+            return ModelTrainer(db, registry=self.registry).train(incremental=incremental, record=record)
+        finally:
+            db.close()
+
+    def _run_logged(self, version_id: int, incremental: bool):
+        try:
+            result = self.run(version_id, incremental)
+            logger.info(f"Training run {version_id} finished: {result}")
+        except Exception as e:
+            # ModelTrainer has recorded the failure on the version row
+            logger.error(f"Training run {version_id} failed: {e}")
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """Wait for the background run started by this process; True once it has finished."""
+        thread = self._thread
+        if thread is None:
+            return True
+        thread.join(timeout)
+        return not thread.is_alive()
+
+
+# Global training job (lazy initialization)
+_training_job_instance: Optional[TrainingJob] = None
+
+
+def get_training_job() -> TrainingJob:
+    """Get or create the process-wide TrainingJob using the application's sessions."""
+    global _training_job_instance
+
+    if _training_job_instance is None:
+        from app.core.database import SessionLocal
+        _training_job_instance = TrainingJob(SessionLocal)
+
+    return _training_job_instance
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Train the money loss model")
+    parser.add_argument("--full", action="store_true", help="Refit on all findings instead of an incremental refresh")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(name)s: %(message)s")
+
+    job = get_training_job()
+    db = job.session_factory()
+    try:
+        record = job.claim(db, incremental=not args.full)
+    except TrainingInProgressError as e:
+        raise SystemExit(str(e))
+    finally:
+        db.close()
+
+    print(json.dumps(job.run(record.id, incremental=not args.full), indent=2, default=str))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+"""
+Byte-level text encoding detection
+
+Readers used to try each candidate encoding by decoding (or parsing) the
+whole file and catching UnicodeDecodeError, so a latin-1 CSV was parsed
+twice. sniff_encoding() decides from the raw bytes instead: each
+candidate is validated block by block, starting with a bounded prefix so
+a wrong guess fails early, and encodings that map every byte (latin-1)
+need no scan at all. Large files are memory-mapped for the scan and the
+final decode. The result is the first candidate that decodes the whole
+file, as before; the caller then reads or parses the file once.
+"""
+import codecs
+import mmap
+import os
+from contextlib import contextmanager
+from typing import Iterator, Optional, Sequence, Tuple, Union
+
+DEFAULT_ENCODINGS = ('utf-8', 'latin-1', 'cp1252')
+PREFIX_BYTES = 64 * 1024  # first block checked; most wrong encodings fail here
+BLOCK_BYTES = 1024 * 1024
+MMAP_THRESHOLD = 4 * 1024 * 1024  # files at least this large are memory-mapped
+
+# Codecs that decode any byte sequence (codecs.lookup() names)
+_TOTAL_CODECS = {'iso8859-1'}
+
+Buffer = Union[bytes, mmap.mmap]
+
+
+@contextmanager
+def file_buffer(file_path: str) -> Iterator[Buffer]:
+    """The file's bytes: memory-mapped from MMAP_THRESHOLD up, read into memory below"""
+    with open(file_path, 'rb') as f:
+        size = os.fstat(f.fileno()).st_size
+        if size < MMAP_THRESHOLD:
+            yield f.read()
+            return
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            yield mapped
+
+
+def _decodes(data: Buffer, encoding: str) -> bool:
+    """True if the whole buffer decodes with the encoding"""
+    if codecs.lookup(encoding).name in _TOTAL_CODECS:
+        return True
+    decoder = codecs.getincrementaldecoder(encoding)()
+    with memoryview(data) as view:
+        try:
+            start, block = 0, PREFIX_BYTES
+            while start < len(view):
+                decoder.decode(view[start:start + block])
+                start += block
+                block = BLOCK_BYTES
+            decoder.decode(b'', final=True)
+        except UnicodeDecodeError:
+            return False
+    return True
+
+
+def sniff_buffer(data: Buffer, encodings: Sequence[str] = DEFAULT_ENCODINGS) -> Optional[str]:
+    """First of encodings that decodes the whole buffer, or None"""
+    for encoding in encodings:
+        if _decodes(data, encoding):
+            return encoding
+    return None
+
+
+def sniff_encoding(file_path: str, encodings: Sequence[str] = DEFAULT_ENCODINGS) -> Optional[str]:
+    """First of encodings that decodes the whole file, or None"""
+    with file_buffer(file_path) as data:
+        return sniff_buffer(data, encodings)
+
+
+def read_text(file_path: str, encodings: Sequence[str] = DEFAULT_ENCODINGS) -> Tuple[Optional[str], Optional[str]]:
+    """
+    Read a text file with the first encoding that decodes it
+
+    Returns (text, encoding), or (None, None) if no encoding fits. Newlines
+    are translated like open(..., 'r') does.
+    """
+    with file_buffer(file_path) as data:
+        encoding = sniff_buffer(data, encodings)
+        if encoding is None:
+            return None, None
+        text = str(data, encoding)
+    if '\r' in text:
+        text = text.replace('\r\n', '\n').replace('\r', '\n')
+    return text, encoding
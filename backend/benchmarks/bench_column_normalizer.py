@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+Benchmark: column-level timestamp/date/duration parsing vs. per-value strptime.
+
+Builds synthetic 4C alert records (mostly distinct timestamps in the
+"DD.MM.YYYY, HH:MM:SS" export format, dates, durations and a share of
+unparseable values) and times DataSaver._alert_time_columns against
+running _parse_timestamp/_parse_duration/_parse_date on every record,
+checking that both agree.
+
+Usage (from backend/):
+    python benchmarks/bench_column_normalizer.py --rows 500000
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+
+# Importing app.services.ingestion loads app.core.config, which requires these
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{os.path.join(tempfile.gettempdir(), 'bench_unused.sqlite3')}")
+os.environ.setdefault("SECRET_KEY", "benchmark")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.services.ingestion.data_saver import DataSaver
+
+
+def build_records(rows: int, seed: int = 42):
+    """Alert records with valid timestamps and ~2% bad dates/durations."""
+    rng = random.Random(seed)
+    records = []
+    for i in range(rows):
+        day, month, hour = 1 + i % 28, 1 + i % 12, rng.randint(0, 23)
+        records.append({
+            "Data": f"{day:02d}.{month:02d}.2024, {hour:02d}:{rng.randint(0, 59):02d}:{rng.randint(0, 59):02d}",
+            "Duration In Time Units (DURATION)": rng.choice([str(rng.randint(1, 600)), rng.uniform(0, 90), "n/a"])
+            if rng.random() > 0.98 else str(rng.randint(1, 600)),
+            "Date (DATE)": "unknown" if rng.random() > 0.98 else f"2024/{month:02d}/{day:02d}",
+        })
+    return records
+
+
+def per_value(saver: DataSaver, records):
+    timestamps, durations, dates = [], [], []
+    for record in records:
+        timestamp = record.get("Data", "") or record.get(list(record.keys())[0], "")
+        timestamps.append(saver._parse_timestamp(timestamp) if timestamp else None)
+        durations.append(saver._parse_duration(record.get("Duration In Time Units (DURATION)", "")))
+        date = record.get("Date (DATE)", "")
+        dates.append(saver._parse_date(date) if date else None)
+    return timestamps, durations, dates
+
+
+def measure(label: str, func, *args):
+    started = time.perf_counter()
+    result = func(*args)
+    print(f"{label:<12} {time.perf_counter() - started:>9.2f}s")
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, default=200000, help="alert records to parse")
+    args = parser.parse_args()
+
+    records = build_records(args.rows)
+    saver = DataSaver(db=None, loader="bulk")
+    print(f"Records: {args.rows:,}\n")
+
+    legacy = measure("per-value", per_value, saver, records)
+    columnar = measure("column-wise", lambda: tuple(saver._alert_time_columns(records)))
+    print(f"\nResults match: {legacy == columnar}")
+
+
+if __name__ == "__main__":
+    main()
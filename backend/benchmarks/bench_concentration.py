@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""
+Benchmark: full-dataset concentration analysis on a large Summary.
+
+Builds an in-memory Summary DataFrame (vendor, company code, customer and two
+amount columns) and times ConcentrationEngine.analyze over all rows.
+
+Usage (from backend/):
+    python benchmarks/bench_concentration.py --rows 1000000
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+import pandas as pd
+
+from app.services.content_analyzer.artifact_reader import ColumnInfo, ColumnType
+from app.services.content_analyzer.concentration_engine import ConcentrationEngine
+
+
+COLUMNS = [
+    ColumnInfo(name="Vendor", original_name="Vendor (LIFNR)", sap_field="LIFNR", column_type=ColumnType.IDENTIFIER),
+    ColumnInfo(name="Company Code", original_name="Company Code (BUKRS)", sap_field="BUKRS", column_type=ColumnType.IDENTIFIER),
+    ColumnInfo(name="Customer", original_name="Customer (KUNNR)", sap_field="KUNNR", column_type=ColumnType.IDENTIFIER),
+    ColumnInfo(name="Amount in LC", original_name="Amount in LC (DMBTR)", sap_field="DMBTR", column_type=ColumnType.CURRENCY, is_key_metric=True),
+    ColumnInfo(name="Amount in DC", original_name="Amount in DC (WRBTR)", sap_field="WRBTR", column_type=ColumnType.CURRENCY, is_key_metric=True),
+]
+
+
+def build_frame(rows: int, seed: int = 42) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        "Vendor (LIFNR)": rng.integers(100000, 150000, rows).astype(str),
+        "Company Code (BUKRS)": rng.integers(1000, 1012, rows).astype(str),
+        "Customer (KUNNR)": rng.integers(2000000, 2200000, rows).astype(str),
+        "Amount in LC (DMBTR)": rng.uniform(10, 250000, rows).round(2),
+        "Amount in DC (WRBTR)": rng.uniform(10, 250000, rows).round(2),
+    })
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, default=1000000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    df = build_frame(args.rows)
+    engine = ConcentrationEngine(top_k=10)
+
+    best = float("inf")
+    for _ in range(args.repeat):
+        started = time.perf_counter()
+        results = engine.analyze(df, COLUMNS)
+        best = min(best, time.perf_counter() - started)
+
+    print(f"{args.rows:,} rows, {len(results)} entity/amount pairs: best {best:.3f}s")
+    for result in results:
+        top = result.top_entries[0]
+        print(f"  {result.entity_column:<13} x {result.amount_column:<13} "
+              f"{result.entity_count:>7,} entities, top {top.entity} {top.percentage_of_total:.2f}%")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Benchmark: PDF page extraction in-process vs. worker processes vs. page cache.
+
+Writes a synthetic report PDF (a heading and a ruled table per page, like
+the SoDA PDF exports) and times PDFParser.parse with one process, with
+--workers processes, and again for a re-upload answered from the
+per-page cache, checking that all three agree.
+
+Usage (from backend/):
+    python benchmarks/bench_pdf_pages.py --pages 300 --workers 4
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+# Importing app.services.ingestion loads app.core.config, which requires these
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{os.path.join(tempfile.gettempdir(), 'bench_unused.sqlite3')}")
+os.environ.setdefault("SECRET_KEY", "benchmark")
+# Only the explicitly passed cache below; the shared one would serve the in-process run
+os.environ["PDF_PAGE_CACHE_ENABLED"] = "false"
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.services.ingestion.pdf_page_cache import PDFPageCache
+from app.services.ingestion.pdf_parser import PDFParser
+
+
+def write_pdf(path: str, page_count: int, rows: int = 30):
+    """Report PDF with a heading and a rows x 4 ruled table on every page."""
+    objects = ["<< /Type /Catalog /Pages 2 0 R >>", None, "<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>"]
+    kids = []
+    top, height, width = 700, 20, 120
+    for i in range(page_count):
+        parts = [f"BT /F1 12 Tf 50 740 Td (Result {i + 1}: users with critical authorizations) Tj ET\n0.5 w\n"]
+        for row in range(rows + 1):
+            y = top - row * height
+            parts.append(f"50 {y} m {50 + 4 * width} {y} l S\n")
+        for col in range(5):
+            x = 50 + col * width
+            parts.append(f"{x} {top} m {x} {top - rows * height} l S\n")
+        for row in range(rows):
+            for col in range(4):
+                parts.append(
+                    f"BT /F1 8 Tf {50 + col * width + 4} {top - (row + 1) * height + 6} Td "
+                    f"(U{i:04d}{row:02d} ROLE_{col}) Tj ET\n"
+                )
+        stream = "".join(parts)
+        objects.append(f"<< /Length {len(stream)} >>\nstream\n{stream}endstream")
+        objects.append(
+            f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] "
+            f"/Resources << /Font << /F1 3 0 R >> >> /Contents {len(objects)} 0 R >>"
+        )
+        kids.append(f"{len(objects)} 0 R")
+    objects[1] = f"<< /Type /Pages /Kids [{' '.join(kids)}] /Count {page_count} >>"
+
+    body, offsets = b"%PDF-1.4\n", []
+    for number, obj in enumerate(objects, start=1):
+        offsets.append(len(body))
+        body += f"{number} 0 obj\n{obj}\nendobj\n".encode("latin-1")
+    xref = len(body)
+    body += f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n".encode()
+    body += "".join(f"{offset:010d} 00000 n \n" for offset in offsets).encode()
+    body += f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\nstartxref\n{xref}\n%%EOF\n".encode()
+    with open(path, "wb") as f:
+        f.write(body)
+
+
+def measure(label: str, func, *args):
+    started = time.perf_counter()
+    result = func(*args)
+    print(f"{label:<12} {time.perf_counter() - started:>9.2f}s")
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--pages", type=int, default=120, help="pages in the synthetic PDF")
+    parser.add_argument("--workers", type=int, default=4, help="extraction processes")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "report.pdf")
+        write_pdf(path, args.pages)
+        cache = PDFPageCache(os.path.join(tmp, "cache"))
+        print(f"Pages: {args.pages:,}, workers: {args.workers}\n")
+
+        serial = measure("in-process", PDFParser(max_workers=1).parse, path)
+        parallel = measure("processes", PDFParser(max_workers=args.workers, parallel_min_pages=2, page_cache=cache).parse, path)
+        cached = measure("cached", PDFParser(max_workers=args.workers, page_cache=cache).parse, path)
+        print(f"\nResults match: {serial == parallel == cached and not serial['errors']}")
+
+
+if __name__ == "__main__":
+    main()
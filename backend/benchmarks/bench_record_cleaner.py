@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+Benchmark: column-wise DataFrame cleaning vs. per-value record cleaning.
+
+Builds a wide synthetic Data sheet (float columns with NaN/Infinity, int,
+text and mixed object columns, as read by pandas from 4C exports) and
+times record_cleaner.dataframe_to_records against cleaning every value of
+to_dict('records') with clean_json_value, checking that both agree.
+
+Usage (from backend/):
+    python benchmarks/bench_record_cleaner.py --rows 200000 --columns 60
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+# Importing app.services.ingestion loads app.core.config, which requires these
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{os.path.join(tempfile.gettempdir(), 'bench_unused.sqlite3')}")
+os.environ.setdefault("SECRET_KEY", "benchmark")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+import pandas as pd
+
+from app.services.ingestion.record_cleaner import clean_json_value, dataframe_to_records
+
+
+def build_frame(rows: int, columns: int, seed: int = 42) -> pd.DataFrame:
+    """Mix of float (with NaN/inf), int, text and mixed object columns."""
+    rng = np.random.default_rng(seed)
+    data = {}
+    for column in range(columns):
+        kind = column % 4
+        if kind == 0:
+            values = rng.normal(1000, 250, rows)
+            values[rng.random(rows) < 0.1] = np.nan
+            values[rng.random(rows) < 0.001] = np.inf
+            data[f"Amount {column}"] = values
+        elif kind == 1:
+            data[f"Count {column}"] = rng.integers(0, 10000, rows)
+        elif kind == 2:
+            text = pd.Series(rng.integers(0, 500, rows)).map(lambda v: f"USER{v}").astype(object)
+            text[rng.random(rows) < 0.05] = None
+            data[f"User {column}"] = text
+        else:
+            mixed = pd.Series(rng.integers(0, 100, rows), dtype=object)
+            mixed[rng.random(rows) < 0.3] = "n/a"
+            data[f"Mixed {column}"] = mixed
+    return pd.DataFrame(data)
+
+
+def per_value(df: pd.DataFrame):
+    records = df.where(pd.notna(df), None).to_dict("records")
+    return [{k: clean_json_value(v) for k, v in record.items()} for record in records]
+
+
+def measure(label: str, func, df: pd.DataFrame):
+    started = time.perf_counter()
+    result = func(df)
+    print(f"{label:<12} {time.perf_counter() - started:>9.2f}s")
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, default=50000, help="rows in the generated frame")
+    parser.add_argument("--columns", type=int, default=40, help="columns in the generated frame")
+    args = parser.parse_args()
+
+    df = build_frame(args.rows, args.columns)
+    print(f"Frame: {args.rows:,} rows x {args.columns} columns\n")
+
+    legacy = measure("per-value", per_value, df)
+    columnar = measure("column-wise", dataframe_to_records, df)
+    print(f"\nResults match: {legacy == columnar}")
+
+
+if __name__ == "__main__":
+    main()
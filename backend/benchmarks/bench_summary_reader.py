@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+Benchmark: streaming Summary reader vs. the pandas two-read path.
+
+Generates a synthetic Summary_*.xlsx (SAP-style header, "Data" marker row)
+and times ArtifactReader._read_xlsx_structured against the original
+reader in dataframe_summary_reader.py, reporting wall time and,
+with --memory, peak Python memory for each.
+
+Usage (from backend/):
+    python benchmarks/bench_summary_reader.py --rows 200000
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.services.content_analyzer.artifact_reader import ArtifactReader
+from benchmarks.dataframe_summary_reader import read_xlsx_structured_dataframe
+
+
+HEADER = [
+    "Company Code (BUKRS)",
+    "Vendor (LIFNR)",
+    "Vendor Name (NAME1)",
+    "Document Number (BELNR)",
+    "Posting Date (BUDAT)",
+    "Amount in LC (DMBTR)",
+    "Amount in DC (WRBTR)",
+    "Currency (WAERS)",
+    "Quantity (MENGE)",
+    "Text (SGTXT)",
+]
+
+
+def build_workbook(path: str, rows: int, seed: int = 42):
+    """Write a Summary workbook with the given number of data rows."""
+    from openpyxl import Workbook
+
+    rng = random.Random(seed)
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet()
+    sheet.append(["Data"])
+    sheet.append(HEADER)
+
+    start = datetime(2024, 1, 1)
+    for i in range(rows):
+        amount = round(rng.uniform(10, 250000), 2)
+        sheet.append([
+            f"{1000 + i % 12}",
+            f"{100000 + rng.randint(0, 5000)}",
+            f"Vendor {rng.randint(0, 5000)}",
+            f"{5100000000 + i}",
+            start + timedelta(days=i % 365),
+            amount,
+            f"{amount:,.2f}",
+            rng.choice(["EUR", "USD", "KES"]),
+            rng.randint(1, 500),
+            "Invoice receipt",
+        ])
+    workbook.save(path)
+
+
+def measure(label: str, func, path: str, repeat: int, trace_memory: bool):
+    """Run func(path) `repeat` times; print best wall time (and peak memory)."""
+    best = float("inf")
+    result = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = func(path)
+        best = min(best, time.perf_counter() - started)
+
+    line = f"{label:<12} {best:>9.2f}s"
+    if trace_memory:
+        # Separate run: tracemalloc slows allocation-heavy code considerably
+        tracemalloc.start()
+        func(path)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        line += f"   peak {peak / 1024 / 1024:>8.1f} MiB"
+    print(line)
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, default=50000, help="data rows in the generated Summary")
+    parser.add_argument("--repeat", type=int, default=1, help="runs per reader (best time is reported)")
+    parser.add_argument("--memory", action="store_true", help="also report peak Python memory (slow)")
+    parser.add_argument("--file", help="benchmark an existing Summary .xlsx instead of generating one")
+    args = parser.parse_args()
+
+    reader = ArtifactReader()
+    with tempfile.TemporaryDirectory() as tmp:
+        path = args.file
+        if not path:
+            path = os.path.join(tmp, "Summary_Benchmark_000000_000000.xlsx")
+            print(f"Generating {args.rows:,} rows -> {path}")
+            build_workbook(path, args.rows)
+
+        size_mb = os.path.getsize(path) / 1024 / 1024
+        print(f"Workbook size: {size_mb:.1f} MiB\n")
+
+        legacy = measure("dataframe", lambda p: read_xlsx_structured_dataframe(reader, p), path, args.repeat, args.memory)
+        streaming = measure("streaming", reader._read_xlsx_structured, path, args.repeat, args.memory)
+
+    if legacy and streaming:
+        same = (
+            legacy.row_count == streaming.row_count
+            and legacy.column_count == streaming.column_count
+            and legacy.currency == streaming.currency
+            and abs((legacy.total_amount or 0) - (streaming.total_amount or 0)) < 0.01
+        )
+        print(f"\nResults match: {same} "
+              f"(rows={streaming.row_count:,}, total_amount={streaming.total_amount or 0:,.2f})")
+
+
+if __name__ == "__main__":
+    main()
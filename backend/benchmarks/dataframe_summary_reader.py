@@ -0,0 +1,110 @@
+"""
+The original DataFrame-based Summary reader.
+
+Loads the whole sheet with two pandas.read_excel calls (one to find the
+header row, one to read the data) and profiles each column from the
+DataFrame. ArtifactReader now streams the workbook instead; this copy is
+the reference for bench_summary_reader.py and the parity tests in
+tests/content_analyzer/test_artifact_reader.py.
+"""
+import logging
+from typing import Optional
+
+from app.services.content_analyzer.artifact_reader import ArtifactReader, ColumnInfo, ColumnType, SummaryData
+
+logger = logging.getLogger(__name__)
+
+
+def analyze_column(reader: ArtifactReader, df: "pd.DataFrame", col_name: str) -> ColumnInfo:
+    """ColumnInfo for one DataFrame column, profiled in BATCH_ROWS slices"""
+    series = df[col_name]
+    profiler = reader._make_profiler(str(col_name))
+    for start in range(0, len(series), reader.BATCH_ROWS):
+        profiler.update(series.iloc[start:start + reader.BATCH_ROWS])
+    return reader._column_info_from_profile(profiler)
+
+
+def read_xlsx_structured_dataframe(reader: ArtifactReader, filepath: str) -> Optional[SummaryData]:
+    """
+    Read a Summary workbook by loading the whole sheet into a DataFrame.
+
+    Returns:
+        SummaryData object with structured column info and metrics
+    """
+    try:
+        import pandas as pd
+        from app.services.content_analyzer.concentration_engine import ConcentrationEngine
+
+        # First, detect header row by reading raw data
+        df_raw = pd.read_excel(filepath, header=None, nrows=5)
+
+        # Find header row (skip "Data" marker row if present)
+        header_row = 0
+        for i, row in df_raw.iterrows():
+            first_val = str(row.iloc[0]).strip().lower() if pd.notna(row.iloc[0]) else ""
+            if first_val == "data":
+                header_row = i + 1
+                break
+            # Check if this looks like a header row (multiple non-empty text values)
+            non_empty = sum(1 for v in row if pd.notna(v) and str(v).strip())
+            if non_empty > 3:
+                header_row = i
+                break
+
+        # Read with detected header
+        df = pd.read_excel(filepath, header=header_row)
+
+        # Remove completely empty columns
+        df = df.dropna(axis=1, how='all')
+
+        summary_data = SummaryData(
+            row_count=len(df),
+            column_count=len(df.columns)
+        )
+
+        # Detect column info for each column
+        currency_column = None
+        for col_name in df.columns:
+            col_info = analyze_column(reader, df, col_name)
+            summary_data.columns.append(col_info)
+
+            # Track currency column for amount columns
+            if col_info.column_type == ColumnType.TEXT and reader._is_currency_column(col_name):
+                # Most common currency
+                if col_info.top_values:
+                    currency_column = col_info.top_values[0][0]
+
+        if currency_column:
+            summary_data.currency = currency_column
+
+        # Calculate total amount from key metric columns
+        total_amount = 0.0
+        for col_info in summary_data.columns:
+            if col_info.is_key_metric and col_info.column_type in [ColumnType.CURRENCY, ColumnType.NUMERIC]:
+                if col_info.total is not None:
+                    total_amount += col_info.total
+
+        if total_amount > 0:
+            summary_data.total_amount = total_amount
+
+        summary_data.concentrations = ConcentrationEngine().analyze(df, summary_data.columns)
+
+        # Extract sample rows
+        for _, row in df.head(10).iterrows():
+            row_dict = {}
+            for col in df.columns:
+                val = row[col]
+                if pd.notna(val):
+                    row_dict[str(col)] = val
+            summary_data.sample_rows.append(row_dict)
+
+        summary_data.raw_text = reader._generate_raw_text(df, summary_data)
+
+        return summary_data
+
+    except ImportError:
+        logger.warning("pandas/openpyxl not installed, cannot read .xlsx files")
+        return None
+    except Exception as e:
+        logger.error(f"Error reading xlsx {filepath}: {e}")
+        return None
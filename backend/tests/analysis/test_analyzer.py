@@ -0,0 +1,121 @@
+"""
+Unit tests for the alert analysis finding modes.
+
+Runs Analyzer end to end against SQLite with one focus area and issue
+type seeded; no ML model is trained, so money loss is the per-severity
+default estimate.
+"""
+
+from datetime import datetime
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.core.database import Base
+import app.models  # noqa: F401  (registers all tables)
+from app.models.alert import Alert, AlertMetadata
+from app.models.data_source import DataSource, DataSourceType, FileFormat
+from app.models.finding import Finding
+from app.models.focus_area import FocusArea
+from app.models.issue_type import IssueType
+from app.services.analysis.analyzer import Analyzer
+
+
+@pytest.fixture
+def db(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'analyzer.sqlite3'}")
+    Base.metadata.create_all(engine)
+    session = sessionmaker(bind=engine)()
+    focus_area = FocusArea(code="ACCESS_GOVERNANCE", name="Access Governance")
+    session.add(focus_area)
+    session.flush()
+    session.add(IssueType(
+        focus_area_id=focus_area.id, code="LONG_SESSION", name="Long Session", default_severity="Medium"
+    ))
+    session.commit()
+    yield session
+    session.close()
+    engine.dispose()
+
+
+def _alert_upload(db, rows):
+    data_source = DataSource(
+        filename="logged_on_users.xlsx",
+        original_filename="logged_on_users.xlsx",
+        file_format=FileFormat.XLSX,
+        data_type=DataSourceType.ALERT,
+        file_path="/tmp/logged_on_users.xlsx",
+    )
+    db.add(data_source)
+    db.flush()
+    db.add(AlertMetadata(data_source_id=data_source.id, alert_name="Users Logged On Over 24 Hours"))
+    db.add_all([
+        Alert(data_source_id=data_source.id, user_name=user, transaction_code=tcode,
+              timestamp=datetime(2024, 1, day))
+        for user, tcode, day in rows
+    ])
+    db.commit()
+    return data_source
+
+
+ROWS = [
+    ("ALICE", "SU01", 1),
+    ("ALICE", "SE16", 3),
+    ("ALICE", "SU01", 2),
+    ("BOB", "SU01", 5),
+    (None, "SE16", 4),
+]
+
+
+class TestAggregatedFindings:
+    """Tests for Analyzer in aggregated finding mode."""
+
+    def test_one_finding_per_user_with_counts(self, db):
+        """Test that alerts are grouped by user with counts and a scaled money loss."""
+        data_source = _alert_upload(db, ROWS)
+
+        run = Analyzer(db, finding_mode="aggregated", group_by="user_name").analyze_data_source(data_source.id)
+
+        findings = db.query(Finding).order_by(Finding.id).all()
+        assert run.status == "completed"
+        assert run.total_findings == 3
+        assert [f.key_findings_json["alert_count"] for f in findings] == [3, 1, 1]
+
+        alice = findings[0]
+        assert alice.title == "Users Logged On Over 24 Hours - ALICE (3 alerts)"
+        assert alice.detected_at == datetime(2024, 1, 1)
+        assert alice.key_findings_json["last_seen"] == "2024-01-03T00:00:00"
+        assert alice.risk_assessment.affected_users == 1
+        assert alice.money_loss_calculation.estimated_loss == 3 * 7500.0
+        assert any("Unknown User" in f.title for f in findings)
+
+        # Same total as one finding per row
+        assert run.total_money_loss == len(ROWS) * 7500.0
+        assert run.total_risk_score == 3 * alice.risk_assessment.risk_score
+
+    def test_group_by_transaction_code(self, db):
+        """Test that a different alert column can be the grouping key."""
+        data_source = _alert_upload(db, ROWS)
+
+        Analyzer(db, finding_mode="aggregated", group_by="transaction_code").analyze_data_source(data_source.id)
+
+        groups = {
+            f.key_findings_json["group_value"]: (f.key_findings_json["alert_count"], f.risk_assessment.affected_users)
+            for f in db.query(Finding)
+        }
+        assert groups == {"SU01": (3, 2), "SE16": (2, 1)}
+
+    def test_per_row_mode_unchanged(self, db):
+        """Test that per-row mode still creates one finding per alert."""
+        data_source = _alert_upload(db, ROWS)
+
+        run = Analyzer(db, finding_mode="per_row").analyze_data_source(data_source.id)
+
+        assert run.total_findings == len(ROWS)
+        assert db.query(Finding).filter(Finding.key_findings_json.is_(None)).count() == len(ROWS)
+
+    def test_rejects_unknown_group_key(self, db):
+        """Test that grouping by a column that is not an alert key is rejected."""
+        with pytest.raises(ValueError):
+            Analyzer(db, finding_mode="aggregated", group_by="raw_data")
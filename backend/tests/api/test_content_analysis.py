@@ -0,0 +1,84 @@
+"""
+Unit tests for the analyze-and-save endpoint.
+
+Analysis is replaced by a stub returning a ready ContentFinding; the tests
+cover that the blocking steps (report generation, the database write) run
+outside the event loop thread.
+"""
+
+import asyncio
+import threading
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.core.database import Base
+import app.models  # noqa: F401  (registers all tables)
+from app.api import content_analysis
+from app.api.content_analysis import AnalyzeDirectoryRequest, ReportLevel, analyze_and_save
+from app.models.finding import Finding
+from app.services.batch_queue import BulkFindingWriter
+from tests.batch_queue.test_finding_writer import make_finding
+
+
+@pytest.fixture
+def db(tmp_path):
+    engine = create_engine(
+        f"sqlite:///{tmp_path / 'content_analysis.sqlite3'}",
+        connect_args={"check_same_thread": False}
+    )
+    Base.metadata.create_all(engine)
+    session = sessionmaker(bind=engine)()
+    yield session
+    session.close()
+    engine.dispose()
+
+
+@pytest.fixture
+def blocking_threads(monkeypatch):
+    """Stub analysis; record the thread each blocking step runs in"""
+    threads = {}
+    writer = BulkFindingWriter(validate=lambda finding: (True, []))
+    write_and_commit = writer.write_and_commit
+
+    class Reader:
+        def read_from_directory(self, directory_path):
+            return object()
+
+    class Analyzer:
+        async def analyze_alert_async(self, artifacts, include_raw=False, use_llm=True):
+            return make_finding()
+
+    def generate_markdown_report(artifacts, content_finding, report_level, directory_path):
+        threads["report"] = threading.get_ident()
+        return "# Report", f"{directory_path}/report.md"
+
+    def recording_write(*args, **kwargs):
+        threads["write"] = threading.get_ident()
+        return write_and_commit(*args, **kwargs)
+
+    monkeypatch.setattr(writer, "write_and_commit", recording_write)
+    monkeypatch.setattr(content_analysis, "get_artifact_reader", lambda: Reader())
+    monkeypatch.setattr(content_analysis, "get_content_analyzer", lambda: Analyzer())
+    monkeypatch.setattr(content_analysis, "get_finding_writer", lambda: writer)
+    monkeypatch.setattr(content_analysis, "_generate_markdown_report", generate_markdown_report)
+    return threads
+
+
+class TestAnalyzeAndSave:
+    """Tests for analyze_and_save."""
+
+    def test_blocking_steps_run_off_event_loop(self, db, tmp_path, blocking_threads):
+        """Test that the full report and the finding write do not run on the event loop thread."""
+        request = AnalyzeDirectoryRequest(directory_path=str(tmp_path), report_level=ReportLevel.FULL)
+
+        async def call():
+            return threading.get_ident(), await analyze_and_save(request, db=db)
+
+        loop_thread, response = asyncio.run(call())
+
+        assert response.markdown_path == f"{tmp_path}/report.md"
+        assert db.query(Finding).one().id == response.finding_id
+        assert set(blocking_threads) == {"report", "write"}
+        assert loop_thread not in blocking_threads.values()
@@ -0,0 +1,86 @@
+"""
+Unit tests for the maintenance delete endpoints.
+
+Calls the endpoint functions directly against SQLite with foreign keys
+enforced, as PostgreSQL does.
+"""
+
+import asyncio
+
+import pytest
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+
+from app.core.database import Base
+import app.models  # noqa: F401  (registers all tables)
+from app.api.maintenance import delete_data_source
+from app.models.alert import Alert, AlertMetadata
+from app.models.data_source import DataSource, DataSourceType, FileFormat
+
+
+@pytest.fixture
+def db(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'maintenance.sqlite3'}")
+
+    @event.listens_for(engine, "connect")
+    def _enforce_foreign_keys(dbapi_connection, connection_record):
+        dbapi_connection.execute("PRAGMA foreign_keys=ON")
+
+    Base.metadata.create_all(engine)
+    session = sessionmaker(bind=engine)()
+    yield session
+    session.close()
+    engine.dispose()
+
+
+def _data_source(db, **kwargs):
+    data_source = DataSource(
+        filename="logged_on_users.xlsx",
+        original_filename="logged_on_users.xlsx",
+        file_format=FileFormat.XLSX,
+        data_type=DataSourceType.ALERT,
+        file_path="/tmp/logged_on_users.xlsx",
+        content_sha256="a" * 64,
+        **kwargs
+    )
+    db.add(data_source)
+    db.commit()
+    return data_source
+
+
+class TestDeleteDataSource:
+    """Tests for delete_data_source."""
+
+    def test_deletes_original_with_duplicates(self, db):
+        """Test that deleting an original upload also deletes the uploads recorded as its duplicates"""
+        original = _data_source(db, status="completed")
+        db.add(AlertMetadata(data_source_id=original.id, alert_name="Logged On Users"))
+        db.add(Alert(data_source_id=original.id, user_name="JDOE"))
+        _data_source(db, status="duplicate", duplicate_of_id=original.id)
+        unrelated = _data_source(db, status="completed")
+        original_id, unrelated_id = original.id, unrelated.id
+
+        response = asyncio.run(delete_data_source(original_id, db=db))
+
+        assert response.success
+        assert response.deleted_records["duplicates"] == 1
+        assert response.deleted_records["alerts"] == 1
+        db.expire_all()
+        remaining = {ds.id for ds in db.query(DataSource).all()}
+        assert remaining == {unrelated_id}
+        assert db.query(Alert).count() == 0
+        assert db.query(AlertMetadata).count() == 0
+
+    def test_deletes_duplicate_only(self, db):
+        """Test that deleting a duplicate keeps the original and its records"""
+        original = _data_source(db, status="completed")
+        db.add(Alert(data_source_id=original.id, user_name="JDOE"))
+        duplicate = _data_source(db, status="duplicate", duplicate_of_id=original.id)
+        original_id = original.id
+
+        response = asyncio.run(delete_data_source(duplicate.id, db=db))
+
+        assert response.deleted_records["duplicates"] == 0
+        db.expire_all()
+        assert [ds.id for ds in db.query(DataSource).all()] == [original_id]
+        assert db.query(Alert).count() == 1
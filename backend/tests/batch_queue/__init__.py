@@ -0,0 +1 @@
+# Batch queue tests package
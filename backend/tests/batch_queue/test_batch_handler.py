@@ -0,0 +1,90 @@
+"""
+Unit tests for the batch content analysis handler (process_batch_alerts).
+
+Analysis itself is replaced by a stub returning a ready ContentFinding;
+the tests cover how findings and task completion are committed together.
+"""
+
+import asyncio
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.core.database import Base
+import app.models  # noqa: F401  (registers all tables)
+from app.api import content_analysis
+from app.models.batch_job import BatchTask
+from app.models.finding import Finding
+from app.services.batch_queue import BatchQueue, BulkFindingWriter, LeaseLostError, PendingFinding
+from app.services.batch_queue.worker import BatchWorker
+from tests.batch_queue.test_finding_writer import make_finding
+
+
+@pytest.fixture
+def session_factory(tmp_path):
+    engine = create_engine(
+        f"sqlite:///{tmp_path / 'batch.sqlite3'}",
+        connect_args={"check_same_thread": False, "timeout": 30}
+    )
+    Base.metadata.create_all(engine)
+    yield sessionmaker(bind=engine)
+    engine.dispose()
+
+
+@pytest.fixture
+def queue(session_factory, monkeypatch):
+    queue = BatchQueue(session_factory, lease_seconds=60, retry_delay_seconds=0)
+    writer = BulkFindingWriter(validate=lambda finding: (True, []))
+
+    async def analyze(directory_path, report_level, bypass_llm_cache):
+        alert_id = directory_path.rsplit("/", 1)[-1]
+        result = {"path": directory_path, "status": "pending", "finding_id": None, "markdown_path": None, "error": None}
+        return PendingFinding(make_finding(alert_id), directory_path), result
+
+    monkeypatch.setattr(content_analysis, "_analyze_batch_alert", analyze)
+    monkeypatch.setattr(content_analysis, "get_batch_queue", lambda: queue)
+    monkeypatch.setattr(content_analysis, "get_finding_writer", lambda: writer)
+    return queue
+
+
+class TestProcessBatchAlerts:
+    """Tests for process_batch_alerts."""
+
+    def test_findings_committed_with_completion(self, queue, session_factory):
+        """Test that each task is completed in the commit that saves its finding."""
+        job_id = queue.create_job(["/data/FI/A1", "/data/FI/A2"])
+
+        worker = BatchWorker(
+            queue, content_analysis.process_batch_alerts, session_factory,
+            worker_id="test", chunk_size=2, heartbeat_interval=10
+        )
+        worker.run(drain=True)
+
+        status = queue.get_job_status(job_id)
+        db = session_factory()
+        finding_ids = {f.source_alert_id: f.id for f in db.query(Finding)}
+        db.close()
+        assert (status["status"], status["successful"]) == ("completed", 2)
+        assert {r["finding_id"] for r in status["results"]} == set(finding_ids.values())
+
+    def test_lost_lease_writes_nothing(self, queue, session_factory):
+        """Test that a worker whose task was re-leased saves no findings, so the retry saves them once."""
+        queue.create_job(["/data/FI/A1"])
+        stale = queue.claim_task("w1")
+        db = session_factory()
+        db.query(BatchTask).update({BatchTask.lease_expires_at: datetime.utcnow() - timedelta(seconds=1)})
+        db.commit()
+        current = queue.claim_task("w2")
+
+        outcomes = asyncio.run(content_analysis.process_batch_alerts(db, [stale]))
+        assert isinstance(outcomes[0], LeaseLostError)
+        assert not stale.recorded
+        assert db.query(Finding).count() == 0
+
+        outcomes = asyncio.run(content_analysis.process_batch_alerts(db, [current]))
+        assert current.recorded
+        assert outcomes[0]["status"] == "success"
+        assert db.query(Finding).count() == 1
+        db.close()
@@ -0,0 +1,226 @@
+"""
+Unit tests for the BulkFindingWriter.
+
+Each test runs against its own SQLite file with the full schema; tests
+cover the rows written for a chunk, lookup caching within a call and the
+per-item fallback when a chunk fails.
+"""
+
+import pytest
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+
+from app.core.database import Base
+import app.models  # noqa: F401  (registers all tables)
+from app.models.finding import Finding
+from app.models.focus_area import FocusArea
+from app.models.risk_assessment import RiskAssessment
+from app.models.money_loss import MoneyLossCalculation
+from app.models.finding_feature import FindingFeature
+from app.models.data_source import DataSource
+from app.models.alert_instance import AlertInstance
+from app.models.alert_analysis import AlertAnalysis
+from app.models.critical_discovery import CriticalDiscovery
+from app.models.key_finding import KeyFinding
+from app.models.concentration_metric import ConcentrationMetric
+from app.models.action_item import ActionItem
+from app.services.batch_queue import BulkFindingWriter, LookupCache, PendingFinding
+from app.services.content_analyzer.analyzer import ContentFinding
+
+
+def make_finding(alert_id="200025_001372", focus_area="BUSINESS_PROTECTION", **overrides):
+    values = dict(
+        alert_id=alert_id,
+        alert_name=f"Alert {alert_id}",
+        focus_area=focus_area,
+        focus_area_confidence=0.9,
+        classification_reasoning="test",
+        title=f"Finding {alert_id}",
+        description="Unusual vendor payments",
+        business_impact="Potential duplicate payments",
+        what_happened="Payments were posted twice",
+        business_risk="Cash leakage",
+        affected_areas=["FI"],
+        total_count=42,
+        monetary_amount=1000.0,
+        currency="EUR",
+        key_metrics={"records": 42},
+        notable_items=[],
+        severity="HIGH",
+        severity_reasoning="Large amounts",
+        risk_score=85,
+        risk_level="High",
+        risk_factors=["Concentration", "Amount"],
+        money_loss_estimate=250.0,
+        money_loss_confidence=0.6,
+        recommended_actions=["Review vendor master", "Block payments"],
+    )
+    values.update(overrides)
+    return ContentFinding(**values)
+
+
+@pytest.fixture
+def session_factory(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'findings.sqlite3'}")
+    Base.metadata.create_all(engine)
+    yield sessionmaker(bind=engine)
+    engine.dispose()
+
+
+@pytest.fixture
+def writer():
+    return BulkFindingWriter(validate=lambda finding: (True, []))
+
+
+class TestBulkFindingWriter:
+    """Tests for BulkFindingWriter."""
+
+    def test_writes_chunk(self, session_factory, writer):
+        """Test that every finding gets its risk, money loss and dashboard rows."""
+        db = session_factory()
+        items = [
+            PendingFinding(make_finding("A1"), "/data/FI/A1", markdown_path="/docs/A1.md"),
+            PendingFinding(
+                make_finding(
+                    "A2", focus_area="JOBS_CONTROL", severity="LOW", risk_score=20,
+                    notable_items=[{"title": "Vendor 1", "amount": 10}],
+                    concentration_metrics=[{"dimension_type": "VENDOR", "dimension_code": "V1", "entity_count": 3}],
+                ),
+                "/data/MM/A2",
+                money_loss_reasoning="Batch processed: Alert A2",
+            ),
+        ]
+
+        written = writer.write(db, items)
+        db.commit()
+
+        findings = db.query(Finding).order_by(Finding.id).all()
+        assert [w.finding_id for w in written] == [f.id for f in findings]
+        assert [f.source_module for f in findings] == ["FI", "MM"]
+        assert findings[0].report_path == "/docs/A1.md"
+        assert findings[1].key_findings_json["risk_score"] == 20
+        assert db.query(RiskAssessment).count() == 2
+        money = {m.finding_id: m.reasoning for m in db.query(MoneyLossCalculation)}
+        assert money[written[1].finding_id] == "Batch processed: Alert A2"
+        assert db.query(FocusArea).count() == 2
+        assert db.query(DataSource).count() == 2
+
+        analyses = {a.id: a for a in db.query(AlertAnalysis)}
+        high = analyses[written[0].dashboard["alert_analysis_id"]]
+        low = analyses[written[1].dashboard["alert_analysis_id"]]
+        assert (high.fraud_indicator, low.fraud_indicator) == ("INVESTIGATE", "NONE")
+        assert high.raw_summary_data["finding_id"] == written[0].finding_id
+        assert low.unique_entities == 3
+
+        # Default discovery from the main finding vs. one per notable item
+        discoveries = db.query(CriticalDiscovery).all()
+        assert {d.alert_analysis_id for d in discoveries} == {high.id, low.id}
+        assert [d.title for d in discoveries if d.alert_analysis_id == low.id] == ["Vendor 1"]
+        assert db.query(KeyFinding).filter(KeyFinding.alert_analysis_id == high.id).count() == 3
+        assert db.query(ConcentrationMetric).count() == 1
+        # Investigation item only for the high-risk alert
+        assert [a.action_type for a in db.query(ActionItem).filter(ActionItem.alert_analysis_id == high.id)] == [
+            "IMMEDIATE", "SHORT_TERM", "SHORT_TERM"
+        ]
+        assert written[0].dashboard["action_items"] == 3
+        assert written[1].dashboard["action_items"] == 2
+        db.close()
+
+    def test_reuses_lookups(self, session_factory, writer):
+        """Test that focus areas, data sources and alert instances are shared within a call."""
+        db = session_factory()
+        lookups = LookupCache()
+        writer.write(db, [
+            PendingFinding(make_finding("A1"), "/data/FI/A1"),
+            PendingFinding(make_finding("A1"), "/data/FI/A1"),
+        ], lookups)
+
+        statements = []
+
+        def record(conn, cursor, statement, *args):
+            statements.append(statement)
+
+        event.listen(db.get_bind(), "before_cursor_execute", record)
+        writer.write(db, [PendingFinding(make_finding("A1"), "/data/FI/A1")], lookups)
+        event.remove(db.get_bind(), "before_cursor_execute", record)
+        db.commit()
+
+        # Second write with the same lookups needs no lookup queries
+        assert not any(s.lstrip().upper().startswith("SELECT") for s in statements)
+
+        assert db.query(FocusArea).count() == 1
+        assert db.query(DataSource).count() == 1
+        assert db.query(AlertInstance).count() == 1
+        assert db.query(AlertAnalysis).count() == 3
+        db.close()
+
+    def test_lookups_not_kept_between_calls(self, session_factory, writer):
+        """Test that rows deleted after a call are created again, not referenced by a stale id."""
+        db = session_factory()
+        writer.write_and_commit(db, [PendingFinding(make_finding("A1"), "/data/FI/A1")])
+
+        # As /maintenance/data-sources does
+        db.query(MoneyLossCalculation).delete()
+        db.query(FindingFeature).delete()
+        db.query(RiskAssessment).delete()
+        db.query(Finding).delete()
+        db.query(DataSource).delete()
+        db.commit()
+
+        written = writer.write_and_commit(db, [PendingFinding(make_finding("A1"), "/data/FI/A1")])
+
+        finding = db.get(Finding, written[0].finding_id)
+        assert db.get(DataSource, finding.data_source_id) is not None
+        assert db.query(DataSource).count() == 1
+        db.close()
+
+    def test_existing_rows_are_found(self, session_factory, writer):
+        """Test that rows created outside the writer are looked up instead of duplicated."""
+        db = session_factory()
+        db.add(FocusArea(code="BUSINESS_PROTECTION", name="Business Protection"))
+        db.commit()
+
+        writer.write(db, [PendingFinding(make_finding("A1"), "/data/FI/A1")])
+        db.commit()
+
+        assert db.query(FocusArea).count() == 1
+        db.close()
+
+    def test_failed_chunk_falls_back_to_single_writes(self, session_factory, writer):
+        """Test that one bad finding fails alone and the rest of the chunk is saved."""
+        db = session_factory()
+        bad = make_finding("BAD", title=None)  # findings.title is NOT NULL
+
+        outcomes = writer.write_and_commit(db, [
+            PendingFinding(make_finding("A1"), "/data/FI/A1"),
+            PendingFinding(bad, "/data/FI/BAD"),
+            PendingFinding(make_finding("A3"), "/data/FI/A3"),
+        ])
+
+        assert isinstance(outcomes[1], Exception)
+        assert not isinstance(outcomes[0], Exception)
+        assert not isinstance(outcomes[2], Exception)
+        assert db.query(Finding).count() == 2
+        assert {f.source_alert_id for f in db.query(Finding)} == {"A1", "A3"}
+        db.close()
+
+    def test_before_commit_runs_in_write_transaction(self, session_factory, writer):
+        """Test that an item whose before_commit check fails is rolled back with its finding."""
+        db = session_factory()
+        seen = []
+
+        def before_commit(db, written):
+            seen.append([position for position, _ in written])
+            if any(position == 1 for position, _ in written):
+                raise RuntimeError("lease lost")
+
+        outcomes = writer.write_and_commit(db, [
+            PendingFinding(make_finding("A1"), "/data/FI/A1"),
+            PendingFinding(make_finding("A2"), "/data/FI/A2"),
+        ], before_commit)
+
+        assert seen == [[0, 1], [0], [1]]
+        assert not isinstance(outcomes[0], Exception)
+        assert isinstance(outcomes[1], RuntimeError)
+        assert [f.source_alert_id for f in db.query(Finding)] == ["A1"]
+        db.close()
@@ -0,0 +1,307 @@
+"""
+Unit tests for the database-backed BatchQueue and BatchWorker.
+
+Each test runs against its own SQLite file; tests cover leasing,
+heartbeats, lease expiry, retry with backoff, results recorded in the
+caller's transaction and draining a job with the worker loop.
+"""
+
+import asyncio
+import threading
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.core.database import Base
+from app.models.batch_job import BatchJob, BatchTask
+from app.services.batch_queue import BatchQueue, LeaseLostError
+from app.services.batch_queue.worker import BatchWorker
+
+
+@pytest.fixture
+def session_factory(tmp_path):
+    engine = create_engine(
+        f"sqlite:///{tmp_path / 'queue.sqlite3'}",
+        connect_args={"check_same_thread": False, "timeout": 30}
+    )
+    Base.metadata.create_all(engine, tables=[BatchJob.__table__, BatchTask.__table__])
+    yield sessionmaker(bind=engine)
+    engine.dispose()
+
+
+@pytest.fixture
+def queue(session_factory):
+    return BatchQueue(session_factory, lease_seconds=60, max_attempts=3, retry_delay_seconds=0)
+
+
+def _expire_lease(session_factory, task_id):
+    db = session_factory()
+    db.query(BatchTask).filter(BatchTask.id == task_id).update(
+        {BatchTask.lease_expires_at: datetime.utcnow() - timedelta(seconds=1)}
+    )
+    db.commit()
+    db.close()
+
+
+class TestBatchQueue:
+    """Tests for BatchQueue leasing and job progress."""
+
+    def test_create_and_claim_in_order(self, queue):
+        """Test that tasks are leased in submission order and the job starts processing."""
+        job_id = queue.create_job(["/a", "/b"], report_level="summary", bypass_llm_cache=True)
+        assert queue.get_job_status(job_id)["status"] == "pending"
+
+        first = queue.claim_task("w1")
+        second = queue.claim_task("w2")
+
+        assert (first.directory_path, second.directory_path) == ("/a", "/b")
+        assert first.report_level == "summary"
+        assert first.bypass_llm_cache is True
+        assert first.attempt == 1
+        assert queue.claim_task("w3") is None
+
+        status = queue.get_job_status(job_id)
+        assert status["status"] == "processing"
+        assert status["running"] == 2
+
+    def test_complete_job(self, queue):
+        """Test counters, per-alert results in position order and completion."""
+        job_id = queue.create_job(["/a", "/b"])
+        first = queue.claim_task("w1")
+        second = queue.claim_task("w1")
+
+        assert queue.complete_task(second.task_id, "w1", {"path": "/b", "status": "failed", "error": "Directory not found: /b"})
+        assert queue.get_job_status(job_id)["status"] == "processing"
+        assert queue.complete_task(first.task_id, "w1", {"path": "/a", "status": "success", "finding_id": 7})
+
+        status = queue.get_job_status(job_id)
+        assert status["status"] == "completed"
+        assert (status["processed"], status["successful"], status["failed"]) == (2, 1, 1)
+        assert [r["path"] for r in status["results"]] == ["/a", "/b"]
+        assert status["completed_at"] is not None
+
+    def test_failed_attempts_are_retried(self, queue):
+        """Test that a failing task is retried until max_attempts, then marked failed."""
+        job_id = queue.create_job(["/a"])
+
+        for attempt in (1, 2, 3):
+            task = queue.claim_task("w1")
+            assert task.attempt == attempt
+            assert queue.fail_task(task.task_id, "w1", f"boom {attempt}")
+
+        assert queue.claim_task("w1") is None
+        status = queue.get_job_status(job_id)
+        assert status["status"] == "completed"
+        assert status["failed"] == 1
+        assert status["results"][0]["error"] == "boom 3"
+
+    def test_retry_backoff(self, session_factory):
+        """Test that a failed task is not claimable until its retry delay passes."""
+        queue = BatchQueue(session_factory, retry_delay_seconds=60)
+        queue.create_job(["/a"])
+        task = queue.claim_task("w1")
+        queue.fail_task(task.task_id, "w1", "timeout")
+
+        assert queue.claim_task("w1") is None
+
+    def test_expired_lease_is_reclaimed(self, queue, session_factory):
+        """Test that a lost worker's task is picked up by another and the stale result is discarded."""
+        queue.create_job(["/a"])
+        task = queue.claim_task("w1")
+        assert queue.heartbeat(task.task_id, "w1")
+
+        _expire_lease(session_factory, task.task_id)
+        retaken = queue.claim_task("w2")
+
+        assert retaken.task_id == task.task_id
+        assert retaken.attempt == 2
+        assert not queue.heartbeat(task.task_id, "w1")
+        assert not queue.complete_task(task.task_id, "w1", {"status": "success"})
+        assert queue.complete_task(task.task_id, "w2", {"status": "success"})
+
+    def test_expired_lease_on_last_attempt_fails(self, session_factory):
+        """Test that a task abandoned on its final attempt is failed instead of re-leased."""
+        queue = BatchQueue(session_factory, max_attempts=1)
+        job_id = queue.create_job(["/a"])
+        task = queue.claim_task("w1")
+
+        _expire_lease(session_factory, task.task_id)
+
+        assert queue.claim_task("w2") is None
+        status = queue.get_job_status(job_id)
+        assert status["status"] == "completed"
+        assert "Lease expired" in status["results"][0]["error"]
+
+    def test_concurrent_claims_are_exclusive(self, queue):
+        """Test that workers racing for tasks never lease the same task twice."""
+        queue.create_job([f"/alert_{i}" for i in range(20)])
+        claimed = []
+        lock = threading.Lock()
+
+        def claim_all(worker_id):
+            while True:
+                task = queue.claim_task(worker_id)
+                if task is None:
+                    return
+                with lock:
+                    claimed.append(task.task_id)
+
+        threads = [threading.Thread(target=claim_all, args=(f"w{i}",)) for i in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert sorted(claimed) == sorted(set(claimed))
+        assert len(claimed) == 20
+
+    def test_record_result_commits_with_caller(self, queue, session_factory):
+        """Test that a result recorded in the caller's transaction is saved only when it commits."""
+        job_id = queue.create_job(["/a"])
+        task = queue.claim_task("w1")
+
+        db = session_factory()
+        queue.record_result(db, task, {"path": "/a", "status": "success"})
+        db.rollback()
+        assert queue.get_job_status(job_id)["running"] == 1
+
+        queue.record_result(db, task, {"path": "/a", "status": "success"})
+        db.commit()
+        db.close()
+        status = queue.get_job_status(job_id)
+        assert (status["status"], status["successful"]) == ("completed", 1)
+
+    def test_last_tasks_finished_in_separate_sessions_complete_job(self, queue, session_factory):
+        """Test that a job completes when its last two tasks finish in overlapping transactions."""
+        job_id = queue.create_job(["/a", "/b"])
+        first, second = queue.claim_task("w1"), queue.claim_task("w2")
+
+        db_first, db_second = session_factory(), session_factory()
+        queue.record_result(db_first, first, {"path": "/a", "status": "success"})
+        started = threading.Event()
+
+        def finish_second():
+            started.set()
+            # Waits on the first transaction's write lock, then counts both tasks
+            queue.record_result(db_second, second, {"path": "/b", "status": "success"})
+            db_second.commit()
+
+        thread = threading.Thread(target=finish_second)
+        thread.start()
+        started.wait()
+        assert queue.get_job_status(job_id)["status"] == "processing"
+        db_first.commit()
+        thread.join()
+        db_first.close()
+        db_second.close()
+
+        status = queue.get_job_status(job_id)
+        assert (status["status"], status["successful"]) == ("completed", 2)
+        assert status["completed_at"] is not None
+
+    def test_record_result_requires_lease(self, queue, session_factory):
+        """Test that a worker whose lease was taken over cannot record a result."""
+        queue.create_job(["/a"])
+        task = queue.claim_task("w1")
+        _expire_lease(session_factory, task.task_id)
+        assert queue.claim_task("w2").task_id == task.task_id
+
+        db = session_factory()
+        with pytest.raises(LeaseLostError):
+            queue.record_result(db, task, {"path": "/a", "status": "success"})
+        db.close()
+
+    def test_unknown_job(self, queue):
+        """Test that status of an unknown job is None."""
+        assert queue.get_job_status("missing") is None
+
+
+class TestBatchWorker:
+    """Tests for BatchWorker processing."""
+
+    def test_drains_job_and_retries_failures(self, queue, session_factory):
+        """Test that the worker processes every task, retrying a transient failure."""
+        job_id = queue.create_job(["/a", "/flaky", "/c"])
+        calls = []
+
+        async def handler(db, tasks):
+            outcomes = []
+            for task in tasks:
+                calls.append(task.directory_path)
+                if task.directory_path == "/flaky" and calls.count("/flaky") == 1:
+                    outcomes.append(RuntimeError("LLM timeout"))
+                else:
+                    outcomes.append({"path": task.directory_path, "status": "success"})
+            return outcomes
+
+        worker = BatchWorker(queue, handler, session_factory, worker_id="test", concurrency=2, heartbeat_interval=0.01)
+        worker.run(drain=True)
+
+        status = queue.get_job_status(job_id)
+        assert status["status"] == "completed"
+        assert status["successful"] == 3
+        assert calls.count("/flaky") == 2
+
+    def test_claims_tasks_in_chunks(self, queue, session_factory):
+        """Test that a slot hands up to chunk_size tasks to the handler at once."""
+        job_id = queue.create_job([f"/alert_{i}" for i in range(5)])
+        chunks = []
+
+        async def handler(db, tasks):
+            chunks.append([task.directory_path for task in tasks])
+            return [{"path": task.directory_path, "status": "success"} for task in tasks]
+
+        worker = BatchWorker(queue, handler, session_factory, worker_id="test", chunk_size=2, heartbeat_interval=0.01)
+        worker.run(drain=True)
+
+        assert [len(chunk) for chunk in chunks] == [2, 2, 1]
+        assert queue.get_job_status(job_id)["successful"] == 5
+
+    def test_handler_error_fails_whole_chunk(self, queue, session_factory):
+        """Test that an exception escaping the handler fails every task of the chunk for retry."""
+        queue.create_job(["/a", "/b"])
+
+        async def handler(db, tasks):
+            raise RuntimeError("database unavailable")
+
+        worker = BatchWorker(queue, handler, session_factory, worker_id="test", chunk_size=2, heartbeat_interval=0.01)
+        assert asyncio.run(worker.process_one())
+
+        db = session_factory()
+        tasks = db.query(BatchTask).all()
+        assert {task.status for task in tasks} == {"pending"}
+        assert {task.error for task in tasks} == {"database unavailable"}
+        db.close()
+
+    def test_recorded_tasks_are_left_alone(self, queue, session_factory):
+        """Test that the worker does not complete tasks the handler already recorded."""
+        job_id = queue.create_job(["/a"])
+
+        async def handler(db, tasks):
+            queue.record_result(db, tasks[0], {"path": "/a", "status": "success", "finding_id": 1})
+            db.commit()
+            tasks[0].recorded = True
+            return [{"path": "/a", "status": "success", "finding_id": 2}]
+
+        worker = BatchWorker(queue, handler, session_factory, worker_id="test", heartbeat_interval=0.01)
+        assert asyncio.run(worker.process_one())
+
+        assert queue.get_job_status(job_id)["results"][0]["finding_id"] == 1
+
+    def test_heartbeat_extends_lease(self, queue, session_factory):
+        """Test that the lease is extended while a slow handler runs."""
+        queue.create_job(["/slow"])
+        leases = []
+
+        async def handler(db, tasks):
+            leases.append(db.query(BatchTask).one().lease_expires_at)
+            await asyncio.sleep(0.1)
+            db.expire_all()
+            leases.append(db.query(BatchTask).one().lease_expires_at)
+            return [{"path": task.directory_path, "status": "success"} for task in tasks]
+
+        worker = BatchWorker(queue, handler, session_factory, worker_id="test", heartbeat_interval=0.02)
+        assert asyncio.run(worker.process_one())
+        assert leases[1] > leases[0]
@@ -0,0 +1,13 @@
+"""
+Shared test configuration.
+
+Settings() requires DATABASE_URL and SECRET_KEY; tests that import models
+get a throwaway SQLite default so they run without a configured database.
+Each test that needs tables creates its own engine.
+"""
+
+import os
+import tempfile
+
+os.environ.setdefault("DATABASE_URL", "sqlite:///" + os.path.join(tempfile.gettempdir(), "tha_test.sqlite3"))
+os.environ.setdefault("SECRET_KEY", "test-secret-key")
@@ -0,0 +1,138 @@
+"""
+Unit tests for ContentAnalyzer.analyze_alert_async.
+
+The LLM is stubbed at LLMClassifier._call_llm_async; tests check parity
+with the sync path, that risk scoring and description run concurrently
+and that the per-call use_llm override leaves the shared analyzer alone.
+"""
+
+import asyncio
+import json
+
+import pytest
+from app.services.content_analyzer import prompts
+from app.services.content_analyzer.analyzer import ContentAnalyzer
+from app.services.content_analyzer.artifact_reader import AlertArtifacts, SummaryData
+
+from .test_fused_analysis import FUSED_RESPONSE, StubLLM
+
+
+class AsyncStubLLM:
+    """Returns the canned stage response matching each prompt, after a delay."""
+
+    def __init__(self, delay: float = 0.0):
+        self.delay = delay
+        self.calls = []
+        self.active = 0
+        self.peak = 0
+
+    def _stage(self, user_prompt: str) -> str:
+        for stage, template in (
+            ("classification", prompts.CLASSIFICATION_PROMPT),
+            ("analysis", prompts.ANALYSIS_PROMPT),
+            ("risk", prompts.RISK_SCORING_PROMPT),
+            ("description", prompts.FINDING_DESCRIPTION_PROMPT),
+        ):
+            if user_prompt.startswith(template[:60]):
+                return stage
+        return "fused"
+
+    async def __call__(self, system_prompt, user_prompt, max_tokens=2000, validate=None):
+        stage = self._stage(user_prompt)
+        self.calls.append(stage)
+        self.active += 1
+        self.peak = max(self.peak, self.active)
+        await asyncio.sleep(self.delay)
+        self.active -= 1
+        return json.dumps(FUSED_RESPONSE if stage == "fused" else FUSED_RESPONSE[stage])
+
+
+@pytest.fixture
+def artifacts():
+    return AlertArtifacts(
+        alert_id="200025_001372",
+        alert_name="Rarely Used Vendors",
+        explanation="This alert identifies vendors that have been inactive for extended periods.",
+        metadata="BACKDAYS=365",
+        summary="Vendor | Amount\nV001 | 50000",
+        summary_data=SummaryData(row_count=12, total_amount=50000.0, currency="EUR"),
+    )
+
+
+def _analyzer(llm_mode="staged"):
+    return ContentAnalyzer(llm_provider="openai", api_key="test-key", use_llm=True, llm_mode=llm_mode)
+
+
+class TestAnalyzeAlertAsync:
+    """Tests for analyze_alert_async."""
+
+    def test_matches_sync_path(self, artifacts, monkeypatch):
+        """Test that the async path produces the same finding as analyze_alert."""
+        analyzer = _analyzer()
+        monkeypatch.setattr(analyzer.llm_classifier, "_call_llm", StubLLM([
+            FUSED_RESPONSE["classification"],
+            FUSED_RESPONSE["analysis"],
+            FUSED_RESPONSE["risk"],
+            FUSED_RESPONSE["description"],
+        ]))
+        monkeypatch.setattr(analyzer.llm_classifier, "_call_llm_async", AsyncStubLLM())
+
+        sync_finding = analyzer.analyze_alert(artifacts, include_raw=True)
+        async_finding = asyncio.run(analyzer.analyze_alert_async(artifacts, include_raw=True))
+
+        sync_dict = sync_finding.to_dict()
+        async_dict = async_finding.to_dict()
+        sync_dict.pop("analyzed_at", None)
+        async_dict.pop("analyzed_at", None)
+        assert async_dict == sync_dict
+
+    def test_risk_and_description_run_concurrently(self, artifacts, monkeypatch):
+        """Test that only the two analysis-dependent stages overlap."""
+        analyzer = _analyzer()
+        stub = AsyncStubLLM(delay=0.05)
+        monkeypatch.setattr(analyzer.llm_classifier, "_call_llm_async", stub)
+
+        finding = asyncio.run(analyzer.analyze_alert_async(artifacts))
+
+        assert stub.calls[:2] == ["classification", "analysis"]
+        assert sorted(stub.calls[2:]) == ["description", "risk"]
+        assert stub.peak == 2
+        assert finding.title == "Payments to rarely used vendors"
+
+    def test_fused_mode_single_call(self, artifacts, monkeypatch):
+        """Test that fused mode makes one async call."""
+        analyzer = _analyzer("fused")
+        stub = AsyncStubLLM()
+        monkeypatch.setattr(analyzer.llm_classifier, "_call_llm_async", stub)
+
+        finding = asyncio.run(analyzer.analyze_alert_async(artifacts))
+
+        assert stub.calls == ["fused"]
+        assert finding.focus_area == "BUSINESS_PROTECTION"
+
+    def test_use_llm_override_is_per_call(self, artifacts, monkeypatch):
+        """Test that use_llm=False skips the LLM without changing the shared analyzer."""
+        analyzer = _analyzer()
+        stub = AsyncStubLLM()
+        monkeypatch.setattr(analyzer.llm_classifier, "_call_llm_async", stub)
+
+        finding = asyncio.run(analyzer.analyze_alert_async(artifacts, use_llm=False))
+
+        assert stub.calls == []
+        assert analyzer.use_llm is True
+        assert finding.alert_id == "200025_001372"
+
+    def test_concurrent_alerts_share_event_loop(self, artifacts, monkeypatch):
+        """Test that several alerts awaited together overlap their LLM calls."""
+        analyzer = _analyzer()
+        stub = AsyncStubLLM(delay=0.02)
+        monkeypatch.setattr(analyzer.llm_classifier, "_call_llm_async", stub)
+
+        async def run_all():
+            return await asyncio.gather(*(analyzer.analyze_alert_async(artifacts) for _ in range(3)))
+
+        findings = asyncio.run(run_all())
+
+        assert len(findings) == 3
+        assert len(stub.calls) == 12
+        assert stub.peak >= 3
@@ -0,0 +1,91 @@
+"""
+Unit tests for concurrent ContentAnalyzer.analyze_multiple.
+
+Tests result ordering, per-alert error isolation and that alerts are
+actually analyzed concurrently up to the configured limit.
+"""
+
+import threading
+import time
+
+import pytest
+from app.services.content_analyzer.analyzer import ContentAnalyzer
+from app.services.content_analyzer.artifact_reader import AlertArtifacts, SummaryData
+
+
+def _artifacts(index: int, alert_name: str = None) -> AlertArtifacts:
+    return AlertArtifacts(
+        alert_id=f"200025_{index:06d}",
+        alert_name=alert_name or f"Rarely Used Vendors {index}",
+        explanation="This alert identifies vendors that have been inactive for extended periods.",
+        summary_data=SummaryData(row_count=index + 1, total_amount=1000.0 * (index + 1)),
+    )
+
+
+class TestAnalyzeMultiple:
+    """Tests for analyze_multiple."""
+
+    @pytest.fixture
+    def analyzer(self):
+        """Create a ContentAnalyzer instance with LLM disabled."""
+        return ContentAnalyzer(use_llm=False, max_workers=4)
+
+    def test_results_keep_input_order(self, analyzer):
+        """Test that concurrent results are returned in input order."""
+        artifacts_list = [_artifacts(i) for i in range(12)]
+        findings = analyzer.analyze_multiple(artifacts_list)
+
+        assert [f.alert_id for f in findings] == [a.alert_id for a in artifacts_list]
+        assert [f.total_count for f in findings] == [i + 1 for i in range(12)]
+
+    def test_concurrent_matches_sequential(self, analyzer):
+        """Test that the thread pool produces the same findings as sequential analysis."""
+        artifacts_list = [_artifacts(i) for i in range(6)]
+        concurrent = analyzer.analyze_multiple(artifacts_list)
+        sequential = analyzer.analyze_multiple(artifacts_list, max_workers=1)
+
+        for c, s in zip(concurrent, sequential):
+            assert (c.focus_area, c.severity, c.risk_score, c.monetary_amount) == \
+                (s.focus_area, s.severity, s.risk_score, s.monetary_amount)
+
+    def test_failure_is_isolated(self, analyzer, monkeypatch):
+        """Test that one failing alert yields an error finding without affecting others."""
+        original = analyzer.analyze_alert
+
+        def analyze_alert(artifacts, include_raw=False):
+            if artifacts.alert_name == "Broken":
+                raise RuntimeError("boom")
+            return original(artifacts, include_raw=include_raw)
+
+        monkeypatch.setattr(analyzer, "analyze_alert", analyze_alert)
+        findings = analyzer.analyze_multiple([_artifacts(0), _artifacts(1, "Broken"), _artifacts(2)])
+
+        assert findings[1].title == "Error analyzing: Broken"
+        assert "boom" in findings[1].description
+        assert findings[0].alert_id == "200025_000000"
+        assert findings[2].alert_id == "200025_000002"
+        assert not findings[2].title.startswith("Error analyzing")
+
+    def test_concurrency_is_bounded(self, analyzer, monkeypatch):
+        """Test that slow (network-bound) analyses overlap up to max_workers."""
+        lock = threading.Lock()
+        state = {"active": 0, "peak": 0}
+
+        def analyze_alert(artifacts, include_raw=False):
+            with lock:
+                state["active"] += 1
+                state["peak"] = max(state["peak"], state["active"])
+            time.sleep(0.05)
+            with lock:
+                state["active"] -= 1
+            return analyzer._create_error_finding(artifacts, "stub")
+
+        monkeypatch.setattr(analyzer, "analyze_alert", analyze_alert)
+        start = time.perf_counter()
+        findings = analyzer.analyze_multiple([_artifacts(i) for i in range(12)], max_workers=3)
+        elapsed = time.perf_counter() - start
+
+        assert len(findings) == 12
+        assert state["peak"] == 3
+        # 12 alerts x 50ms at 3 workers is ~0.2s; sequential would be 0.6s
+        assert elapsed < 0.5
@@ -0,0 +1,89 @@
+"""
+Unit tests for Summary workbook reading in ArtifactReader.
+
+Tests that the single-pass streaming reader produces the same SummaryData
+as the original DataFrame-based reader.
+"""
+
+import pytest
+
+pytest.importorskip("pandas")
+openpyxl = pytest.importorskip("openpyxl")
+
+from app.services.content_analyzer.artifact_reader import ArtifactReader, ColumnType
+from benchmarks.dataframe_summary_reader import read_xlsx_structured_dataframe
+
+
+class TestStreamingSummaryReader:
+    """Tests for the streaming xlsx reader."""
+
+    @pytest.fixture
+    def reader(self):
+        """Create an ArtifactReader instance."""
+        return ArtifactReader()
+
+    @pytest.fixture
+    def summary_xlsx(self, tmp_path):
+        """Create a Summary workbook with a "Data" marker row and a blank row."""
+        workbook = openpyxl.Workbook()
+        sheet = workbook.active
+        sheet.append(["Data"])
+        sheet.append(["Vendor (LIFNR)", "Amount (DMBTR)", "Currency (WAERS)", "Currency", "Text", None])
+        sheet.append(["V001", 1000.5, "EUR", "USD", "a", None])
+        sheet.append(["V002", "2,500.00-", "EUR", "USD", "b", None])
+        sheet.append([])
+        sheet.append(["V001", 300, "EUR", "EUR", None, None])
+        path = tmp_path / "Summary_Test Alert_200025_001372.xlsx"
+        workbook.save(path)
+        return str(path)
+
+    def test_streaming_matches_dataframe_reader(self, reader, summary_xlsx):
+        """Test that streaming and DataFrame readers agree on structure and totals."""
+        streamed = reader._read_xlsx_structured(summary_xlsx)
+        loaded = read_xlsx_structured_dataframe(reader, summary_xlsx)
+
+        assert streamed.row_count == loaded.row_count == 4
+        assert streamed.column_count == loaded.column_count == 5
+        assert streamed.currency == loaded.currency
+        assert streamed.total_amount == pytest.approx(loaded.total_amount)
+
+        for s_col, l_col in zip(streamed.columns, loaded.columns):
+            assert s_col.name == l_col.name
+            assert s_col.column_type == l_col.column_type
+            assert s_col.is_key_metric == l_col.is_key_metric
+            assert s_col.non_null_count == l_col.non_null_count
+            if l_col.total is not None:
+                assert s_col.total == pytest.approx(l_col.total)
+                assert s_col.min_value == pytest.approx(l_col.min_value)
+                assert s_col.max_value == pytest.approx(l_col.max_value)
+
+    def test_streaming_amount_statistics(self, reader, summary_xlsx):
+        """Test that SAP trailing-minus strings are totalled as magnitudes."""
+        summary = reader._read_xlsx_structured(summary_xlsx)
+        amount = next(col for col in summary.columns if col.sap_field == "DMBTR")
+
+        assert amount.column_type == ColumnType.CURRENCY
+        assert amount.is_key_metric is True
+        assert amount.total == pytest.approx(3800.5)
+        assert amount.min_value == pytest.approx(300.0)
+        assert amount.max_value == pytest.approx(2500.0)
+        assert summary.total_amount == pytest.approx(3800.5)
+
+    def test_streaming_sample_rows_include_blank_rows(self, reader, summary_xlsx):
+        """Test that sample rows keep interior blank rows like the DataFrame reader."""
+        summary = reader._read_xlsx_structured(summary_xlsx)
+
+        assert len(summary.sample_rows) == 4
+        assert summary.sample_rows[0]["Vendor (LIFNR)"] == "V001"
+        assert summary.sample_rows[2] == {}
+        assert "Sample Data (first 10 rows):" in summary.raw_text
+
+    def test_header_detection_without_marker_row(self, reader):
+        """Test that the first row with more than 3 values is the header."""
+        rows = [("Report", None, None, None, None), ("A", "B", "C", "D", "E"), ("1", "2", "3", "4", "5")]
+        assert reader._detect_header_row(rows) == 1
+
+    def test_duplicate_and_empty_header_names(self, reader):
+        """Test pandas-compatible naming of duplicate and empty header cells."""
+        names = reader._make_column_names(("Name", None, "Name", "Name"))
+        assert names == ["Name", "Unnamed: 1", "Name.1", "Name.2"]
@@ -0,0 +1,145 @@
+"""
+Unit tests for the batched ColumnProfiler.
+
+Tests online statistics, the HyperLogLog distinct count, space-saving top-k
+and how ArtifactReader fills ColumnInfo from profiles.
+"""
+
+import pytest
+
+pd = pytest.importorskip("pandas")
+np = pytest.importorskip("numpy")
+
+from app.services.content_analyzer.artifact_reader import ArtifactReader, ColumnType
+from app.services.content_analyzer.column_profiler import (
+    ColumnProfiler,
+    HyperLogLog,
+    SpaceSavingTopK,
+    coerce_numeric,
+)
+
+
+def _feed(profiler, values, batch_size):
+    series = pd.Series(values)
+    for start in range(0, len(series), batch_size):
+        profiler.update(series.iloc[start:start + batch_size])
+    return profiler
+
+
+class TestColumnProfiler:
+    """Tests for ColumnProfiler statistics and sketches."""
+
+    def test_batched_statistics_match_full_column(self):
+        """Test that per-batch Welford/Chan merging matches whole-column stats."""
+        values = np.random.default_rng(1).lognormal(5, 1.5, 10007)
+        profiler = _feed(ColumnProfiler("Amount"), values, batch_size=1000)
+
+        assert profiler.numeric_count == len(values)
+        assert profiler.total == pytest.approx(values.sum())
+        assert profiler.mean == pytest.approx(values.mean())
+        assert profiler.std_dev == pytest.approx(values.std(ddof=1))
+        assert profiler.min_value == pytest.approx(values.min())
+        assert profiler.max_value == pytest.approx(values.max())
+
+    def test_sap_number_strings(self):
+        """Test that '1,234.50-' style strings and mixed cells are parsed as magnitudes."""
+        series = pd.Series(["1,234.50-", 100, "n/a", None, 2.5, True], dtype=object)
+        numbers = coerce_numeric(series)
+
+        assert numbers[0] == pytest.approx(1234.5)
+        assert numbers[1] == pytest.approx(100)
+        assert np.isnan(numbers[2])
+        assert numbers[4] == pytest.approx(2.5)
+        assert np.isnan(numbers[5])
+
+    def test_distinct_count_small_is_exact(self):
+        """Test that small cardinalities are counted (near) exactly."""
+        profiler = _feed(ColumnProfiler("Currency"), ["EUR", "USD", "GBP", "EUR"] * 500, batch_size=300)
+        assert profiler.distinct_count == 3
+
+    def test_distinct_count_large_is_approximate(self):
+        """Test that HyperLogLog stays within a few percent on large cardinalities."""
+        values = [f"V{i:07d}" for i in range(60000)] * 2
+        profiler = _feed(ColumnProfiler("Vendor"), values, batch_size=7000)
+        assert profiler.distinct_count == pytest.approx(60000, rel=0.05)
+
+    def test_top_values_find_heavy_hitters_across_batches(self):
+        """Test that frequent values survive eviction of a long unique tail."""
+        rng = np.random.default_rng(3)
+        values = np.concatenate([
+            np.repeat(["HOT1"], 5000),
+            np.repeat(["HOT2"], 3000),
+            np.array([f"tail{i}" for i in range(20000)]),
+        ])
+        rng.shuffle(values)
+        profiler = _feed(ColumnProfiler("Vendor", top_k_capacity=16), values, batch_size=2000)
+
+        top = profiler.top_values(2)
+        error = profiler.top_values_error
+        assert [value for value, _ in top] == ["HOT1", "HOT2"]
+        # Reported counts are lower bounds, off by at most the error bound
+        assert error > 0
+        assert top[0][1] <= 5000 <= top[0][1] + error
+        assert top[1][1] <= 3000 <= top[1][1] + error
+
+    def test_top_values_exact_within_capacity(self):
+        """Test exact counts and smallest-value tie breaking with few distinct values."""
+        sketch = SpaceSavingTopK(capacity=8)
+        sketch.update_counts(pd.Series({"USD": 2, "EUR": 2}))
+        sketch.update_counts(pd.Series({"GBP": 1}))
+
+        assert sketch.top(3) == [("EUR", 2), ("USD", 2), ("GBP", 1)]
+        assert sketch.offset == 0
+
+    def test_counts_bound_true_counts_after_eviction(self):
+        """Test that every reported count is within offset below the true count once values are evicted."""
+        true_counts = {"A": 10, "B": 6, "C": 2, "D": 1, "E": 4}
+        sketch = SpaceSavingTopK(capacity=2)
+        sketch.update_counts(pd.Series({"A": 10}))
+        sketch.update_counts(pd.Series({"B": 3, "C": 2, "D": 1}))
+        sketch.update_counts(pd.Series({"B": 3, "E": 4}))
+
+        assert sketch.offset > 0
+        assert sketch.top(1)[0][0] == "A"
+        for value, count in sketch.top():
+            assert count <= true_counts[value] <= count + sketch.offset
+
+    def test_numeric_resolver_skips_text_columns(self):
+        """Test that numeric parsing stops once the head sample says the column is text."""
+        profiler = ColumnProfiler("Text", numeric_resolver=lambda head: False)
+        _feed(profiler, ["123"] * 50, batch_size=25)
+
+        assert profiler.track_numeric is False
+        assert profiler.numeric_count == 0
+        assert profiler.non_null_count == 50
+
+    def test_hyperloglog_empty(self):
+        """Test that an empty sketch estimates zero."""
+        assert HyperLogLog().estimate() == 0
+
+
+class TestReaderColumnProfiles:
+    """Tests for ColumnInfo filled from column profiles."""
+
+    def test_column_info_fills_sketch_fields(self):
+        """Test that ColumnInfo from a profile reports statistics, distinct count and top values."""
+        reader = ArtifactReader()
+        df = pd.DataFrame({
+            "Amount (DMBTR)": ["1,000.00-", "250.00", None, "250.00"],
+            "Currency (WAERS)": ["EUR", "USD", "EUR", None],
+        })
+
+        def column_info(name):
+            return reader._column_info_from_profile(_feed(reader._make_profiler(name), df[name], batch_size=2))
+
+        amount = column_info("Amount (DMBTR)")
+        assert amount.column_type == ColumnType.CURRENCY
+        assert amount.total == pytest.approx(1500.0)
+        assert amount.avg_value == pytest.approx(500.0)
+        assert amount.distinct_count == 2
+        assert amount.top_values[0] == ("250.00", 2)
+
+        currency = column_info("Currency (WAERS)")
+        assert currency.column_type == ColumnType.TEXT
+        assert currency.total is None
+        assert currency.top_values[0] == ("EUR", 2)
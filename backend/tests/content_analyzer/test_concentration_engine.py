@@ -0,0 +1,147 @@
+"""
+Unit tests for the full-dataset concentration engine.
+
+Tests entity/amount aggregation over all rows, top-k ranking, batched
+accumulation, and how the analyzer uses the results.
+"""
+
+import pytest
+
+pd = pytest.importorskip("pandas")
+
+from app.services.content_analyzer.analyzer import ContentAnalyzer
+from app.services.content_analyzer.artifact_reader import SummaryData, ColumnInfo, ColumnType
+from app.services.content_analyzer.concentration_engine import (
+    ConcentrationEngine,
+    ConcentrationAccumulator,
+    dimension_type_for,
+)
+
+
+@pytest.fixture
+def columns():
+    """ColumnInfo for a vendor/amount Summary."""
+    return [
+        ColumnInfo(name="Vendor", original_name="Vendor (LIFNR)", sap_field="LIFNR",
+                   column_type=ColumnType.IDENTIFIER),
+        ColumnInfo(name="Amount", original_name="Amount (DMBTR)", sap_field="DMBTR",
+                   column_type=ColumnType.CURRENCY, is_key_metric=True),
+    ]
+
+
+@pytest.fixture
+def summary_df():
+    """Summary rows where V001 holds 70% of the amount beyond the first 10 rows."""
+    vendors = ["V002", "V003"] * 10 + ["V001"] * 5
+    amounts = [100.0] * 20 + [1000.0] * 5
+    return pd.DataFrame({"Vendor (LIFNR)": vendors, "Amount (DMBTR)": amounts})
+
+
+class TestConcentrationEngine:
+    """Tests for ConcentrationEngine."""
+
+    def test_aggregates_all_rows(self, summary_df, columns):
+        """Test that totals and shares are computed over every row."""
+        results = ConcentrationEngine(top_k=3).analyze(summary_df, columns)
+
+        assert len(results) == 1
+        result = results[0]
+        assert result.total_amount == pytest.approx(7000.0)
+        assert result.entity_count == 3
+        assert result.dimension_type == "VENDOR"
+
+        top = result.top_entries[0]
+        assert top.entity == "V001"
+        assert top.amount == pytest.approx(5000.0)
+        assert top.record_count == 5
+        assert top.percentage_of_total == pytest.approx(5000 / 7000 * 100)
+        assert [e.rank for e in result.top_entries] == [1, 2, 3]
+
+    def test_top_k_limits_entries(self, summary_df, columns):
+        """Test that only the top-k entities are kept, sorted by amount."""
+        result = ConcentrationEngine(top_k=2).analyze(summary_df, columns)[0]
+
+        assert len(result.top_entries) == 2
+        amounts = [e.amount for e in result.top_entries]
+        assert amounts == sorted(amounts, reverse=True)
+
+    def test_batched_accumulation_matches_single_pass(self, summary_df, columns):
+        """Test that feeding batches gives the same result as one DataFrame."""
+        accumulator = ConcentrationAccumulator(["Vendor (LIFNR)"], ["Amount (DMBTR)"])
+        for start in range(0, len(summary_df), 7):
+            accumulator.update(summary_df.iloc[start:start + 7])
+        batched = accumulator.results(columns, top_k=3)[0]
+        single = ConcentrationEngine(top_k=3).analyze(summary_df, columns)[0]
+
+        assert [(e.entity, e.amount, e.record_count) for e in batched.top_entries] == \
+            [(e.entity, e.amount, e.record_count) for e in single.top_entries]
+
+    def test_sap_formatted_amount_strings(self, columns):
+        """Test that "1,234.00-" style strings are coerced to magnitudes."""
+        df = pd.DataFrame({
+            "Vendor (LIFNR)": ["V1", "V2", None],
+            "Amount (DMBTR)": ["1,000.00-", "500", "250"],
+        })
+        result = ConcentrationEngine().analyze(df, columns)[0]
+
+        assert result.total_amount == pytest.approx(1750.0)
+        assert result.top_entries[0].entity == "V1"
+        assert result.top_entries[0].amount == pytest.approx(1000.0)
+
+    def test_no_amount_column_returns_empty(self):
+        """Test that no results are produced without an amount column."""
+        columns = [ColumnInfo(name="Vendor", original_name="Vendor", column_type=ColumnType.TEXT)]
+        df = pd.DataFrame({"Vendor": ["V1", "V2"]})
+        assert ConcentrationEngine().analyze(df, columns) == []
+
+    def test_dimension_type_from_column_name(self):
+        """Test dimension type codes derived from column names."""
+        assert dimension_type_for("Sales Organization (VKORG)") == "SALES_ORGANIZATION"
+        assert dimension_type_for("Company Code") == "COMPANY_CODE"
+
+
+class TestAnalyzerUsesConcentrations:
+    """Tests that ContentAnalyzer prefers full-dataset concentrations."""
+
+    @pytest.fixture
+    def analyzer(self):
+        """Create a ContentAnalyzer instance with LLM disabled."""
+        return ContentAnalyzer(use_llm=False)
+
+    @pytest.fixture
+    def summary_data(self, summary_df, columns):
+        """SummaryData whose sample rows do not include the dominant vendor."""
+        return SummaryData(
+            row_count=len(summary_df),
+            column_count=2,
+            columns=columns,
+            total_amount=7000.0,
+            sample_rows=summary_df.head(10).to_dict("records"),
+            concentrations=ConcentrationEngine().analyze(summary_df, columns)
+        )
+
+    def test_concentration_detected_outside_sample_rows(self, analyzer, summary_data):
+        """Test >50% concentration found even though V001 is not in the sample."""
+        violations = analyzer._detect_concentration_patterns(summary_data)
+
+        assert len(violations) == 1
+        assert "V001" in violations[0]
+        assert "71.4%" in violations[0]
+
+    def test_notable_items_from_concentrations(self, analyzer, summary_data):
+        """Test notable items are the top entities over all rows."""
+        items = analyzer._extract_notable_items(summary_data, max_items=5)
+
+        assert items[0]["title"] == "V001"
+        assert items[0]["amount"] == pytest.approx(5000.0)
+        assert items[0]["percentage_of_total"] == pytest.approx(5000 / 7000 * 100)
+
+    def test_concentration_metrics_rows(self, analyzer, summary_data):
+        """Test flattening into ConcentrationMetric-ready rows."""
+        metrics = analyzer._build_concentration_metrics(summary_data)
+
+        assert len(metrics) == 3
+        assert metrics[0]["dimension_type"] == "VENDOR"
+        assert metrics[0]["dimension_code"] == "V001"
+        assert metrics[0]["rank"] == 1
+        assert metrics[0]["percentage_of_total"] == pytest.approx(71.43)
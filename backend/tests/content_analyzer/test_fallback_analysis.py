@@ -69,10 +69,8 @@ class TestFallbackAnalysis:
         """Test fallback analysis with structured summary_data."""
         basic_artifacts.summary_data = structured_summary_data
         
-        # Set focus area for severity determination
-        analyzer._last_classification_focus_area = "BUSINESS_PROTECTION"
-        
-        result = analyzer._fallback_analysis(basic_artifacts)
+        # Focus area drives severity determination
+        result = analyzer._fallback_analysis(basic_artifacts, focus_area="BUSINESS_PROTECTION")
         
         assert isinstance(result, AnalysisResult)
         assert result.quantitative_analysis["total_count"] == 1500
@@ -83,9 +81,7 @@ class TestFallbackAnalysis:
 
     def test_fallback_analysis_with_text_only(self, analyzer, basic_artifacts):
         """Test fallback analysis with text-only summary (no structured data)."""
-        analyzer._last_classification_focus_area = "BUSINESS_CONTROL"
-        
-        result = analyzer._fallback_analysis(basic_artifacts)
+        result = analyzer._fallback_analysis(basic_artifacts, focus_area="BUSINESS_CONTROL")
         
         assert isinstance(result, AnalysisResult)
         # Text extraction may not always work perfectly - just verify it's a valid result
@@ -201,20 +197,16 @@ class TestFallbackAnalysis:
     def test_severity_reasoning_includes_quantitative_factors(self, analyzer, basic_artifacts, structured_summary_data):
         """Test that severity reasoning includes quantitative factors."""
         basic_artifacts.summary_data = structured_summary_data
-        analyzer._last_classification_focus_area = "BUSINESS_PROTECTION"
-        
-        result = analyzer._fallback_analysis(basic_artifacts)
+        result = analyzer._fallback_analysis(basic_artifacts, focus_area="BUSINESS_PROTECTION")
         
         # Severity reasoning should include count and/or amount
         assert "1500" in result.severity_reasoning or "50,000" in result.severity_reasoning or "50000" in result.severity_reasoning
 
     def test_recommended_actions_by_severity(self, analyzer, basic_artifacts):
         """Test that recommended actions vary by severity level."""
-        analyzer._last_classification_focus_area = "BUSINESS_PROTECTION"
-        
         # Test with HIGH severity alert
         basic_artifacts.alert_name = "Rarely Used Vendor Alert"
-        result_high = analyzer._fallback_analysis(basic_artifacts)
+        result_high = analyzer._fallback_analysis(basic_artifacts, focus_area="BUSINESS_PROTECTION")
         
         assert len(result_high.recommended_actions) > 0
         assert any("review" in action.lower() for action in result_high.recommended_actions)
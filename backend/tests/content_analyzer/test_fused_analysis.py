@@ -0,0 +1,162 @@
+"""
+Unit tests for the fused (single-call) LLM analysis mode.
+
+The LLM is stubbed at LLMClassifier._call_llm; tests check that one call
+fills all four stages, that schema violations fall back to the staged
+calls, and that the staged path is unchanged.
+"""
+
+import json
+
+import pytest
+from app.services.content_analyzer.analyzer import ContentAnalyzer
+from app.services.content_analyzer.artifact_reader import AlertArtifacts, SummaryData
+
+
+FUSED_RESPONSE = {
+    "classification": {
+        "focus_area": "BUSINESS_PROTECTION",
+        "confidence": 0.9,
+        "reasoning": "Payments to rarely used vendors"
+    },
+    "analysis": {
+        "findings_summary": "12 payments to dormant vendors",
+        "qualitative_analysis": {
+            "what_happened": "Dormant vendors received payments",
+            "business_risk": "Possible payment diversion",
+            "affected_areas": ["Accounts Payable"]
+        },
+        "quantitative_analysis": {"total_count": 12, "key_metrics": {}, "notable_items": []},
+        "severity": "High",
+        "severity_reasoning": "Large amounts",
+        "recommended_actions": ["Review vendor master changes"]
+    },
+    "risk": {
+        "risk_score": 72,
+        "risk_level": "High",
+        "risk_factors": ["Dormant vendors"],
+        "potential_financial_impact": {"estimated_amount": 50000.0, "currency": "EUR"}
+    },
+    "description": {
+        "title": "Payments to rarely used vendors",
+        "description": "Twelve payments went to vendors inactive for over a year.",
+        "business_impact": "Potential fraud exposure"
+    }
+}
+
+
+class StubLLM:
+    """Records prompts and returns canned responses in order."""
+
+    def __init__(self, responses):
+        self.responses = list(responses)
+        self.prompts = []
+
+    def __call__(self, system_prompt, user_prompt, max_tokens=2000, validate=None):
+        self.prompts.append(user_prompt)
+        response = self.responses.pop(0) if self.responses else "{}"
+        return response if isinstance(response, str) else json.dumps(response)
+
+
+@pytest.fixture
+def artifacts():
+    return AlertArtifacts(
+        alert_id="200025_001372",
+        alert_name="Rarely Used Vendors",
+        explanation="This alert identifies vendors that have been inactive for extended periods.",
+        metadata="BACKDAYS=365",
+        summary="Vendor | Amount\nV001 | 50000",
+        summary_data=SummaryData(row_count=12, total_amount=50000.0, currency="EUR"),
+    )
+
+
+def _analyzer(llm_mode):
+    return ContentAnalyzer(llm_provider="openai", api_key="test-key", use_llm=True, llm_mode=llm_mode)
+
+
+class TestFusedAnalysis:
+    """Tests for llm_mode="fused"."""
+
+    def test_single_call_fills_all_stages(self, artifacts, monkeypatch):
+        """Test that one LLM call produces classification, analysis, risk and description."""
+        analyzer = _analyzer("fused")
+        stub = StubLLM([FUSED_RESPONSE])
+        monkeypatch.setattr(analyzer.llm_classifier, "_call_llm", stub)
+
+        finding = analyzer.analyze_alert(artifacts, include_raw=True)
+
+        assert len(stub.prompts) == 1
+        assert stub.prompts[0].count(artifacts.explanation) == 1
+        assert finding.focus_area == "BUSINESS_PROTECTION"
+        assert finding.focus_area_confidence == pytest.approx(0.9)
+        assert finding.title == "Payments to rarely used vendors"
+        assert finding.what_happened == "Dormant vendors received payments"
+        assert finding.recommended_actions == ["Review vendor master changes"]
+        assert finding.raw_analysis["risk"]["risk_score"] == 72
+
+    def test_schema_violation_falls_back_to_staged(self, artifacts, monkeypatch):
+        """Test that an incomplete fused response triggers the four staged calls."""
+        analyzer = _analyzer("fused")
+        broken = {key: value for key, value in FUSED_RESPONSE.items() if key != "risk"}
+        stub = StubLLM([
+            broken,
+            FUSED_RESPONSE["classification"],
+            FUSED_RESPONSE["analysis"],
+            FUSED_RESPONSE["risk"],
+            FUSED_RESPONSE["description"],
+        ])
+        monkeypatch.setattr(analyzer.llm_classifier, "_call_llm", stub)
+
+        finding = analyzer.analyze_alert(artifacts)
+
+        assert len(stub.prompts) == 5
+        assert finding.focus_area == "BUSINESS_PROTECTION"
+        assert finding.title == "Payments to rarely used vendors"
+
+    def test_unparseable_response_falls_back(self, artifacts, monkeypatch):
+        """Test that non-JSON fused output falls back to the staged path."""
+        analyzer = _analyzer("fused")
+        stub = StubLLM(["Sorry, I cannot help with that."])
+        monkeypatch.setattr(analyzer.llm_classifier, "_call_llm", stub)
+
+        finding = analyzer.analyze_alert(artifacts)
+
+        assert len(stub.prompts) == 5
+        assert finding.alert_id == "200025_001372"
+
+    def test_staged_mode_makes_four_calls(self, artifacts, monkeypatch):
+        """Test that the default staged mode is unchanged."""
+        analyzer = _analyzer("staged")
+        stub = StubLLM([
+            FUSED_RESPONSE["classification"],
+            FUSED_RESPONSE["analysis"],
+            FUSED_RESPONSE["risk"],
+            FUSED_RESPONSE["description"],
+        ])
+        monkeypatch.setattr(analyzer.llm_classifier, "_call_llm", stub)
+
+        finding = analyzer.analyze_alert(artifacts)
+
+        assert len(stub.prompts) == 4
+        assert finding.title == "Payments to rarely used vendors"
+
+    @pytest.mark.parametrize("section,key,value", [
+        ("classification", "confidence", 1.5),
+        ("analysis", "severity", "Severe"),
+        ("risk", "risk_score", "high"),
+        ("description", "title", ""),
+    ])
+    def test_schema_check_rejects_bad_values(self, section, key, value):
+        """Test the fused response schema check on out-of-range or mistyped fields."""
+        analyzer = _analyzer("fused")
+        response = json.loads(json.dumps(FUSED_RESPONSE))
+        response[section][key] = value
+
+        errors = analyzer.llm_classifier._validate_fused_response(response)
+        assert any(f"{section}.{key}" in error for error in errors)
+        assert analyzer.llm_classifier._validate_fused_response(FUSED_RESPONSE) == []
+
+    def test_unknown_mode_rejected(self):
+        """Test that an unknown llm_mode raises."""
+        with pytest.raises(ValueError):
+            ContentAnalyzer(use_llm=False, llm_mode="parallel")
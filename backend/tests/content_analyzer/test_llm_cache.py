@@ -0,0 +1,261 @@
+"""
+Unit tests for the persistent LLMResponseCache.
+
+Tests prompt fingerprinting, TTL expiry, LRU eviction by size, per-request
+bypass, that repeated LLMClassifier analyses and MoneyLossLLM estimates
+are answered from the cache and that unusable responses are not cached.
+"""
+
+import asyncio
+import json
+import threading
+import time
+
+import pytest
+from app.models.finding import Finding
+from app.services.content_analyzer.analyzer import ContentAnalyzer
+from app.services.content_analyzer.artifact_reader import AlertArtifacts, SummaryData
+from app.services.llm_engine.money_loss_llm import MoneyLossLLM
+from app.services.llm_cache import (
+    LLMResponseCache, llm_cache_bypass, is_llm_cache_bypassed
+)
+
+
+CLASSIFICATION = {"focus_area": "BUSINESS_PROTECTION", "confidence": 0.8, "reasoning": "Dormant vendors"}
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return LLMResponseCache(str(tmp_path / "llm_cache.sqlite3"))
+
+
+@pytest.fixture
+def artifacts():
+    return AlertArtifacts(
+        alert_id="200025_001372",
+        alert_name="Rarely Used Vendors",
+        explanation="This alert identifies vendors that have been inactive for extended periods.",
+        summary_data=SummaryData(row_count=12, total_amount=50000.0, currency="EUR"),
+    )
+
+
+class TestLLMResponseCache:
+    """Tests for LLMResponseCache storage, expiry and eviction."""
+
+    def test_hit_and_miss(self, cache):
+        """Test that identical prompts hit and any changed component misses."""
+        assert cache.get("openai", "gpt-4o-mini", "system", "user") is None
+        cache.put("openai", "gpt-4o-mini", "system", "user", "response")
+
+        assert cache.get("openai", "gpt-4o-mini", "system", "user") == "response"
+        assert cache.get("openai", "gpt-4o", "system", "user") is None
+        assert cache.get("anthropic", "gpt-4o-mini", "system", "user") is None
+        assert cache.get("openai", "gpt-4o-mini", "system", "user 2") is None
+
+        stats = cache.stats()
+        assert stats["hits"] == 1
+        assert stats["misses"] == 4
+        assert stats["entries"] == 1
+
+    def test_persists_across_instances(self, cache):
+        """Test that responses survive reopening the database."""
+        cache.put("openai", "gpt-4o-mini", "system", "user", "response")
+        reopened = LLMResponseCache(cache.path)
+        assert reopened.get("openai", "gpt-4o-mini", "system", "user") == "response"
+
+    def test_ttl_expiry(self, tmp_path, monkeypatch):
+        """Test that entries older than the TTL are treated as misses."""
+        cache = LLMResponseCache(str(tmp_path / "llm_cache.sqlite3"), ttl_seconds=60)
+        cache.put("openai", "gpt-4o-mini", "system", "user", "response")
+
+        later = time.time() + 120
+        monkeypatch.setattr(time, "time", lambda: later)
+
+        assert cache.get("openai", "gpt-4o-mini", "system", "user") is None
+        assert cache.stats()["entries"] == 0
+
+    def test_lru_eviction_by_size(self, tmp_path):
+        """Test that least recently used responses are evicted once over budget."""
+        cache = LLMResponseCache(str(tmp_path / "llm_cache.sqlite3"), max_bytes=250)
+        cache.put("openai", "m", "s", "first", "a" * 100)
+        cache.put("openai", "m", "s", "second", "b" * 100)
+        time.sleep(0.01)
+        assert cache.get("openai", "m", "s", "first") is not None
+
+        cache.put("openai", "m", "s", "third", "c" * 100)
+
+        assert cache.get("openai", "m", "s", "second") is None
+        assert cache.get("openai", "m", "s", "first") is not None
+        assert cache.get("openai", "m", "s", "third") is not None
+        assert cache.stats()["size_bytes"] <= 250
+
+    def test_bypass_skips_lookup_but_stores(self, cache):
+        """Test that a bypassed lookup misses and the fresh response is still stored."""
+        cache.put("openai", "m", "s", "u", "stale")
+
+        with llm_cache_bypass():
+            assert is_llm_cache_bypassed()
+            assert cache.get("openai", "m", "s", "u") is None
+            cache.put("openai", "m", "s", "u", "fresh")
+
+        assert not is_llm_cache_bypassed()
+        assert cache.get("openai", "m", "s", "u") == "fresh"
+        assert cache.stats()["bypassed"] == 1
+
+
+class TestClassifierUsesCache:
+    """Tests for LLMClassifier and ContentAnalyzer with an LLMResponseCache."""
+
+    def _analyzer(self, cache, monkeypatch):
+        analyzer = ContentAnalyzer(
+            llm_provider="openai", api_key="test-key", use_llm=True, llm_cache=cache, max_workers=4
+        )
+        calls = []
+
+        def request_llm(system_prompt, user_prompt, max_tokens):
+            calls.append(user_prompt)
+            return json.dumps(CLASSIFICATION)
+
+        monkeypatch.setattr(analyzer.llm_classifier, "_request_llm", request_llm)
+        return analyzer, calls
+
+    def test_repeat_analysis_makes_no_api_calls(self, cache, artifacts, monkeypatch):
+        """Test that re-analyzing an unchanged alert is served entirely from the cache."""
+        analyzer, calls = self._analyzer(cache, monkeypatch)
+
+        first = analyzer.analyze_alert(artifacts)
+        api_calls = len(calls)
+        assert api_calls == 4
+
+        second = analyzer.analyze_alert(artifacts)
+        assert len(calls) == api_calls
+        assert second.focus_area == first.focus_area == "BUSINESS_PROTECTION"
+        assert cache.stats()["hits"] == api_calls
+
+    def test_bypass_reaches_worker_threads(self, cache, artifacts, monkeypatch):
+        """Test that llm_cache_bypass applies to alerts analyzed by analyze_multiple."""
+        analyzer, calls = self._analyzer(cache, monkeypatch)
+        analyzer.analyze_alert(artifacts)
+        calls.clear()
+
+        analyzer.analyze_multiple([artifacts, artifacts])
+        assert calls == []
+
+        with llm_cache_bypass():
+            analyzer.analyze_multiple([artifacts, artifacts])
+        assert len(calls) == 8
+
+    def test_unusable_responses_are_not_cached(self, cache, artifacts, monkeypatch):
+        """Test that a truncated reply is requested again instead of being served from the cache."""
+        analyzer = ContentAnalyzer(llm_provider="openai", api_key="test-key", use_llm=True, llm_cache=cache)
+        classifier = analyzer.llm_classifier
+        responses = ['{"focus_area": "BUSINESS_PROT', json.dumps(CLASSIFICATION)]
+        monkeypatch.setattr(classifier, "_request_llm", lambda system_prompt, user_prompt, max_tokens: responses.pop(0))
+
+        assert classifier.classify_focus_area(artifacts).focus_area == "BUSINESS_CONTROL"
+        assert cache.stats()["entries"] == 0
+
+        assert classifier.classify_focus_area(artifacts).focus_area == "BUSINESS_PROTECTION"
+        assert classifier.classify_focus_area(artifacts).focus_area == "BUSINESS_PROTECTION"
+        assert responses == []
+        assert cache.stats()["entries"] == 1
+
+    def test_invalid_fused_response_is_not_cached(self, cache, artifacts, monkeypatch):
+        """Test that a fused reply failing the schema check is not cached."""
+        analyzer = ContentAnalyzer(
+            llm_provider="openai", api_key="test-key", use_llm=True, llm_cache=cache, llm_mode="fused"
+        )
+        classifier = analyzer.llm_classifier
+        monkeypatch.setattr(
+            classifier, "_request_llm", lambda system_prompt, user_prompt, max_tokens: json.dumps(CLASSIFICATION)
+        )
+
+        assert classifier.analyze_fused(artifacts) is None
+        assert cache.stats()["entries"] == 0
+
+    def test_async_cache_access_off_event_loop(self, cache, artifacts, monkeypatch):
+        """Test that the async path reads and writes the cache outside the event loop thread."""
+        analyzer = ContentAnalyzer(llm_provider="openai", api_key="test-key", use_llm=True, llm_cache=cache)
+        classifier = analyzer.llm_classifier
+        calls = []
+
+        async def request_llm_async(system_prompt, user_prompt, max_tokens):
+            calls.append(user_prompt)
+            return json.dumps(CLASSIFICATION)
+
+        cache_threads = []
+        for name in ("get", "put"):
+            original = getattr(cache, name)
+
+            def recording(*args, _original=original, **kwargs):
+                cache_threads.append(threading.get_ident())
+                return _original(*args, **kwargs)
+
+            monkeypatch.setattr(cache, name, recording)
+        monkeypatch.setattr(classifier, "_request_llm_async", request_llm_async)
+
+        async def classify_twice():
+            first = await classifier.classify_focus_area_async(artifacts)
+            with llm_cache_bypass():
+                second = await classifier.classify_focus_area_async(artifacts)
+            return threading.get_ident(), first, second
+
+        loop_thread, first, second = asyncio.run(classify_twice())
+        assert first.focus_area == second.focus_area == "BUSINESS_PROTECTION"
+        assert len(calls) == 2
+        assert cache_threads and loop_thread not in cache_threads
+
+
+class _StubClient:
+    """LLM client returning queued replies"""
+    provider = "openai"
+    model = "test-model"
+
+    def __init__(self, replies):
+        self.replies = list(replies)
+        self.calls = 0
+
+    def generate(self, prompt, system_prompt):
+        self.calls += 1
+        return self.replies.pop(0)
+
+
+class TestMoneyLossLLMUsesCache:
+    """Tests for MoneyLossLLM with an LLMResponseCache."""
+
+    ESTIMATE = {"estimated_loss": 25000, "confidence": 0.7, "reasoning": "Duplicate payments"}
+
+    def test_estimate_is_cached(self, cache):
+        """Test that a JSON estimate is cached and repeated findings make no further calls."""
+        client = _StubClient([json.dumps(self.ESTIMATE)])
+        calculator = MoneyLossLLM(client, response_cache=cache)
+        finding = Finding(title="Duplicate vendor payments", severity="High")
+
+        first = calculator.calculate(finding)
+        second = calculator.calculate(finding)
+        assert first == second
+        assert first["estimated_loss"] == 25000.0
+        assert client.calls == 1
+        assert cache.stats()["entries"] == 1
+
+    def test_unusable_replies_are_not_cached(self, cache):
+        """Test that truncated, free-text or non-numeric replies are requested again."""
+        replies = [
+            '{"estimated_loss": 250',
+            "Roughly $40,000 in duplicate payments",
+            json.dumps({"estimated_loss": "a lot"}),
+            json.dumps(self.ESTIMATE),
+        ]
+        client = _StubClient(replies)
+        calculator = MoneyLossLLM(client, response_cache=cache)
+        finding = Finding(title="Duplicate vendor payments", severity="High")
+
+        assert calculator.calculate(finding)["confidence"] == 0.4  # estimate read from text
+        assert calculator.calculate(finding)["estimated_loss"] == 40000.0
+        assert calculator.calculate(finding)["confidence"] == 0.3  # fallback calculation
+        assert cache.stats()["entries"] == 0
+
+        assert calculator.calculate(finding)["estimated_loss"] == 25000.0
+        assert calculator.calculate(finding)["estimated_loss"] == 25000.0
+        assert client.calls == 4
+        assert cache.stats()["entries"] == 1
@@ -0,0 +1,134 @@
+"""
+Unit tests for the on-disk SummaryCache.
+
+Tests round-tripping parsed SummaryData, cache hits skipping xlsx parsing,
+invalidation on content change and LRU eviction by total size.
+"""
+
+import os
+import time
+
+import pytest
+
+pytest.importorskip("pandas")
+openpyxl = pytest.importorskip("openpyxl")
+
+from app.services.content_analyzer.artifact_reader import ArtifactReader, SummaryData, ColumnInfo
+from app.services.content_analyzer.summary_cache import SummaryCache
+
+
+def _write_summary(path, rows):
+    workbook = openpyxl.Workbook()
+    sheet = workbook.active
+    sheet.append(["Vendor (LIFNR)", "Amount (DMBTR)", "Currency (WAERS)", "Text"])
+    for row in rows:
+        sheet.append(row)
+    workbook.save(path)
+    return str(path)
+
+
+class TestSummaryCache:
+    """Tests for SummaryCache storage and eviction."""
+
+    @pytest.fixture
+    def cache(self, tmp_path):
+        return SummaryCache(str(tmp_path / "cache"), max_bytes=10 * 1024 * 1024)
+
+    def test_round_trip(self, cache, tmp_path):
+        """Test that SummaryData is restored with columns and sample rows."""
+        source = tmp_path / "Summary.xlsx"
+        source.write_bytes(b"content")
+        summary = SummaryData(row_count=3, column_count=1, total_amount=12.5, currency="EUR")
+        summary.columns.append(ColumnInfo(name="Amount", original_name="Amount (DMBTR)", total=12.5))
+        summary.sample_rows.append({"Amount (DMBTR)": 12.5})
+
+        key = cache.key_for(str(source))
+        assert cache.get(key) is None
+        cache.put(key, summary)
+        restored = cache.get(key)
+
+        assert restored == summary
+        assert cache.stats()["hits"] == 1
+        assert cache.stats()["misses"] == 1
+
+    def test_key_follows_content(self, cache, tmp_path):
+        """Test that identical content shares a key and changed content does not."""
+        first = tmp_path / "a.xlsx"
+        second = tmp_path / "b.xlsx"
+        first.write_bytes(b"same")
+        second.write_bytes(b"same")
+        assert cache.key_for(str(first)) == cache.key_for(str(second))
+
+        second.write_bytes(b"changed")
+        assert cache.key_for(str(first)) != cache.key_for(str(second))
+
+    def test_corrupt_entry_is_a_miss(self, cache):
+        """Test that unreadable entries are discarded instead of raising."""
+        key = "ab" + "0" * 62
+        path = cache._entry_path(key)
+        path.parent.mkdir(parents=True)
+        path.write_bytes(b"garbage")
+
+        assert cache.get(key) is None
+        assert not path.exists()
+
+    def test_lru_eviction_by_total_size(self, tmp_path):
+        """Test that least recently used entries are evicted once over budget."""
+        probe = SummaryCache(str(tmp_path / "probe"))
+        probe.put("00" * 32, SummaryData(raw_text="x" * 10))
+        entry_size = probe.stats()["size_bytes"]
+
+        cache = SummaryCache(str(tmp_path / "cache"), max_bytes=entry_size * 2)
+        keys = [f"{i:02d}" * 32 for i in range(3)]
+        cache.put(keys[0], SummaryData(raw_text="x" * 10))
+        cache.put(keys[1], SummaryData(raw_text="x" * 10))
+
+        # Touch the first entry so the second becomes least recently used
+        past = time.time() - 60
+        os.utime(cache._entry_path(keys[1]), (past, past))
+        assert cache.get(keys[0]) is not None
+
+        cache.put(keys[2], SummaryData(raw_text="x" * 10))
+
+        assert cache.get(keys[1]) is None
+        assert cache.get(keys[0]) is not None
+        assert cache.get(keys[2]) is not None
+        assert cache.stats()["size_bytes"] <= entry_size * 2
+
+
+class TestReaderUsesSummaryCache:
+    """Tests for ArtifactReader with a SummaryCache."""
+
+    def test_unchanged_file_skips_parsing(self, tmp_path, monkeypatch):
+        """Test that a second read of the same workbook is served from the cache."""
+        path = _write_summary(tmp_path / "Summary_Test_200025_001372.xlsx", [
+            ["V001", 100.0, "EUR", "a"],
+            ["V002", "250.00-", "EUR", "b"],
+        ])
+        cache = SummaryCache(str(tmp_path / "cache"))
+        first = ArtifactReader(summary_cache=cache)._read_summary_xlsx(path)
+
+        reader = ArtifactReader(summary_cache=cache)
+
+        def fail(*args, **kwargs):
+            raise AssertionError("workbook parsed despite cache hit")
+
+        monkeypatch.setattr(reader, "_read_xlsx_structured", fail)
+        second = reader._read_summary_xlsx(path)
+
+        assert second == first
+        assert second.total_amount == pytest.approx(350.0)
+        assert cache.hits == 1
+
+    def test_changed_file_is_reparsed(self, tmp_path):
+        """Test that edited workbooks are parsed again."""
+        path = tmp_path / "Summary_Test_200025_001372.xlsx"
+        cache = SummaryCache(str(tmp_path / "cache"))
+        reader = ArtifactReader(summary_cache=cache)
+
+        _write_summary(path, [["V001", 100.0, "EUR", "a"]])
+        assert reader._read_summary_xlsx(str(path)).total_amount == pytest.approx(100.0)
+
+        _write_summary(path, [["V001", 100.0, "EUR", "a"], ["V002", 50.0, "EUR", "b"]])
+        assert reader._read_summary_xlsx(str(path)).total_amount == pytest.approx(150.0)
+        assert cache.hits == 0
@@ -0,0 +1 @@
+# Ingestion tests package
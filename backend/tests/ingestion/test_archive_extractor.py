@@ -0,0 +1,75 @@
+"""
+Unit tests for alert archive extraction.
+
+Artifacts must land in one directory per alert whatever folder layout
+the archive uses, and archives over the limits must be rejected.
+"""
+
+import io
+import os
+import zipfile
+
+import pytest
+
+from app.services.ingestion.archive_extractor import ArchiveError, ArchiveExtractor
+
+
+def write_zip(members):
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w", zipfile.ZIP_DEFLATED) as zf:
+        for name, content in members.items():
+            zf.writestr(name, content)
+    buffer.seek(0)
+    return buffer
+
+
+class TestArchiveExtractor:
+    """Tests for ArchiveExtractor."""
+
+    def test_groups_artifacts_by_alert(self, tmp_path):
+        """Test that artifacts are grouped by filename alert ID, falling back to the folder name."""
+        archive = write_zip({
+            "FI/200025_001372 - Vendor Payments/Code_Vendor Payments_200025_001372.txt": "FORM x.",
+            "FI/200025_001372 - Vendor Payments/Summary_Vendor Payments_200025_001372.csv": "a,b\n1,2\n",
+            "flat/Explanation_Vendor Payments_200025_001372.txt": "Payments",
+            "SD/200025_001441 - Negative Profit Deal/Metadata Negative Profit Deal.txt": "Layer: L1",
+            "SD/200025_001441 - Negative Profit Deal/Summary_Negative Profit Deal.xlsx": b"PK",
+            "SD/200025_001441 - Negative Profit Deal/readme.md": "notes",
+            "../../Code_Escape_200025_009999.txt": "FORM y.",
+        })
+
+        result = ArchiveExtractor().extract(archive, str(tmp_path))
+        alerts = {alert.alert_id: alert for alert in result.alerts}
+
+        assert sorted(alerts) == ["200025_001372", "200025_001441", "200025_009999"]
+        vendor = alerts["200025_001372"]
+        assert os.path.basename(vendor.directory) == "200025_001372 - Vendor Payments"
+        assert sorted(vendor.artifacts) == ["code", "explanation", "summary"]
+        assert vendor.analyzable
+
+        profit = alerts["200025_001441"]
+        assert profit.alert_name == "Negative Profit Deal"
+        assert sorted(profit.artifacts) == ["metadata", "summary"]
+
+        escape = alerts["200025_009999"]
+        assert os.path.dirname(escape.directory) == str(tmp_path)
+        assert not escape.analyzable
+
+        assert result.skipped == ["SD/200025_001441 - Negative Profit Deal/readme.md"]
+        assert result.total_bytes == sum(alert.size for alert in result.alerts)
+        with open(vendor.artifacts["summary"]) as f:
+            assert f.read() == "a,b\n1,2\n"
+
+    def test_limits(self, tmp_path):
+        """Test that archives over the file count or expanded size, and non-ZIPs, are rejected."""
+        archive = write_zip({f"Code_Alert_200025_{i:06d}.txt": "x" * 1000 for i in range(3)})
+
+        with pytest.raises(ArchiveError):
+            ArchiveExtractor(max_members=2).extract(archive, str(tmp_path / "count"))
+        archive.seek(0)
+        with pytest.raises(ArchiveError):
+            ArchiveExtractor(max_bytes=2500).extract(archive, str(tmp_path / "size"))
+        assert sum(len(files) for _, _, files in os.walk(tmp_path / "size")) == 2
+
+        with pytest.raises(ArchiveError):
+            ArchiveExtractor().extract(io.BytesIO(b"not a zip"), str(tmp_path / "bad"))
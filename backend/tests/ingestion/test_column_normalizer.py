@@ -0,0 +1,87 @@
+"""
+Unit tests for column-level date and number parsing.
+
+parse_datetime_column and parse_integer_column, with their unparsed
+bucket resolved per value, must give what DataSaver's per-value rules
+give for every value.
+"""
+
+import random
+from datetime import datetime
+
+from app.services.ingestion.column_normalizer import parse_datetime_column, parse_integer_column
+from app.services.ingestion.data_saver import DATE_FORMATS, TIMESTAMP_FORMATS, DataSaver
+
+
+def strptime_first(value, formats):
+    for fmt in formats:
+        try:
+            return datetime.strptime(str(value), fmt)
+        except ValueError:
+            continue
+    return None
+
+
+def random_values(seed=7):
+    rng = random.Random(seed)
+    values = []
+    for _ in range(2000):
+        day, month, year = rng.randint(1, 31), rng.randint(1, 13), rng.choice([2024, 1500, 99])
+        values.append(rng.choice([
+            f"{day:02d}.{month:02d}.{year}, {rng.randint(0, 24):02d}:10:00",
+            f"{year}-{month}-{day} 1:2:3",
+            f"{day}/{month}/{year} 08:00:00",
+            f"{year}/{month:02d}/{day:02d}",
+            f"{year}-{month:02d}-{day:02d}",
+            f"{day}.{month}.{year}",
+            rng.choice(["", None, 0, "now", "today", "n/a", "2024-01-01T00:00:00", 20240101, " 2024-01-01"]),
+        ]))
+    return values
+
+
+class TestParseDatetimeColumn:
+    """Tests for parse_datetime_column."""
+
+    def test_matches_strptime(self):
+        """Test that parsed values plus the bucket equal first-match strptime for every value."""
+        values = random_values()
+        for formats in (TIMESTAMP_FORMATS, DATE_FORMATS):
+            parsed = parse_datetime_column(values, formats, sample_size=20)
+
+            for position, value in enumerate(values):
+                expected = strptime_first(value, formats) if value else None
+                if position in parsed.unparsed:
+                    assert parsed.values[position] is None
+                    assert value
+                else:
+                    assert parsed.values[position] == expected, value
+
+    def test_unparsed_bucket(self):
+        """Test that only non-empty values no format parses land in the bucket."""
+        values = ["01.02.2024, 10:15:00", "", None, "garbage", "now", "01.02.2024, 10:15:00", "2024-03-05 08:00:00"]
+
+        parsed = parse_datetime_column(values, TIMESTAMP_FORMATS)
+
+        assert parsed.unparsed == [3, 4]
+        assert parsed.values[0] == parsed.values[5] == datetime(2024, 2, 1, 10, 15)
+        assert parsed.values[6] == datetime(2024, 3, 5, 8)
+        assert parsed.values[1] is parsed.values[2] is None
+
+
+class TestParseIntegerColumn:
+    """Tests for parse_integer_column."""
+
+    def test_matches_per_value_rule(self):
+        """Test that parsed durations plus the resolved bucket equal _parse_duration."""
+        values = [
+            "12.7", "", None, "n/a", 3, 0, 2.9, "1_000", "inf", "nan", " 12 ", True,
+            "529886718624364698.20291423592273241939", "-4", "1e3",
+        ]
+        saver = DataSaver(db=None, loader="bulk")
+
+        parsed = parse_integer_column(values)
+        for position in parsed.unparsed:
+            parsed.values[position] = saver._parse_duration(values[position])
+
+        assert parsed.values == [saver._parse_duration(value) for value in values]
+        assert all(type(value) in (int, type(None)) for value in parsed.values)
@@ -0,0 +1,268 @@
+"""
+Unit tests for DataSaver's bulk loader.
+
+Each test runs against its own SQLite file (the executemany fallback) and
+checks that the bulk path stores exactly what the ORM path stores.
+"""
+
+import math
+from datetime import datetime
+
+import numpy as np
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.core.database import Base
+import app.models  # noqa: F401  (registers all tables)
+from app.models.alert import Alert
+from app.models.data_source import DataSource, DataSourceType, FileFormat
+from app.models.soda_report import SoDAReport, SoDAReportMetadata
+from app.services.ingestion.data_saver import DataSaver
+
+
+ALERT_RECORDS = [
+    {
+        "Data": "01.02.2024, 10:15:00",
+        "User Name (BNAME)": "JDOE",
+        "Full Name (NAME_TEXT)": "John Doe",
+        "Client (MANDT)": 100,
+        "Application Server (RFCDEST)": "sap01",
+        "Duration In Time Units (DURATION)": "12.7",
+        "Duration Unit (DURATION_UNIT)": "M",
+        "IP address (HOSTADR)": "10.0.0.1",
+        "Transaction Code (TCODE)": "SE16\tN",
+        "Date (DATE)": "2024/02/01",
+        "Amount": np.float64(1.5),
+    },
+    {
+        "Data": None,
+        "User Name (BNAME)": "",
+        "Full Name (NAME_TEXT)": None,
+        "Client (MANDT)": "200",
+        "Application Server (RFCDEST)": None,
+        "Duration In Time Units (DURATION)": "n/a",
+        "Duration Unit (DURATION_UNIT)": None,
+        "IP address (HOSTADR)": "",
+        "Transaction Code (TCODE)": "SU01",
+        "Date (DATE)": "not a date",
+        "Amount": math.nan,
+    },
+    {
+        "Data": "2024-03-05 08:00:00",
+        "User Name (BNAME)": "ASMITH",
+        "Full Name (NAME_TEXT)": "Anna \\ Smith",
+        "Client (MANDT)": 100,
+        "Application Server (RFCDEST)": "sap02",
+        "Duration In Time Units (DURATION)": 3,
+        "Duration Unit (DURATION_UNIT)": "H",
+        "IP address (HOSTADR)": "10.0.0.2",
+        "Transaction Code (TCODE)": "FB60",
+        "Date (DATE)": "05.03.2024",
+        "Amount": math.inf,
+    },
+]
+
+UNNAMED_RECORDS = [
+    {"Unnamed: 0": "01.02.2024, 10:15:00", "Unnamed: 4": "JDOE", "Unnamed: 9": 5.0, "Unnamed: 21": "2024-02-01"},
+    {"Unnamed: 0": "", "Unnamed: 4": None, "Unnamed: 9": None, "Unnamed: 21": None},
+]
+
+SODA_RECORDS = [
+    {"User Name": "JDOE", "Role Name": "Z_FI_AP", "TCODE": "FB60", "Authorization Object": "F_BKPF_BUK"},
+    {"BNAME": "ASMITH", "Role": "Z_MM", "Transaction": "ME21N", "Note": "possible fraud"},
+    {"Col": "first", "ROLE": None},
+]
+
+ALERT_FIELDS = [
+    "application_server", "user_name", "full_name", "client", "transaction_code",
+    "timestamp", "duration", "duration_unit", "ip_address", "date", "raw_data",
+]
+SODA_FIELDS = [
+    "user_name", "role_name", "transaction_code", "authorization_object",
+    "violation_type", "risk_level", "raw_data",
+]
+
+
+@pytest.fixture
+def db(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'ingestion.sqlite3'}")
+    Base.metadata.create_all(engine)
+    session = sessionmaker(bind=engine)()
+    yield session
+    session.close()
+    engine.dispose()
+
+
+def _data_source(db, data_type=DataSourceType.ALERT):
+    data_source = DataSource(
+        filename="upload.xlsx",
+        original_filename="upload.xlsx",
+        file_format=FileFormat.XLSX,
+        data_type=data_type,
+        file_path="/tmp/upload.xlsx",
+    )
+    db.add(data_source)
+    db.commit()
+    return data_source
+
+
+def _rows(db, model, data_source, fields):
+    rows = db.query(model).filter(model.data_source_id == data_source.id).order_by(model.id).all()
+    return [{field: getattr(row, field) for field in fields} for row in rows]
+
+
+class TestBulkLoader:
+    """Tests for the bulk ingestion path."""
+
+    @pytest.mark.parametrize("records", [ALERT_RECORDS, UNNAMED_RECORDS])
+    def test_alerts_match_orm(self, db, records):
+        """Test that bulk-loaded alerts equal ORM-saved alerts field by field."""
+        orm_source = _data_source(db)
+        bulk_source = _data_source(db)
+
+        DataSaver(db, loader="orm").save_4c_alert(orm_source, {"metadata": {"alert_name": "A"}, "data": records})
+        DataSaver(db, loader="bulk").save_4c_alert(bulk_source, {"metadata": {"alert_name": "A"}, "data": records})
+
+        orm_rows = _rows(db, Alert, orm_source, ALERT_FIELDS)
+        bulk_rows = _rows(db, Alert, bulk_source, ALERT_FIELDS)
+        assert len(bulk_rows) == len(records)
+
+        for orm_row, bulk_row in zip(orm_rows, bulk_rows):
+            # Unparseable timestamps fall back to "now" in both paths
+            if orm_row["timestamp"] and abs((orm_row["timestamp"] - datetime.utcnow()).total_seconds()) < 60:
+                assert abs((bulk_row["timestamp"] - datetime.utcnow()).total_seconds()) < 60
+                orm_row["timestamp"] = bulk_row["timestamp"] = None
+            assert bulk_row == orm_row
+
+    def test_alert_normalization(self, db):
+        """Test normalized columns and the cleaned raw_data of bulk-loaded alerts."""
+        data_source = _data_source(db)
+        DataSaver(db, loader="bulk").save_4c_alert(data_source, {"metadata": {}, "data": ALERT_RECORDS})
+
+        first, second, third = _rows(db, Alert, data_source, ALERT_FIELDS)
+        assert first["timestamp"] == datetime(2024, 2, 1, 10, 15)
+        assert first["duration"] == 12
+        assert first["client"] == "100"
+        assert first["transaction_code"] == "SE16\tN"
+        assert first["raw_data"]["Amount"] == 1.5
+        assert second["duration"] is None
+        assert second["date"] is None
+        assert second["raw_data"]["Amount"] is None
+        assert third["full_name"] == "Anna \\ Smith"
+        assert third["raw_data"]["Amount"] is None
+
+    def test_soda_reports_match_orm(self, db):
+        """Test that bulk-loaded SoDA rows equal ORM-saved rows field by field."""
+        for report_type in ("AVR", "CRV"):
+            orm_source = _data_source(db, DataSourceType.REPORT)
+            bulk_source = _data_source(db, DataSourceType.REPORT)
+            parse_result = {"metadata": {"report_type": report_type}, "data": SODA_RECORDS}
+
+            DataSaver(db, loader="orm").save_soda_report(orm_source, parse_result)
+            DataSaver(db, loader="bulk").save_soda_report(bulk_source, parse_result)
+
+            assert _rows(db, SoDAReport, bulk_source, SODA_FIELDS) == _rows(db, SoDAReport, orm_source, SODA_FIELDS)
+
+        crv_rows = _rows(db, SoDAReport, bulk_source, SODA_FIELDS)
+        assert [row["violation_type"] for row in crv_rows] == ["Access Issue", "Fraud Indicator", "Access Issue"]
+        assert crv_rows[2]["user_name"] == "first"
+
+
+class TestCopyStream:
+    """Tests for the COPY text-format stream."""
+
+    def test_formats_rows(self):
+        """Test NULLs, escapes and datetimes in COPY text format, read in small pieces."""
+        from app.services.ingestion.bulk_loader import _CopyStream
+
+        rows = [
+            (1, None, "a\tb", datetime(2024, 1, 2, 3, 4, 5)),
+            (2, "", "back\\slash\nnewline", None),
+        ]
+        stream = _CopyStream(rows, chunk_rows=1)
+
+        pieces = []
+        while True:
+            piece = stream.read(5)
+            if not piece:
+                break
+            pieces.append(piece)
+
+        assert "".join(pieces) == (
+            "1\t\\N\ta\\tb\t2024-01-02 03:04:05\n"
+            "2\t\tback\\\\slash\\nnewline\t\\N\n"
+        )
+        assert stream.row_count == 2
+
+
+class TestStreamedSave:
+    """Tests for saving parse_stream() results batch by batch."""
+
+    @pytest.mark.parametrize("loader", ["orm", "bulk"])
+    def test_batches_match_list(self, db, loader):
+        """Test that saving record batches stores the same rows as saving the list."""
+        list_source = _data_source(db, DataSourceType.REPORT)
+        stream_source = _data_source(db, DataSourceType.REPORT)
+        saver = DataSaver(db, loader=loader)
+
+        saved_list = saver.save_soda_report(list_source, {"metadata": {"report_type": "CRV"}, "data": SODA_RECORDS})
+        saved_stream = saver.save_soda_report(stream_source, {
+            "metadata": {"report_type": "CRV"},
+            "batches": iter([SODA_RECORDS[:2], [], SODA_RECORDS[2:]]),
+        })
+
+        assert saved_list == saved_stream == 3
+        assert _rows(db, SoDAReport, stream_source, SODA_FIELDS) == _rows(db, SoDAReport, list_source, SODA_FIELDS)
+        counts = {m.data_source_id: m.result_count for m in db.query(SoDAReportMetadata)}
+        assert counts[stream_source.id] == 3
+
+    def test_record_limit_stops_stream(self, db, monkeypatch):
+        """Test that MAX_RECORDS_PER_FILE cuts a stream and leaves later batches unread."""
+        from app.core.config import settings
+
+        monkeypatch.setattr(settings, "MAX_RECORDS_PER_FILE", 3)
+        read = []
+
+        def batches():
+            for start in range(0, 8, 2):
+                read.append(start)
+                yield [{"Data": None, "User Name (BNAME)": f"U{start + i}"} for i in range(2)]
+
+        data_source = _data_source(db)
+        saved = DataSaver(db, loader="bulk").save_4c_alert(
+            data_source, {"metadata": {}, "batches": batches(), "records_cleaned": True}
+        )
+
+        assert saved == 3
+        assert [row["user_name"] for row in _rows(db, Alert, data_source, ["user_name"])] == ["U0", "U1", "U2"]
+        assert read == [0, 2]
+
+
+class TestFindIngested:
+    """Tests for the content-hash lookup of earlier uploads."""
+
+    def test_latest_completed_original(self, db):
+        """Test that only completed, non-duplicate sources of the same type and hash are found."""
+        saver = DataSaver(db, loader="bulk")
+        sources = [_data_source(db) for _ in range(4)]
+        for data_source, status in zip(sources, ["completed", "completed", "error", "completed"]):
+            data_source.content_sha256 = "a" * 64
+            data_source.status = status
+        sources[3].duplicate_of_id = sources[1].id
+        db.commit()
+
+        assert saver.find_ingested("a" * 64, DataSourceType.ALERT).id == sources[1].id
+        assert saver.find_ingested("a" * 64, DataSourceType.REPORT) is None
+        assert saver.find_ingested("b" * 64, DataSourceType.ALERT) is None
+
+    def test_saved_count(self, db):
+        """Test that saved_count counts the records of the source's type."""
+        saver = DataSaver(db, loader="bulk")
+        alert_source = _data_source(db)
+        report_source = _data_source(db, DataSourceType.REPORT)
+        saver.save_4c_alert(alert_source, {"metadata": {}, "data": ALERT_RECORDS})
+        saver.save_soda_report(report_source, {"metadata": {"report_type": "CRV"}, "data": SODA_RECORDS[:2]})
+
+        assert saver.saved_count(alert_source) == len(ALERT_RECORDS)
+        assert saver.saved_count(report_source) == 2
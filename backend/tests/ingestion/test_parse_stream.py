@@ -0,0 +1,89 @@
+"""
+Unit tests for streaming parses.
+
+parse_stream() must deliver the records of parse() in batches, with a
+preview of the first records, and fill in counts known only at the end.
+"""
+
+import pandas as pd
+
+from app.services.ingestion.base_parser import BaseParser
+from app.services.ingestion.csv_parser import CSVParser
+from app.services.ingestion.excel_parser_4c import ExcelParser4C
+from app.services.ingestion.excel_parser_soda import ExcelParserSoDA
+from app.services.ingestion.parser_factory import ParserFactory
+
+
+def write_workbook(path, sheets):
+    with pd.ExcelWriter(path) as writer:
+        for name, frame in sheets.items():
+            frame.to_excel(writer, sheet_name=name, index=False)
+    return str(path)
+
+
+def flatten(batches):
+    return [record for batch in batches for record in batch]
+
+
+class TestParseStream:
+    """Tests for parse_stream()."""
+
+    def test_csv_batches(self, tmp_path):
+        """Test that CSV batches equal parse() records and the row count is set once consumed."""
+        path = tmp_path / "upload.csv"
+        lines = ["user,amount,note"] + [f"U{i},{i}.5,{'x' if i % 3 else ''}" for i in range(7)]
+        path.write_text("\n".join(lines) + "\n", encoding="cp1252")
+
+        parser = CSVParser()
+        result = parser.parse_stream(str(path), batch_size=3, preview_rows=2)
+
+        assert result["errors"] == []
+        assert result["metadata"]["columns"] == ["user", "amount", "note"]
+        assert result["metadata"]["row_count"] is None
+        assert result["preview"] == parser.parse(str(path))["data"][:2]
+
+        batches = list(result["batches"])
+        assert [len(batch) for batch in batches] == [3, 3, 1]
+        assert flatten(batches) == parser.parse(str(path))["data"]
+        assert result["metadata"]["row_count"] == 7
+
+    def test_workbook_batches(self, tmp_path):
+        """Test that 4C and SoDA batches equal parse() records."""
+        alert = write_workbook(tmp_path / "Summary_Logons_SLG_200025_001372.xlsx", {
+            "Data": pd.DataFrame({"User": [f"U{i}" for i in range(5)], "Amount": [1.5, None, 3, 4, 5]}),
+        })
+        soda = write_workbook(tmp_path / "AVR_review.xlsx", {
+            "Result 1": pd.DataFrame({"A": ["User", "JDOE", "ASMITH"]}),
+            "Result 2": pd.DataFrame({"A": ["User", "BKING"]}),
+        })
+
+        for parser, path in ((ExcelParser4C(), alert), (ExcelParserSoDA(), soda)):
+            with ParserFactory.probe(path) as probe:
+                result = ParserFactory.stream_file(parser, path, batch_size=2, preview_rows=1, probe=probe)
+            expected = parser.parse(path)
+
+            assert "data" not in result
+            assert result["metadata"] == expected["metadata"]
+            assert result["preview"] == expected["data"][:1]
+            assert flatten(result["batches"]) == expected["data"]
+
+    def test_default_parse_stream(self):
+        """Test that the default parse_stream slices record lists and keeps other data (PDF text)."""
+
+        class StaticParser(BaseParser):
+            def __init__(self, data):
+                self.data = data
+
+            def can_parse(self, file_path):
+                return True
+
+            def parse(self, file_path):
+                return {"metadata": {}, "data": self.data, "errors": []}
+
+        result = StaticParser([{"n": i} for i in range(5)]).parse_stream("file", batch_size=2, preview_rows=3)
+        assert result["preview"] == [{"n": 0}, {"n": 1}]
+        assert [len(batch) for batch in result["batches"]] == [2, 2, 1]
+
+        result = StaticParser({"text": "page 1"}).parse_stream("file.pdf")
+        assert result["data"] == {"text": "page 1"}
+        assert "batches" not in result
@@ -0,0 +1,128 @@
+"""
+Unit tests for PDF page extraction.
+
+Pages extracted across worker processes or served from the per-page
+cache must give exactly what the single in-process loop over
+pdfplumber pages gives.
+"""
+
+import pdfplumber
+import pytest
+
+from app.core.config import settings
+from app.services.ingestion import pdf_parser
+from app.services.ingestion.pdf_page_cache import PDFPageCache
+from app.services.ingestion.pdf_parser import PDFParser
+
+
+def write_pdf(path, page_count):
+    """Minimal PDF: a text line and a ruled 2x2 table per page."""
+    objects = ["<< /Type /Catalog /Pages 2 0 R >>", None, "<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>"]
+    kids = []
+    for i in range(page_count):
+        cells = "".join(
+            f"BT /F1 10 Tf {72 + col * 100 + 5} {600 - row * 20 + 5} Td (r{row}c{col}p{i}) Tj ET\n"
+            for row in range(2) for col in range(2)
+        )
+        stream = (
+            f"BT /F1 12 Tf 72 720 Td (Page {i + 1} of the SoDA report) Tj ET\n"
+            "0.5 w 72 580 200 40 re S 172 580 m 172 620 l S 72 600 m 272 600 l S\n" + cells
+        )
+        objects.append(f"<< /Length {len(stream)} >>\nstream\n{stream}endstream")
+        objects.append(
+            f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] "
+            f"/Resources << /Font << /F1 3 0 R >> >> /Contents {len(objects)} 0 R >>"
+        )
+        kids.append(f"{len(objects)} 0 R")
+    objects[1] = f"<< /Type /Pages /Kids [{' '.join(kids)}] /Count {page_count} >>"
+
+    body, offsets = b"%PDF-1.4\n", []
+    for number, obj in enumerate(objects, start=1):
+        offsets.append(len(body))
+        body += f"{number} 0 obj\n{obj}\nendobj\n".encode("latin-1")
+    xref = len(body)
+    body += f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n".encode()
+    body += "".join(f"{offset:010d} 00000 n \n" for offset in offsets).encode()
+    body += f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\nstartxref\n{xref}\n%%EOF\n".encode()
+    path.write_bytes(body)
+    return str(path)
+
+
+def serial_data(path):
+    """What the single page loop extracts."""
+    full_text, tables = [], []
+    with pdfplumber.open(path) as pdf:
+        for page in pdf.pages:
+            text = page.extract_text()
+            if text:
+                full_text.append(text)
+            tables.extend(page.extract_tables())
+    return {"text": "\n\n".join(full_text), "tables": tables}
+
+
+@pytest.fixture(autouse=True)
+def no_shared_cache(monkeypatch):
+    monkeypatch.setattr(settings, "PDF_PAGE_CACHE_ENABLED", False)
+    monkeypatch.setattr(pdf_parser, "_page_cache_instance", None)
+
+
+class TestPDFParser:
+    """Tests for PDFParser."""
+
+    def test_parallel_matches_serial(self, tmp_path):
+        """Test that extraction across processes merges pages in page order."""
+        path = write_pdf(tmp_path / "report.pdf", 9)
+
+        parallel = PDFParser(max_workers=2, parallel_min_pages=2).parse(path)
+        serial = PDFParser(max_workers=1).parse(path)
+
+        assert parallel["errors"] == []
+        assert parallel == serial
+        assert parallel["data"] == serial_data(path)
+        assert parallel["metadata"]["page_count"] == 9
+
+    def test_cached_pages_skip_extraction(self, tmp_path, monkeypatch):
+        """Test that a re-upload is served from the cache and only missing pages are extracted."""
+        path = write_pdf(tmp_path / "report.pdf", 4)
+        cache = PDFPageCache(str(tmp_path / "cache"))
+        parser = PDFParser(max_workers=1, page_cache=cache)
+        first = parser.parse(path)
+
+        extracted = []
+        original = pdf_parser._extract_page
+        monkeypatch.setattr(pdf_parser, "_extract_page", lambda page: extracted.append(page.page_number) or original(page))
+
+        # Same content under another name, as for a re-upload
+        copy = tmp_path / "reupload.pdf"
+        copy.write_bytes((tmp_path / "report.pdf").read_bytes())
+        assert parser.parse(str(copy)) == first
+        assert extracted == []
+
+        (tmp_path / "cache" / cache.key_for(path)[:2] / cache.key_for(path) / "2.page").write_bytes(b"garbage")
+        assert parser.parse(path) == first
+        assert extracted == [3]
+        assert first["data"] == serial_data(path)
+
+
+class TestPDFPageCache:
+    """Tests for PDFPageCache."""
+
+    def test_round_trip_and_eviction(self, tmp_path):
+        """Test that pages round-trip per (file, page) and the least recently used go first."""
+        cache = PDFPageCache(str(tmp_path), max_bytes=10 ** 6)
+        page = ("Page 1\nUser SAP_ALL", [[["User", "Role"], ["JDOE", None]]])
+        cache.put("ab" * 32, 0, page)
+
+        assert cache.get("ab" * 32, 0) == page
+        assert cache.get("ab" * 32, 1) is None
+        assert cache.get("cd" * 32, 0) is None
+        assert cache.get_many("ab" * 32, range(3)) == {0: page}
+
+        entry_size = cache.stats()["size_bytes"]
+        cache.max_bytes = entry_size * 2
+        cache.put("cd" * 32, 0, page)
+        cache.put("ef" * 32, 0, page)
+
+        assert cache.get("ab" * 32, 0) is None
+        assert cache.get("ef" * 32, 0) == page
+        assert cache.stats()["size_bytes"] <= cache.max_bytes
@@ -0,0 +1,123 @@
+"""
+Unit tests for raw SAP field queries.
+
+Filters and aggregates run in SQL against SQLite here (JSON path
+comparisons); the PostgreSQL form is checked by compiling it, since it
+must be a JSONB containment predicate the GIN index can serve.
+"""
+
+import pytest
+from sqlalchemy import create_engine, event
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.orm import sessionmaker
+
+from app.core.database import Base
+import app.models  # noqa: F401  (registers all tables)
+from app.models.alert import Alert
+from app.models.data_source import DataSource, DataSourceType, FileFormat
+from app.services.ingestion.raw_field_query import RawFieldQuery, technical_name
+
+
+@pytest.fixture
+def db(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'raw_fields.sqlite3'}")
+    Base.metadata.create_all(engine)
+    session = sessionmaker(bind=engine)()
+    yield session
+    session.close()
+    engine.dispose()
+
+
+def _upload(db, raw_rows):
+    data_source = DataSource(
+        filename="upload.xlsx",
+        original_filename="upload.xlsx",
+        file_format=FileFormat.XLSX,
+        data_type=DataSourceType.ALERT,
+        file_path="/tmp/upload.xlsx",
+    )
+    db.add(data_source)
+    db.flush()
+    db.add_all([Alert(data_source_id=data_source.id, raw_data=raw) for raw in raw_rows])
+    db.commit()
+    return data_source
+
+
+@pytest.fixture
+def uploads(db):
+    # 4C export headers carry the technical name in brackets; values arrive as text or numbers
+    first = _upload(db, [
+        {"Vendor (LIFNR)": "100200", "Company Code (BUKRS)": "1000", "Amount (WRBTR)": 10.5},
+        {"Vendor (LIFNR)": 100300, "Company Code (BUKRS)": "1000", "Amount (WRBTR)": "n/a"},
+        {"Vendor (LIFNR)": 100200, "Company Code (BUKRS)": "2000", "Amount (WRBTR)": 4},
+    ])
+    second = _upload(db, [
+        {"LIFNR": "100200", "BUKRS": "1000", "WRBTR": 1.5},
+    ])
+    return first, second
+
+
+class TestRawFieldQuery:
+    """Tests for RawFieldQuery."""
+
+    def test_resolve_fields(self, db, uploads):
+        """Test that fields resolve by header or technical name across uploads."""
+        query = RawFieldQuery(db, Alert)
+
+        assert query.resolve("lifnr") == ["Vendor (LIFNR)", "LIFNR"]
+        assert query.resolve("Company Code (BUKRS)") == ["Company Code (BUKRS)", "BUKRS"]
+        assert query.resolve("MATNR") == []
+        assert RawFieldQuery(db, Alert, data_source_ids=[uploads[1].id]).resolve("LIFNR") == ["LIFNR"]
+        assert technical_name("Vendor (LIFNR) ") == "LIFNR"
+
+    def test_field_keys_single_query(self, db, uploads):
+        """Test that the keys of every upload are read with one statement, however many uploads exist."""
+        for _ in range(5):
+            _upload(db, [{"MATNR": "M1"}])
+        statements = []
+
+        def record(conn, cursor, statement, *args):
+            statements.append(statement)
+
+        event.listen(db.get_bind(), "before_cursor_execute", record)
+        keys = RawFieldQuery(db, Alert).field_keys()
+        event.remove(db.get_bind(), "before_cursor_execute", record)
+
+        assert len(statements) == 1
+        assert keys[uploads[0].id] == ["Vendor (LIFNR)", "Company Code (BUKRS)", "Amount (WRBTR)"]
+        assert len(keys) == 7
+
+    def test_filter(self, db, uploads):
+        """Test that filters match text and numeric values, AND across fields and OR across values."""
+        query = RawFieldQuery(db, Alert)
+
+        rows = query.filter({"LIFNR": ["100200"]}).all()
+        assert [row.raw_data.get("Amount (WRBTR)", row.raw_data.get("WRBTR")) for row in rows] == [10.5, 4, 1.5]
+        assert query.count({"LIFNR": ["100200"], "BUKRS": ["1000"]}) == 2
+        assert query.count({"LIFNR": ["100200", "100300"]}) == 4
+        assert query.count({"MATNR": ["1"]}) == 0
+        assert query.count() == 4
+
+        scoped = RawFieldQuery(db, Alert, data_source_ids=[uploads[0].id])
+        assert scoped.count({"LIFNR": ["100200"]}) == 2
+
+    def test_aggregate(self, db, uploads):
+        """Test that groups count records and sum only numeric values."""
+        groups = RawFieldQuery(db, Alert).aggregate("BUKRS", sum_field="WRBTR")
+
+        assert [(group.value, group.count, group.total) for group in groups] == [
+            ("1000", 3, 12.0),
+            ("2000", 1, 4.0),
+        ]
+        filtered = RawFieldQuery(db, Alert).aggregate("BUKRS", filters={"LIFNR": ["100300"]})
+        assert [(group.value, group.count, group.total) for group in filtered] == [("1000", 1, None)]
+        assert RawFieldQuery(db, Alert).aggregate("MATNR") == []
+
+    def test_postgresql_containment(self, db, uploads, monkeypatch):
+        """Test that PostgreSQL filters compile to JSONB containment for text and number forms."""
+        monkeypatch.setattr(RawFieldQuery, "is_postgresql", property(lambda self: True))
+        query = RawFieldQuery(db, Alert, data_source_ids=[uploads[0].id])
+
+        compiled = query._predicate({"LIFNR": ["100200"]}).compile(dialect=postgresql.dialect())
+        assert str(compiled).count("alerts.raw_data @>") == 2
+        assert sorted(map(str, compiled.params.values())) == ["{'Vendor (LIFNR)': '100200'}", "{'Vendor (LIFNR)': 100200}"]
@@ -0,0 +1,90 @@
+"""
+Unit tests for column-wise record cleaning.
+
+dataframe_to_records must return exactly what cleaning every value of
+df.where(pd.notna(df), None).to_dict('records') returns.
+"""
+
+import datetime
+import decimal
+import json
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from app.services.ingestion.csv_parser import CSVParser
+from app.services.ingestion.record_cleaner import clean_json_value, dataframe_to_records
+
+
+def per_value_records(df):
+    records = df.where(pd.notna(df), None).to_dict('records')
+    return [{k: clean_json_value(v) for k, v in record.items()} for record in records]
+
+
+@pytest.fixture
+def mixed_frame():
+    return pd.DataFrame({
+        "float": [1.5, np.nan, np.inf, -np.inf, 1.5e308],
+        "int": [1, 2, 3, 4, 5],
+        "bool": [True, False, True, False, True],
+        "text": ["a", None, "c", "d", "e"],
+        "object": [np.int64(3), decimal.Decimal("1.1"), {"x": np.nan}, [1, np.float64("nan")], datetime.date(2024, 1, 1)],
+        "mixed": [1, "x", 2.5, float("inf"), None],
+        "datetime": pd.to_datetime(["2024-01-01", None, "2024-01-02 03:04:05", "2024-01-01", "2024-01-01"], format="mixed"),
+        "category": pd.Categorical(["a", "b", None, "a", "b"]),
+        "nullable_int": pd.array([1, None, 3, 4, 5], dtype="Int64"),
+        "nullable_float": pd.array([1.5, None, 3, 4, 5], dtype="Float64"),
+        "string": pd.array(["a", None, "c", "d", "e"], dtype="string"),
+        "float32": np.array([0.1, np.nan, 1, 2, 3], dtype="float32"),
+        7: ["k", None, "x", "y", "z"],
+    })
+
+
+class TestDataFrameToRecords:
+    """Tests for dataframe_to_records."""
+
+    def test_matches_per_value_cleaning(self, mixed_frame):
+        """Test that column-wise cleaning equals the per-value rule for every dtype."""
+        records = dataframe_to_records(mixed_frame)
+        expected = per_value_records(mixed_frame)
+
+        assert records == expected
+        assert json.dumps(records) == json.dumps(expected)
+
+    def test_values_are_json_safe(self, mixed_frame):
+        """Test that NaN/Infinity become None and numpy scalars become Python values."""
+        first, second, third, fourth, fifth = dataframe_to_records(mixed_frame)
+
+        assert second["float"] is None and third["float"] is None and fifth["float"] is None
+        assert type(first["int"]) is int
+        assert first["object"] == 3 and type(first["object"]) is int
+        assert second["object"] == "1.1"
+        assert third["object"] == {"x": None}
+        assert fourth["mixed"] is None
+        assert second["nullable_int"] is None
+        assert first["datetime"] == "2024-01-01 00:00:00"
+
+    @pytest.mark.filterwarnings("ignore:DataFrame columns are not unique")
+    def test_duplicate_and_empty_columns(self):
+        """Test that duplicate column names keep the last value, like to_dict."""
+        df = pd.DataFrame([[1, 2.5], [3, np.nan]], columns=["a", "a"])
+        assert dataframe_to_records(df) == per_value_records(df)
+        assert dataframe_to_records(pd.DataFrame(index=range(2))) == [{}, {}]
+
+
+class TestParsersCleanRecords:
+    """Tests that parsers hand DataSaver already-clean records."""
+
+    def test_csv_parser(self, tmp_path):
+        """Test that CSV records are cleaned and flagged as such."""
+        path = tmp_path / "upload.csv"
+        path.write_text("user,amount,note\nJDOE,1.5,\nASMITH,,x\n", encoding="utf-8")
+
+        result = CSVParser().parse(str(path))
+
+        assert result["records_cleaned"] is True
+        assert result["data"] == [
+            {"user": "JDOE", "amount": 1.5, "note": None},
+            {"user": "ASMITH", "amount": None, "note": "x"},
+        ]
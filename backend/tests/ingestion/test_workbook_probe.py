@@ -0,0 +1,120 @@
+"""
+Unit tests for the shared workbook probe.
+
+Detection and parsing of one upload must open the workbook exactly once,
+and parsing through a probe must return what a parser opening the file
+itself returns.
+"""
+
+import openpyxl
+import pandas as pd
+import pytest
+
+from app.services.ingestion.excel_parser_4c import ExcelParser4C
+from app.services.ingestion.excel_parser_soda import ExcelParserSoDA
+from app.services.ingestion.parser_factory import ParserFactory
+from app.services.ingestion.workbook_probe import WorkbookProbe
+
+
+def write_workbook(path, sheets):
+    with pd.ExcelWriter(path) as writer:
+        for name, frame in sheets.items():
+            frame.to_excel(writer, sheet_name=name, index=False)
+    return str(path)
+
+
+@pytest.fixture
+def alert_workbook(tmp_path):
+    return write_workbook(tmp_path / "Summary_Vendor_Payments_SLG_200025_001372.xlsx", {
+        "Alert Parameters": pd.DataFrame({"Layer": ["L1"], "Field": ["BUKRS"], "Description": ["Company"]}),
+        "Data": pd.DataFrame({"Vendor": ["V1", "V2"], "Amount": [10.5, 20.0]}),
+    })
+
+
+@pytest.fixture
+def soda_workbook(tmp_path):
+    return write_workbook(tmp_path / "Quarterly_review.xlsx", {
+        "Parameters": pd.DataFrame({"Key": ["System"], "Value": ["PRD"]}),
+        "KPIs": pd.DataFrame({"Metric": ["Users"], "Value": [12], "Unit": ["count"]}),
+        "Result 1": pd.DataFrame({"A": ["User", "JDOE"], "B": ["Role", "SAP_ALL"]}),
+    })
+
+
+@pytest.fixture
+def workbook_opens(monkeypatch):
+    """Count how often openpyxl loads a workbook"""
+    opened = []
+    load_workbook = openpyxl.load_workbook
+
+    def counting(*args, **kwargs):
+        opened.append(args)
+        return load_workbook(*args, **kwargs)
+
+    monkeypatch.setattr(openpyxl, "load_workbook", counting)
+    return opened
+
+
+class TestWorkbookProbe:
+    """Tests for WorkbookProbe."""
+
+    def test_detect_and_parse_open_once(self, alert_workbook, soda_workbook, workbook_opens):
+        """Test that factory detection plus parsing opens each workbook once."""
+        for path, expected in ((alert_workbook, ExcelParser4C), (soda_workbook, ExcelParserSoDA)):
+            workbook_opens.clear()
+            with ParserFactory.probe(path) as probe:
+                assert ParserFactory.can_parse_file(path, probe=probe)
+                parser = ParserFactory.get_parser(path, probe=probe)
+                result = ParserFactory.parse_file(parser, path, probe=probe)
+
+            assert isinstance(parser, expected)
+            assert result["errors"] == []
+            assert len(workbook_opens) == 1
+
+    def test_probe_matches_standalone_parse(self, alert_workbook, soda_workbook):
+        """Test that parsing through a shared probe gives the same result."""
+        for parser, path in ((ExcelParser4C(), alert_workbook), (ExcelParserSoDA(), soda_workbook)):
+            with WorkbookProbe(path) as probe:
+                assert parser.parse(path, probe=probe) == parser.parse(path)
+
+    def test_head_and_unreadable_file(self, alert_workbook, tmp_path, workbook_opens):
+        """Test that previews are cached and open errors are remembered."""
+        with WorkbookProbe(alert_workbook) as probe:
+            head = probe.head("Data", rows=1)
+            assert head.iloc[0].tolist() == ["Vendor", "Amount"]
+            assert probe.head("Data", rows=1) is head
+        assert len(workbook_opens) == 1
+
+        broken = tmp_path / "Summary_SLG_200025_001372.xlsx"
+        broken.write_bytes(b"not a workbook")
+        probe = WorkbookProbe(str(broken))
+        assert not probe.has_sheet("Data")
+        with pytest.raises(Exception):
+            probe.sheet_names
+        # The 4C filename pattern is still accepted when the file cannot be read
+        assert ExcelParser4C().can_parse(str(broken), probe=probe)
+        assert not ExcelParserSoDA().can_parse(str(broken), probe=probe)
+
+    def test_parsers_close_only_their_own_probes(self, alert_workbook, soda_workbook, monkeypatch):
+        """Test that a probe a parser opens itself is closed, and a passed-in probe is left open."""
+        closed = []
+        close = WorkbookProbe.close
+
+        def recording(probe):
+            closed.append(probe)
+            close(probe)
+
+        monkeypatch.setattr(WorkbookProbe, "close", recording)
+        for parser, path in ((ExcelParser4C(), alert_workbook), (ExcelParserSoDA(), soda_workbook)):
+            closed.clear()
+            assert parser.can_parse(path)
+            parser.parse(path)
+            assert len(closed) == 2
+            assert all(probe._excel_file is None for probe in closed)
+
+            closed.clear()
+            probe = WorkbookProbe(path)
+            assert parser.can_parse(path, probe=probe)
+            parser.parse(path, probe=probe)
+            assert closed == []
+            assert probe._excel_file is not None
+            probe.close()
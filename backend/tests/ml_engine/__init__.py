@@ -0,0 +1 @@
+# ML engine tests package
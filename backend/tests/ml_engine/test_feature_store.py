@@ -0,0 +1,114 @@
+"""
+Unit tests for the materialized money loss features.
+
+Findings are saved to SQLite through the Analyzer and directly, then
+read back the way training and inference do.
+"""
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.core.database import Base
+import app.models  # noqa: F401  (registers all tables)
+from app.models.alert import Alert, AlertMetadata
+from app.models.data_source import DataSource, DataSourceType, FileFormat
+from app.models.finding import Finding
+from app.models.finding_feature import FindingFeature
+from app.models.focus_area import FocusArea
+from app.models.issue_type import IssueType
+from app.models.money_loss import MoneyLossCalculation
+from app.models.risk_assessment import RiskAssessment
+from app.services.analysis.analyzer import Analyzer
+from app.services.ml_engine.feature_store import FeatureStore, feature_vector, stable_code, stored_vectors
+
+
+@pytest.fixture
+def engine(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'features.sqlite3'}")
+    Base.metadata.create_all(engine)
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def db(engine):
+    session = sessionmaker(bind=engine)()
+    focus_area = FocusArea(code="ACCESS_GOVERNANCE", name="Access Governance")
+    session.add(focus_area)
+    session.flush()
+    session.add(IssueType(
+        focus_area_id=focus_area.id, code="SOD_VIOLATION", name="SoD Violation", default_severity="High"
+    ))
+    data_source = DataSource(
+        filename="sod.xlsx", original_filename="sod.xlsx", file_format=FileFormat.XLSX,
+        data_type=DataSourceType.ALERT, file_path="/tmp/sod.xlsx",
+    )
+    session.add(data_source)
+    session.flush()
+    session.add(AlertMetadata(data_source_id=data_source.id, alert_name="SoD Violation Users"))
+    session.add_all([Alert(data_source_id=data_source.id, user_name=f"USER{i}") for i in range(3)])
+    session.commit()
+    yield session
+    session.close()
+
+
+class TestFeatureStore:
+    """Tests for FeatureStore and the stable feature encoding."""
+
+    def test_encoding_is_stable(self):
+        """Test that category codes do not depend on the process (hash() randomization)."""
+        assert stable_code("SOD_VIOLATION", 1000) == 103
+        assert feature_vector("HIGH", 70, "SOD_VIOLATION", 0.8, "ACCESS_GOVERNANCE") == \
+            feature_vector("High", 70, "SOD_VIOLATION", 0.8, "ACCESS_GOVERNANCE")
+
+    def test_analysis_materializes_features(self, db):
+        """Test that analyzed findings are saved with their features and read back for training."""
+        run = Analyzer(db, finding_mode="per_row").analyze_data_source(1)
+
+        X, y = FeatureStore(db).training_matrix()
+
+        assert run.total_findings == 3
+        assert db.query(FindingFeature).count() == 3
+        assert X.shape == (3, 5)
+        assert list(y) == [f.money_loss_calculation.estimated_loss for f in db.query(Finding).order_by(Finding.id)]
+        finding = db.query(Finding).first()
+        assert list(X[0]) == feature_vector(
+            "High", finding.risk_assessment.risk_score, "SOD_VIOLATION",
+            finding.classification_confidence, "ACCESS_GOVERNANCE"
+        )
+
+    def test_aggregated_findings_train_on_per_alert_loss(self, db):
+        """Test that an aggregated finding's training target is its per-alert estimate, not the group total."""
+        db.add_all([Alert(data_source_id=1, user_name="USER0") for _ in range(2)])
+        db.commit()
+        Analyzer(db, finding_mode="aggregated", group_by="user_name").analyze_data_source(1)
+
+        X, y = FeatureStore(db).training_matrix()
+
+        calculations = [f.money_loss_calculation for f in db.query(Finding).order_by(Finding.id)]
+        assert X.shape == (3, 5)
+        assert list(y) == [c.calculation_details["per_alert_estimate"] for c in calculations]
+        assert [c.calculation_details["alert_count"] for c in calculations] == [3, 1, 1]
+        assert y[0] > 0
+        assert calculations[0].estimated_loss == pytest.approx(y[0] * 3)
+
+    def test_backfill_and_stored_vectors(self, db, engine):
+        """Test that findings saved without features are backfilled and their vectors reused."""
+        finding = Finding(data_source_id=1, focus_area_id=1, issue_type_id=1, title="Old finding", severity="Low")
+        finding.risk_assessment = RiskAssessment(risk_score=40, risk_level="Low")
+        finding.money_loss_calculation = MoneyLossCalculation(estimated_loss=1200.0)
+        db.add(finding)
+        db.commit()
+
+        store = FeatureStore(db)
+        assert store.backfill() == 1
+        assert store.backfill() == 0
+        db.commit()
+
+        other = sessionmaker(bind=engine)()
+        try:
+            loaded = other.get(Finding, finding.id)
+            assert stored_vectors([loaded]) == [feature_vector("Low", 40, "SOD_VIOLATION", None, "ACCESS_GOVERNANCE")]
+        finally:
+            other.close()
@@ -0,0 +1,71 @@
+"""
+Unit tests for the process-wide model registry.
+
+Models are small RandomForestRegressors published to a temporary
+directory; each test uses its own registry instance.
+"""
+
+import os
+import pickle
+
+import numpy as np
+import pytest
+from sklearn.ensemble import RandomForestRegressor
+
+from app.services.ml_engine.model_registry import MONEY_LOSS_MODEL, ModelRegistry
+from app.services.ml_engine.money_loss_ml import MoneyLossML
+
+X = np.random.default_rng(0).uniform(0, 100, size=(40, 5))
+
+
+def _model(scale):
+    return RandomForestRegressor(n_estimators=3, random_state=0).fit(X, X[:, 1] * scale)
+
+
+class TestModelRegistry:
+    """Tests for ModelRegistry."""
+
+    def test_loads_each_version_once(self, tmp_path):
+        """Test that a published model is loaded once, memory-mapped, and predicts like the original."""
+        model = _model(10)
+        registry = ModelRegistry(str(tmp_path))
+        registry.publish(MONEY_LOSS_MODEL, model, "v1")
+
+        first = registry.get(MONEY_LOSS_MODEL)
+        second = registry.get(MONEY_LOSS_MODEL)
+
+        assert first is second
+        assert registry.loads == 1
+        assert registry.current().version == "v1"
+        assert np.allclose(first.predict(X[:5]), model.predict(X[:5]))
+
+    def test_new_version_replaces_loaded_model(self, tmp_path):
+        """Test that a version published by another registry (another process) is picked up."""
+        reader = ModelRegistry(str(tmp_path))
+        writer = ModelRegistry(str(tmp_path), keep_versions=2)
+        writer.publish(MONEY_LOSS_MODEL, _model(10), "v1")
+        ml = MoneyLossML(registry=reader)
+        before = ml.model.predict(X[:1])[0]
+
+        writer.publish(MONEY_LOSS_MODEL, _model(1000), "v2")
+        writer.publish(MONEY_LOSS_MODEL, _model(1000), "v3")
+
+        assert reader.current().version == "v3"
+        assert ml.model.predict(X[:1])[0] == pytest.approx(before * 100, rel=0.01)
+        assert reader.versions() == ["v3", "v2"]
+
+    def test_legacy_pickle_until_first_publish(self, tmp_path):
+        """Test that money_loss_model.pkl is served while no version has been published."""
+        (tmp_path / "money_loss_model.pkl").write_bytes(pickle.dumps(_model(10)))
+        registry = ModelRegistry(str(tmp_path))
+
+        assert registry.current().version == "legacy"
+        registry.publish(MONEY_LOSS_MODEL, _model(10), "v1")
+        assert registry.current().version == "v1"
+
+    def test_no_model(self, tmp_path):
+        """Test that an empty model directory yields no model."""
+        registry = ModelRegistry(str(tmp_path / "missing"))
+
+        assert registry.get() is None
+        assert not os.path.exists(tmp_path / "missing")
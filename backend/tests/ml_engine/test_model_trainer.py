@@ -0,0 +1,167 @@
+"""
+Unit tests for model training: full fits, incremental refreshes and the
+background training job.
+
+Findings with risk and money loss rows are saved to SQLite; models are
+published to a registry in a temporary directory.
+"""
+
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import sessionmaker
+
+from app.core.database import Base
+import app.models  # noqa: F401  (registers all tables)
+from app.models.data_source import DataSource, DataSourceType, FileFormat
+from app.models.finding import Finding
+from app.models.focus_area import FocusArea
+from app.models.model_version import ModelVersion
+from app.models.money_loss import MoneyLossCalculation
+from app.models.risk_assessment import RiskAssessment
+from app.services.ml_engine.model_registry import ModelRegistry
+from app.services.ml_engine.model_trainer import ModelTrainer
+from app.services.ml_engine.training_job import TrainingInProgressError, TrainingJob
+
+
+@pytest.fixture
+def engine(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'training.sqlite3'}")
+    Base.metadata.create_all(engine)
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def db(engine):
+    session = sessionmaker(bind=engine)()
+    session.add(FocusArea(code="BUSINESS_PROTECTION", name="Business Protection"))
+    session.add(DataSource(
+        filename="vendors.xlsx", original_filename="vendors.xlsx", file_format=FileFormat.XLSX,
+        data_type=DataSourceType.ALERT, file_path="/tmp/vendors.xlsx",
+    ))
+    session.commit()
+    yield session
+    session.close()
+
+
+@pytest.fixture
+def registry(tmp_path):
+    return ModelRegistry(str(tmp_path / "models"))
+
+
+def _add_findings(db, count):
+    for i in range(count):
+        risk_score = 10 + (i * 7) % 90
+        finding = Finding(
+            data_source_id=1, focus_area_id=1, title=f"Finding {i}",
+            severity=["Critical", "High", "Medium", "Low"][i % 4], classification_confidence=0.7,
+        )
+        finding.risk_assessment = RiskAssessment(risk_score=risk_score, risk_level="Medium")
+        finding.money_loss_calculation = MoneyLossCalculation(estimated_loss=risk_score * 1000.0)
+        db.add(finding)
+    db.commit()
+
+
+class TestModelTrainer:
+    """Tests for ModelTrainer full and incremental training."""
+
+    def test_full_then_incremental_refresh(self, db, registry):
+        """Test that a refresh adds trees fit only on new findings and each run is recorded."""
+        _add_findings(db, 30)
+        trainer = ModelTrainer(db, registry=registry)
+
+        full = trainer.train(model_version="v1")
+        assert full["mode"] == "full"
+        assert full["training_samples"] == 24
+        assert full["n_estimators"] == 100
+
+        _add_findings(db, 15)
+        refresh = trainer.train(model_version="v2", incremental=True)
+        assert refresh["mode"] == "incremental"
+        assert refresh["base_version"] == "v1"
+        assert refresh["training_samples"] == 12
+        assert refresh["n_estimators"] == 120
+        assert registry.current().version == "v2"
+
+        versions = {v.version: v for v in db.query(ModelVersion)}
+        assert versions["v1"].last_finding_id == 30
+        assert versions["v2"].last_finding_id == 45
+        assert versions["v2"].model_size_bytes > versions["v1"].model_size_bytes > 0
+        assert versions["v2"].training_seconds > 0
+
+    def test_refresh_without_new_findings_is_skipped(self, db, registry):
+        """Test that an incremental run with no new findings records a skipped version."""
+        _add_findings(db, 20)
+        trainer = ModelTrainer(db, registry=registry)
+        trainer.train(model_version="v1")
+
+        result = trainer.train(model_version="v2", incremental=True)
+
+        assert result["success"] is False
+        assert db.query(ModelVersion).filter_by(version="v2").one().status == "skipped"
+        assert registry.current().version == "v1"
+
+
+class TestTrainingJob:
+    """Tests for TrainingJob."""
+
+    def test_trains_in_background(self, db, engine, registry):
+        """Test that start() returns a queued version that a background thread completes."""
+        _add_findings(db, 20)
+        job = TrainingJob(sessionmaker(bind=engine), registry=registry)
+
+        record = job.start(db, incremental=True)
+        assert record.status == "queued"
+        assert job.wait(timeout=60)
+
+        db.expire_all()
+        record = db.get(ModelVersion, record.id)
+        assert record.status == "completed"
+        assert record.mode == "full"  # no earlier version to refresh
+        assert registry.current().version == record.version
+
+    def test_one_run_at_a_time(self, db, engine, registry):
+        """Test that a queued run blocks another start."""
+        db.add(ModelVersion(name="money_loss_model", version="pending", status="queued"))
+        db.commit()
+        job = TrainingJob(sessionmaker(bind=engine), registry=registry)
+
+        with pytest.raises(TrainingInProgressError):
+            job.start(db)
+
+    def test_claim_is_exclusive_across_jobs(self, db, engine, registry):
+        """Test that the database, not a process lock, lets only one of two jobs claim a run."""
+        first = TrainingJob(sessionmaker(bind=engine), registry=registry)
+        second = TrainingJob(sessionmaker(bind=engine), registry=registry)
+        other_db = sessionmaker(bind=engine)()
+
+        record = first.claim(db)
+        with pytest.raises(TrainingInProgressError, match=record.version):
+            second.claim(other_db)
+
+        # Even an insert that skipped every check is refused by the index
+        other_db.add(ModelVersion(name="money_loss_model", version="racer", status="running"))
+        with pytest.raises(IntegrityError):
+            other_db.commit()
+        other_db.rollback()
+        other_db.close()
+        assert db.query(ModelVersion).filter(ModelVersion.status.in_(("queued", "running"))).count() == 1
+
+    def test_stale_run_is_abandoned(self, db, engine, registry):
+        """Test that a run left queued past ML_TRAINING_STALE_MINUTES is failed and no longer blocks."""
+        stale = ModelVersion(
+            name="money_loss_model", version="crashed", status="running",
+            created_at=datetime.utcnow() - timedelta(days=1)
+        )
+        db.add(stale)
+        db.commit()
+        job = TrainingJob(sessionmaker(bind=engine), registry=registry)
+
+        record = job.claim(db)
+        db.refresh(stale)
+        assert record.status == "queued"
+        assert stale.status == "failed"
+        assert stale.message.startswith("Abandoned")
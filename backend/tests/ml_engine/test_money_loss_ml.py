@@ -0,0 +1,84 @@
+"""
+Unit tests for batched money loss inference.
+
+Findings are built in memory (not persisted); the model is a small
+RandomForestRegressor pickled to a temporary path.
+"""
+
+import pickle
+
+import numpy as np
+import pytest
+from sklearn.ensemble import RandomForestRegressor
+
+from app.models.finding import Finding
+from app.models.focus_area import FocusArea
+from app.models.issue_type import IssueType
+from app.models.risk_assessment import RiskAssessment
+from app.services.hybrid_engine import HybridMoneyLossEngine
+from app.services.ml_engine.money_loss_ml import MoneyLossML
+
+
+class CountingForest(RandomForestRegressor):
+    """RandomForestRegressor that counts predict() calls"""
+
+    predict_calls = 0
+
+    def predict(self, X):
+        type(self).predict_calls += 1
+        return super().predict(X)
+
+
+def _findings(count):
+    focus_area = FocusArea(code="BUSINESS_PROTECTION", name="Business Protection")
+    issue_type = IssueType(code="FRAUD_DETECTION", name="Fraud Detection")
+    findings = []
+    for i in range(count):
+        finding = Finding(
+            title=f"Finding {i}",
+            severity=["Critical", "High", "Medium", "Low"][i % 4],
+            classification_confidence=0.5 + (i % 5) / 10,
+            focus_area=focus_area,
+            issue_type=issue_type,
+        )
+        finding.risk_assessment = RiskAssessment(risk_score=20 + i, risk_level="Medium")
+        findings.append(finding)
+    return findings
+
+
+@pytest.fixture
+def model_path(tmp_path):
+    rng = np.random.default_rng(0)
+    X = rng.uniform(0, 100, size=(50, 5))
+    model = CountingForest(n_estimators=5, random_state=0).fit(X, X[:, 1] * 100)
+    path = tmp_path / "money_loss_model.pkl"
+    path.write_bytes(pickle.dumps(model))
+    return str(path)
+
+
+class TestCalculateMany:
+    """Tests for MoneyLossML.calculate_many and HybridMoneyLossEngine.calculate_many."""
+
+    def test_one_predict_call_per_batch(self, model_path):
+        """Test that a batch is scored with one predict call and matches per-finding results."""
+        ml = MoneyLossML(model_path=model_path)
+        findings = _findings(12)
+
+        CountingForest.predict_calls = 0
+        batch = ml.calculate_many(findings)
+        assert CountingForest.predict_calls == 1
+
+        single = [ml.calculate(finding, finding.issue_type) for finding in findings]
+        assert [r["estimated_loss"] for r in batch] == pytest.approx([r["estimated_loss"] for r in single])
+
+    def test_default_estimates_without_model(self, tmp_path):
+        """Test that the hybrid engine falls back to per-severity defaults when no model is trained."""
+        engine = HybridMoneyLossEngine()
+        engine.ml_calculator = MoneyLossML(model_path=str(tmp_path / "missing.pkl"))
+        findings = _findings(4)
+
+        results = engine.calculate_many(findings, use_llm=False)
+
+        assert [r["estimated_loss"] for r in results] == [75000.0, 35000.0, 7500.0, 750.0]
+        assert {r["calculation_method"] for r in results} == {"ml"}
+        assert engine.calculate_many([], use_llm=False) == []
@@ -0,0 +1,92 @@
+"""
+Unit tests for byte-level encoding detection.
+
+The sniffer must pick the encoding the old try-each-encoding loops picked,
+and the readers built on it must decode (or parse) each file once.
+"""
+
+import pandas as pd
+import pytest
+
+from app.services.content_analyzer.artifact_reader import ArtifactReader
+from app.services.ingestion.csv_parser import CSVParser
+from app.utils import encoding
+from app.utils.encoding import read_text, sniff_encoding
+
+
+def legacy_read(path, encodings=("utf-8", "latin-1", "cp1252")):
+    for name in encodings:
+        try:
+            with open(path, "r", encoding=name) as f:
+                return f.read(), name
+        except UnicodeDecodeError:
+            continue
+    return None, None
+
+
+@pytest.fixture(params=[False, True], ids=["read", "mmap"])
+def mmap_mode(request, monkeypatch):
+    if request.param:
+        monkeypatch.setattr(encoding, "MMAP_THRESHOLD", 1)
+    monkeypatch.setattr(encoding, "PREFIX_BYTES", 8)
+    monkeypatch.setattr(encoding, "BLOCK_BYTES", 16)
+    return request.param
+
+
+class TestSniffEncoding:
+    """Tests for sniff_encoding and read_text."""
+
+    @pytest.mark.parametrize("content", [
+        b"",
+        b"plain ascii\r\nsecond line\rthird\n",
+        "Grüße aus München €\n".encode("utf-8") * 5,
+        b"\xef\xbb\xbfbom first\n",
+        b"valid utf-8 for a while ... then latin-1: \xe9t\xe9\r\n",
+        "café " * 3 + "€" * 7,  # multi-byte characters across block boundaries
+        b"split euro \xe2\x82",  # truncated sequence at the end
+    ])
+    def test_matches_legacy_reader(self, tmp_path, mmap_mode, content):
+        """Test that the chosen encoding and text equal the try-each-encoding loop."""
+        path = tmp_path / "artifact.txt"
+        path.write_bytes(content.encode("utf-8") if isinstance(content, str) else content)
+
+        text, name = legacy_read(path)
+        assert read_text(str(path)) == (text, name)
+        assert sniff_encoding(str(path)) == name
+
+    def test_no_matching_encoding(self, tmp_path):
+        """Test that None is returned when no candidate decodes the file."""
+        path = tmp_path / "artifact.txt"
+        path.write_bytes(b"ok \x81 cp1252 gap")
+
+        assert sniff_encoding(str(path), ("utf-8", "cp1252")) is None
+        assert read_text(str(path), ("utf-8", "cp1252")) == (None, None)
+
+
+class TestReadersUseSniffer:
+    """Tests that CSVParser and ArtifactReader read each file once."""
+
+    def test_latin1_csv_parsed_once(self, tmp_path, monkeypatch):
+        """Test that a latin-1 CSV is parsed by read_csv exactly once."""
+        path = tmp_path / "upload.csv"
+        path.write_bytes("user,city\nJDOE,Köln\n".encode("latin-1"))
+        calls = []
+        read_csv = pd.read_csv
+
+        def counting(*args, **kwargs):
+            calls.append(kwargs.get("encoding"))
+            return read_csv(*args, **kwargs)
+
+        monkeypatch.setattr(pd, "read_csv", counting)
+        result = CSVParser().parse(str(path))
+
+        assert calls == ["latin-1"]
+        assert result["data"] == [{"user": "JDOE", "city": "Köln"}]
+
+    def test_artifact_reader(self, tmp_path, mmap_mode):
+        """Test that text artifacts read like open(..., 'r') with the first fitting encoding."""
+        path = tmp_path / "Explanation_Alert_200025_001372.txt"
+        path.write_bytes("Line one\r\nZahlung über 10.000 €\r\n".encode("cp1252"))
+
+        assert ArtifactReader()._read_file(str(path)) == legacy_read(path)[0]
+        assert ArtifactReader()._read_file(str(tmp_path / "missing.txt")) is None